@@ -0,0 +1,69 @@
+"""Shared benchmark plumbing: best-of-N timings checked against stored baselines.
+
+``bench(name, fn)`` runs ``fn`` a few times, keeps the best wall time, prints it next
+to the baseline in ``baselines.json`` and fails when it is slower than the baseline by
+more than ``FOLIOMAN_BENCH_THRESHOLD`` (a fraction; default 0.5, i.e. 50% slower)
+plus a fixed 10 ms, so millisecond-scale timings don't flap on scheduler noise.
+The committed baselines were recorded on a modest single-core machine; record your
+own with ``FOLIOMAN_BENCH_UPDATE=1 make bench``, which rewrites the timings of every
+benchmark that ran instead of checking them. A benchmark with no baseline only
+reports its time.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+_BASELINES = Path(__file__).with_name("baselines.json")
+_SLACK_S = 0.010
+
+
+def _updating() -> bool:
+    return os.environ.get("FOLIOMAN_BENCH_UPDATE") == "1"
+
+
+def _stored() -> dict[str, float]:
+    return json.loads(_BASELINES.read_text()) if _BASELINES.exists() else {}
+
+
+@pytest.fixture(scope="session")
+def _bench_timings():
+    timings: dict[str, float] = {}
+    yield timings
+    if timings and _updating():
+        merged = {**_stored(), **timings}
+        _BASELINES.write_text(json.dumps(dict(sorted(merged.items())), indent=2) + "\n")
+
+
+@pytest.fixture
+def bench(_bench_timings) -> Callable:
+    threshold = float(os.environ.get("FOLIOMAN_BENCH_THRESHOLD", "0.5"))
+    baselines = {} if _updating() else _stored()
+
+    def run(name: str, fn: Callable, *, rounds: int = 3):
+        best, result = math.inf, None
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - t0)
+        _bench_timings[name] = round(best, 4)
+        baseline = baselines.get(name)
+        if baseline is None:
+            print(f"\n  {name:<32} {best * 1e3:9.1f} ms  (no baseline)")
+            return result
+        print(f"\n  {name:<32} {best * 1e3:9.1f} ms  ({best / baseline:.2f}x baseline)")
+        limit = baseline * (1 + threshold) + _SLACK_S
+        assert best <= limit, (
+            f"{name}: {best * 1e3:.1f} ms is over {limit * 1e3:.1f} ms "
+            f"(baseline {baseline * 1e3:.1f} ms + {threshold:.0%} + {_SLACK_S * 1e3:.0f} ms)"
+        )
+        return result
+
+    return run
@@ -0,0 +1,95 @@
+"""AMFI history report benchmark: a 90-day, 4,000-scheme report, buffered vs streamed.
+
+Not part of the default suite; run with ``make bench`` or
+``uv run pytest app/benchmarks/test_bench_amfi_stream.py -s``. DB- and network-free:
+an ``httpx.MockTransport`` serves a synthetic report in 64 KiB chunks, the way the
+portal's response arrives.
+
+Times and traces (``tracemalloc`` peak) the old path — the whole body read into a
+string, split into lines, every row parsed — against ``fetch_range`` streaming the
+same body with a ``wanted`` set of ~150 funds, the size of a large household's
+portfolio. Both must agree on the wanted funds' series.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import time
+import tracemalloc
+
+import httpx
+from folioman_core.price_feeds import amfi_bulk
+
+_SCHEMES = 4_000
+_DAYS = 90
+_WANTED = 150
+_CHUNK = 64 * 1024
+_START = dt.date(2026, 1, 1)
+
+
+def _report() -> bytes:
+    lines = [
+        "Scheme Code;Scheme Name;ISIN Div Payout/ISIN Growth;ISIN Div Reinvestment;"
+        "Net Asset Value;Repurchase Price;Sale Price;Date",
+        "",
+        "Open Ended Schemes ( Equity Scheme - Large Cap Fund )",
+        "",
+    ]
+    for offset in range(_DAYS):
+        day = f"{_START + dt.timedelta(days=offset):%d-%b-%Y}"
+        lines.extend(
+            f"{100_000 + n};Synthetic Fund {n} - Direct Growth;INF{n:06d}01A1;-;"
+            f"{10 + n % 500 + offset / 100:.4f};;;{day}"
+            for n in range(_SCHEMES)
+        )
+    return "\n".join(lines).encode()
+
+
+def _client(body: bytes) -> httpx.Client:
+    def handler(_request):
+        chunks = (body[i : i + _CHUNK] for i in range(0, len(body), _CHUNK))
+        return httpx.Response(200, content=chunks)
+
+    return httpx.Client(base_url="https://amfi.test", transport=httpx.MockTransport(handler))
+
+
+def _buffered(client: httpx.Client, lo: dt.date, hi: dt.date) -> dict:
+    response = client.get(f"/report?frmdt={lo:%d-%b-%Y}&todt={hi:%d-%b-%Y}")
+    return amfi_bulk.parse_nav_history(response.text)
+
+
+def _measure(run) -> tuple[dict, float, int]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - t0
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def test_bench_amfi_history_stream_90_days():
+    body = _report()
+    hi = _START + dt.timedelta(days=_DAYS - 1)
+    wanted = {str(100_000 + n) for n in range(0, _SCHEMES, _SCHEMES // _WANTED)}
+
+    with _client(body) as client:
+        whole, before_s, before_peak = _measure(lambda: _buffered(client, _START, hi))
+        amfi_bulk._day.cache_clear()
+        streamed, after_s, after_peak = _measure(
+            lambda: amfi_bulk.fetch_range(_START, hi, client=client, wanted=wanted)
+        )
+
+    assert streamed.keys() == wanted
+    assert all(streamed[code] == whole[code] for code in wanted)
+    assert all(len(points) == _DAYS for points in streamed.values())
+
+    print(
+        f"\nAMFI history report, {_SCHEMES} schemes x {_DAYS} days "
+        f"({len(body) / 2**20:.0f} MB), {len(wanted)} wanted:"
+        f"\n  time  {before_s * 1e3:7.0f} ms -> {after_s * 1e3:5.0f} ms"
+        f"  ({before_s / after_s:.1f}x)"
+        f"\n  peak  {before_peak / 2**20:7.1f} MB -> {after_peak / 2**20:5.1f} MB"
+        f"  ({before_peak / after_peak:.0f}x)"
+    )
+    assert after_peak < before_peak / 10
@@ -0,0 +1,123 @@
+"""Valuation/tax engine benchmarks over a synthetic book, checked against baselines.
+
+Not part of the default suite; run with ``make bench`` or
+``uv run pytest app/benchmarks/test_bench_engines.py -s``. Offline: the book comes
+from ``seed_synthetic``'s generator (10 investors, 12 funds and 6 stocks each,
+fortnightly SIPs with periodic redemptions, a split, a bonus and a merger, six years
+of daily prices), built once for the module, and ``refresh_navs`` runs against a
+stubbed whole-market feed.
+
+Each engine is timed best-of-three through the ``bench`` fixture (``conftest.py``),
+which fails a run more than ``FOLIOMAN_BENCH_THRESHOLD`` slower than its stored
+baseline. A spec change invalidates the baselines — re-record them with
+``FOLIOMAN_BENCH_UPDATE=1``.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import itertools
+from decimal import Decimal
+
+import pytest
+from folioman_app.management.commands.seed_synthetic import (
+    SyntheticSpec,
+    build_synthetic_book,
+    synthetic_mf_statement,
+)
+from folioman_app.models import Investor
+from folioman_app.services import nav_cache
+from folioman_app.services.tax_export import build_capital_gains
+from folioman_app.services.valuation import (
+    _value_series,
+    build_investor_summary,
+    build_scheme_detail,
+)
+from folioman_app.tasks import refresh_navs as refresh_navs_mod
+from folioman_app.tasks.import_cas import persist_mf_statement
+from folioman_app.tasks.reconcile import reconcile_security
+from folioman_app.tasks.refresh_navs import refresh_navs
+
+_SPEC = SyntheticSpec(investors=10, funds=12, equities=6, years=6, sip_days=14, redeem_every=9)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(scope="module")
+def book(django_db_setup, django_db_blocker):
+    """The synthetic book, committed once for every benchmark here and removed after."""
+    with django_db_blocker.unblock():
+        built = build_synthetic_book(_SPEC)
+        yield built
+        built.delete()
+
+
+def test_bench_value_series(bench, book):
+    points = bench(
+        "value_series.daily",
+        lambda: _value_series(book.investors, _SPEC.start, _SPEC.end, "daily"),
+    )
+    assert len(points) == (_SPEC.end - _SPEC.start).days + 1
+    assert points[-1]["value_inr"] > 0
+
+
+def test_bench_investor_summary(bench, book):
+    summary = bench(
+        "investor_summary", lambda: build_investor_summary(book.investors[0], _SPEC.end)
+    )
+    assert summary["total_inr"] > 0 and summary["holdings_count"] == 12 + 5
+
+
+def test_bench_investor_summary_cold_nav_cache(bench, book):
+    """Priced from the DB every round: the first request after a restart or a backfill."""
+
+    def cold():
+        nav_cache.clear()
+        return build_investor_summary(book.investors[0], _SPEC.end)
+
+    summary = bench("investor_summary.cold_navs", cold)
+    assert summary["total_inr"] > 0 and summary["holdings_count"] == 12 + 5
+
+
+def test_bench_scheme_detail(bench, book):
+    inv, fund, acquirer = book.investors[0], book.funds[0], book.equities[3]
+    fund_detail = bench("scheme_detail.mf", lambda: build_scheme_detail(inv, fund, _SPEC.end))
+    equity_detail = bench(
+        "scheme_detail.equity", lambda: build_scheme_detail(inv, acquirer, _SPEC.end)
+    )
+    assert fund_detail["transactions"] and equity_detail["transactions"]
+
+
+def test_bench_capital_gains(bench, book):
+    fy = f"{_SPEC.end.year - 1}-{_SPEC.end.year % 100:02d}"
+    gains = bench("capital_gains.fy", lambda: build_capital_gains(book.investors[0], fy))
+    assert gains["rows"]
+
+
+def test_bench_reconcile_security(bench, book):
+    inv, split = book.investors[0], book.equities[0]
+    statuses = bench("reconcile_security", lambda: reconcile_security(inv, split))
+    assert [s.status for s in statuses] == ["full_history"]
+
+
+def test_bench_refresh_navs(monkeypatch, bench, book):
+    day = _SPEC.end + dt.timedelta(days=1)
+    last = {sid: series[-1][1] for sid, series in book.prices.items()}
+    mf_map = {s.amfi_code: (day, last[s.id] + Decimal("0.01"), "amfi") for s in book.funds}
+    eq_map = {s.symbol: (day, last[s.id] + Decimal("0.05"), "nse") for s in book.equities}
+    monkeypatch.setattr(refresh_navs_mod, "_prime_bulk", lambda _c, _w=None: (mf_map, eq_map))
+
+    summary = bench("refresh_navs", lambda: refresh_navs(securities=book.securities))
+    assert summary == {"updated": len(book.securities), "skipped": 0, "errors": 0}
+
+
+def test_bench_cas_persistence(bench, book):
+    statement = synthetic_mf_statement(_SPEC, book)
+    n = itertools.count(1)
+
+    def _persist():
+        holder = Investor.objects.create(owned_by=book.user, name=f"CAS holder {next(n)}")
+        return persist_mf_statement(holder, statement)
+
+    summary = bench("cas_persistence", _persist)
+    assert summary["incomplete_history"] == []
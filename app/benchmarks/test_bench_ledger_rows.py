@@ -0,0 +1,163 @@
+"""Ledger replay benchmark: ~20k stored rows across 40 equities, through the projection.
+
+Not part of the default suite; run with ``make bench`` or
+``uv run pytest app/benchmarks/test_bench_ledger_rows.py -s``. DB-free: unsaved ORM
+rows (ids set, relations attached) stand in for the ``select_related`` queryset
+``projected_transactions`` iterates, so the timing isolates the in-memory stages.
+
+Profiles the same ledger twice — mapped to validated pydantic ``Transaction``s with a
+core ``Security`` per row (before) and to slotted ``LedgerRow``s sharing one
+``Security`` per security (after) — stage by stage: mapping, intraday netting, the
+corporate-action replay (a split and a merger rewrite most rows) and per-bucket FIFO,
+plus the resident size of the mapped ledger. Both must yield the same disposals.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import random
+import time
+import tracemalloc
+from decimal import Decimal
+
+from folioman_app.mappers import to_core_security, to_core_transaction, to_ledger_row
+from folioman_app.models import Folio, Security, Transaction
+from folioman_core.corporate_action_subject import CorpActionType
+from folioman_core.corporate_actions import CorporateActionApplyEvent, apply_corporate_action_events
+from folioman_core.fifo import build_sell_disposals, net_intraday_offsets
+
+_SECURITIES = 40
+_ROWS = 20_000
+_START = dt.date(2012, 1, 2)
+
+
+def _orm_rows(seed: int = 5) -> list[Transaction]:
+    """Daily trades per equity in one demat: buys, a sell every ~6th day and the odd
+    same-day round trip, all already stored (``pk`` set)."""
+    rng = random.Random(seed)
+    folio = Folio(id=1, number="1201", broker="zerodha")
+    securities = [
+        Security(
+            id=n + 1,
+            name=f"Equity {n}",
+            security_type="equity",
+            isin=f"INE{n:03d}A01011",
+            symbol=f"EQ{n}",
+            exchange="NSE",
+        )
+        for n in range(_SECURITIES)
+    ]
+    rows, held = [], dict.fromkeys(range(_SECURITIES), 0)
+    for pk in range(1, _ROWS + 1):
+        n = pk % _SECURITIES
+        when = _START + dt.timedelta(days=pk // _SECURITIES)
+        sell = held[n] > 20 and (pk // _SECURITIES) % 6 == 5
+        units = rng.randint(1, held[n] // 4) if sell else rng.randint(5, 30)
+        held[n] += -units if sell else units
+        trades = [(pk, "sell" if sell else "buy", units)]
+        if not sell and rng.random() < 0.05:  # squared off in part the same day
+            trades.append((_ROWS + pk, "sell", units // 2))
+            held[n] -= units // 2
+        price = Decimal(rng.randint(10_000, 90_000)) / 100
+        rows += [
+            Transaction(
+                pk=row_pk,
+                security=securities[n],
+                folio=folio,
+                date=when,
+                transaction_type=kind,
+                units=Decimal(qty),
+                nav_or_price=price,
+                fees=Decimal("0"),
+                brokerage=Decimal("20.00"),
+                source="csv-import",
+                source_ref=f"trade-{row_pk}",
+            )
+            for row_pk, kind, qty in trades
+        ]
+    return rows
+
+
+def _events() -> list[CorporateActionApplyEvent]:
+    first, second = (
+        to_core_security(
+            Security(
+                security_type="equity",
+                name=f"Equity {n}",
+                isin=f"INE{n:03d}A01011",
+                symbol=f"EQ{n}",
+                exchange="NSE",
+            )
+        )
+        for n in (0, 1)
+    )
+    return [
+        CorporateActionApplyEvent(
+            kind=CorpActionType.SPLIT,
+            ex_date=dt.date(2020, 6, 1),
+            security=first,
+            unit_multiplier=Decimal("5"),
+            source_ref="split-eq0",
+        ),
+        CorporateActionApplyEvent(
+            kind=CorpActionType.MERGER,
+            ex_date=dt.date(2021, 3, 1),
+            security=second,
+            merger_old_security=first,
+            merger_new_security=second,
+            merger_ratio=Decimal("0.75"),
+            source_ref="merger-eq0",
+        ),
+    ]
+
+
+def _profile(rows, mapper) -> tuple[dict[str, float], int, list]:
+    stages: dict[str, float] = {}
+    tracemalloc.start()
+    kept = mapper(rows)
+    resident = tracemalloc.get_traced_memory()[0]  # what the mapped ledger keeps alive
+    tracemalloc.stop()
+    del kept
+    t0 = time.perf_counter()
+    mapped = mapper(rows)
+    stages["map"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    netted = net_intraday_offsets(mapped)
+    stages["intraday"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    adjusted = apply_corporate_action_events(netted, _events())
+    stages["corp-actions"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    disposals = build_sell_disposals(adjusted)
+    stages["fifo"] = time.perf_counter() - t0
+    return stages, resident, disposals
+
+
+def test_bench_ledger_rows_20k():
+    rows = _orm_rows()
+
+    def _validated(rs):
+        return [to_core_transaction(t) for t in rs]
+
+    def _slotted(rs):
+        securities: dict = {}
+        return [to_ledger_row(t, securities) for t in rs]
+
+    before, before_bytes, before_out = _profile(rows, _validated)
+    after, after_bytes, after_out = _profile(rows, _slotted)
+    assert after_out == before_out
+
+    lines = [
+        f"  {stage:<13} {before[stage] * 1e3:8.0f} ms -> {after[stage] * 1e3:6.0f} ms"
+        f"  ({before[stage] / after[stage]:.1f}x)"
+        for stage in before
+    ]
+    total_before, total_after = sum(before.values()), sum(after.values())
+    print(
+        f"\nledger replay {len(rows)} rows x {_SECURITIES} equities, pydantic -> slotted rows:\n"
+        + "\n".join(lines)
+        + f"\n  {'total':<13} {total_before * 1e3:8.0f} ms -> {total_after * 1e3:6.0f} ms"
+        f"  ({total_before / total_after:.1f}x)"
+        f"\n  resident ledger {before_bytes / 2**20:.1f} MiB -> {after_bytes / 2**20:.1f} MiB"
+    )
+    assert total_after < total_before
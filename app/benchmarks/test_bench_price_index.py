@@ -0,0 +1,105 @@
+"""NAV price index benchmark: 5,000 securities x 15 years of daily NAVs.
+
+Not part of the default suite; run with ``make bench`` or
+``uv run pytest app/benchmarks/test_bench_price_index.py -s``. DB-free: the rows are
+synthesised in the ``(security_id, date, nav)`` shape ``PriceIndex.load`` streams.
+
+Reports the index's resident size at full scale against the ``[(date, Decimal)]``
+lists it replaced (measured on a slice and scaled up — materialising 27M tuples
+would need several GB), the build rate, and lookup latency: single as-of lookups and
+the vectorised "price at each of N dates" walk the value series uses.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import random
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+from folioman_app.services.price_index import PriceIndex
+
+_SECURITIES = 5_000
+_DAYS = 15 * 365 + 4  # 15 years, leap days included
+_SLICE = 100  # securities materialised as tuple lists for the before-measure
+_END = dt.date(2025, 12, 31)
+_START = _END - dt.timedelta(days=_DAYS - 1)
+_DATES = [_START + dt.timedelta(days=i) for i in range(_DAYS)]
+
+
+def _rows(securities: range, seed: int = 11):
+    """Daily NAVs per security, quantized to the column's 6 dp as the DB returns them."""
+    rng = random.Random(seed)
+    q = Decimal("0.000001")
+    for sec_id in securities:
+        nav = rng.uniform(10, 500)
+        for when in _DATES:
+            nav *= 1 + rng.uniform(-0.01, 0.0105)
+            yield sec_id, when, Decimal(nav).quantize(q)
+
+
+def _legacy_price_at(idx: dict, sec_id: int, as_of: dt.date):
+    """The removed lookup: a hand-rolled bisect over ``[(date, Decimal)]``."""
+    seq = idx.get(sec_id)
+    if not seq:
+        return None
+    lo, hi = 0, len(seq)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if seq[mid][0] <= as_of:
+            lo = mid + 1
+        else:
+            hi = mid
+    return seq[lo - 1][1] if lo > 0 else None
+
+
+def test_bench_price_index_5000_securities_15y():
+    # Before: tuple lists on a slice, scaled to the full universe.
+    tracemalloc.start()
+    legacy: dict[int, list] = {}
+    for sec_id, when, nav in _rows(range(_SLICE)):
+        legacy.setdefault(sec_id, []).append((when, nav))
+    legacy_bytes = tracemalloc.get_traced_memory()[0] * _SECURITIES / _SLICE
+    tracemalloc.stop()
+
+    # After: the full universe, streamed straight into the arrays. Sized from the
+    # arrays themselves (tracing 27M allocations would dominate the timing).
+    t0 = time.perf_counter()
+    idx = PriceIndex.from_rows(_rows(range(_SECURITIES)))
+    build_s = time.perf_counter() - t0
+    index_bytes = (
+        sum(sys.getsizeof(a) for arrays in (idx._days, idx._navs) for a in arrays.values())
+        + sys.getsizeof(idx._days)
+        + sys.getsizeof(idx._navs)
+    )
+    points = _SECURITIES * _DAYS
+    assert len(idx) == _SECURITIES and idx.nbytes == points * 12
+
+    rng = random.Random(3)
+    probes = [(rng.randrange(_SLICE), rng.choice(_DATES)) for _ in range(200_000)]
+    t0 = time.perf_counter()
+    legacy_hits = [_legacy_price_at(legacy, s, d) for s, d in probes]
+    legacy_us = (time.perf_counter() - t0) / len(probes) * 1e6
+    t0 = time.perf_counter()
+    hits = [idx.price_at(s, d) for s, d in probes]
+    single_us = (time.perf_counter() - t0) / len(probes) * 1e6
+    assert hits == legacy_hits
+
+    grid = _DATES[-3650:]  # a 10-year daily series for one holding
+    t0 = time.perf_counter()
+    for sec_id in range(_SLICE):
+        idx.prices_at(sec_id, grid)
+    grid_us = (time.perf_counter() - t0) / (_SLICE * len(grid)) * 1e6
+    assert idx.prices_at(7, grid) == [_legacy_price_at(legacy, 7, d) for d in grid]
+    print(
+        f"\nNAV index {_SECURITIES} securities x {_DAYS} days ({points / 1e6:.1f}M points):"
+        f"\n  memory  tuple lists ~{legacy_bytes / 2**20:,.0f} MiB (scaled from {_SLICE})"
+        f" -> arrays {index_bytes / 2**20:,.0f} MiB ({idx.nbytes / 2**20:,.0f} MiB payload,"
+        f" {legacy_bytes / index_bytes:.0f}x smaller)"
+        f"\n  build   {build_s:.0f}s ({points / build_s / 1e6:.2f}M rows/s, incl. synthesis)"
+        f"\n  lookup  as-of {single_us:.2f}us (tuple bisect {legacy_us:.2f}us);"
+        f" vectorised grid {grid_us:.3f}us/date"
+    )
+    assert index_bytes < legacy_bytes / 5
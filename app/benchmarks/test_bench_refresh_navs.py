@@ -0,0 +1,91 @@
+"""NAV refresh write benchmark: 3,000 securities' latest points, per-row vs bulk upsert.
+
+Not part of the default suite; run with ``make bench`` or
+``uv run pytest app/benchmarks/test_bench_refresh_navs.py -s``. Unlike the other
+benchmarks this one needs a database, since the round trips are what it measures: a
+file-backed SQLite test DB in WAL mode (the desktop/settings ``OPTIONS``) by default,
+or Postgres with the ``make test-app-pg`` environment and
+``--ds=folioman_app.settings.server``.
+
+The feeds are stubbed with a whole-market AMFI map, so the pass is all DB writes. It
+times the per-row ``update_or_create`` loop ``refresh_navs`` used to run, then
+``refresh_navs`` itself (gathered points, batched ``bulk_create(update_conflicts=
+True)``), each twice: a first pass that inserts the day's points and a second that
+updates them in place, as the 6-hourly re-runs do.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import time
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from folioman_app.models import NAVHistory, Security
+from folioman_app.tasks import refresh_navs as refresh_navs_mod
+from folioman_app.tasks.refresh_navs import refresh_navs
+from folioman_core.models import SecurityType
+
+_SECURITIES = 3_000
+_DAY = dt.date(2025, 6, 2)
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(tmp_path_factory):
+    """A file test DB for SQLite — the in-memory one silently ignores WAL."""
+    from django.conf import settings
+
+    db = settings.DATABASES["default"]
+    if db["ENGINE"].endswith("sqlite3"):
+        db.setdefault("TEST", {})["NAME"] = str(tmp_path_factory.mktemp("bench") / "navs.db")
+
+
+def _per_row(securities, mf_map) -> None:
+    for security in securities:
+        on, nav, source = mf_map[security.amfi_code]
+        NAVHistory.objects.update_or_create(
+            security=security, date=on, defaults={"nav": nav, "source": source}
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bench_refresh_navs_3k_securities(monkeypatch):
+    Security.objects.bulk_create(
+        Security(security_type=SecurityType.MF.value, name=f"Fund {n}", amfi_code=f"1{n:05d}")
+        for n in range(_SECURITIES)
+    )
+    securities = list(Security.objects.order_by("id"))
+
+    def _market(bump: str) -> dict:
+        return {
+            s.amfi_code: (_DAY, Decimal(10 + s.id % 90) + Decimal(bump), "amfi") for s in securities
+        }
+
+    timings: dict[str, list[float]] = {"update_or_create": [], "bulk upsert": []}
+    for bump in ("0.1", "0.2"):  # insert the day's points, then update them
+        mf_map = _market(bump)
+        t0 = time.perf_counter()
+        _per_row(securities, mf_map)
+        timings["update_or_create"].append(time.perf_counter() - t0)
+
+    NAVHistory.objects.all().delete()
+    for bump in ("0.1", "0.2"):
+        mf_map = _market(bump)
+        monkeypatch.setattr(refresh_navs_mod, "_prime_bulk", lambda _c, _w=None, m=mf_map: (m, {}))
+        t0 = time.perf_counter()
+        summary = refresh_navs(securities=securities)
+        timings["bulk upsert"].append(time.perf_counter() - t0)
+        assert summary == {"updated": _SECURITIES, "skipped": 0, "errors": 0}
+    assert NAVHistory.objects.filter(date=_DAY, nav=Decimal("10.2")).exists()
+    assert NAVHistory.objects.count() == _SECURITIES
+
+    (before_insert, before_update), (after_insert, after_update) = timings.values()
+    print(
+        f"\nNAV refresh writes, {_SECURITIES} securities on {connection.vendor}:"
+        f"\n  insert pass {before_insert * 1e3:7.0f} ms -> {after_insert * 1e3:5.0f} ms"
+        f"  ({before_insert / after_insert:.1f}x)"
+        f"\n  update pass {before_update * 1e3:7.0f} ms -> {after_update * 1e3:5.0f} ms"
+        f"  ({before_update / after_update:.1f}x)"
+    )
+    assert after_insert < before_insert and after_update < before_update
@@ -0,0 +1,86 @@
+"""Valuation worker benchmark: the real claim → recompute path over the synthetic book.
+
+Not part of the default suite; run with ``make bench`` or
+``uv run pytest app/benchmarks/test_bench_valuation_workers.py -s``. Offline: the book
+comes from ``seed_synthetic``'s generator (10 investors, 12 funds and 6 stocks each,
+fortnightly SIPs with periodic redemptions, six years of daily prices), built once for
+the module, and NAV priming is left out — the book's prices are already stored.
+
+Each round queues every investor from the start of its history and drains the queue
+the way a worker-mode tick does: ``claim_due_investors`` leases a batch and
+``recompute_investor_valuation`` rewrites each claimed investor's daily series.
+``valuation_workers.claimed`` drains serially in this process;
+``valuation_workers.pool`` runs ``process_pending_valuations`` across spawned worker
+processes, which needs a database with ``SKIP LOCKED`` and is skipped elsewhere.
+Timed and checked against baselines through the ``bench`` fixture (``conftest.py``).
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+from django.db import connection
+from folioman_app.management.commands.seed_synthetic import SyntheticSpec, build_synthetic_book
+from folioman_app.models import Investor, ValuationStatus
+from folioman_app.tasks import valuation_jobs
+from folioman_app.tasks.valuation_jobs import (
+    claim_due_investors,
+    process_pending_valuations,
+    recompute_investor_valuation,
+)
+
+_SPEC = SyntheticSpec(investors=10, funds=12, equities=6, years=6, sip_days=14, redeem_every=9)
+_BATCH = 4  # investors per claim
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(scope="module")
+def book(django_db_setup, django_db_blocker):
+    """The synthetic book, committed once for every benchmark here and removed after."""
+    with django_db_blocker.unblock():
+        built = build_synthetic_book(_SPEC)
+        yield built
+        built.delete()
+
+
+def _queue(book) -> None:
+    """Queue every investor in the book for a recompute from its first trade."""
+    Investor.objects.filter(id__in=[inv.id for inv in book.investors]).update(
+        valuation_status=ValuationStatus.PENDING,
+        valuation_recompute_from=_SPEC.start,
+        valuation_claimed_by="",
+        valuation_claimed_until=None,
+    )
+
+
+def _drain_claimed(book) -> int:
+    _queue(book)
+    processed = 0
+    while claimed := claim_due_investors("bench", _BATCH):
+        for investor_id, recompute_from in claimed:
+            recompute_investor_valuation(
+                investor_id, recompute_from, prime_navs=False, worker="bench"
+            )
+            processed += 1
+    return processed
+
+
+def test_bench_valuation_claimed(bench, book):
+    processed = bench("valuation_workers.claimed", lambda: _drain_claimed(book))
+    assert processed == _SPEC.investors
+    assert not Investor.objects.exclude(valuation_status=ValuationStatus.READY).exists()
+
+
+def test_bench_valuation_pool(bench, book, monkeypatch):
+    if not connection.features.has_select_for_update_skip_locked:
+        pytest.skip("the worker pool claims with SKIP LOCKED")
+    monkeypatch.setattr(valuation_jobs, "_prime_navs", lambda investor_ids: None)
+    workers = min(4, os.cpu_count() or 1)
+
+    def drain() -> int:
+        _queue(book)
+        return process_pending_valuations(workers)
+
+    assert bench("valuation_workers.pool", drain) == _SPEC.investors
@@ -0,0 +1,105 @@
+"""Value-series engine benchmark: one investor, 10k transactions, a 3,650-day series.
+
+Not part of the default suite (``app/benchmarks`` is outside ``testpaths``); run with
+``make bench`` or ``uv run pytest app/benchmarks -s``. DB-free: the ledger index and
+NAV index are built in memory in the shapes ``_ledger_index`` / ``_nav_index`` return,
+so the timing isolates the engine itself.
+
+The per-date replay it replaced is O(days x transactions), far too slow to run over
+every day of the series here — it's timed on a monthly subsample, checked equal to
+the sweep on those dates, and extrapolated to the daily series for the comparison.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import random
+import time
+from decimal import Decimal
+
+from folioman_app.models import Security
+from folioman_app.services.price_index import PriceIndex
+from folioman_app.services.valuation import (
+    _positions_asof,
+    _sample_dates,
+    _series_points,
+    _sweep_positions,
+)
+from folioman_core.models import Security as CoreSecurity
+from folioman_core.models import SecurityType, TransactionSource, TransactionType
+from folioman_core.models import Transaction as CoreTransaction
+
+_SCHEMES = 20
+_TXNS = 10_000
+_DAYS = 3_650
+_END = dt.date(2025, 12, 31)
+_START = _END - dt.timedelta(days=_DAYS - 1)
+
+
+def _synthetic_investor(seed: int = 7):
+    """``(txn_keys, nav_idx)`` for one investor: weekly SIPs across ``_SCHEMES`` funds
+    with a redemption every ~10th row, and a daily NAV series per fund."""
+    rng = random.Random(seed)
+    txn_keys: dict = {}
+    nav_rows: list = []
+    per_scheme = _TXNS // _SCHEMES
+    step = _DAYS // per_scheme
+    for n in range(_SCHEMES):
+        sec = Security(id=n + 1, name=f"Fund {n}", security_type="mf", amfi_code=f"9{n:05d}")
+        core_sec = CoreSecurity(type=SecurityType.MF, name=sec.name, amfi_code=sec.amfi_code)
+        nav = Decimal("10")
+        navs = []
+        for day in range(_DAYS):
+            nav = (nav * Decimal(str(1 + rng.uniform(-0.01, 0.0107)))).quantize(Decimal("0.0001"))
+            navs.append((_START + dt.timedelta(days=day), nav))
+        nav_rows += [(sec.id, when, price) for when, price in navs]
+        core, cash, held = [], [], Decimal("0")
+        for i in range(per_scheme):
+            when, price = navs[i * step]
+            if i % 10 == 9 and held > Decimal("20"):
+                ttype, units = TransactionType.SELL, (held / 4).quantize(Decimal("0.001"))
+                held -= units
+            else:
+                ttype = TransactionType.BUY
+                units = (Decimal("5000") / price).quantize(Decimal("0.001"))
+                held += units
+            txn = CoreTransaction(
+                security=core_sec,
+                date=when,
+                type=ttype,
+                units=units,
+                nav_or_price=price,
+                source=TransactionSource.CAS_PDF,
+                folio_number="F1",
+            )
+            core.append((when, txn))
+            cash.append((when, ttype.value, units * price))
+        txn_keys[(sec.id, 1)] = {"security": sec, "core": core, "cash": cash}
+    return txn_keys, PriceIndex.from_rows(nav_rows)
+
+
+def test_bench_value_series_daily_10k_txns():
+    txn_keys, nav_idx = _synthetic_investor()
+    daily = _sample_dates(_START, _END, "daily")
+    assert len(daily) == _DAYS
+
+    t0 = time.perf_counter()
+    points = _series_points(txn_keys, nav_idx, daily)
+    sweep_s = time.perf_counter() - t0
+    assert len(points) == _DAYS
+    assert points[-1]["value_inr"] > 0
+
+    monthly = _sample_dates(_START, _END, "monthly")
+    t0 = time.perf_counter()
+    replayed = [_positions_asof(txn_keys, {}, d) for d in monthly]
+    replay_s = time.perf_counter() - t0
+    swept = [agg for _d, agg in _sweep_positions(txn_keys, monthly)]
+    assert repr(swept) == repr(replayed)
+
+    replay_daily_est = replay_s / len(monthly) * _DAYS
+    print(
+        f"\nvalue-series {_TXNS} txns x {_DAYS} days: sweep {sweep_s:.2f}s; "
+        f"per-date replay {replay_s:.2f}s for {len(monthly)} monthly samples "
+        f"(~{replay_daily_est:.0f}s daily, {replay_daily_est / sweep_s:.0f}x)"
+    )
+    assert sweep_s < replay_daily_est
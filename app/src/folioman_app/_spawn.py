@@ -0,0 +1,37 @@
+"""Process pools for CPU-bound work fanned out from a threaded process.
+
+The pools are spawned, never forked. Valuation ticks run on a scheduler thread and
+batch imports on a web worker's request thread, and a fork from there copies every
+other thread's held locks and open DB sockets into the child. A spawned child starts
+bare, so :func:`_init_django` points it at the parent's databases (a test run renames
+them) and sets Django up before it unpickles the first task.
+
+Kept free of model imports: the child unpickles the initializer before Django is set
+up.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from django.conf import settings
+
+
+def _init_django(databases: dict[str, str]) -> None:
+    import django
+
+    for alias, name in databases.items():
+        settings.DATABASES[alias]["NAME"] = name
+    django.setup()
+
+
+def spawn_pool(workers: int) -> ProcessPoolExecutor:
+    """A pool of ``workers`` spawned processes, each with Django set up."""
+    databases = {alias: str(db["NAME"]) for alias, db in settings.DATABASES.items()}
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+        initializer=_init_django,
+        initargs=(databases,),
+    )
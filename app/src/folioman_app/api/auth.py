@@ -22,6 +22,8 @@ from __future__ import annotations
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.db import transaction as db_transaction
 from django.http import HttpRequest
 from django.shortcuts import get_object_or_404
 from folioman_core.models.cas import CasInvestorIdentity
@@ -94,13 +96,22 @@ def resolve_or_create_investor(user, identity: CasInvestorIdentity) -> tuple[Inv
     investor from the statement identity — name + email + the full PAN, encrypted
     via ``set_pan``. Returns ``(investor, created)``. The caller must ensure
     ``identity.pan`` is non-empty (a PAN-less statement is rejected upstream).
+
+    Race-free: two uploads for a new PAN can both miss the lookup, but the unique
+    ``(owned_by, pan_hash)`` constraint lets only one insert land — the loser rolls
+    back its savepoint and returns the winner's investor.
     """
     from folioman_app.security.pan import pan_hash
 
-    investor = Investor.objects.filter(owned_by=user, pan_hash=pan_hash(identity.pan)).first()
+    digest = pan_hash(identity.pan)
+    investor = Investor.objects.filter(owned_by=user, pan_hash=digest).first()
     if investor is not None:
         return investor, False
     investor = Investor(owned_by=user, name=identity.name, email=identity.email)
     investor.set_pan(identity.pan)
-    investor.save()
+    try:
+        with db_transaction.atomic():
+            investor.save()
+    except IntegrityError:
+        return Investor.objects.get(owned_by=user, pan_hash=digest), False
     return investor, True
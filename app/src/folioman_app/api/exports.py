@@ -8,7 +8,9 @@ tax professional, not a filed return, and every response carries that framing
 
 from __future__ import annotations
 
-from django.http import HttpResponse
+from collections.abc import Iterable
+
+from django.http import StreamingHttpResponse
 from ninja import Router
 from ninja.errors import HttpError
 
@@ -18,14 +20,14 @@ from folioman_app.api.schemas import (
     Schedule112ARequest,
     Schedule112AResponse,
 )
-from folioman_app.services.exports import build_holdings_csv, build_transactions_csv
+from folioman_app.services.exports import iter_holdings_csv, iter_transactions_csv
 from folioman_app.services.tax_export import build_capital_gains, build_schedule_112a
 
 router = Router(tags=["exports"])
 
 
-def _csv_response(text: str, filename: str) -> HttpResponse:
-    response = HttpResponse(text, content_type="text/csv")
+def _csv_response(lines: Iterable[str], filename: str) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(lines, content_type="text/csv")
     response["Content-Disposition"] = f'attachment; filename="{filename}"'
     return response
 
@@ -34,14 +36,14 @@ def _csv_response(text: str, filename: str) -> HttpResponse:
 def export_holdings(request, investor_id: int):
     """Current holdings + valuation as a downloadable CSV."""
     investor = get_owned_investor(request, investor_id)
-    return _csv_response(build_holdings_csv(investor), f"holdings_{investor_id}.csv")
+    return _csv_response(iter_holdings_csv(investor), f"holdings_{investor_id}.csv")
 
 
 @router.get("/{investor_id}/exports/transactions")
 def export_transactions(request, investor_id: int):
     """Full transaction ledger as a CSV in the import format (round-trippable)."""
     investor = get_owned_investor(request, investor_id)
-    return _csv_response(build_transactions_csv(investor), f"transactions_{investor_id}.csv")
+    return _csv_response(iter_transactions_csv(investor), f"transactions_{investor_id}.csv")
 
 
 @router.post("/{investor_id}/exports/schedule-112a", response=Schedule112AResponse)
@@ -7,8 +7,12 @@ front. The flow is two-step:
 
 - ``POST /api/imports/cas/preview`` parses and returns the owner identity (name +
   *masked* PAN) and whether it matches an existing investor. Persists nothing.
-- ``POST /api/imports/cas`` resolves/creates the investor, then runs the import
-  job under it. The eCAS destructive-change ``confirm`` gate is unchanged.
+- ``POST /api/imports/cas`` resolves/creates the investor, then submits the import
+  job under it and returns the job — finished, or PENDING when background import
+  workers are configured (poll the job; its ``stage`` shows progress). The eCAS
+  destructive-change ``confirm`` gate is unchanged.
+- ``POST /api/imports/cas/batch`` does the same for a stack of files (a family's
+  statements), parsing them in parallel and returning one aggregate report.
 
 A statement with no PAN is rejected (422) — we can't attribute it to anyone, and
 a partial import is never done. Job reads stay per-investor (jobs belong to the
@@ -30,15 +34,24 @@ from ninja.errors import HttpError
 from ninja.files import UploadedFile
 
 from folioman_app.api.auth import get_owned_investor, resolve_or_create_investor
-from folioman_app.api.schemas import CasPreviewOut, ImportJobOut, ImportQuarantineOut
+from folioman_app.api.schemas import (
+    CasBatchOut,
+    CasPreviewOut,
+    ImportJobOut,
+    ImportQuarantineOut,
+)
 from folioman_app.models import ImportJob, ImportQuarantine, Investor
-from folioman_app.models.jobs import ImportKind
+from folioman_app.models.jobs import ImportKind, ImportStage
 from folioman_app.security.pan import mask_pan, pan_hash
-from folioman_app.services.imports import run_import_job
+from folioman_app.services.imports import recover_stale_jobs, submit_import_job
+from folioman_app.tasks.import_cas_batch import BatchFile, import_cas_batch
 
 router = Router(tags=["imports"])  # per-investor job reads + csv stub (mounted at /investors)
 cas_router = Router(tags=["imports"])  # advisor-level CAS preview + import (mounted at /imports)
 
+# Each file is read whole into memory (MAX_UPLOAD_BYTES apiece), so cap the stack.
+_MAX_BATCH_FILES = 24
+
 _NO_PAN_MSG = (
     "This statement has no PAN, so we can't tell whose it is. "
     "Import a statement that includes the holder's PAN."
@@ -159,7 +172,9 @@ def import_cas(
     Auto-detects MF CAS vs NSDL/CDSL eCAS. An eCAS that would *remove* securities
     returns the job at status ``needs_confirmation`` with ``result.removals`` and
     persists nothing — resubmit with ``confirm=true`` to apply. A PAN-less
-    statement is rejected (422); nothing is created.
+    statement is rejected (422); nothing is created. Parsing stays in the request —
+    the PAN picks the investor the job belongs to, and a bad password or unreadable
+    file should fail the upload itself — persist + reconcile may run in the background.
     """
     content = _read_upload(file)
     # Parse once to resolve the investor, then hand that parse to the job processor
@@ -168,11 +183,43 @@ def import_cas(
     if not parsed.investor.pan:
         raise HttpError(422, _NO_PAN_MSG)
     investor, _created = resolve_or_create_investor(request.auth, parsed.investor)
-    job = ImportJob.objects.create(investor=investor, kind=ImportKind.CAS, filename=file.name or "")
-    run_import_job(job, content=content, password=password, confirm=confirm, parsed=parsed)
+    job = ImportJob.objects.create(
+        investor=investor,
+        kind=ImportKind.CAS,
+        filename=file.name or "",
+        stage=ImportStage.PERSIST,  # parsed above
+    )
+    submit_import_job(job, content=content, password=password, confirm=confirm, parsed=parsed)
     return Status(201, job)
 
 
+@cas_router.post("/cas/batch", response={201: CasBatchOut})
+def import_cas_batch_files(
+    request,
+    files: list[UploadedFile] = File(...),
+    passwords: list[str] = Form([]),
+):
+    """Import several CAS/eCAS files at once, each under the investor its PAN names.
+
+    The files are parsed in parallel (``FOLIOMAN_CAS_PARSE_WORKERS`` processes) and
+    each investor's statements persist oldest first. ``passwords`` is one password
+    for every file or one per file, in order. A file that can't be read is reported
+    in the result, not raised — the rest still import. No ``confirm``: an eCAS that
+    would remove holdings lands at ``needs_confirmation``; re-upload it on its own.
+    """
+    if len(files) > _MAX_BATCH_FILES:
+        raise HttpError(422, f"Upload at most {_MAX_BATCH_FILES} statements at a time.")
+    if len(passwords) not in (0, 1, len(files)):
+        raise HttpError(422, "Give one password for every file, or one per file.")
+    if len(passwords) <= 1:
+        passwords = (passwords or [""]) * len(files)
+    batch = [
+        BatchFile(f.name or "", _read_upload(f), password)
+        for f, password in zip(files, passwords, strict=True)
+    ]
+    return Status(201, import_cas_batch(request.auth, batch))
+
+
 @router.post("/{investor_id}/imports/csv", response={201: ImportJobOut})
 def import_csv(request, investor_id: int, file: UploadedFile = File(...)):
     """Import a canonical-CSV transaction file for an investor.
@@ -186,13 +233,14 @@ def import_csv(request, investor_id: int, file: UploadedFile = File(...)):
     investor = get_owned_investor(request, investor_id)
     content = _read_upload(file)
     job = ImportJob.objects.create(investor=investor, kind=ImportKind.CSV, filename=file.name or "")
-    run_import_job(job, content=content)
+    submit_import_job(job, content=content)
     return Status(201, job)
 
 
 @router.get("/{investor_id}/imports", response=list[ImportJobOut])
 def list_import_jobs(request, investor_id: int):
     investor = get_owned_investor(request, investor_id)
+    recover_stale_jobs([investor])
     return list(investor.import_jobs.all())
 
 
@@ -222,5 +270,6 @@ def dismiss_quarantine(request, investor_id: int, quarantine_id: int):
 @router.get("/{investor_id}/imports/{job_id}", response=ImportJobOut)
 def get_import_job(request, investor_id: int, job_id: int):
     investor = get_owned_investor(request, investor_id)
+    recover_stale_jobs([investor])  # a job its process died running reads FAILED
     # Scope the job to the investor — a job belonging to another investor 404s.
     return get_object_or_404(ImportJob, id=job_id, investor=investor)
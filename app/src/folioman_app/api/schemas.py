@@ -293,6 +293,7 @@ class ImportJobOut(Schema):
     investor_id: int
     kind: str
     status: str
+    stage: str  # parse -> persist -> reconcile -> done; where a FAILED job stopped
     filename: str
     source_ref: str
     result: dict
@@ -302,6 +303,25 @@ class ImportJobOut(Schema):
     created_at: datetime
 
 
+class CasBatchFileOut(Schema):
+    """One file of a batch CAS upload: the investor and job it landed in, or — for a
+    file that couldn't be parsed — no job and the reason."""
+
+    filename: str
+    investor_id: int | None
+    investor_name: str
+    job_id: int | None
+    status: str
+    stage: str
+    error: str
+
+
+class CasBatchOut(Schema):
+    files: list[CasBatchFileOut]  # in upload order
+    investors: int
+    totals: dict[str, int]  # files by job status
+
+
 class ImportJobSummaryOut(Schema):
     """A recent import job for the advisor-wide Settings activity list."""
 
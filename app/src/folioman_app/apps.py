@@ -43,6 +43,10 @@ class FoliomanAppConfig(AppConfig):
         # Register the PAN-encryption-key startup guard (system check).
         from folioman_app.security import checks  # noqa: F401
 
+        # Connect the write-through receivers (post_save/post_delete): the NAV cache's,
+        # and the ledger-version bumps that keep the realised-gains cache current.
+        from folioman_app.services import ledger_version, nav_cache  # noqa: F401
+
         self._maybe_start_scheduler()
 
     def _maybe_start_scheduler(self) -> None:
@@ -0,0 +1,40 @@
+"""manage.py check_positions — compare materialized positions with the ledger."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from folioman_app.models import Investor
+from folioman_app.services.positions import check_positions, refresh_positions
+
+
+class Command(BaseCommand):
+    help = "Check every investor's materialized positions against a rebuild from the ledger."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--investor", type=int, help="Check only this investor id.")
+        parser.add_argument(
+            "--repair", action="store_true", help="Rebuild the positions of investors that drift."
+        )
+
+    def handle(self, *args, **options) -> None:
+        investors = Investor.objects.order_by("id")
+        if options["investor"] is not None:
+            investors = investors.filter(pk=options["investor"])
+        checked = drifted = 0
+        for investor in investors.iterator():
+            checked += 1
+            drift = check_positions(investor)
+            if not drift:
+                continue
+            drifted += 1
+            for row in drift:
+                self.stdout.write(
+                    f"investor {investor.id} security {row['security_id']} "
+                    f"folio {row['folio_id']}: stored {row['stored']} expected {row['expected']}"
+                )
+            if options["repair"]:
+                refresh_positions(investor)
+        verb = "repaired" if options["repair"] else "drifted"
+        style = self.style.SUCCESS if not drifted or options["repair"] else self.style.WARNING
+        self.stdout.write(style(f"Checked {checked} investors, {drifted} {verb}"))
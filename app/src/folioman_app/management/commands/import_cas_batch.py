@@ -0,0 +1,73 @@
+"""manage.py import_cas_batch — import a stack of CAS/eCAS PDFs in one go."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from folioman_app.api.auth import get_local_user
+from folioman_app.tasks.import_cas_batch import BatchFile, import_cas_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Parse CAS/eCAS PDFs in parallel and import each under the investor its PAN "
+        "names (created if new)."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("files", nargs="+", type=Path, metavar="PDF")
+        parser.add_argument(
+            "--password",
+            action="append",
+            default=[],
+            metavar="PW",
+            help="PDF password: once for every file, or once per file in order.",
+        )
+        parser.add_argument(
+            "--user",
+            metavar="USERNAME",
+            help="Advisor who owns the investors (default: the local desktop user).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=0,
+            metavar="N",
+            help="Parse across N processes (default: FOLIOMAN_CAS_PARSE_WORKERS, or one per CPU).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        paths: list[Path] = options["files"]
+        passwords: list[str] = options["password"]
+        if len(passwords) not in (0, 1, len(paths)):
+            raise CommandError(f"pass one --password, or one per file ({len(paths)})")
+        if len(passwords) <= 1:
+            passwords = (passwords or [""]) * len(paths)
+        if options["user"]:
+            try:
+                user = get_user_model().objects.get(username=options["user"])
+            except get_user_model().DoesNotExist as exc:
+                raise CommandError(f"no such user: {options['user']!r}") from exc
+        else:
+            user = get_local_user()
+        files = []
+        for path, password in zip(paths, passwords, strict=True):
+            try:
+                files.append(BatchFile(path.name, path.read_bytes(), password))
+            except OSError as exc:
+                raise CommandError(f"cannot read {path}: {exc.strerror}") from exc
+
+        report = import_cas_batch(user, files, workers=options["workers"])
+        for entry in report["files"]:
+            outcome = entry["status"] + (f": {entry['error']}" if entry["error"] else "")
+            who = f" -> {entry['investor_name']}" if entry["investor_name"] else ""
+            self.stdout.write(f"  {entry['filename']}{who}  [{outcome}]")
+        totals = ", ".join(f"{n} {status}" for status, n in sorted(report["totals"].items()))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {len(files)} statements for {report['investors']} investors ({totals})"
+            )
+        )
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
 from django.core.management.base import BaseCommand
 
 from folioman_app.tasks.reconcile import reconcile_all_investors
@@ -10,10 +12,38 @@ from folioman_app.tasks.reconcile import reconcile_all_investors
 class Command(BaseCommand):
     help = "Re-reconcile every security for every investor (refreshes integrity)."
 
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            metavar="N",
+            help="Reconcile investors across N processes (SQLite always runs serially).",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=Path,
+            metavar="FILE",
+            help="Record finished investors in FILE; rerun with it to resume an "
+            "interrupted run. Removed once every investor is done.",
+        )
+
     def handle(self, *args, **options) -> None:
-        summary = reconcile_all_investors()
+        every = 0
+
+        def progress(done: int, total: int) -> None:
+            nonlocal every
+            every = every or max(1, total // 20)
+            if done % every == 0 or done == total:
+                self.stdout.write(f"  {done}/{total} investors")
+
+        summary = reconcile_all_investors(
+            workers=options["workers"], checkpoint=options["checkpoint"], progress=progress
+        )
+        resumed = f" (resumed past {summary['resumed']})" if summary["resumed"] else ""
         self.stdout.write(
             self.style.SUCCESS(
-                f"Reconciled {summary['statuses']} statuses across {summary['investors']} investors"
+                f"Reconciled {summary['statuses']} statuses across "
+                f"{summary['investors']} investors{resumed}"
             )
         )
@@ -21,7 +21,12 @@ class Command(BaseCommand):
         parser.add_argument(
             "--since",
             metavar="YYYY-MM-DD",
-            help="Earliest ex-date to fetch (default: 2016-01-01).",
+            help="Earliest ex-date to fetch (default: resume from the last sync).",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Re-scan each equity's whole history back to 2016-01-01.",
         )
 
     def handle(self, *args, **options) -> None:
@@ -31,7 +36,9 @@ class Command(BaseCommand):
                 since = date.fromisoformat(options["since"])
             except ValueError as exc:
                 raise CommandError(f"invalid --since date: {options['since']!r}") from exc
-        summary = refresh_corporate_actions(symbol=options["symbol"], since=since)
+        summary = refresh_corporate_actions(
+            symbol=options["symbol"], since=since, full=options["full"]
+        )
         self.stdout.write(
             self.style.SUCCESS(
                 f"Corporate actions: {summary['securities']} securities, "
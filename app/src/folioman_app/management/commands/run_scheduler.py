@@ -14,6 +14,14 @@ from folioman_app.scheduler import run_blocking_scheduler
 class Command(BaseCommand):
     help = "Run the folioman background scheduler (day-wise valuation worker)."
 
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Recompute pending valuations across N lease-claimed worker processes "
+            "(Postgres; default FOLIOMAN_VALUATION_WORKERS, 0 = serial).",
+        )
+
     def handle(self, *args, **options) -> None:
         # Seed + point CASPARSER_ISIN_DB at the writable copy so this process's daily
         # ISIN refresh writes in place (no-op when no writable path is configured).
@@ -22,6 +30,6 @@ class Command(BaseCommand):
         ensure_isin_db()
         self.stdout.write(self.style.SUCCESS("Starting folioman valuation scheduler…"))
         try:
-            run_blocking_scheduler()
+            run_blocking_scheduler(workers=options["workers"])
         except (KeyboardInterrupt, SystemExit):
             self.stdout.write("Scheduler stopped.")
@@ -61,6 +61,7 @@ from folioman_app.models import (
     Security,
     Transaction,
 )
+from folioman_app.services.positions import refresh_positions
 from folioman_app.services.projected_ledger import compute_ledger
 from folioman_app.tasks._upsert import upsert_folio, upsert_security
 from folioman_app.tasks.reconcile import reconcile_after_import
@@ -397,6 +398,7 @@ class Command(BaseCommand):
             (equity_inv, equity_secs),
         ):
             reconcile_after_import(inv, secs)
+            refresh_positions(inv)
             recompute_investor_valuation(inv.id, start, prime_navs=False)
 
         self.stdout.write(
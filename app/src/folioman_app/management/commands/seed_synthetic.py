@@ -0,0 +1,383 @@
+"""Seed a large, deterministic synthetic book — offline, for load and benchmark runs.
+
+``seed_demo`` builds a small real-world family and prices it off the live feeds;
+this builds as big a book as asked for with no network at all. Every number comes
+from one seeded ``random.Random``, so the same arguments always produce the same
+rows:
+
+- a universe of ``funds`` equity-oriented mutual funds and ``equities`` NSE stocks,
+  each with a synthetic daily price series (a seeded random walk) over ``years``,
+- ``investors`` investors under one family, each with a folio per fund and one demat,
+  buying every fund and stock on a ``sip_days`` cadence and redeeming a quarter of
+  the units every ``redeem_every``-th instalment,
+- corporate actions on the first stocks, applied to every holder: a 1:2 split, a 1:1
+  bonus, and a merger of one stock into another (prices adjusted to match).
+
+Rows are written with ``bulk_create``; each investor is then reconciled and its
+positions refreshed, so every read path sees it as it would an imported ledger.
+``build_synthetic_book`` is the entry point the benchmarks (``app/benchmarks``) use;
+``synthetic_mf_statement`` builds a CAS statement of the same shape for the import
+path. ``--reset`` removes a previous synthetic book first.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import random
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction as db_transaction
+from folioman_core.corporate_action_subject import CorpActionType
+from folioman_core.models import (
+    FolioType,
+    SecurityType,
+    TransactionSource,
+    TransactionType,
+)
+from folioman_core.models.cas import MfCasLineItem, MfCasSchemeBlock, MfCasStatement
+from folioman_core.models.investor import Folio as CoreFolio
+from folioman_core.models.security import Security as CoreSecurity
+
+from folioman_app.models import (
+    AppliedCorporateAction,
+    Family,
+    Folio,
+    Investor,
+    NAVHistory,
+    Security,
+    Transaction,
+)
+from folioman_app.services import nav_cache
+from folioman_app.services.ledger_version import bump_ledger_version
+from folioman_app.services.positions import refresh_positions
+from folioman_app.tasks.reconcile import recompute_investor
+
+SYNTHETIC_USERNAME = "synthetic"
+_SIP_AMOUNT = Decimal("5000")
+_UNITS = Decimal("0.001")
+_PRICE = Decimal("0.0001")
+_EQUITY_META = {"equity_oriented": True, "fund_type": "EQUITY"}
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticSpec:
+    """The shape of a synthetic book. Same spec, same rows."""
+
+    investors: int = 5
+    funds: int = 8
+    equities: int = 4
+    years: int = 5
+    sip_days: int = 30  # days between instalments
+    redeem_every: int = 12  # every Nth instalment redeems a quarter of the units
+    end: dt.date = dt.date(2025, 12, 31)
+    seed: int = 7
+
+    @property
+    def start(self) -> dt.date:
+        return self.end - dt.timedelta(days=365 * self.years - 1)
+
+
+@dataclass(slots=True)
+class SyntheticBook:
+    """What ``build_synthetic_book`` created, for the caller to drive and clean up."""
+
+    spec: SyntheticSpec
+    user: object
+    investors: list[Investor]
+    funds: list[Security]
+    equities: list[Security]
+    # {security_id: [(date, price), ...]} — the series written to NAVHistory.
+    prices: dict[int, list[tuple[dt.date, Decimal]]] = field(repr=False)
+
+    @property
+    def securities(self) -> list[Security]:
+        return self.funds + self.equities
+
+    def delete(self) -> None:
+        """Remove everything the book wrote."""
+        _delete_book(self.user, [s.id for s in self.securities])
+
+
+def _delete_book(user, security_ids: list[int]) -> None:
+    # Investors first: their ledgers cascade, and a traded security is PROTECTed.
+    Investor.objects.filter(owned_by=user).delete()
+    Family.objects.filter(owned_by=user).delete()
+    NAVHistory.objects.filter(security_id__in=security_ids).delete()
+    Security.objects.filter(id__in=security_ids).delete()
+
+
+def _corporate_actions(spec: SyntheticSpec, equities: list[Security]) -> list[dict]:
+    """The book's corporate actions, a quarter, half and three quarters of the way
+    through the window: stock 0 splits 1:2, stock 1 issues a 1:1 bonus, stock 2 merges
+    into stock 3 at 1.5 new per old. Dropped when there aren't enough stocks."""
+    span = (spec.end - spec.start).days
+    on = [spec.start + dt.timedelta(days=span * k // 4) for k in (1, 2, 3)]
+    events = []
+    if len(equities) > 0:
+        events.append(
+            {
+                "kind": CorpActionType.SPLIT,
+                "security": equities[0],
+                "ex_date": on[0],
+                "unit_multiplier": Decimal("2"),
+            }
+        )
+    if len(equities) > 1:
+        events.append(
+            {
+                "kind": CorpActionType.BONUS,
+                "security": equities[1],
+                "ex_date": on[1],
+                "unit_multiplier": Decimal("2"),
+                "bonus_ratio_a": 1,
+                "bonus_ratio_b": 1,
+            }
+        )
+    if len(equities) > 3:
+        events.append(
+            {
+                "kind": CorpActionType.MERGER,
+                "security": equities[2],
+                "ex_date": on[2],
+                "counterparty_security": equities[3],
+                "merger_ratio": Decimal("1.5"),
+            }
+        )
+    return events
+
+
+def _price_series(
+    rng: random.Random, spec: SyntheticSpec, base: Decimal, adjust: dict[dt.date, Decimal]
+) -> list[tuple[dt.date, Decimal]]:
+    """A daily random walk from ``base``, divided by ``adjust[day]`` on each
+    corporate-action ex-date (a split or a 1:1 bonus halves the quote)."""
+    price, out, day = base, [], spec.start
+    while day <= spec.end:
+        price *= Decimal(str(1 + rng.uniform(-0.012, 0.0132)))
+        price /= adjust.get(day, Decimal("1"))
+        out.append((day, price.quantize(_PRICE)))
+        day += dt.timedelta(days=1)
+    return out
+
+
+def _universe(rng: random.Random, spec: SyntheticSpec) -> tuple[list, list]:
+    funds = Security.objects.bulk_create(
+        Security(
+            security_type=SecurityType.MF.value,
+            name=f"Synthetic Flexi Cap {n} - Direct Growth",
+            amfi_code=f"9{spec.seed:02d}{n:03d}",
+            isin=f"INF{spec.seed % 100:02d}{n:05d}Y1",
+            metadata=dict(_EQUITY_META),
+        )
+        for n in range(spec.funds)
+    )
+    equities = Security.objects.bulk_create(
+        Security(
+            security_type=SecurityType.EQUITY.value,
+            name=f"Synthetic Industries {n}",
+            isin=f"INE{spec.seed % 100:02d}{n:03d}S017",
+            symbol=f"SYN{spec.seed}X{n}",
+            exchange="NSE",
+        )
+        for n in range(spec.equities)
+    )
+    return funds, equities
+
+
+def _instalments(spec: SyntheticSpec, prices, *, stop: dt.date | None = None) -> list[tuple]:
+    """``(date, type, units, price)`` rows for one holder of one security: a fixed-amount
+    buy every ``sip_days`` and, every ``redeem_every``-th time, a sale of a quarter of
+    the units held instead. ``stop`` ends the plan (a merged-away stock)."""
+    rows, held = [], Decimal("0")
+    for n, i in enumerate(range(0, len(prices), spec.sip_days), start=1):
+        day, price = prices[i]
+        if stop is not None and day >= stop:
+            break
+        if n % spec.redeem_every == 0 and held > 0:
+            units = (held / 4).quantize(_UNITS)
+            rows.append((day, TransactionType.SELL, units, price))
+            held -= units
+        else:
+            units = (_SIP_AMOUNT / price).quantize(_UNITS)
+            rows.append((day, TransactionType.BUY, units, price))
+            held += units
+    return rows
+
+
+def build_synthetic_book(spec: SyntheticSpec | None = None, *, user=None) -> SyntheticBook:
+    """Write ``spec``'s book (the default spec if none) and return handles to it.
+    Offline and deterministic."""
+    spec = spec or SyntheticSpec()
+    rng = random.Random(spec.seed)
+    if user is None:
+        user, _ = get_user_model().objects.get_or_create(username=SYNTHETIC_USERNAME)
+    with db_transaction.atomic():
+        funds, equities = _universe(rng, spec)
+        events = _corporate_actions(spec, equities)
+        adjust = {
+            (e["security"].id, e["ex_date"]): e["unit_multiplier"]
+            for e in events
+            if "unit_multiplier" in e
+        }
+        prices = {
+            s.id: _price_series(
+                rng,
+                spec,
+                Decimal(rng.randint(10, 400) if s in funds else rng.randint(100, 3000)),
+                {day: m for (sid, day), m in adjust.items() if sid == s.id},
+            )
+            for s in funds + equities
+        }
+        NAVHistory.objects.bulk_create(
+            NAVHistory(security_id=sid, date=day, nav=price, source="synthetic")
+            for sid, series in prices.items()
+            for day, price in series
+        )
+        nav_cache.invalidate(prices)  # bulk_create sends no post_save
+        stops = {
+            e["security"].id: e["ex_date"] for e in events if e["kind"] is CorpActionType.MERGER
+        }
+        family = Family.objects.create(owned_by=user, name=f"Synthetic family {spec.seed}")
+        investors = []
+        for i in range(spec.investors):
+            investor = Investor.objects.create(
+                owned_by=user, family=family, name=f"Synthetic investor {i + 1}"
+            )
+            investors.append(investor)
+            demat = Folio.objects.create(
+                investor=investor,
+                folio_type=FolioType.DEMAT.value,
+                number=f"1208{spec.seed:04d}{i:08d}",
+                broker="synthetic",
+            )
+            rows = []
+            for n, fund in enumerate(funds):
+                folio = Folio.objects.create(
+                    investor=investor,
+                    folio_type=FolioType.MF.value,
+                    number=f"{i + 1}{n:04d}/{spec.seed}",
+                )
+                rows += [(fund, folio, r) for r in _instalments(spec, prices[fund.id])]
+            for equity in equities:
+                plan = _instalments(spec, prices[equity.id], stop=stops.get(equity.id))
+                rows += [(equity, demat, r) for r in plan]
+            Transaction.objects.bulk_create(
+                Transaction(
+                    investor=investor,
+                    security=security,
+                    folio=folio,
+                    date=day,
+                    transaction_type=ttype.value,
+                    units=units,
+                    nav_or_price=price,
+                    amount=(units * price).quantize(Decimal("0.01")),
+                    source=TransactionSource.CAS_PDF.value
+                    if security.security_type == SecurityType.MF.value
+                    else TransactionSource.CSV_IMPORT.value,
+                )
+                for security, folio, (day, ttype, units, price) in rows
+            )
+            AppliedCorporateAction.objects.bulk_create(
+                AppliedCorporateAction(
+                    investor=investor,
+                    folio=demat,
+                    source_ref=f"synthetic-{e['kind']}-{e['security'].id}",
+                    **{**e, "kind": e["kind"].value},
+                )
+                for e in events
+            )
+            bump_ledger_version(investor.id)  # bulk_create skips the post_save bump
+    for investor in investors:
+        recompute_investor(investor)
+        refresh_positions(investor)
+    return SyntheticBook(spec, user, investors, funds, equities, prices)
+
+
+def synthetic_mf_statement(spec: SyntheticSpec, book: SyntheticBook) -> MfCasStatement:
+    """A since-inception MF CAS for one new holder of ``book``'s funds — the same
+    SIP/redemption plan, shaped as the parser hands it to ``persist_mf_statement``."""
+    schemes = []
+    for n, fund in enumerate(book.funds):
+        plan = _instalments(spec, book.prices[fund.id])
+        held = sum((u if t is TransactionType.BUY else -u for _d, t, u, _p in plan), Decimal(0))
+        schemes.append(
+            MfCasSchemeBlock(
+                folio=CoreFolio(folio_type="mf", number=f"CAS{n:04d}/{spec.seed}", amc_code="SYN"),
+                security=CoreSecurity(
+                    type=SecurityType.MF,
+                    name=fund.name,
+                    amfi_code=fund.amfi_code,
+                    isin=fund.isin,
+                    metadata=dict(_EQUITY_META),
+                ),
+                opening_units="0",
+                closing_units=held,
+                transactions=[
+                    MfCasLineItem(
+                        date=day,
+                        transaction_type=ttype,
+                        units=units,
+                        nav=price,
+                        amount=(units * price).quantize(Decimal("0.01")),
+                    )
+                    for day, ttype, units, price in plan
+                ],
+            )
+        )
+    return MfCasStatement(statement_from=spec.start, statement_to=spec.end, schemes=schemes)
+
+
+class Command(BaseCommand):
+    help = "Seed a large deterministic synthetic portfolio book (offline; no feeds)."
+
+    def add_arguments(self, parser) -> None:
+        defaults = SyntheticSpec()
+        for name, help_text in (
+            ("investors", "Investors in the synthetic family."),
+            ("funds", "Mutual funds every investor holds."),
+            ("equities", "Stocks every investor holds (the first four carry corporate actions)."),
+            ("years", "Years of history, ending at --end."),
+            ("sip-days", "Days between instalments."),
+            ("redeem-every", "Every Nth instalment redeems a quarter of the units instead."),
+            ("seed", "Random seed; the same seed and sizes give the same book."),
+        ):
+            dest = name.replace("-", "_")
+            parser.add_argument(
+                f"--{name}", type=int, default=getattr(defaults, dest), help=help_text
+            )
+        parser.add_argument(
+            "--end", type=dt.date.fromisoformat, default=defaults.end, metavar="YYYY-MM-DD"
+        )
+        parser.add_argument(
+            "--reset", action="store_true", help="Delete a previous synthetic book first."
+        )
+
+    def handle(self, *args, **options) -> None:
+        spec = SyntheticSpec(
+            investors=options["investors"],
+            funds=options["funds"],
+            equities=options["equities"],
+            years=options["years"],
+            sip_days=options["sip_days"],
+            redeem_every=options["redeem_every"],
+            end=options["end"],
+            seed=options["seed"],
+        )
+        user, _ = get_user_model().objects.get_or_create(username=SYNTHETIC_USERNAME)
+        if Investor.objects.filter(owned_by=user).exists():
+            if not options["reset"]:
+                self.stdout.write("Synthetic book already present (pass --reset to rebuild).")
+                return
+            held = Security.objects.filter(transactions__investor__owned_by=user).distinct()
+            _delete_book(user, list(held.values_list("id", flat=True)))
+        book = build_synthetic_book(spec, user=user)
+        txns = Transaction.objects.filter(investor__owned_by=user).count()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {len(book.investors)} investors, {len(book.securities)} securities, "
+                f"{txns} transactions, {sum(map(len, book.prices.values()))} prices"
+            )
+        )
@@ -16,6 +16,14 @@ from folioman_app.tasks.valuation_ticks import run_pending_valuations_tick
 class Command(BaseCommand):
     help = "Process investors with pending/retryable day-wise valuation (one pass)."
 
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Recompute across N lease-claimed worker processes (Postgres; default "
+            "FOLIOMAN_VALUATION_WORKERS, 0 = serial). Safe to run on several hosts at once.",
+        )
+
     def handle(self, *args, **options) -> None:
-        processed = run_pending_valuations_tick()
+        processed = run_pending_valuations_tick(options["workers"])
         self.stdout.write(self.style.SUCCESS(f"Pending valuation pass: {processed} processed"))
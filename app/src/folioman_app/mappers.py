@@ -3,21 +3,45 @@
 The core library (FIFO, valuation, reconciliation, tax) operates on pydantic
 models. Services convert ORM rows into those at the boundary so the domain
 logic stays Django-free. This is the single place that conversion lives.
+
+Ledger replays (projection, valuation) map stored rows with :func:`to_ledger_row`
+instead: an unvalidated slotted :class:`LedgerRow`, since every stored row was
+validated on its way in.
+
+Every mapper takes an optional ``interned`` identity map (:data:`SecurityMap`) for
+the length of one load: the first row of a security builds its core ``Security``,
+every later row — and every event of that security — gets the same object back.
+A 5,000-row scheme then holds one security instead of 5,000 equal copies, and the
+FIFO/netting passes hash it once (its hash is cached) and match it by ``is``.
 """
 
 from __future__ import annotations
 
 from folioman_core.models import Holding as CoreHolding
-from folioman_core.models import HoldingSource, SecurityType, TransactionSource, TransactionType
+from folioman_core.models import (
+    HoldingSource,
+    LedgerRow,
+    SecurityType,
+    TransactionSource,
+    TransactionType,
+)
 from folioman_core.models import Security as CoreSecurity
 from folioman_core.models import Transaction as CoreTransaction
 
 from folioman_app.models import Holding, Security, Transaction
 
+# Per-load identity map: Django ``Security.pk`` -> its one shared core ``Security``.
+SecurityMap = dict[int, CoreSecurity]
+
 
-def to_core_security(security: Security) -> CoreSecurity:
-    """Django ``Security`` row -> core ``Security`` value object."""
-    return CoreSecurity(
+def to_core_security(security: Security, interned: SecurityMap | None = None) -> CoreSecurity:
+    """Django ``Security`` row -> core ``Security`` value object (the shared one when
+    ``interned`` already holds it)."""
+    if interned is not None:
+        core = interned.get(security.pk)
+        if core is not None:
+            return core
+    core = CoreSecurity(
         type=SecurityType(security.security_type),
         name=security.name,
         isin=security.isin,
@@ -27,12 +51,25 @@ def to_core_security(security: Security) -> CoreSecurity:
         amfi_code=security.amfi_code,
         metadata=dict(security.metadata or {}),
     )
+    if interned is not None and security.pk is not None:
+        interned[security.pk] = core
+    return core
 
 
-def to_core_transaction(txn: Transaction) -> CoreTransaction:
+def _row_security(row: Transaction | Holding, interned: SecurityMap | None) -> CoreSecurity:
+    """The row's core security, looked up by FK id first so an interned hit never
+    touches (or lazily loads) the ``security`` relation."""
+    if interned is not None:
+        core = interned.get(row.security_id)
+        if core is not None:
+            return core
+    return to_core_security(row.security, interned)
+
+
+def to_core_transaction(txn: Transaction, interned: SecurityMap | None = None) -> CoreTransaction:
     """Django ``Transaction`` row -> core ``Transaction`` (FIFO/reconcile input)."""
     return CoreTransaction(
-        security=to_core_security(txn.security),
+        security=_row_security(txn, interned),
         date=txn.date,
         type=TransactionType(txn.transaction_type),
         units=txn.units,
@@ -52,10 +89,38 @@ def to_core_transaction(txn: Transaction) -> CoreTransaction:
     )
 
 
-def to_core_holding(holding: Holding) -> CoreHolding:
+def to_ledger_row(txn: Transaction, interned: SecurityMap | None = None) -> LedgerRow:
+    """Django ``Transaction`` row -> core :class:`LedgerRow` (FIFO/valuation hot path).
+
+    Same values as :func:`to_core_transaction` — strings stripped and the currency
+    upper-cased as the pydantic fields would — without re-validating.
+    """
+    folio = txn.folio
+    return LedgerRow(
+        security=_row_security(txn, interned),
+        date=txn.date,
+        type=TransactionType(txn.transaction_type),
+        units=txn.units,
+        nav_or_price=txn.nav_or_price,
+        amount=txn.amount,
+        currency=(txn.currency or "INR").strip().upper(),
+        fx_rate_to_inr=txn.fx_rate_to_inr,
+        fees=txn.fees,
+        stamp_duty=txn.stamp_duty,
+        brokerage=txn.brokerage,
+        cost_total=txn.cost_total,
+        source=TransactionSource(txn.source),
+        source_ref=txn.source_ref.strip(),
+        folio_number=folio.number.strip() if folio else "",
+        broker=folio.broker.strip() if folio else "",
+        ledger_id=txn.pk,
+    )
+
+
+def to_core_holding(holding: Holding, interned: SecurityMap | None = None) -> CoreHolding:
     """Django ``Holding`` row -> core ``Holding`` (reconcile input)."""
     return CoreHolding(
-        security=to_core_security(holding.security),
+        security=_row_security(holding, interned),
         as_of_date=holding.as_of_date,
         units=holding.units,
         value_observed=holding.value_observed,
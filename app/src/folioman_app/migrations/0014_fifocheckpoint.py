@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('folioman_app', '0013_appliedcorporateaction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FIFOCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('as_of', models.DateField()),
+                ('ledger_fingerprint', models.CharField(max_length=64)),
+                ('buckets', models.JSONField(default=list)),
+                ('investor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='fifo_checkpoint', to='folioman_app.investor')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:03
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('folioman_app', '0014_fifocheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('investor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_version', to='folioman_app.investor')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='CurrentPosition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('units', models.DecimalField(decimal_places=8, max_digits=24)),
+                ('invested_inr', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=20)),
+                ('last_activity', models.DateField()),
+                ('source', models.CharField(choices=[('ecas', 'Ecas'), ('manual', 'Manual'), ('cas-pdf', 'Cas Pdf'), ('ledger', 'Ledger')], max_length=20)),
+                ('folio', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='folioman_app.folio')),
+                ('investor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='current_positions', to='folioman_app.investor')),
+                ('security', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='folioman_app.security')),
+            ],
+            options={
+                'ordering': ['investor', 'security', 'folio'],
+                'constraints': [models.UniqueConstraint(fields=('investor', 'security', 'folio'), name='uniq_position_inv_sec_folio'), models.UniqueConstraint(condition=models.Q(('folio__isnull', True)), fields=('investor', 'security'), name='uniq_position_inv_sec_no_folio')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('folioman_app', '0015_current_positions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='investor',
+            name='valuation_claimed_by',
+            field=models.CharField(blank=True, default='', max_length=128),
+        ),
+        migrations.AddField(
+            model_name='investor',
+            name='valuation_claimed_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
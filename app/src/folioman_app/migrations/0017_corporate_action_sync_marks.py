@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('folioman_app', '0016_investor_valuation_lease'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CorporateActionSyncMark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('exchange', models.CharField(max_length=8)),
+                ('fetched_through', models.DateField()),
+                ('security', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='corporate_action_marks', to='folioman_app.security')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('security', 'exchange'), name='uniq_corp_action_mark_sec_exch')],
+            },
+        ),
+    ]
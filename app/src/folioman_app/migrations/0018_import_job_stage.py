@@ -0,0 +1,36 @@
+"""Track an import job's progress stage (parse -> persist -> reconcile -> done).
+
+Jobs that already finished ran every stage, so they're backfilled to ``done``."""
+
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+def mark_finished_done(apps, schema_editor):
+    ImportJob = apps.get_model("folioman_app", "ImportJob")
+    ImportJob.objects.exclude(status__in=("pending", "running")).update(stage="done")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("folioman_app", "0017_corporate_action_sync_marks"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="stage",
+            field=models.CharField(
+                choices=[
+                    ("parse", "Parse"),
+                    ("persist", "Persist"),
+                    ("reconcile", "Reconcile"),
+                    ("done", "Done"),
+                ],
+                default="parse",
+                max_length=16,
+            ),
+        ),
+        migrations.RunPython(mark_finished_done, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('folioman_app', '0018_import_job_stage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RealisedGainSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('include_unreconciled', models.BooleanField(default=False)),
+                ('ledger_version', models.PositiveBigIntegerField()),
+                ('gating_key', models.CharField(max_length=64)),
+                ('ungrandfathered', models.JSONField(blank=True, default=list)),
+                ('investor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='realised_gain_sets', to='folioman_app.investor')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RealisedGain',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('fy', models.CharField(max_length=7)),
+                ('line', models.JSONField()),
+                ('gain_set', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='folioman_app.realisedgainset')),
+            ],
+            options={
+                'ordering': ['gain_set', 'id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='realisedgainset',
+            constraint=models.UniqueConstraint(fields=('investor', 'include_unreconciled'), name='uniq_gain_set_inv_mode'),
+        ),
+        migrations.AddIndex(
+            model_name='realisedgain',
+            index=models.Index(fields=['gain_set', 'fy'], name='idx_gain_set_fy'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('folioman_app', '0019_realised_gains'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='realisedgainset',
+            name='ungrandfathered',
+        ),
+        migrations.AddField(
+            model_name='realisedgainset',
+            name='fmv_key',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('folioman_app', '0020_realised_gain_fmvs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='runner',
+            field=models.CharField(blank=True, default='', max_length=128),
+        ),
+    ]
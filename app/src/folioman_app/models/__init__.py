@@ -9,12 +9,17 @@ from folioman_app.models.integrity import SecurityIntegrityStatus
 from folioman_app.models.jobs import ImportJob, ImportQuarantine
 from folioman_app.models.ledger import (
     AppliedCorporateAction,
+    CurrentPosition,
     Family,
+    FIFOCheckpoint,
     Folio,
     Holding,
     Investor,
     InvestorValue,
+    LedgerVersion,
     PartialBlock,
+    RealisedGain,
+    RealisedGainSet,
     Transaction,
     ValuationStatus,
 )
@@ -22,6 +27,7 @@ from folioman_app.models.licensing import License
 from folioman_app.models.master import (
     AMC,
     CorporateActionReference,
+    CorporateActionSyncMark,
     FXRate,
     NAVHistory,
     Security,
@@ -31,6 +37,9 @@ __all__ = [
     "AMC",
     "AppliedCorporateAction",
     "CorporateActionReference",
+    "CorporateActionSyncMark",
+    "CurrentPosition",
+    "FIFOCheckpoint",
     "FXRate",
     "Family",
     "Folio",
@@ -39,9 +48,12 @@ __all__ = [
     "ImportQuarantine",
     "Investor",
     "InvestorValue",
+    "LedgerVersion",
     "License",
     "NAVHistory",
     "PartialBlock",
+    "RealisedGain",
+    "RealisedGainSet",
     "Security",
     "SecurityIntegrityStatus",
     "Transaction",
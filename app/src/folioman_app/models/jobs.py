@@ -1,8 +1,10 @@
-"""ImportJob: a synchronous import status row (no task queue in v1).
+"""ImportJob: an import's status row (no task queue — see Key decisions).
 
-Imports run synchronously (see Key decisions): an import creates an ImportJob,
-runs the parse + upsert in-process, then updates the row to SUCCESS/FAILED with
-a result summary. The API returns the job id and the client polls
+An import creates an ImportJob and hands the work to ``services.imports``, which
+runs the parse + upsert in-process — inline, or on the process's background import
+threads (``FOLIOMAN_IMPORT_WORKERS``) — then updates the row to SUCCESS/FAILED with
+a result summary. ``stage`` tracks where a running job is (parse -> persist ->
+reconcile -> done). The API returns the job and the client polls
 ``GET /api/investors/{id}/imports/{job_id}``. Investor-scoped so the flow knows
 exactly what is being mutated.
 """
@@ -38,12 +40,22 @@ class ImportJobStatus(models.TextChoices):
     FAILED = "failed", "Failed"
 
 
+class ImportStage(models.TextChoices):
+    # Where a job is (or stopped, for a FAILED one). A CAS upload is parsed in the
+    # request to resolve its investor, so its job starts at PERSIST.
+    PARSE = "parse", "Parse"
+    PERSIST = "persist", "Persist"
+    RECONCILE = "reconcile", "Reconcile"
+    DONE = "done", "Done"
+
+
 class ImportJob(TimeStampedModel):
     investor = models.ForeignKey(Investor, on_delete=models.CASCADE, related_name="import_jobs")
     kind = models.CharField(max_length=16, choices=ImportKind.choices)
     status = models.CharField(
         max_length=24, choices=ImportJobStatus.choices, default=ImportJobStatus.PENDING
     )
+    stage = models.CharField(max_length=16, choices=ImportStage.choices, default=ImportStage.PARSE)
     filename = models.CharField(max_length=255, blank=True, default="")
     source_ref = models.CharField(max_length=128, blank=True, default="")  # file hash
     # Summary counts (securities/transactions/holdings created, skipped, etc.).
@@ -51,6 +63,9 @@ class ImportJob(TimeStampedModel):
     error = models.TextField(blank=True, default="")
     started_at = models.DateTimeField(null=True, blank=True)
     finished_at = models.DateTimeField(null=True, blank=True)
+    # Boot id of the process that queued or runs the job (services/imports.py); its
+    # heartbeat keeps the job's ``updated_at`` fresh while that process lives.
+    runner = models.CharField(max_length=128, blank=True, default="")
 
     class Meta:
         ordering = ["-created_at"]
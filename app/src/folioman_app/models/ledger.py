@@ -48,7 +48,7 @@ class ValuationStatus(models.TextChoices):
     """Lifecycle of an investor's day-wise valuation computation."""
 
     PENDING = "pending", "Pending"  # queued; not started
-    COMPUTING = "computing", "Computing"  # NAVs fetching / day-wise running
+    COMPUTING = "computing", "Computing"  # claimed by a worker: NAVs fetching / running
     READY = "ready", "Ready"  # series computed through today
     ERROR = "error", "Error"  # last attempt failed; awaiting retry
 
@@ -109,6 +109,10 @@ class Investor(TimeStampedModel):
     valuation_attempts = models.PositiveSmallIntegerField(default=0)
     valuation_next_attempt_at = models.DateTimeField(null=True, blank=True)
     valuation_error = models.TextField(blank=True, default="")
+    # Worker-pool lease (Postgres): the worker recomputing this investor and when its
+    # claim lapses. A ``computing`` row whose lease has expired is due again.
+    valuation_claimed_by = models.CharField(max_length=128, blank=True, default="")
+    valuation_claimed_until = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ["name"]
@@ -371,6 +375,136 @@ class InvestorValue(TimeStampedModel):
         return f"{self.value_inr} @ {self.date}"
 
 
+class FIFOCheckpoint(TimeStampedModel):
+    """The investor's per-(security, folio) FIFO state as of ``as_of`` — what lets a
+    day-wise recompute resume mid-history instead of replaying the whole ledger.
+
+    ``buckets`` is the live sweep state in bucket order (see
+    ``services.valuation_checkpoints``). Derived and disposable: ``ledger_fingerprint``
+    summarises the ledger it was built from, so any import, corporate-action apply or
+    remap makes it stale and the recompute falls back to a full replay.
+    """
+
+    investor = models.OneToOneField(
+        Investor, on_delete=models.CASCADE, related_name="fifo_checkpoint"
+    )
+    as_of = models.DateField()
+    ledger_fingerprint = models.CharField(max_length=64)
+    buckets = models.JSONField(default=list)
+
+    def __str__(self) -> str:
+        return f"checkpoint {self.investor_id} @ {self.as_of}"
+
+
+class LedgerVersion(TimeStampedModel):
+    """A per-investor counter bumped by every ledger write — what ledger-derived caches
+    (:class:`RealisedGainSet`) record and compare to know they are current.
+
+    Single-row writes to ``Transaction`` / ``Holding`` / ``AppliedCorporateAction``
+    bump it through signals; the paths that write with ``QuerySet.update`` bump it
+    explicitly, and an import bumps once for all its rows (see
+    ``services.ledger_version``). A missing row means nothing was cached yet.
+    Kept off ``Investor`` so a full ``investor.save()`` can't write back a stale value.
+    """
+
+    investor = models.OneToOneField(
+        Investor, on_delete=models.CASCADE, related_name="ledger_version"
+    )
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"ledger {self.investor_id} v{self.version}"
+
+
+class CurrentPosition(TimeStampedModel):
+    """Materialized current units per (investor, security, folio) — what the summary,
+    roster and family rollups value, read with one indexed query instead of netting the
+    projected ledger on every request.
+
+    Derived and rebuildable: units come from the corporate-action-adjusted ledger when
+    the folio has one (``source`` "ledger", ``invested_inr`` its FIFO cost basis), else
+    from the latest holding snapshot (its source, ``avg_cost_observed`` cost). Rebuilt
+    per investor by ``services.positions.refresh_positions`` inside the transaction of
+    each ledger writer; ``check_positions`` compares it to a fresh build.
+    """
+
+    investor = models.ForeignKey(
+        Investor, on_delete=models.CASCADE, related_name="current_positions"
+    )
+    security = models.ForeignKey(Security, on_delete=models.CASCADE, related_name="+")
+    folio = models.ForeignKey(
+        Folio, null=True, blank=True, on_delete=models.CASCADE, related_name="+"
+    )
+    units = models.DecimalField(max_digits=24, decimal_places=8)
+    invested_inr = models.DecimalField(max_digits=20, decimal_places=2, default=Decimal("0"))
+    last_activity = models.DateField()
+    source = models.CharField(max_length=20, choices=HOLDING_SOURCE_CHOICES)
+
+    class Meta:
+        ordering = ["investor", "security", "folio"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["investor", "security", "folio"], name="uniq_position_inv_sec_folio"
+            ),
+            models.UniqueConstraint(
+                fields=["investor", "security"],
+                condition=models.Q(folio__isnull=True),
+                name="uniq_position_inv_sec_no_folio",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.units} units (sec {self.security_id})"
+
+
+class RealisedGainSet(TimeStampedModel):
+    """One investor's cached realised-gains ledger for one gating mode, and what it was
+    computed from.
+
+    Every disposal's classified ``GainLine`` (see :class:`RealisedGain`) from the whole
+    tax-ready history, so an FY view is an indexed read rather than a projection and
+    FIFO pass over every year. Current while ``ledger_version`` matches the investor's
+    :class:`LedgerVersion` and ``gating_key`` the fingerprint of its tax-ready
+    (security, folio) buckets, their securities' classification and the engine
+    version; otherwise ``services.tax_export`` recomputes and replaces it. ``fmv_key``
+    fingerprints the 31-Jan-2018 FMV inputs of its securities (``services.fmv``) — a
+    backfilled or corrected FMV also makes it stale.
+    """
+
+    investor = models.ForeignKey(
+        Investor, on_delete=models.CASCADE, related_name="realised_gain_sets"
+    )
+    include_unreconciled = models.BooleanField(default=False)
+    ledger_version = models.PositiveBigIntegerField()
+    gating_key = models.CharField(max_length=64)
+    fmv_key = models.CharField(max_length=64, blank=True, default="")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["investor", "include_unreconciled"], name="uniq_gain_set_inv_mode"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"gains {self.investor_id} v{self.ledger_version}"
+
+
+class RealisedGain(TimeStampedModel):
+    """One cached ``GainLine`` (its JSON dump), indexed by the FY it was sold in."""
+
+    gain_set = models.ForeignKey(RealisedGainSet, on_delete=models.CASCADE, related_name="lines")
+    fy = models.CharField(max_length=7)  # india_fy_label of the sale, e.g. "2024-25"
+    line = models.JSONField()
+
+    class Meta:
+        ordering = ["gain_set", "id"]  # the engine's order, as computed
+        indexes = [models.Index(fields=["gain_set", "fy"], name="idx_gain_set_fy")]
+
+    def __str__(self) -> str:
+        return f"gain line {self.fy} (set {self.gain_set_id})"
+
+
 class AppliedCorporateAction(TimeStampedModel):
     """The event log replayed over the immutable as-traded ledger.
 
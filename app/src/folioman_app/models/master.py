@@ -167,6 +167,32 @@ class CorporateActionReference(TimeStampedModel):
         return f"{ident} @ {self.ex_date}: {self.subject[:60]}"
 
 
+class CorporateActionSyncMark(TimeStampedModel):
+    """How far one equity's corporate actions have been fetched from one exchange.
+
+    The daily refresh resumes each (security, exchange) from ``fetched_through``
+    (less a small overlap for late corrections) instead of re-downloading the whole
+    history back to 2016; a full re-scan is ``refresh_corporate_actions --full``.
+    Only advanced by a fetch that covered everything since the previous mark.
+    """
+
+    security = models.ForeignKey(
+        Security, on_delete=models.CASCADE, related_name="corporate_action_marks"
+    )
+    exchange = models.CharField(max_length=8)
+    fetched_through = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["security", "exchange"], name="uniq_corp_action_mark_sec_exch"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.security_id}/{self.exchange} through {self.fetched_through}"
+
+
 class FXRate(TimeStampedModel):
     """Daily FX rate (base -> quote). For the deferred multi-currency valuation (v2)."""
 
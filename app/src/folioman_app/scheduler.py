@@ -37,6 +37,7 @@ from folioman_app.tasks.corporate_action_ticks import (
     run_corporate_action_catch_up_tick,
     run_corporate_action_refresh_tick,
 )
+from folioman_app.tasks.import_ticks import run_stale_import_recovery_tick
 from folioman_app.tasks.isin_ticks import run_isin_catch_up_tick, run_isin_update_tick
 from folioman_app.tasks.valuation_ticks import (
     REVALUE_HOURS,
@@ -161,6 +162,15 @@ def _add_catch_up_job(scheduler) -> None:
         replace_existing=True,
         misfire_grace_time=None,
     )
+    # Import jobs a restart stranded mid-queue would otherwise be polled forever.
+    scheduler.add_job(
+        run_stale_import_recovery_tick,
+        id="recover_stale_imports_on_launch",
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
+        misfire_grace_time=None,
+    )
     # ISIN-DB launch catch-up (its daily run is skipped if the app was shut at 02:30).
     scheduler.add_job(
         run_isin_catch_up_tick,
@@ -213,10 +223,14 @@ def shutdown_background_scheduler(*, wait: bool = False) -> None:
     logger.info("folioman background scheduler stopped")
 
 
-def run_blocking_scheduler() -> None:
-    """Run a blocking scheduler in the foreground (server `run_scheduler` process)."""
+def run_blocking_scheduler(*, workers: int | None = None) -> None:
+    """Run a blocking scheduler in the foreground (server `run_scheduler` process).
+
+    ``workers`` overrides ``FOLIOMAN_VALUATION_WORKERS`` for the pending tick."""
     sched = BlockingScheduler(timezone=str(settings.TIME_ZONE))
     _add_jobs(sched)
+    if workers is not None:
+        sched.modify_job("process_pending_valuations", kwargs={"workers": workers})
     _add_catch_up_job(sched)  # one-shot on the scheduler thread, fires once start() loops
     logger.info("folioman scheduler running (blocking)")
     sched.start()  # blocks
@@ -26,7 +26,10 @@ from folioman_app.models import (
     Security,
     Transaction,
 )
+from folioman_app.services.ledger_version import bump_ledger_version
+from folioman_app.services.positions import refresh_positions
 from folioman_app.services.projected_ledger import compute_ledger
+from folioman_app.services.valuation_checkpoints import invalidate_checkpoints
 from folioman_app.tasks._upsert import upsert_security
 from folioman_app.tasks.reconcile import reconcile_security
 
@@ -137,7 +140,7 @@ def _flag_pre2016_cost_basis(investor: Investor, folio: Folio, security_ids: set
     rows to FIFO). This is a reliability annotation, not a trade rewrite — units and
     price are untouched. Applied to the securities a corporate action just touched.
     """
-    Transaction.objects.filter(
+    flagged = Transaction.objects.filter(
         investor=investor,
         folio=folio,
         security_id__in=security_ids,
@@ -150,6 +153,8 @@ def _flag_pre2016_cost_basis(investor: Investor, folio: Folio, security_ids: set
         date__lt=COST_BASIS_RELIABLE_SINCE,
         cost_basis_complete=True,
     ).update(cost_basis_complete=False)
+    if flagged:
+        bump_ledger_version(investor.id)
 
 
 def _filter_unapplied_events(
@@ -271,6 +276,7 @@ def apply_corporate_actions_to_folio(
     # them on read. Flag any pre-window acquisitions the events touch as cost-basis
     # incomplete before anything reads the projection.
     events_written, affected_ids = _persist_applied_events(investor, folio, all_events)
+    invalidate_checkpoints(investor)
 
     # A split / bonus can square off an over-sold tradebook (sold against a pre-split
     # balance), so re-derive FIFO completeness now the event is on record — it reads the
@@ -289,6 +295,7 @@ def apply_corporate_actions_to_folio(
         # fractional remainder doesn't read as a mismatch.
         _settle_fractional_entitlement(investor, folio, sec)
         reconcile_security(investor, sec)
+    refresh_positions(investor)
 
     return {
         "updated": 0,
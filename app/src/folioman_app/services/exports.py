@@ -6,17 +6,24 @@ reuses the reconciliation output (``SecurityIntegrityStatus``) for current units
 (CAS), equity, and eCAS-only positions all appear, with their trust status. The
 transactions export uses the CSV-import column layout, so export round-trips
 back through `import_csv`.
+
+Both are generators of CSV lines over chunked ``.iterator()`` reads, so the API
+streams them and a 50k-row ledger never sits whole in worker memory.
 """
 
 from __future__ import annotations
 
 import csv
-import io
+from collections.abc import Iterable, Iterator
 from datetime import date as date_cls
-from decimal import Decimal
+
+from django.db.models import OuterRef, Subquery
 
 from folioman_app.models import Investor, NAVHistory
 
+# Rows fetched per database round trip while streaming an export.
+_CHUNK = 2000
+
 _HOLDINGS_COLUMNS = [
     "security_type",
     "name",
@@ -55,81 +62,93 @@ _TRANSACTION_COLUMNS = [
 ]
 
 
-def _latest_price(security_id: int, as_of: date_cls) -> Decimal | None:
-    return (
-        NAVHistory.objects.filter(security_id=security_id, date__lte=as_of)
-        .order_by("-date")
-        .values_list("nav", flat=True)
-        .first()
-    )
+class _Echo:
+    """A write-only "file" that hands each formatted CSV line straight back, so a
+    ``csv`` writer can feed a generator without buffering the document."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv_lines(columns: list[str], rows: Iterable[dict]) -> Iterator[str]:
+    writer = csv.DictWriter(_Echo(), fieldnames=columns)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
 
 
-def build_holdings_csv(investor: Investor, as_of: date_cls | None = None) -> str:
+def iter_holdings_csv(investor: Investor, as_of: date_cls | None = None) -> Iterator[str]:
+    """The holdings CSV, line by line. One query: each status row carries its
+    security's latest price on/before ``as_of`` as a subquery annotation."""
     as_of = as_of or date_cls.today()
-    out = io.StringIO()
-    writer = csv.DictWriter(out, fieldnames=_HOLDINGS_COLUMNS)
-    writer.writeheader()
+    latest = (
+        NAVHistory.objects.filter(security=OuterRef("security_id"), date__lte=as_of)
+        .order_by("-date")
+        .values("nav")[:1]
+    )
+    statuses = (
+        investor.integrity_statuses.select_related("security")
+        .annotate(price=Subquery(latest))
+        .order_by("security__name")
+    )
+    return _csv_lines(_HOLDINGS_COLUMNS, _holding_rows(statuses, as_of))
+
 
-    statuses = investor.integrity_statuses.select_related("security").order_by("security__name")
-    for status in statuses:
+def _holding_rows(statuses, as_of: date_cls) -> Iterator[dict]:
+    for status in statuses.iterator(chunk_size=_CHUNK):
         units = status.units_from_transactions
         basis = "transactions"
         if units is None:
             units, basis = status.units_from_holdings, "holdings"
         if not units:  # None or zero — not currently held
             continue
-        price = _latest_price(status.security_id, as_of)
+        price = status.price
         value = units * price if price is not None else None
         security = status.security
-        writer.writerow(
-            {
-                "security_type": security.security_type,
-                "name": security.name,
-                "isin": security.isin,
-                "symbol": security.symbol,
-                "units": units,
-                "basis": basis,
-                "integrity_status": status.status,
-                "tax_safe": status.tax_safe,
-                "price_inr": price if price is not None else "",
-                "value_inr": value if value is not None else "",
-                "as_of": as_of.isoformat(),
-            }
-        )
-    return out.getvalue()
-
-
-def build_transactions_csv(investor: Investor) -> str:
-    out = io.StringIO()
-    writer = csv.DictWriter(out, fieldnames=_TRANSACTION_COLUMNS)
-    writer.writeheader()
+        yield {
+            "security_type": security.security_type,
+            "name": security.name,
+            "isin": security.isin,
+            "symbol": security.symbol,
+            "units": units,
+            "basis": basis,
+            "integrity_status": status.status,
+            "tax_safe": status.tax_safe,
+            "price_inr": price if price is not None else "",
+            "value_inr": value if value is not None else "",
+            "as_of": as_of.isoformat(),
+        }
 
+
+def iter_transactions_csv(investor: Investor) -> Iterator[str]:
+    """The full ledger as CSV, line by line, streamed from the database in chunks."""
     transactions = investor.transactions.select_related("security", "folio").order_by("date", "id")
-    for txn in transactions:
+    return _csv_lines(_TRANSACTION_COLUMNS, _transaction_rows(transactions))
+
+
+def _transaction_rows(transactions) -> Iterator[dict]:
+    for txn in transactions.iterator(chunk_size=_CHUNK):
         metadata = txn.security.metadata or {}
-        writer.writerow(
-            {
-                "security_type": txn.security.security_type,
-                "name": txn.security.name,
-                "symbol": txn.security.symbol,
-                "isin": txn.security.isin,
-                "amfi_code": txn.security.amfi_code,
-                "coin_id": metadata.get("coin_id", ""),
-                "principal": metadata.get("principal", ""),
-                "date": txn.date.isoformat(),
-                "transaction_type": txn.transaction_type,
-                "units": txn.units,
-                "price": txn.nav_or_price,
-                "amount": txn.amount if txn.amount is not None else "",
-                "fees": txn.fees,
-                "stamp_duty": txn.stamp_duty,
-                "brokerage": txn.brokerage,
-                "currency": txn.currency,
-                "source_ref": txn.source_ref,
-                # The demat account / folio so an equity export re-imports cleanly
-                # (equity import requires a real demat number) onto the same folio.
-                "folio_number": txn.folio.number if txn.folio else "",
-                "broker": txn.folio.broker if txn.folio else "",
-            }
-        )
-    return out.getvalue()
+        yield {
+            "security_type": txn.security.security_type,
+            "name": txn.security.name,
+            "symbol": txn.security.symbol,
+            "isin": txn.security.isin,
+            "amfi_code": txn.security.amfi_code,
+            "coin_id": metadata.get("coin_id", ""),
+            "principal": metadata.get("principal", ""),
+            "date": txn.date.isoformat(),
+            "transaction_type": txn.transaction_type,
+            "units": txn.units,
+            "price": txn.nav_or_price,
+            "amount": txn.amount if txn.amount is not None else "",
+            "fees": txn.fees,
+            "stamp_duty": txn.stamp_duty,
+            "brokerage": txn.brokerage,
+            "currency": txn.currency,
+            "source_ref": txn.source_ref,
+            # The demat account / folio so an equity export re-imports cleanly
+            # (equity import requires a real demat number) onto the same folio.
+            "folio_number": txn.folio.number if txn.folio else "",
+            "broker": txn.folio.broker if txn.folio else "",
+        }
@@ -0,0 +1,93 @@
+"""Per-host request budgets for the public price feeds.
+
+The NAV refresh and gap filler fetch their non-bulk tail concurrently; what keeps
+that polite is a token bucket per feed host rather than a global sleep between calls.
+Every request a :func:`throttled` client sends first takes a token from its host's
+bucket — retries included — so a pass runs as fast as each provider tolerates: mfapi
+and the edge-cached captnemo mirror briskly, Yahoo and NSE (which block bursts) and
+CoinGecko's free tier slowly, all in the same pass.
+
+Buckets are process-wide, so two passes running at once (the scheduler's refresh and
+a manual ``backfill_navs``) share one budget per host instead of doubling it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+# host -> (requests per second, burst). Module-level so a deployment can tune it;
+# a host not listed gets ``_DEFAULT_RATE``.
+FEED_RATES: dict[str, tuple[float, int]] = {
+    "api.mfapi.in": (5.0, 5),
+    "mf.captnemo.in": (10.0, 10),
+    "query1.finance.yahoo.com": (2.0, 2),
+    "www.nseindia.com": (2.0, 1),
+    "www.bseindia.com": (2.0, 1),
+    "api.coingecko.com": (0.5, 1),  # free tier: ~30 calls a minute
+}
+_DEFAULT_RATE = (1 / 0.15, 1)  # the old fixed spacing between live calls
+
+# Indirected so tests drive the bucket with a fake clock.
+_CLOCK = time.monotonic
+_SLEEP = time.sleep
+
+
+class TokenBucket:
+    """``rate`` tokens a second, up to ``burst`` banked. :meth:`acquire` reserves a
+    token and sleeps until it's due; waiting happens outside the lock, so callers
+    queue up in arrival order without holding each other up."""
+
+    __slots__ = ("_lock", "_stamp", "_tokens", "burst", "rate")
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._stamp = _CLOCK()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, blocking until one is available. Returns the seconds waited."""
+        with self._lock:
+            now = _CLOCK()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            _SLEEP(wait)
+        return wait
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def bucket_for(host: str) -> TokenBucket:
+    """The shared bucket for ``host``, created from :data:`FEED_RATES` on first use."""
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = _buckets[host] = TokenBucket(*FEED_RATES.get(host, _DEFAULT_RATE))
+        return bucket
+
+
+def reset() -> None:
+    """Forget every bucket, so changed :data:`FEED_RATES` take effect (tests)."""
+    with _buckets_lock:
+        _buckets.clear()
+
+
+def _take_token(request) -> None:
+    bucket_for(request.url.host).acquire()
+
+
+def throttled(client):
+    """Make ``client`` wait on its host's bucket before every request. Takes an
+    ``httpx.Client`` or an exchange client wrapping one (``.http``); returns it."""
+    http = getattr(client, "http", client)
+    hooks = getattr(http, "event_hooks", None)
+    if hooks is not None and _take_token not in hooks["request"]:
+        http.event_hooks = {**hooks, "request": [*hooks["request"], _take_token]}
+    return client
@@ -12,14 +12,26 @@ price on 31-Jan-2018" the statute names — a documented, pragmatic approximatio
 consistent with how we price elsewhere. When the equity isn't priced back to 2018
 yet, this returns ``None`` and the caller flags ``grandfathering_unavailable``
 rather than guessing.
+
+A capital-gains run asks for the FMV once per grandfathered lot, and again per 112A
+row — hundreds of times for a long-held SIP, always for the same few ISINs. The
+tax exports therefore use an ``FmvTable``: every ISIN resolved once, up front (the
+casparser dataset over one connection, then one ``NAVHistory`` query for the rest).
+``fmv_fingerprint`` stamps those inputs without resolving anything, so a cache of
+results priced with them can check it is current in one query.
 """
 
 from __future__ import annotations
 
+import hashlib
+from collections.abc import Iterable
 from datetime import date
 from decimal import Decimal
 
+from django.db.models import Count, Max, OuterRef, Subquery
+from folioman_core.price_feeds.casparser_fmv import dataset_stamp as _mf_dataset_stamp
 from folioman_core.price_feeds.casparser_fmv import fmv_lookup as _mf_fmv
+from folioman_core.price_feeds.casparser_fmv import fmv_table as _mf_fmv_table
 from folioman_core.tax.india import GRANDFATHER_FMV_DATE
 
 from folioman_app.models import NAVHistory, Security
@@ -46,3 +58,70 @@ def fmv_lookup(isin: str, on: date) -> Decimal | None:
         .values_list("nav", flat=True)
         .first()
     )
+
+
+def _equity_closes(isins: list[str]) -> dict[str, Decimal | None]:
+    """``fmv_lookup``'s NAVHistory fallback for many ISINs in one query: the close
+    on/before the grandfather date of the first security (by name) with each ISIN."""
+    close = (
+        NAVHistory.objects.filter(security=OuterRef("pk"), date__lte=GRANDFATHER_FMV_DATE)
+        .order_by("-date")
+        .values("nav")[:1]
+    )
+    rows = (
+        Security.objects.filter(isin__in=isins)
+        .annotate(fmv=Subquery(close))
+        .order_by("name", "id")
+        .values_list("isin", "fmv")
+    )
+    out: dict[str, Decimal | None] = {}
+    for isin, fmv in rows:
+        out.setdefault(isin, fmv)
+    return out
+
+
+def fmv_fingerprint(isins: Iterable[str]) -> str:
+    """A stamp of everything ``FmvTable.preload(isins)`` reads: the casparser dataset
+    file, and how many ``NAVHistory`` closes on/before the grandfather date the ISINs'
+    securities have and when the latest was written (one query). A backfilled,
+    corrected or deleted close, or a replaced dataset, moves it."""
+    wanted = sorted({isin for isin in isins if isin})
+    rows, latest = 0, None
+    if wanted:
+        stats = NAVHistory.objects.filter(
+            security__isin__in=wanted, date__lte=GRANDFATHER_FMV_DATE
+        ).aggregate(rows=Count("id"), latest=Max("updated_at"))
+        rows, latest = stats["rows"], stats["latest"]
+    parts = [_mf_dataset_stamp(), str(rows), latest.isoformat() if latest else "", *wanted]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+class FmvTable:
+    """``fmv_lookup`` memoized for one computation, preloaded in a batch.
+
+    ``preload(isins)`` resolves every ISIN at once; the table is then an ``FmvLookup``
+    the core tax engine calls as often as it likes. An ISIN outside the preloaded set
+    goes through ``fmv_lookup`` once and is remembered. Don't keep a table across
+    requests — a newly backfilled equity close wouldn't show up.
+    """
+
+    __slots__ = ("_fmv",)
+
+    def __init__(self, fmv: dict[str, Decimal | None] | None = None) -> None:
+        self._fmv = dict(fmv or {})
+
+    @classmethod
+    def preload(cls, isins: Iterable[str]) -> FmvTable:
+        fmv = _mf_fmv_table(isins)
+        missing = [isin for isin, value in fmv.items() if value is None]
+        if missing:
+            closes = _equity_closes(missing)
+            fmv.update({isin: closes.get(isin) for isin in missing})
+        return cls(fmv)
+
+    def __call__(self, isin: str, on: date) -> Decimal | None:
+        if not isin:
+            return None
+        if isin not in self._fmv:
+            self._fmv[isin] = fmv_lookup(isin, on)
+        return self._fmv[isin]
@@ -8,6 +8,9 @@ from folioman_core.models.security import Security as CoreSecurity
 
 from folioman_app.models import Folio, Investor, Security
 from folioman_app.services.equity_identity import resolve_equity_identity
+from folioman_app.services.ledger_version import bump_ledger_version
+from folioman_app.services.positions import refresh_positions
+from folioman_app.services.valuation_checkpoints import invalidate_checkpoints
 from folioman_app.tasks._upsert import upsert_security
 from folioman_app.tasks.reconcile import reconcile_security
 
@@ -56,9 +59,12 @@ def apply_identity_remap(
     holdings_updated = investor.holdings.filter(security=from_security, folio=folio).update(
         security=target
     )
+    bump_ledger_version(investor.id)  # QuerySet.update sends no post_save
+    invalidate_checkpoints(investor)
 
     reconcile_security(investor, from_security)
     reconcile_security(investor, target)
+    refresh_positions(investor)
 
     return {
         "transactions_updated": txns_updated,
@@ -1,10 +1,29 @@
-"""Synchronous import-job runner (no task queue — see Key decisions).
+"""Import-job runner (no task queue — see Key decisions).
 
 An import creates an ``ImportJob``, then ``run_import_job`` dispatches by kind to
 a registered processor, recording SUCCESS + a result summary or FAILED + the
 error on the job row. The raw uploaded file is processed in memory and never
 persisted (privacy-first); only its SHA-256 ``source_ref`` is kept, for dedup.
 
+``submit_import_job`` is the request path's entry point. With
+``FOLIOMAN_IMPORT_WORKERS`` = N > 0 it queues the job on this process's pool of N
+background threads and returns at once — the job stays PENDING until a thread picks
+it up, and the client polls the job row, whose ``stage`` moves parse -> persist ->
+reconcile -> done (processors report the reconcile step via ``report_stage``). 0
+runs it inline, as before. Jobs for one investor run one at a time in a process, so
+two uploads for the same PAN never persist into the same ledger concurrently;
+``submit_import_jobs`` queues a batch's statements for one investor as a single
+ordered run.
+
+The queue lives in the process, so a restart or crash strands whatever it held.
+Each job records the boot id of the process that owns it (``runner``), and a
+heartbeat thread touches that process's live jobs every quarter of
+``FOLIOMAN_IMPORT_STALE_SECONDS``; a job untouched for the whole window therefore
+belongs to a process that is gone. ``recover_stale_jobs`` fails those, at launch and
+whenever jobs are read, so no client polls a dead job forever — and never fails one
+its own process still owns. A job that recovery did fail anyway is not run, and a run
+that finishes after it keeps the FAILED status instead of overwriting it.
+
 Processors are registered by the per-kind import services: CAS PDF,
 eCAS, CSV. Until a kind is registered, its job fails with a clear
 "not implemented yet" message — the flow + API are fully wired now.
@@ -13,22 +32,117 @@ eCAS, CSV. Until a kind is registered, its job fails with a clear
 from __future__ import annotations
 
 import hashlib
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import timedelta
 
+from django.conf import settings
+from django.db import close_old_connections
+from django.db import transaction as db_transaction
 from django.utils import timezone
 
 from folioman_app.models import Holding, ImportJob, ImportQuarantine, Transaction
-from folioman_app.models.jobs import ImportJobStatus
+from folioman_app.models.jobs import ImportJobStatus, ImportStage
+from folioman_app.services.ledger_version import deferred_ledger_bumps
+
+logger = logging.getLogger(__name__)
 
 # processor(job, content, password, *, confirm, parsed) -> result summary dict
 ImportProcessor = Callable[..., dict]
 _PROCESSORS: dict[str, ImportProcessor] = {}
 
 
+# The job the current thread is running, so a processor deep in persist can report
+# its stage without threading the job through every persist helper.
+_CURRENT_JOB: ContextVar[ImportJob | None] = ContextVar("current_import_job", default=None)
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_investor_locks: dict[int, threading.Lock] = {}
+_heartbeat: threading.Thread | None = None
+
+# This process's boot id, recorded on the jobs it owns. Unlike host:pid, it never
+# repeats after a restart, so a recycled pid can't claim a dead process's jobs.
+_BOOT_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+_ACTIVE = (ImportJobStatus.PENDING, ImportJobStatus.RUNNING)
+
+
 def register_processor(kind: str, processor: ImportProcessor) -> None:
     _PROCESSORS[kind] = processor
 
 
+def report_stage(stage: ImportStage) -> None:
+    """Record that the running job has reached ``stage`` (a no-op outside a job).
+
+    A narrow UPDATE, so a poll sees it while the rest of the row is still being
+    worked on. It moves ``updated_at`` too: a job's last stage report is what
+    ``recover_stale_jobs`` ages it by."""
+    job = _CURRENT_JOB.get()
+    if job is None or job.stage == stage:
+        return
+    job.stage = stage
+    ImportJob.objects.filter(id=job.id).update(stage=stage, updated_at=timezone.now())
+
+
+def touch_own_jobs() -> int:
+    """Mark this process's PENDING/RUNNING jobs as alive (moves their ``updated_at``).
+    Returns how many were touched."""
+    return ImportJob.objects.filter(runner=_BOOT_ID, status__in=_ACTIVE).update(
+        updated_at=timezone.now()
+    )
+
+
+def _heartbeat_loop() -> None:
+    while True:
+        time.sleep(max(1, settings.FOLIOMAN_IMPORT_STALE_SECONDS // 4))
+        try:
+            touch_own_jobs()
+        except Exception:
+            logger.exception("import heartbeat failed")
+        finally:
+            close_old_connections()
+
+
+def _ensure_heartbeat() -> None:
+    global _heartbeat
+    with _pool_lock:
+        if _heartbeat is None:
+            _heartbeat = threading.Thread(
+                target=_heartbeat_loop, name="import-heartbeat", daemon=True
+            )
+            _heartbeat.start()
+
+
+def recover_stale_jobs(investors=None) -> int:
+    """Fail every PENDING/RUNNING job (of ``investors``, or all) untouched for
+    ``FOLIOMAN_IMPORT_STALE_SECONDS`` — its owner stopped heartbeating, so the process
+    that queued or ran it is gone. Jobs this process owns are never failed.
+    Returns how many were failed."""
+    now = timezone.now()
+    stale = ImportJob.objects.filter(
+        status__in=_ACTIVE,
+        updated_at__lt=now - timedelta(seconds=settings.FOLIOMAN_IMPORT_STALE_SECONDS),
+    ).exclude(runner=_BOOT_ID)
+    if investors is not None:
+        stale = stale.filter(investor__in=investors)
+    failed = stale.update(
+        status=ImportJobStatus.FAILED,
+        error="Import interrupted: the server restarted before it finished. Upload it again.",
+        finished_at=now,
+        updated_at=now,
+    )
+    if failed:
+        logger.warning("failed %s stale import job(s)", failed)
+    return failed
+
+
 def resolve_quarantine(investor) -> int:
     """Auto-resolve open quarantine rows whose (security, folio) now has data.
 
@@ -94,21 +208,31 @@ def run_import_job(
     confirm: bool = False,
     parsed: object | None = None,
 ) -> ImportJob:
-    """Run an import synchronously, recording the outcome on ``job``.
+    """Run an import in this thread, recording the outcome on ``job``.
 
     ``confirm`` opts into a destructive import (an eCAS that removes securities);
     without it such an import is previewed but not applied (NEEDS_CONFIRMATION).
     ``parsed`` hands the processor an already-parsed statement so it needn't
     re-parse the PDF (the upload path parses once to resolve the investor).
+
+    The outcome is written only while the job is still RUNNING: one that
+    ``recover_stale_jobs`` failed mid-run stays FAILED.
     """
+    _ensure_heartbeat()
     job.source_ref = hashlib.sha256(content).hexdigest()
     job.started_at = timezone.now()
+    job.status = ImportJobStatus.RUNNING
+    job.stage = ImportStage.PARSE if parsed is None else ImportStage.PERSIST
+    job.runner = _BOOT_ID
+    job.save(update_fields=["source_ref", "started_at", "status", "stage", "runner", "updated_at"])
     processor = _PROCESSORS.get(job.kind)
+    token = _CURRENT_JOB.set(job)
     try:
         if processor is None:
             msg = f"{job.kind} importer not implemented yet"
             raise NotImplementedError(msg)
-        job.result = processor(job, content, password, confirm=confirm, parsed=parsed) or {}
+        with deferred_ledger_bumps():  # one version bump per import, not per row
+            job.result = processor(job, content, password, confirm=confirm, parsed=parsed) or {}
         if job.result.get("requires_confirmation"):
             # Previewed a destructive import; persisted nothing. Await confirm.
             job.status = ImportJobStatus.NEEDS_CONFIRMATION
@@ -124,12 +248,22 @@ def run_import_job(
             job.status = ImportJobStatus.COMPLETED_WITH_WARNINGS
         else:
             job.status = ImportJobStatus.SUCCESS
+        job.stage = ImportStage.DONE
         job.error = ""
     except Exception as exc:  # any failure is recorded on the job, not raised
+        # ``stage`` stays where it failed, so the error reads in context.
         job.status = ImportJobStatus.FAILED
         job.error = str(exc)
-    job.finished_at = timezone.now()
-    job.save()
+    finally:
+        _CURRENT_JOB.reset(token)
+    job.finished_at = job.updated_at = timezone.now()
+    outcome = ("status", "stage", "error", "result", "finished_at", "updated_at")
+    if not ImportJob.objects.filter(id=job.id, status=ImportJobStatus.RUNNING).update(
+        **{field: getattr(job, field) for field in outcome}
+    ):
+        logger.warning("import job %s failed while it ran; dropped its %s", job.id, job.status)
+        job.refresh_from_db()
+        return job
     # A run that persisted data may have fixed earlier quarantined rows (a corrected
     # re-import) — clear those first, then record this run's new rejects. A pure
     # failure or an unconfirmed destructive preview persisted nothing, so skip both.
@@ -137,3 +271,77 @@ def run_import_job(
         resolve_quarantine(job.investor)
         _record_quarantine(job)
     return job
+
+
+def _import_pool(workers: int) -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import")
+        return _pool
+
+
+def _investor_lock(investor_id: int) -> threading.Lock:
+    with _pool_lock:
+        return _investor_locks.setdefault(investor_id, threading.Lock())
+
+
+def _run_queued(runs: list[tuple[int, dict]]) -> None:
+    """Background-thread body: run queued jobs in order, each under its investor's lock."""
+    for job_id, kwargs in runs:
+        try:
+            job = ImportJob.objects.select_related("investor").get(id=job_id)
+            with _investor_lock(job.investor_id):
+                # Re-read under the lock: the job may have waited long enough behind
+                # the investor's other runs to be failed as stale meanwhile.
+                job.refresh_from_db(fields=["status"])
+                if job.status != ImportJobStatus.PENDING:
+                    logger.warning("import job %s is %s, not pending; skipped", job_id, job.status)
+                    continue
+                run_import_job(job, **kwargs)
+        except Exception:
+            # run_import_job records processor failures on the job; this is the job
+            # row vanishing or the quarantine bookkeeping failing after the fact.
+            logger.exception("import job %s failed outside its processor", job_id)
+            # Don't leave it RUNNING: the heartbeat would keep it alive for good.
+            ImportJob.objects.filter(id=job_id, status__in=_ACTIVE).update(
+                status=ImportJobStatus.FAILED,
+                error="Import failed unexpectedly. Upload it again.",
+                finished_at=timezone.now(),
+                updated_at=timezone.now(),
+            )
+    close_old_connections()  # this thread's connection, not a request's
+
+
+def submit_import_jobs(runs: list[tuple[ImportJob, dict]]) -> list[ImportJob]:
+    """Run ``(job, run_import_job kwargs)`` pairs in order — in the background if
+    import workers are configured, else inline.
+
+    Returns the jobs as they stand: finished when run inline, PENDING when queued.
+    One queued task runs the whole sequence, so an investor's statements persist in
+    the order given (``persist_mf_statement`` chains them by date). It is submitted
+    on commit, so the thread never looks for a row the request hasn't committed."""
+    workers = settings.FOLIOMAN_IMPORT_WORKERS
+    if workers <= 0:
+        return [run_import_job(job, **kwargs) for job, kwargs in runs]
+    pool = _import_pool(workers)
+    _ensure_heartbeat()
+    for job, _kwargs in runs:
+        job.runner = _BOOT_ID
+    ImportJob.objects.filter(id__in=[job.id for job, _kwargs in runs]).update(runner=_BOOT_ID)
+    queued = [(job.id, kwargs) for job, kwargs in runs]
+    db_transaction.on_commit(lambda: pool.submit(_run_queued, queued))
+    return [job for job, _kwargs in runs]
+
+
+def submit_import_job(
+    job: ImportJob,
+    *,
+    content: bytes,
+    password: str = "",
+    confirm: bool = False,
+    parsed: object | None = None,
+) -> ImportJob:
+    """Submit one job (see ``submit_import_jobs``)."""
+    kwargs = {"content": content, "password": password, "confirm": confirm, "parsed": parsed}
+    return submit_import_jobs([(job, kwargs)])[0]
@@ -0,0 +1,71 @@
+"""Per-investor ledger version: a counter every ledger write moves forward.
+
+Derived, cached answers keyed by it (the realised-gains set in
+:mod:`folioman_app.services.tax_export`) are current only while the investor's
+:class:`LedgerVersion` still reads the version they were built from.
+
+* A single-row ``Transaction`` / ``Holding`` / ``AppliedCorporateAction`` save or
+  delete bumps it (the receivers below), as does a ``Folio`` delete, which nulls its
+  rows' folio without a signal; the paths that rewrite rows with ``QuerySet.update``
+  call :func:`bump_ledger_version` themselves.
+* Inside :func:`deferred_ledger_bumps` — every import job runs in one — bumps are
+  only collected, and each investor's version moves once when the block exits, so
+  an import of thousands of rows issues one ``UPDATE`` rather than one per row.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from folioman_app.models import AppliedCorporateAction, Folio, Holding, LedgerVersion, Transaction
+
+# Investors whose bump the enclosing :func:`deferred_ledger_bumps` block owes.
+_DEFERRED: ContextVar[set[int] | None] = ContextVar("deferred_ledger_bumps", default=None)
+
+
+def bump_ledger_version(investor_id: int) -> None:
+    """Mark the investor's ledger-derived caches stale — call after a signal-less
+    ledger write. Deferred to the block's exit inside :func:`deferred_ledger_bumps`."""
+    pending = _DEFERRED.get()
+    if pending is not None:
+        pending.add(investor_id)
+        return
+    LedgerVersion.objects.filter(investor_id=investor_id).update(version=F("version") + 1)
+
+
+@contextmanager
+def deferred_ledger_bumps() -> Iterator[None]:
+    """Collect the block's ledger-version bumps and apply each investor's once on exit.
+
+    Enter it outside the writers' transaction: the bump then lands after their commit,
+    so a cache filled from the pre-import ledger meanwhile is left stale, not kept. The
+    bumps run on an exception too (an import may have committed part of its work). A
+    nested block defers to the outermost one."""
+    if _DEFERRED.get() is not None:
+        yield
+        return
+    pending: set[int] = set()
+    token = _DEFERRED.set(pending)
+    try:
+        yield
+    finally:
+        _DEFERRED.reset(token)
+        for investor_id in sorted(pending):
+            bump_ledger_version(investor_id)
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=Holding)
+@receiver(post_delete, sender=Holding)
+@receiver(post_save, sender=AppliedCorporateAction)
+@receiver(post_delete, sender=AppliedCorporateAction)
+@receiver(post_delete, sender=Folio)  # its rows' folio is nulled without a signal
+def _ledger_row_written(sender, instance, **kwargs) -> None:
+    bump_ledger_version(instance.investor_id)
@@ -0,0 +1,309 @@
+"""Process-wide cache of per-security NAV series, invalidated on write.
+
+Every summary, scheme page, value series and XIRR call used to re-read ``NAVHistory``
+for the same popular schemes. :func:`lookup` serves a security's *full* ascending
+series — the ``(ordinal days, scaled NAVs)`` array pair :class:`PriceIndex` keeps —
+from a bounded LRU, and :meth:`PriceIndex.load` queries only the misses (one query)
+and slices to its ``upto``. Series are never mutated in place: an index built from a
+cached pair shares the arrays, so a write replaces the entry instead.
+
+Writers keep it current: every single-row ``NAVHistory`` save — the ``refresh_navs``
+upsert, an admin/shell correction — goes through :func:`record_point` (``post_save``), a
+row delete drops the entry (``post_delete``), and each backfill calls :func:`invalidate`
+for the securities it bulk-inserted (``bulk_create`` sends no signals).
+
+Backends:
+
+- **local** (default) — an in-process ``OrderedDict`` of at most
+  ``FOLIOMAN_NAV_CACHE_SIZE`` securities; ``0`` turns caching off. A save in this
+  process is written through (appended to the cached series). Entries expire after
+  ``FOLIOMAN_NAV_CACHE_TTL`` seconds, which bounds staleness for writes made by
+  *another* process (a ``manage.py`` command beside the desktop app).
+- **shared** — when ``FOLIOMAN_NAV_CACHE_ALIAS`` names a Django cache (memcached,
+  Redis, the DB cache), series are stored there as array bytes so every gunicorn
+  worker and the scheduler share one copy. Each security has a generation counter in
+  the backend, and a series is stored under the generation read before its rows were
+  loaded. Every write bumps the generation (an atomic ``incr``), so a fill that raced
+  a write in *any* process lands under a dead key and the next lookup misses instead
+  of reading it: no process-local guard and no read-modify-write of a shared entry.
+  The TTL there only reclaims dead generations' entries.
+
+Counters (:func:`stats`) are per process; a summary line is logged every
+:data:`_REPORT_EVERY` lookups so the size can be tuned from the logs.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from array import array
+from collections import Counter, OrderedDict
+from collections.abc import Iterable
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from folioman_app.models import NAVHistory
+
+logger = logging.getLogger(__name__)
+
+# ``(ordinal days, scaled NAVs)``, ascending by day — see :mod:`price_index`.
+Series = tuple[array, array]
+
+_KEY = "folioman:navs:{}:{}"  # security id, generation
+_GEN_KEY = "folioman:navs:gen:{}"
+_REPORT_EVERY = 1000  # securities looked up between two counter log lines
+
+_lock = threading.Lock()
+# sec_id -> (expires_at, days, navs); most recently used last.
+_local: OrderedDict[int, tuple[float, array, array]] = OrderedDict()
+_counts: Counter[str] = Counter()
+# Bumped by every write; a fill that raced one is not stored (it may predate it).
+# Guards the local backend only — the shared one versions entries in the backend.
+_epoch = 0
+
+
+def _max_entries() -> int:
+    return settings.FOLIOMAN_NAV_CACHE_SIZE
+
+
+def _ttl() -> int:
+    return settings.FOLIOMAN_NAV_CACHE_TTL
+
+
+def _shared():
+    alias = settings.FOLIOMAN_NAV_CACHE_ALIAS
+    return caches[alias] if alias else None
+
+
+def _pack(days: array, navs: array) -> tuple[bytes, bytes]:
+    return days.tobytes(), navs.tobytes()
+
+
+def _unpack(payload: tuple[bytes, bytes]) -> Series:
+    days, navs = array("i"), array("q")
+    days.frombytes(payload[0])
+    navs.frombytes(payload[1])
+    return days, navs
+
+
+def enabled() -> bool:
+    return _shared() is not None or _max_entries() > 0
+
+
+def _generations(shared, ids: list[int]) -> dict[int, int]:
+    """Each security's current generation, starting a missing counter at a fresh base
+    (a clock reading, so an evicted counter never comes back at an old value)."""
+    keys = {sec_id: _GEN_KEY.format(sec_id) for sec_id in ids}
+    gens = shared.get_many(list(keys.values()))
+    missing = [key for key in keys.values() if key not in gens]
+    if missing:
+        for key in missing:
+            shared.add(key, time.time_ns(), timeout=None)
+        gens.update(shared.get_many(missing))
+    return {sec_id: gens[key] for sec_id, key in keys.items() if key in gens}
+
+
+def _bump(shared, ids: list[int]) -> None:
+    for sec_id in ids:
+        key = _GEN_KEY.format(sec_id)
+        try:
+            shared.incr(key)
+        except ValueError:  # no counter yet: nothing stored under it can be read
+            shared.add(key, time.time_ns(), timeout=None)
+
+
+def lookup(security_ids: Iterable[int]) -> tuple[dict[int, Series], object]:
+    """Cached series for whichever of ``security_ids`` are present, plus an opaque
+    token (the local write epoch, or the shared generations) to hand back to
+    :func:`store` once the misses are loaded."""
+    ids = list(security_ids)
+    found: dict[int, Series] = {}
+    shared = _shared()
+    if shared is not None:
+        token = _generations(shared, ids)
+        payloads = shared.get_many([_KEY.format(i, gen) for i, gen in token.items()])
+        for sec_id, gen in token.items():
+            payload = payloads.get(_KEY.format(sec_id, gen))
+            if payload is not None:
+                found[sec_id] = _unpack(payload)
+        _count(hits=len(found), misses=len(ids) - len(found))
+        return found, token
+    now = time.monotonic()
+    with _lock:
+        epoch = _epoch
+        for sec_id in ids:
+            entry = _local.get(sec_id)
+            if entry is None:
+                continue
+            if entry[0] <= now:
+                del _local[sec_id]
+                _counts["expired"] += 1
+                continue
+            _local.move_to_end(sec_id)
+            found[sec_id] = entry[1], entry[2]
+    _count(hits=len(found), misses=len(ids) - len(found))
+    return found, epoch
+
+
+def store(series: dict[int, Series], token) -> None:
+    """Cache freshly loaded full series under the ``token`` :func:`lookup` handed out.
+
+    Locally, nothing is stored if a write landed since (the rows read may predate it);
+    in the shared backend each series goes under the generation read before the load,
+    which a write since has already retired. Empty series are not cached: a security
+    with no history yet is typically about to be backfilled elsewhere."""
+    series = {sec_id: pair for sec_id, pair in series.items() if pair[0]}
+    if not series:
+        return
+    shared = _shared()
+    if shared is not None:
+        shared.set_many(
+            {
+                _KEY.format(sec_id, token[sec_id]): _pack(*pair)
+                for sec_id, pair in series.items()
+                if sec_id in token
+            },
+            timeout=_ttl(),
+        )
+        return
+    with _lock:
+        if token != _epoch:
+            _counts["discarded"] += len(series)
+            return
+        limit = _max_entries()
+        if limit <= 0:
+            return
+        expires = time.monotonic() + _ttl()
+        for sec_id, (days, navs) in series.items():
+            _local[sec_id] = (expires, days, navs)
+            _local.move_to_end(sec_id)
+        while len(_local) > limit:
+            _local.popitem(last=False)
+            _counts["evictions"] += 1
+
+
+def invalidate(security_ids: Iterable[int]) -> None:
+    """Drop the securities' series — called after a bulk insert of their history."""
+    global _epoch
+    ids = list(security_ids)
+    if not ids:
+        return
+    with _lock:
+        _epoch += 1
+        for sec_id in ids:
+            _local.pop(sec_id, None)
+        _counts["invalidations"] += len(ids)
+    shared = _shared()
+    if shared is not None:
+        _bump(shared, ids)
+
+
+def record_point(security_id: int, on: date, nav: Decimal) -> None:
+    """A single saved point. Locally it's written through: a point after the cached
+    head is appended, one on the head replaces it, an earlier one (a corrected
+    back-date) or one finer than the column drops the entry; the arrays are copied,
+    never mutated. The shared backend just retires the security's generation — a
+    read-modify-write of a shared entry would lose concurrent writers' points."""
+    from folioman_app.services.price_index import NAV_PLACES, _encode
+
+    global _epoch
+    if (
+        _shared() is not None
+        or not isinstance(on, date)
+        or not isinstance(nav, Decimal)
+        or nav.as_tuple().exponent < -NAV_PLACES
+    ):
+        # Shared, or not stored as given (the column holds the backend's rounding).
+        invalidate([security_id])
+        return
+    day, scaled = on.toordinal(), _encode(nav)
+    with _lock:
+        _epoch += 1
+        entry = _local.get(security_id)
+        if entry is None:
+            return
+        updated = _with_point(entry[1:], day, scaled)
+        if updated is None:
+            del _local[security_id]
+        else:
+            _local[security_id] = (entry[0], *updated)
+        _counts["appends" if updated else "invalidations"] += 1
+
+
+@receiver(post_save, sender=NAVHistory, dispatch_uid="nav_cache_saved")
+def _nav_saved(sender, instance: NAVHistory, **kwargs) -> None:
+    record_point(instance.security_id, instance.date, instance.nav)
+
+
+@receiver(post_delete, sender=NAVHistory, dispatch_uid="nav_cache_deleted")
+def _nav_deleted(sender, instance: NAVHistory, **kwargs) -> None:
+    invalidate([instance.security_id])
+
+
+def _with_point(pair: Series, day: int, scaled: int) -> Series | None:
+    days, navs = pair
+    if not days or day < days[-1]:
+        return None
+    if day == days[-1]:
+        days, navs = days[:-1], navs[:-1]
+    else:
+        days, navs = array("i", days), array("q", navs)
+    days.append(day)
+    navs.append(scaled)
+    return days, navs
+
+
+def clear() -> None:
+    """Empty the local cache and reset the counters (tests, a settings change)."""
+    global _epoch
+    with _lock:
+        _epoch += 1
+        _local.clear()
+        _counts.clear()
+
+
+def stats() -> dict:
+    """This process's counters plus the local cache's fill, for sizing."""
+    with _lock:
+        counts = dict(_counts)
+        entries = len(_local)
+    looked_up = counts.get("hits", 0) + counts.get("misses", 0)
+    return {
+        "backend": "shared" if _shared() is not None else "local",
+        "entries": entries,
+        "max_entries": _max_entries(),
+        "hits": counts.get("hits", 0),
+        "misses": counts.get("misses", 0),
+        "hit_rate": counts.get("hits", 0) / looked_up if looked_up else None,
+        "evictions": counts.get("evictions", 0),
+        "expired": counts.get("expired", 0),
+        "invalidations": counts.get("invalidations", 0),
+        "appends": counts.get("appends", 0),
+        "discarded": counts.get("discarded", 0),
+    }
+
+
+def _count(*, hits: int, misses: int) -> None:
+    with _lock:
+        before = _counts["hits"] + _counts["misses"]
+        _counts["hits"] += hits
+        _counts["misses"] += misses
+        report = before // _REPORT_EVERY != (before + hits + misses) // _REPORT_EVERY
+    if report:
+        s = stats()
+        logger.info(
+            "NAV cache (%s): %d hits / %d misses (%.0f%%), %d/%d entries, %d evictions",
+            s["backend"],
+            s["hits"],
+            s["misses"],
+            100 * (s["hit_rate"] or 0),
+            s["entries"],
+            s["max_entries"],
+            s["evictions"],
+        )
@@ -21,6 +21,7 @@ from folioman_app.models import (
     Transaction,
 )
 from folioman_app.services.demerger_match import find_demerger_parent
+from folioman_app.services.positions import refresh_positions
 from folioman_app.tasks.reconcile import reconcile_security_folio
 
 _ZERO = Decimal("0")
@@ -115,6 +116,7 @@ def record_opening_lot(
         cost_basis_complete=complete,
     )
     reconcile_security_folio(investor, security, folio)
+    refresh_positions(investor)
     return {
         "created": 1,
         "classification": kind.value,
@@ -271,11 +273,10 @@ def record_opening_lots(
         # The parent's cost basis moved; refresh its reconciliation too.
         parent_security = Security.objects.get(id=suggested_parent["id"])
         reconcile_security_folio(investor, parent_security, folio)
+    refresh_positions(investor)
+    rows = investor.transactions.filter(security=security, folio=folio)
     net = net_units_from_transactions(
-        [
-            to_core_transaction(t)
-            for t in investor.transactions.filter(security=security, folio=folio)
-        ]
+        [to_core_transaction(t) for t in rows.select_related("security", "folio")]
     )
     return {"created": created, "net_units": str(net), "suggested_parent": suggested_parent}
 
@@ -318,6 +319,7 @@ def remove_opening_lots(investor: Investor, folio: Folio, security: Security) ->
         parent = Security.objects.filter(id=parent_id).first()
         if parent is not None:
             reconcile_security_folio(investor, parent, folio)
+    refresh_positions(investor)
     return {"removed": removed, "parent_ids": parent_ids}
 
 
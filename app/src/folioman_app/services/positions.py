@@ -0,0 +1,146 @@
+"""Materialized current positions: the summary's holdings as one indexed read.
+
+``/summary``, the family aggregate and the roster used to project and net each
+investor's whole ledger in Python just to learn what is held now. The
+:class:`CurrentPosition` table keeps that answer per (investor, security, folio) —
+units, FIFO cost basis, last activity and source — and :func:`load_positions` reads it.
+
+The table is maintained on the write path, never on a read: the import processors
+(through ``queue_recompute``), manual entry, corporate-action applies, identity
+remaps and opening-lot edits call :func:`refresh_positions` inside their transaction,
+so the rows commit with the ledger change that moved them. A write outside those
+paths — an admin edit, a shell fix — is caught by :func:`check_positions`
+(``manage.py check_positions`` runs it, ``--repair`` rebuilds what drifted).
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction as db_transaction
+from folioman_core.fifo import InsufficientUnitsError, apply_fifo, net_units_from_transactions
+from folioman_core.models import HoldingSource
+
+from folioman_app.models import CurrentPosition, Investor, LedgerVersion
+from folioman_app.services.projected_ledger import demerger_reductions, security_key
+from folioman_app.services.valuation import _ledger_by_investor
+
+_ZERO = Decimal("0")
+_PAISA = Decimal("0.01")
+
+
+def build_positions(investor: Investor) -> list[CurrentPosition]:
+    """The investor's positions computed from the ledger (unsaved rows).
+
+    Per (security, folio): the projected ledger when the folio has one — net units,
+    the FIFO cost basis of the units still held, the latest trade date — else the
+    latest holding snapshot. Ledger and snapshot are matched on the security identity,
+    so a folio reconciled against an eCAS holding isn't counted twice.
+    """
+    txn_keys, hold_keys = _ledger_by_investor([investor])[investor.id]
+    reductions = demerger_reductions(investor)
+    rows: list[CurrentPosition] = []
+    ledger_keys = set()
+    for (_sec_id, folio_id), rec in txn_keys.items():
+        security = rec["security"]
+        ledger_keys.add((security_key(security), folio_id))
+        cores = [core for _d, core in rec["core"]]
+        ident = security.isin or security.symbol or security.name
+        try:
+            invested = apply_fifo(cores, demerger_reductions=reductions.get(ident, [])).invested
+        except InsufficientUnitsError:
+            invested = _ZERO  # an over-sold manual ledger: units only, as valuation does
+        rows.append(
+            CurrentPosition(
+                investor=investor,
+                security=security,
+                folio_id=folio_id,
+                units=net_units_from_transactions(cores),
+                invested_inr=invested.quantize(_PAISA),
+                last_activity=max(txn_date for txn_date, _core in rec["core"]),
+                source=HoldingSource.LEDGER.value,
+            )
+        )
+
+    snapshots: dict[tuple[str, int | None], list] = defaultdict(list)
+    for (_sec_id, folio_id), rec in hold_keys.items():
+        key = (security_key(rec["security"]), folio_id)
+        if key not in ledger_keys:
+            snapshots[key].extend(rec["rows"])
+    for (_skey, folio_id), holdings in snapshots.items():
+        latest = max(h.as_of_date for h in holdings)
+        current = [h for h in holdings if h.as_of_date == latest]
+        invested = sum(
+            (h.avg_cost_observed * h.units for h in current if h.avg_cost_observed is not None),
+            _ZERO,
+        )
+        rows.append(
+            CurrentPosition(
+                investor=investor,
+                security=holdings[0].security,
+                folio_id=folio_id,
+                units=sum((h.units for h in current), _ZERO),
+                invested_inr=invested.quantize(_PAISA),
+                last_activity=latest,
+                source=holdings[0].source,
+            )
+        )
+    return rows
+
+
+@db_transaction.atomic
+def refresh_positions(investor: Investor) -> int:
+    """Rebuild the investor's positions from the ledger. Joins the caller's transaction.
+
+    Locks the investor's :class:`LedgerVersion` row first, so two writers refreshing the
+    same investor rebuild one after the other instead of racing on the unique rows."""
+    LedgerVersion.objects.select_for_update().get_or_create(investor=investor)
+    rows = build_positions(investor)
+    CurrentPosition.objects.filter(investor=investor).delete()
+    CurrentPosition.objects.bulk_create(rows)
+    return len(rows)
+
+
+def load_positions(investors: list[Investor]) -> dict[int, list[CurrentPosition]]:
+    """Each investor's stored positions, security and AMC attached. One query; never
+    rebuilds — the writers keep the table current."""
+    ids = [investor.id for investor in investors]
+    out: dict[int, list[CurrentPosition]] = {investor_id: [] for investor_id in ids}
+    for position in CurrentPosition.objects.filter(investor_id__in=ids).select_related(
+        "security", "security__amc"
+    ):
+        out[position.investor_id].append(position)
+    return out
+
+
+def _signature(position: CurrentPosition) -> tuple:
+    return (
+        position.units.quantize(Decimal("1e-8")),
+        position.invested_inr.quantize(_PAISA),
+        position.last_activity,
+        position.source,
+    )
+
+
+def check_positions(investor: Investor) -> list[dict]:
+    """Stored positions that differ from a fresh build — one entry per (security,
+    folio) that is missing, extra or changed. Empty when the table is consistent."""
+    stored = {
+        (p.security_id, p.folio_id): _signature(p)
+        for p in CurrentPosition.objects.filter(investor=investor)
+    }
+    expected = {(p.security.id, p.folio_id): _signature(p) for p in build_positions(investor)}
+    drift = []
+    for security_id, folio_id in sorted(stored.keys() | expected.keys(), key=repr):
+        have, want = stored.get((security_id, folio_id)), expected.get((security_id, folio_id))
+        if have != want:
+            drift.append(
+                {
+                    "security_id": security_id,
+                    "folio_id": folio_id,
+                    "stored": have,
+                    "expected": want,
+                }
+            )
+    return drift
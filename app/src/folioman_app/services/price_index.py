@@ -0,0 +1,180 @@
+"""Compact in-memory NAV index shared by every valuation path in a request or job.
+
+``NAVHistory`` loaded as ``[(date, Decimal)]`` lists costs ~200 bytes a point, and
+each consumer (value series, holding extras, XIRR, period returns) used to load its
+own copy. :class:`PriceIndex` keeps each security's series as two parallel typed
+arrays — proleptic-ordinal days (``array('i')``) and NAVs scaled to integers at the
+column's fixed decimal places (``array('q')``) — about 12 bytes a point, and answers
+"price at each of N dates" with one bisect-guided walk. Stdlib only (``array`` /
+``bisect``), so it bundles with the desktop build like the rest of the app.
+
+Series are kept whole in the process-wide :mod:`nav_cache` between requests;
+:meth:`PriceIndex.load` slices them to its ``upto`` and queries only the misses.
+
+NAVs come back from the column quantized to its decimal places, so decoding the
+scaled integer at that exponent returns the very ``Decimal`` the row held.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from datetime import date
+from decimal import Decimal
+
+from folioman_app.models import NAVHistory
+from folioman_app.services import nav_cache
+
+# Scale = the column's decimal places; a scaled NAV must fit a signed 64-bit int
+# (NAVs below ~9.2 trillion at 6 dp).
+NAV_PLACES = NAVHistory._meta.get_field("nav").decimal_places
+
+
+def _encode(nav: Decimal) -> int:
+    return int(nav.scaleb(NAV_PLACES))
+
+
+def _decode(scaled: int) -> Decimal:
+    return Decimal(scaled).scaleb(-NAV_PLACES)
+
+
+class PriceIndex:
+    """Per-security ascending NAV series, looked up as-of a date (latest point
+    on/before it). Build once with :meth:`load` and hand it to every consumer."""
+
+    __slots__ = ("_days", "_navs")
+
+    def __init__(self) -> None:
+        self._days: dict[int, array] = {}
+        self._navs: dict[int, array] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[int, date, Decimal]]) -> PriceIndex:
+        """Build from ``(security_id, date, nav)`` rows ordered by security, then date."""
+        idx = cls()
+        current = None
+        days = navs = None
+        for sec_id, nav_date, nav in rows:
+            if sec_id != current:
+                current = sec_id
+                days = idx._days[sec_id] = array("i")
+                navs = idx._navs[sec_id] = array("q")
+            days.append(nav_date.toordinal())
+            navs.append(_encode(nav))
+        return idx
+
+    @classmethod
+    def load(cls, security_ids: Iterable[int], upto: date) -> PriceIndex:
+        """Every NAV up to ``upto`` for the securities — one query, streamed.
+
+        With the :mod:`nav_cache` on, cached full series are sliced to ``upto`` and
+        only the misses are queried (whole history, so later calls can reuse them)."""
+        ids = list(dict.fromkeys(security_ids))
+        rows = NAVHistory.objects.order_by("security_id", "date")
+        if not nav_cache.enabled():
+            rows = rows.filter(security_id__in=ids, date__lte=upto)
+            return cls.from_rows(
+                rows.values_list("security_id", "date", "nav").iterator(chunk_size=10_000)
+            )
+
+        series, token = nav_cache.lookup(ids)
+        missing = [sec_id for sec_id in ids if sec_id not in series]
+        if missing:
+            rows = rows.filter(security_id__in=missing).values_list("security_id", "date", "nav")
+            loaded = cls.from_rows(rows.iterator(chunk_size=10_000))
+            fresh = {sec_id: (days, loaded._navs[sec_id]) for sec_id, days in loaded._days.items()}
+            nav_cache.store(fresh, token)
+            series.update(fresh)
+
+        idx = cls()
+        cutoff = upto.toordinal()
+        for sec_id, (days, navs) in series.items():
+            pos = bisect_right(days, cutoff)
+            if pos == len(days):  # the whole series: share the cached arrays
+                idx._days[sec_id], idx._navs[sec_id] = days, navs
+            elif pos:
+                idx._days[sec_id], idx._navs[sec_id] = days[:pos], navs[:pos]
+        return idx
+
+    def __contains__(self, sec_id: int) -> bool:
+        return sec_id in self._days
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the day/NAV arrays (excluding the per-security dict slots)."""
+        return sum(
+            a.itemsize * len(a) for arrays in (self._days, self._navs) for a in arrays.values()
+        )
+
+    def price_at(self, sec_id: int, as_of: date) -> Decimal | None:
+        """Latest NAV on/before ``as_of`` for the security, or ``None``."""
+        days = self._days.get(sec_id)
+        if not days:
+            return None
+        pos = bisect_right(days, as_of.toordinal())
+        return _decode(self._navs[sec_id][pos - 1]) if pos else None
+
+    def last_date(self, sec_id: int, as_of: date) -> date | None:
+        """Date of the latest NAV on/before ``as_of`` for the security, or ``None``."""
+        days = self._days.get(sec_id)
+        pos = bisect_right(days, as_of.toordinal()) if days else 0
+        return date.fromordinal(days[pos - 1]) if pos else None
+
+    def prices_at(self, sec_id: int, dates: Sequence[date]) -> list[Decimal | None]:
+        """:meth:`price_at` for each of ``dates`` in one pass. Ascending dates (a sample
+        grid) bisect forward from the previous hit; equal hits share one ``Decimal``."""
+        days = self._days.get(sec_id)
+        if not days:
+            return [None] * len(dates)
+        navs = self._navs[sec_id]
+        out: list[Decimal | None] = []
+        lo = 0
+        prev_day = None
+        last_pos = 0
+        last_price = None
+        for when in dates:
+            day = when.toordinal()
+            if prev_day is not None and day < prev_day:
+                lo = 0  # out-of-order date: search the whole series again
+            pos = bisect_right(days, day, lo)
+            lo, prev_day = pos, day
+            if not pos:
+                out.append(None)
+                continue
+            if pos != last_pos:
+                last_pos, last_price = pos, _decode(navs[pos - 1])
+            out.append(last_price)
+        return out
+
+    def history(
+        self, sec_id: int, *, weekly_before: date | None = None
+    ) -> list[tuple[date, Decimal]]:
+        """The security's whole indexed series as ``(date, nav)`` points, oldest first.
+
+        ``weekly_before`` thins the points dated before it to the last of each
+        (Monday-start) week, straight off the arrays — a decades-long daily series
+        comes back chart-sized while recent points stay daily."""
+        days, navs = self._days.get(sec_id, ()), self._navs.get(sec_id, ())
+        if weekly_before is None:
+            return [(date.fromordinal(d), _decode(v)) for d, v in zip(days, navs, strict=True)]
+        cutoff = weekly_before.toordinal()
+        last = len(days) - 1
+        # Ordinal 1 (0001-01-01) is a Monday, so (ordinal - 1) // 7 numbers the weeks.
+        return [
+            (date.fromordinal(d), _decode(navs[i]))
+            for i, d in enumerate(days)
+            if d >= cutoff or i == last or (days[i + 1] - 1) // 7 != (d - 1) // 7
+        ]
+
+    def tail(self, sec_id: int, as_of: date, n: int = 2) -> list[Decimal]:
+        """The last ``n`` NAVs on/before ``as_of``, oldest first (fewer if the series
+        is shorter) — e.g. the two points a day-change compares."""
+        days = self._days.get(sec_id)
+        if not days:
+            return []
+        pos = bisect_right(days, as_of.toordinal())
+        return [_decode(v) for v in self._navs[sec_id][max(0, pos - n) : pos]]
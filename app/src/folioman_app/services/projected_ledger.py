@@ -11,6 +11,7 @@ and the existing rewrite are untouched until read paths are redirected onto it.
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from datetime import date
 from decimal import Decimal
 
@@ -18,20 +19,31 @@ from django.db.models import Q
 from folioman_core.corporate_action_subject import CorpActionType
 from folioman_core.corporate_actions import CorporateActionApplyEvent, apply_corporate_action_events
 from folioman_core.fifo import net_intraday_offsets
+from folioman_core.models import LedgerRow
+from folioman_core.models import Security as CoreSecurity
 from folioman_core.models.transaction import Transaction as CoreTransaction
 
-from folioman_app.mappers import to_core_security, to_core_transaction
-from folioman_app.models import AppliedCorporateAction, Investor, Security
+from folioman_app.mappers import SecurityMap, to_core_security, to_ledger_row
+from folioman_app.models import AppliedCorporateAction, Investor, Security, Transaction
+
+# Raw rows replay as unvalidated ``LedgerRow``s; rows an event synthesises (bonus,
+# markers, rights) come back as validated core ``Transaction``s.
+ProjectedRow = LedgerRow | CoreTransaction
 
 
 def security_key(sec) -> str:
     """Stable identity for grouping projected core rows back to a Django security.
     Works on both core and Django ``Security`` (ISIN for equity, AMFI for MF)."""
+    if isinstance(sec, CoreSecurity):
+        return sec.identity_key  # computed once per (interned) core security
     return sec.isin or sec.amfi_code or sec.symbol or sec.name
 
 
-def event_from_applied(aca: AppliedCorporateAction) -> CorporateActionApplyEvent:
-    """Reconstruct the core apply-event from a stored :class:`AppliedCorporateAction`."""
+def event_from_applied(
+    aca: AppliedCorporateAction, interned: SecurityMap | None = None
+) -> CorporateActionApplyEvent:
+    """Reconstruct the core apply-event from a stored :class:`AppliedCorporateAction`.
+    ``interned`` shares the ledger's core securities with the event."""
     kind = CorpActionType(aca.kind)
     if kind is CorpActionType.DEMERGER:
         # The parent↔child link only. Its cost effect — reducing the parent lots still
@@ -40,18 +52,18 @@ def event_from_applied(aca: AppliedCorporateAction) -> CorporateActionApplyEvent
         return CorporateActionApplyEvent(
             kind=kind,
             ex_date=aca.ex_date,
-            security=to_core_security(aca.security),
+            security=to_core_security(aca.security, interned),
             source_ref=aca.source_ref,
         )
     if kind is CorpActionType.MERGER:
         # The affected security merges away into the acquirer (counterparty). The core
         # event's ``security`` is the acquirer; old/new carry the conversion.
-        acquirer = to_core_security(aca.counterparty_security)
+        acquirer = to_core_security(aca.counterparty_security, interned)
         return CorporateActionApplyEvent(
             kind=kind,
             ex_date=aca.ex_date,
             security=acquirer,
-            merger_old_security=to_core_security(aca.security),
+            merger_old_security=to_core_security(aca.security, interned),
             merger_new_security=acquirer,
             merger_ratio=aca.merger_ratio,
             source_ref=aca.source_ref,
@@ -64,7 +76,7 @@ def event_from_applied(aca: AppliedCorporateAction) -> CorporateActionApplyEvent
     return CorporateActionApplyEvent(
         kind=kind,
         ex_date=aca.ex_date,
-        security=to_core_security(aca.security),
+        security=to_core_security(aca.security, interned),
         unit_multiplier=aca.unit_multiplier,
         bonus_ratio=bonus_ratio,
         dividend_per_share=aca.dividend_per_share,
@@ -74,11 +86,14 @@ def event_from_applied(aca: AppliedCorporateAction) -> CorporateActionApplyEvent
     )
 
 
-def _replay(raw: list[CoreTransaction], events_qs, as_of: date | None) -> list[CoreTransaction]:
+def _replay(
+    raw: list[ProjectedRow], events_qs, as_of: date | None, interned: SecurityMap
+) -> list[ProjectedRow]:
     """Apply the event log over raw rows; restrict to ``as_of`` when given."""
     if as_of is not None:
         events_qs = events_qs.filter(ex_date__lte=as_of)
-    events = [event_from_applied(aca) for aca in events_qs]
+    events_qs = events_qs.select_related("security", "counterparty_security")
+    events = [event_from_applied(aca, interned) for aca in events_qs]
     adjusted = apply_corporate_action_events(raw, events)
     if as_of is not None:
         adjusted = [t for t in adjusted if t.date <= as_of]
@@ -86,19 +101,50 @@ def _replay(raw: list[CoreTransaction], events_qs, as_of: date | None) -> list[C
 
 
 def projected_transactions(
-    investor: Investor, *, folio=None, as_of: date | None = None
-) -> list[CoreTransaction]:
+    investor: Investor, *, folio=None, as_of: date | None = None, after: date | None = None
+) -> list[ProjectedRow]:
     """The whole investor (or one ``folio``) cost-basis ledger, corporate actions
     applied in memory. The investor-wide view for consumers that span securities
     (valuation, capital-gains export); per-security callers use :func:`compute_ledger`.
+
+    ``after`` loads only the raw rows dated after it and returns only projected rows
+    after it — the tail a resumed FIFO checkpoint needs. It equals the matching slice
+    of the full projection only when no applied event falls after ``after`` (the
+    caller's check; see ``services.valuation_checkpoints``).
     """
     raw_qs = investor.transactions.cost_basis().select_related("security", "folio")
     events_qs = AppliedCorporateAction.objects.filter(investor=investor)
     if folio is not None:
         raw_qs = raw_qs.filter(folio=folio)
         events_qs = events_qs.filter(folio=folio)
-    raw = net_intraday_offsets([to_core_transaction(t) for t in raw_qs])
-    return _replay(raw, events_qs, as_of)
+    if after is not None:
+        raw_qs = raw_qs.filter(date__gt=after)
+    interned: SecurityMap = {}
+    raw = net_intraday_offsets([to_ledger_row(t, interned) for t in raw_qs])
+    adjusted = _replay(raw, events_qs, as_of, interned)
+    if after is not None:
+        adjusted = [t for t in adjusted if t.date > after]
+    return adjusted
+
+
+def project_by_security(
+    rows: Iterable[Transaction],
+    applied: Iterable[AppliedCorporateAction],
+    interned: SecurityMap,
+) -> dict[str, list[ProjectedRow]]:
+    """Every security's :func:`compute_ledger` from one replay over rows already loaded.
+
+    ``rows`` (``security``/``folio`` selected) and ``applied`` (``security`` /
+    ``counterparty_security`` selected) are one folio's, in their default order; the
+    result is keyed by :func:`security_key`. For callers that reconcile a whole book
+    at once instead of querying each (security, folio) bucket.
+    """
+    raw = net_intraday_offsets([to_ledger_row(t, interned) for t in rows])
+    events = [event_from_applied(aca, interned) for aca in applied]
+    out: dict[str, list[ProjectedRow]] = {}
+    for t in apply_corporate_action_events(raw, events):
+        out.setdefault(security_key(t.security), []).append(t)
+    return out
 
 
 def demerger_reductions(investor: Investor, *, folio=None) -> dict[str, list]:
@@ -126,6 +172,21 @@ def demerger_reductions(investor: Investor, *, folio=None) -> dict[str, list]:
     return out
 
 
+def _linked_closure(start: int, pairs: Iterable[tuple[int, int]]) -> set[int]:
+    """Security ids reachable from ``start`` over ``(security, counterparty)`` links."""
+    adjacent: dict[int, set[int]] = {}
+    for a, b in pairs:
+        adjacent.setdefault(a, set()).add(b)
+        adjacent.setdefault(b, set()).add(a)
+    seen, frontier = {start}, [start]
+    while frontier:
+        for nxt in adjacent.get(frontier.pop(), ()):
+            if nxt not in seen:
+                seen.add(nxt)
+                frontier.append(nxt)
+    return seen
+
+
 def compute_ledger(
     investor: Investor,
     security: Security,
@@ -133,7 +194,7 @@ def compute_ledger(
     folio=None,
     as_of: date | None = None,
     include_incomplete: bool = False,
-) -> list[CoreTransaction]:
+) -> list[ProjectedRow]:
     """The cost-basis ledger for ``security`` with corporate actions applied in memory.
 
     Replays every applied event touching ``security`` — including a merger that
@@ -148,18 +209,17 @@ def compute_ledger(
     is for the reconciliation replay alone: it must test a cached split/bonus against the
     *whole* timeline (orphan sells included) while still seeing already-applied events.
     """
-    # Securities in scope: this one, plus any linked by a merger (old <-> acquirer),
-    # so the acquirer's projection includes the lots rebased onto it.
-    linked = AppliedCorporateAction.objects.filter(investor=investor).filter(
-        Q(security=security) | Q(counterparty_security=security)
+    # Securities in scope: this one, plus every security linked to it through a chain
+    # of mergers (old <-> acquirer, A -> B -> C), so the acquirer's projection includes
+    # all the lots rebased onto it — and nothing else the investor holds.
+    links = AppliedCorporateAction.objects.filter(investor=investor).exclude(
+        counterparty_security=None
     )
     if folio is not None:
-        linked = linked.filter(folio=folio)
-    sec_ids: set[int] = {security.id}
-    for aca in linked:
-        sec_ids.add(aca.security_id)
-        if aca.counterparty_security_id:
-            sec_ids.add(aca.counterparty_security_id)
+        links = links.filter(folio=folio)
+    sec_ids = _linked_closure(
+        security.id, links.values_list("security_id", "counterparty_security_id")
+    )
 
     events_qs = AppliedCorporateAction.objects.filter(investor=investor).filter(
         Q(security_id__in=sec_ids) | Q(counterparty_security_id__in=sec_ids)
@@ -170,8 +230,9 @@ def compute_ledger(
         events_qs = events_qs.filter(folio=folio)
         raw_qs = raw_qs.filter(folio=folio)
 
-    raw = net_intraday_offsets([to_core_transaction(t) for t in raw_qs])
-    adjusted = _replay(raw, events_qs, as_of)
+    interned: SecurityMap = {}
+    raw = net_intraday_offsets([to_ledger_row(t, interned) for t in raw_qs])
+    adjusted = _replay(raw, events_qs, as_of, interned)
     # Keep the rows that now belong to ``security``. Match on the shared identity key
     # (ISIN for equity, AMFI for funds) so it holds across the core/Django boundary and
     # for no-ISIN funds (object equality would never match a core row to a Django one).
@@ -7,22 +7,44 @@ ledger, which keeps the core tax engine folio-agnostic. India-only in v1.
 
 FMV-as-of-31-Jan-2018 (grandfathering) comes from the layered ``services.fmv``
 lookup (MF via casparser's NAV dataset, listed equity via backfilled price
-history) — injectable so tests stay deterministic.
+history), preloaded per computation as an ``FmvTable`` for the ISINs with
+grandfathered lots — injectable so tests stay deterministic.
+
+The classified gain lines are cached per investor and gating mode
+(``RealisedGainSet``): every view reads them — one FY's with an indexed query — and
+they're only recomputed when something they were classified from has moved since:
+the ledger version, the tax-ready buckets and their securities' type and metadata
+(a shared fund's ``equity_oriented`` flag), the grandfathering FMV inputs
+(``fmv_fingerprint``), or ``_ENGINE_VERSION``. An injected ``fmv_lookup`` always
+computes afresh and never touches the cache.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 from collections.abc import Callable
 from decimal import ROUND_HALF_EVEN, Decimal
 
+from django.db import transaction as db_transaction
 from folioman_core.reconciliation import IntegrityStatus
 from folioman_core.tax import compute_gain_lines, compute_schedule_112a, get_policy
-from folioman_core.tax.india import india_fy_label, india_fy_range
-from folioman_core.tax.models import Term
+from folioman_core.tax.india import (
+    GRANDFATHER_ACQUIRE_CUTOFF,
+    india_fy_label,
+    india_fy_range,
+)
+from folioman_core.tax.models import GainLine, Term
 from folioman_core.tax.schedule_112a import SCHEDULE_112A_CSV_COLUMNS
 
-from folioman_app.models import Investor, Security
-from folioman_app.services.fmv import fmv_lookup as _default_fmv
+from folioman_app.models import (
+    Investor,
+    LedgerVersion,
+    RealisedGain,
+    RealisedGainSet,
+    Security,
+)
+from folioman_app.services.fmv import FmvTable, fmv_fingerprint
 from folioman_app.services.projected_ledger import (
     demerger_reductions,
     projected_transactions,
@@ -31,6 +53,10 @@ from folioman_app.services.projected_ledger import (
 
 _Q2 = Decimal("0.01")
 
+# Bump with any change to how ``compute_gain_lines`` or the India policy classifies or
+# prices a line: every stored ``RealisedGainSet`` then misses once and is rebuilt.
+_ENGINE_VERSION = "1"
+
 
 def _folio_tax_ready(status: IntegrityStatus, *, include_unreconciled: bool) -> bool:
     """Per-folio mirror of the core export gate (schedule_112a._is_tax_ready)."""
@@ -41,18 +67,25 @@ def _folio_tax_ready(status: IntegrityStatus, *, include_unreconciled: bool) ->
     return status in (IntegrityStatus.FULL_HISTORY, IntegrityStatus.RECONCILED)
 
 
-def _tax_ready_transactions(investor: Investor, *, include_unreconciled: bool) -> list:
+def _tax_ready_keys(
+    investor: Investor, *, include_unreconciled: bool
+) -> dict[tuple[str, str], Security]:
+    """The investor's tax-ready buckets, ``(security identity, folio number)``, each
+    with its security."""
+    return {
+        (security_key(st.security), st.folio.number): st.security
+        for st in investor.integrity_statuses.select_related("security", "folio").all()
+        if _folio_tax_ready(IntegrityStatus(st.status), include_unreconciled=include_unreconciled)
+    }
+
+
+def _tax_ready_transactions(investor: Investor, ready_keys) -> list:
     """Core transactions from this investor's tax-ready (security, folio) buckets.
 
     Per-folio gating: only buckets whose integrity status is tax-ready reach FIFO,
     so disposals can only come from those. Fails closed — a bucket with no status
     is simply absent from the ready set.
     """
-    ready_keys = {
-        (security_key(st.security), st.folio.number)
-        for st in investor.integrity_statuses.select_related("security", "folio").all()
-        if _folio_tax_ready(IntegrityStatus(st.status), include_unreconciled=include_unreconciled)
-    }
     # Corporate-action-adjusted ledger (split-scaled units, merged lots, bonus shares):
     # FIFO over the projection gives the right cost basis and proceeds without rewriting
     # rows. Keyed by stable security identity + folio so a merged disposal is gated by —
@@ -64,6 +97,103 @@ def _tax_ready_transactions(investor: Investor, *, include_unreconciled: bool) -
     ]
 
 
+def _fmv_table(transactions: list) -> FmvTable:
+    """The run's FMV table: every ISIN with a lot bought by the grandfathering cutoff
+    (the only lots ``adjusted_cost`` asks about), looked up in one batch."""
+    return FmvTable.preload(
+        t.security.isin for t in transactions if t.date <= GRANDFATHER_ACQUIRE_CUTOFF
+    )
+
+
+def _gating_key(ready_keys: dict[tuple[str, str], Security]) -> str:
+    """A fingerprint of what, besides the ledger, classifies the lines: the tax-ready
+    bucket set, each bucket's security type and metadata, and the engine version.
+
+    Securities are shared across investors, so an import that flips a fund's
+    ``equity_oriented`` (or corrects its type) for another investor moves it too."""
+    rows = [
+        (sec, folio, security.security_type, json.dumps(security.metadata or {}, sort_keys=True))
+        for (sec, folio), security in sorted(ready_keys.items())
+    ]
+    joined = "\n".join([_ENGINE_VERSION, *("\t".join(row) for row in rows)])
+    return hashlib.sha256(joined.encode()).hexdigest()
+
+
+def _compute_gain_lines(investor: Investor, ready_keys, fmv_lookup: Callable | None) -> list:
+    """The classified gain lines, priced with ``fmv_lookup`` or the run's FMV table."""
+    transactions = _tax_ready_transactions(investor, ready_keys)
+    return compute_gain_lines(
+        transactions,
+        get_policy("IN"),
+        fmv_lookup=fmv_lookup if fmv_lookup is not None else _fmv_table(transactions),
+        demerger_reductions=demerger_reductions(investor),
+    )
+
+
+def _fmv_key(ready_keys: dict[tuple[str, str], Security]) -> str:
+    """The FMV fingerprint of every tax-ready security's ISIN — a superset of the
+    grandfathered lots' ISINs that needs no ledger read to list."""
+    return fmv_fingerprint(security.isin for security in ready_keys.values())
+
+
+def _gain_lines(
+    investor: Investor,
+    *,
+    include_unreconciled: bool,
+    fmv_lookup: Callable | None = None,
+    fy: str | None = None,
+) -> list[GainLine]:
+    """Every classified gain line from the investor's tax-ready history, or only
+    those sold in ``fy`` (an ``india_fy_label``), in the engine's order.
+
+    Served from the investor's ``RealisedGainSet`` when it's current; otherwise
+    computed and stored. The ledger version and FMV fingerprint are read before
+    computing, so a write that lands meanwhile leaves the stored set stale rather than
+    wrong."""
+    ready_keys = _tax_ready_keys(investor, include_unreconciled=include_unreconciled)
+    if fmv_lookup is not None:
+        lines = _compute_gain_lines(investor, ready_keys, fmv_lookup)
+        return [g for g in lines if fy is None or india_fy_label(g.disposal.sold_on) == fy]
+
+    version = LedgerVersion.objects.get_or_create(investor=investor)[0].version
+    gating_key = _gating_key(ready_keys)
+    fmv_key = _fmv_key(ready_keys)
+    cached = RealisedGainSet.objects.filter(
+        investor=investor,
+        include_unreconciled=include_unreconciled,
+        ledger_version=version,
+        gating_key=gating_key,
+        fmv_key=fmv_key,
+    ).first()
+    if cached is not None:
+        rows = cached.lines.all() if fy is None else cached.lines.filter(fy=fy)
+        return [GainLine.model_validate(line) for line in rows.values_list("line", flat=True)]
+
+    lines = _compute_gain_lines(investor, ready_keys, None)
+    with db_transaction.atomic():
+        # Serialise rebuilds of one investor on its version row.
+        LedgerVersion.objects.select_for_update().filter(investor=investor).first()
+        gain_set, _ = RealisedGainSet.objects.update_or_create(
+            investor=investor,
+            include_unreconciled=include_unreconciled,
+            defaults={
+                "ledger_version": version,
+                "gating_key": gating_key,
+                "fmv_key": fmv_key,
+            },
+        )
+        gain_set.lines.all().delete()
+        RealisedGain.objects.bulk_create(
+            RealisedGain(
+                gain_set=gain_set,
+                fy=india_fy_label(g.disposal.sold_on),
+                line=g.model_dump(mode="json"),
+            )
+            for g in lines
+        )
+    return [g for g in lines if fy is None or india_fy_label(g.disposal.sold_on) == fy]
+
+
 def build_capital_gains(
     investor: Investor,
     fy_label: str,
@@ -75,17 +205,13 @@ def build_capital_gains(
     short-/long-term, plus STCG/LTCG totals. Listed equity and equity-oriented
     mutual funds with tax-ready folios; same gating as the 112A export.
     """
-    fmv = fmv_lookup if fmv_lookup is not None else _default_fmv
-    fy_start, fy_end = india_fy_range(fy_label)  # raises ValueError on a bad label
-    transactions = _tax_ready_transactions(investor, include_unreconciled=include_unreconciled)
-    gain_lines = compute_gain_lines(
-        transactions,
-        get_policy("IN"),
-        fmv_lookup=fmv,
-        demerger_reductions=demerger_reductions(investor),
+    fy_start, _fy_end = india_fy_range(fy_label)  # raises ValueError on a bad label
+    in_fy = _gain_lines(
+        investor,
+        include_unreconciled=include_unreconciled,
+        fmv_lookup=fmv_lookup,
+        fy=india_fy_label(fy_start),
     )
-
-    in_fy = [g for g in gain_lines if fy_start <= g.disposal.sold_on <= fy_end]
     # Map core securities back to Django ids so rows can deep-link to the scheme.
     isin_to_id = dict(
         Security.objects.filter(
@@ -151,13 +277,8 @@ def build_capital_gains_by_fy(
     each by the FY it was sold in, so a loss year yields a negative total.
     Ascending by FY so the chart reads left-to-right in time.
     """
-    fmv = fmv_lookup if fmv_lookup is not None else _default_fmv
-    transactions = _tax_ready_transactions(investor, include_unreconciled=include_unreconciled)
-    gain_lines = compute_gain_lines(
-        transactions,
-        get_policy("IN"),
-        fmv_lookup=fmv,
-        demerger_reductions=demerger_reductions(investor),
+    gain_lines = _gain_lines(
+        investor, include_unreconciled=include_unreconciled, fmv_lookup=fmv_lookup
     )
 
     stcg: dict[str, Decimal] = {}
@@ -187,21 +308,28 @@ def build_schedule_112a(
     include_unreconciled: bool = False,
     fmv_lookup: Callable | None = None,
 ) -> dict:
-    fmv = fmv_lookup if fmv_lookup is not None else _default_fmv
-
+    fy_start, _fy_end = india_fy_range(fy_label)  # raises ValueError on a bad label
     # Only tax-ready (security, folio) buckets reach FIFO, so disposals come only
     # from them (shared with the realised capital-gains view).
-    transactions = _tax_ready_transactions(investor, include_unreconciled=include_unreconciled)
-    gain_lines = compute_gain_lines(
-        transactions,
-        get_policy("IN"),
-        fmv_lookup=fmv,
-        demerger_reductions=demerger_reductions(investor),
+    gain_lines = _gain_lines(
+        investor,
+        include_unreconciled=include_unreconciled,
+        fmv_lookup=fmv_lookup,
+        fy=india_fy_label(fy_start),
+    )
+    fmv = (
+        fmv_lookup
+        if fmv_lookup is not None
+        else FmvTable.preload(
+            g.disposal.security.isin
+            for g in gain_lines
+            if g.disposal.acquired_on <= GRANDFATHER_ACQUIRE_CUTOFF
+        )
     )
 
     # Per-folio gating is already applied above; mark the surviving securities
     # ready so the core per-security gate (which can't see folios) lets them through.
-    integrity_by_security = {t.security: IntegrityStatus.RECONCILED for t in transactions}
+    integrity_by_security = {g.disposal.security: IntegrityStatus.RECONCILED for g in gain_lines}
     rows = compute_schedule_112a(
         gain_lines,
         fy_label,
@@ -11,21 +11,35 @@ engine handles that). XIRR and reconciled-units valuation are layered on later
 from __future__ import annotations
 
 import calendar
+from bisect import bisect_right
 from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import date, timedelta
 from decimal import Decimal
+from itertools import groupby
 
 from django.db.models import Max, Q
-from folioman_core.fifo import InsufficientUnitsError, apply_fifo, net_units_from_transactions
+from folioman_core.fifo import (
+    FIFOUnits,
+    InsufficientUnitsError,
+    apply_fifo,
+    net_units_from_transactions,
+)
 from folioman_core.models import Holding as CoreHolding
 from folioman_core.models import HoldingSource, Quote, SecurityType, TransactionType
 from folioman_core.reconciliation import TOLERANCE, IntegrityStatus
 from folioman_core.valuation import value_holdings
-from folioman_core.xirr import cashflows_from_transactions, compute_xirr
+from folioman_core.xirr import (
+    CashFlow,
+    cashflows_from_transactions,
+    compute_xirr,
+    compute_xirr_many,
+)
 
-from folioman_app.mappers import to_core_security, to_core_transaction
+from folioman_app.mappers import SecurityMap, to_core_security, to_ledger_row
 from folioman_app.models import (
     AppliedCorporateAction,
+    CurrentPosition,
     Family,
     Folio,
     Holding,
@@ -39,6 +53,7 @@ from folioman_app.models import (
 )
 from folioman_app.models.jobs import ImportJob, ImportJobStatus
 from folioman_app.services.dividends import build_equity_dividend_detail
+from folioman_app.services.price_index import PriceIndex
 from folioman_app.services.projected_ledger import (
     compute_ledger,
     demerger_reductions,
@@ -58,15 +73,6 @@ _BUY_TYPES = frozenset({TransactionType.BUY.value, TransactionType.TRANSFER_IN.v
 _SELL_TYPES = frozenset({TransactionType.SELL.value, TransactionType.TRANSFER_OUT.value})
 
 
-def _latest_price(security_id: int, as_of: date) -> Decimal | None:
-    return (
-        NAVHistory.objects.filter(security_id=security_id, date__lte=as_of)
-        .order_by("-date")
-        .values_list("nav", flat=True)
-        .first()
-    )
-
-
 def _amc_label(security) -> str:
     """Fund house for the allocation breakdown — the AMC FK, else the parser's
     ``metadata['amc']`` string, else empty (bucketed as "Other" by the rollup)."""
@@ -102,99 +108,63 @@ def _category_label(security) -> str:
     return _SECURITY_TYPE_CATEGORY.get(security.security_type, "Other")
 
 
-def _current_positions(investor: Investor):
+def _current_positions(positions: list[CurrentPosition]):
     """Yield (django_security, units, as_of_date, source) — current units per security.
 
-    Units come per (security, folio) from the **transaction ledger** when one
-    exists (a full-history scheme has transactions but no holding snapshot), else
-    from the latest **holding snapshot** (eCAS/manual/incomplete-CAS). Preferring
-    the ledger avoids double-counting a reconciled folio (ledger + eCAS holding)
-    and is what lets full-history MF holdings contribute to net worth at all.
-    Aggregated per security for the rollup.
-
-    Nets the whole ledger in Python on each call — deliberately, at the current
-    scale (a handful of portfolios). This generator is the single seam every
-    valuation path funnels through: if a long ledger ever makes ``/summary`` slow,
-    swap this body for DB-side signed aggregation (or a materialized
-    current-units table updated on import) with no change to callers.
+    Reads one investor's materialized :class:`CurrentPosition` rows (see
+    :mod:`folioman_app.services.positions`): per (security, folio), units from the
+    corporate-action-adjusted **transaction ledger** when one exists (a full-history
+    scheme has transactions but no holding snapshot), else from the latest **holding
+    snapshot** (eCAS/manual/incomplete-CAS). Preferring the ledger avoids
+    double-counting a reconciled folio (ledger + eCAS holding) and is what lets
+    full-history MF holdings contribute to net worth at all. Aggregated per security
+    identity, so a merger that rebases lots onto the acquirer counts under the acquirer.
     """
-    # Ledger units come from the corporate-action-adjusted projection (split-scaled,
-    # merged, bonus shares) over the immutable rows — keyed by a stable security
-    # identity + folio so a merger that rebases lots onto the acquirer is counted under
-    # the acquirer, not the merged-away scrip. (Cost-basis rows only; a partial scheme
-    # has none and falls back to its holding snapshot below.)
-    txns_by_key: dict[tuple[str, str], list] = defaultdict(list)
-    for core in projected_transactions(investor):
-        txns_by_key[(_security_key(core.security), core.folio_number or "")].append(core)
-
-    holdings_by_key: dict[tuple[str, str], list] = defaultdict(list)
-    sec_by_key: dict[str, Security] = {}
-    for holding in investor.holdings.select_related("security", "security__amc", "folio"):
-        skey = _security_key(holding.security)
-        holdings_by_key[(skey, holding.folio.number if holding.folio else "")].append(holding)
-        sec_by_key.setdefault(skey, holding.security)
-
-    # Django securities for ledger-only keys (incl. a merger acquirer the investor never
-    # traded directly — its lots arrive via the event, so resolve counterparties too).
-    cp_ids = list(
-        AppliedCorporateAction.objects.filter(investor=investor)
-        .exclude(counterparty_security=None)
-        .values_list("counterparty_security_id", flat=True)
-    )
-    for sec in (
-        Security.objects.filter(Q(transactions__investor=investor) | Q(pk__in=cp_ids))
-        .select_related("amc")
-        .distinct()
-    ):
-        sec_by_key.setdefault(_security_key(sec), sec)
-
     # security_key -> [django_security, units, latest_as_of, source]
     agg: dict[str, list] = {}
-    for key in set(txns_by_key) | set(holdings_by_key):
-        skey = key[0]
-        if key in txns_by_key:
-            cores = txns_by_key[key]
-            units = net_units_from_transactions(cores)
-            security = sec_by_key.get(skey)
-            as_of = max(c.date for c in cores)
-            source = HoldingSource.LEDGER.value
-        else:
-            rows = holdings_by_key[key]
-            latest = max(h.as_of_date for h in rows)
-            units = sum((h.units for h in rows if h.as_of_date == latest), _ZERO)
-            security = rows[0].security
-            as_of = latest
-            source = rows[0].source
-        if security is None:
-            continue  # projected key with no Django security (defensive; shouldn't happen)
-        slot = agg.setdefault(skey, [security, _ZERO, as_of, source])
-        slot[0] = security
-        slot[1] += units
-        slot[2] = max(slot[2], as_of)
+    for position in positions:
+        slot = agg.setdefault(
+            _security_key(position.security),
+            [position.security, _ZERO, position.last_activity, position.source],
+        )
+        slot[0] = position.security
+        slot[1] += position.units
+        slot[2] = max(slot[2], position.last_activity)
         # A ledger position wins the (informational) source label for the security.
-        if source == HoldingSource.LEDGER.value:
-            slot[3] = source
+        if position.source == HoldingSource.LEDGER.value:
+            slot[3] = position.source
 
     for security, units, as_of, source in agg.values():
         if units > _ZERO:
             yield security, units, as_of, source
 
 
-def _value_investors(investors: list[Investor], as_of: date):
+def _value_investors(investors: list[Investor], as_of: date, ctx: PortfolioContext | None = None):
     """Value the latest holding snapshot per (investor, security) across the set.
 
     Returns the core valuation plus a map from core Security →
     (id, name, type, amc_name, category) so Django metadata can be reattached to
-    the priced rows for the rollup's allocation breakdowns.
+    the priced rows for the rollup's allocation breakdowns. Positions come from the
+    materialized table; prices from ``ctx`` when the caller already loaded one, else
+    one load here.
     """
+    # Local import: ``services.positions`` builds on this module's ledger loader.
+    from folioman_app.services.positions import load_positions
+
+    ctx = ctx or PortfolioContext.load(investors, as_of)
+    positions = load_positions(investors)
     core_holdings: list[CoreHolding] = []
     price_by_security: dict = {}
     # core Security -> (id, name, security_type, amc_name, category)
     meta_by_security: dict = {}
+    held: list[tuple] = []
+    interned: SecurityMap = {}
 
     for investor in investors:
-        for django_security, units, snapshot_date, source in _current_positions(investor):
-            core_security = to_core_security(django_security)
+        for django_security, units, snapshot_date, source in _current_positions(
+            positions[investor.id]
+        ):
+            core_security = to_core_security(django_security, interned)
             core_holdings.append(
                 CoreHolding(
                     security=core_security,
@@ -210,9 +180,11 @@ def _value_investors(investors: list[Investor], as_of: date):
                 _amc_label(django_security),
                 _category_label(django_security),
             )
-            price = _latest_price(django_security.id, as_of)
-            if price is not None:
-                price_by_security[core_security] = price
+            held.append((core_security, django_security.id))
+    for core_security, sec_id in held:
+        price = ctx.nav_idx.price_at(sec_id, as_of)
+        if price is not None:
+            price_by_security[core_security] = price
 
     def nav_provider(security, _as_of):
         return price_by_security.get(security)
@@ -318,7 +290,9 @@ def _security_cashflows(txn_keys: dict) -> dict[int, list[tuple[date, Decimal]]]
     return by_sec
 
 
-def _holding_extras(investors: list[Investor], as_of: date) -> dict[int, dict]:
+def _holding_extras(
+    investors: list[Investor], as_of: date, ctx: PortfolioContext | None = None
+) -> dict[int, dict]:
     """Per-security cost basis, intraday day-change, and per-fund XIRR.
 
     - ``invested_inr``: FIFO cost basis of the units still held (ledger), or the
@@ -333,41 +307,44 @@ def _holding_extras(investors: list[Investor], as_of: date) -> dict[int, dict]:
       fund (can't value the terminal leg). This is the per-fund growth number;
       the portfolio headline XIRR is computed separately.
 
-    Returns ``{security_id: {invested_inr, day_change_inr, day_change_pct, xirr}}``.
+    Returns ``{security_id: {units, invested_inr, day_change_inr, day_change_pct, xirr}}``.
     """
-    txn_keys, hold_keys = _ledger_index(investors)
-    positions = _positions_asof(txn_keys, hold_keys, as_of, _merged_reductions(investors))
-    nav_idx = _nav_index(positions.keys(), as_of)
+    ctx = ctx or PortfolioContext.load(investors, as_of)
+    txn_keys, nav_idx = ctx.txn_keys, ctx.nav_idx
+    positions = _positions_asof(txn_keys, ctx.hold_keys, as_of, ctx.reductions)
     cash_by_sec = _security_cashflows(txn_keys)
     extras: dict[int, dict] = {}
+    to_solve: dict[int, list] = {}
     for sec_id, (_sec, units, invested) in positions.items():
-        seq = nav_idx.get(sec_id) or []
-        latest = seq[-1][1] if seq else None
-        prev = seq[-2][1] if len(seq) >= 2 else None
+        seq = nav_idx.tail(sec_id, as_of, 2)
+        latest = seq[-1] if seq else None
+        prev = seq[-2] if len(seq) >= 2 else None
         day_change_inr = day_change_pct = None
         if units > _ZERO and latest is not None and prev is not None and prev != _ZERO:
             day_change_inr = units * (latest - prev)
             day_change_pct = float((latest - prev) / prev)
 
         flows = cash_by_sec.get(sec_id)
-        xirr = None
         if flows:
             # Held → terminal is the current value of the units; fully exited →
             # terminal 0 (pure realized return). Held-but-unpriced can't be valued.
             terminal = (units * latest if latest is not None else None) if units > _ZERO else _ZERO
             if terminal is not None:
-                cashflows = cashflows_from_transactions(
+                to_solve[sec_id] = cashflows_from_transactions(
                     flows, present_date=as_of, present_value=terminal
                 )
-                xirr = compute_xirr(cashflows)
 
         extras[sec_id] = {
+            "units": units,
             "invested_inr": invested,
             "latest_nav": latest,  # the price the holding is valued at (for display)
             "day_change_inr": day_change_inr,
             "day_change_pct": day_change_pct,
-            "xirr": xirr,
+            "xirr": None,
         }
+    # Every fund's XIRR in one batched solve.
+    for sec_id, xirr in zip(to_solve, compute_xirr_many(list(to_solve.values())), strict=True):
+        extras[sec_id]["xirr"] = xirr
     return extras
 
 
@@ -380,8 +357,9 @@ def _day_change_total(extras: dict[int, dict]) -> Decimal | None:
 
 def build_family_aggregate(family: Family, as_of: date) -> dict:
     investors = list(family.investors.all())
-    valuation, meta_by_security = _value_investors(investors, as_of)
-    extras = _holding_extras(investors, as_of)
+    ctx = PortfolioContext.load(investors, as_of)
+    valuation, meta_by_security = _value_investors(investors, as_of, ctx)
+    extras = _holding_extras(investors, as_of, ctx)
     rollup = _rollup(valuation, meta_by_security, extras)
     statuses = (
         list(
@@ -392,7 +370,7 @@ def build_family_aggregate(family: Family, as_of: date) -> dict:
         if investors
         else []
     )
-    navs_as_of = _book_navs_as_of(investors, as_of)
+    navs_as_of = ctx.navs_as_of()
     return {
         "family_id": family.id,
         "as_of": as_of,
@@ -410,8 +388,8 @@ def build_family_aggregate(family: Family, as_of: date) -> dict:
         "navs_as_of": navs_as_of,
         "navs_stale": _navs_stale(navs_as_of, as_of),
         "day_change_inr": _day_change_total(extras),
-        "xirr": compute_portfolio_xirr(investors, as_of),
-        "period_returns": compute_portfolio_period_returns(investors, as_of),
+        "xirr": compute_portfolio_xirr(investors, as_of, ctx),
+        "period_returns": compute_portfolio_period_returns(investors, as_of, ctx),
     }
 
 
@@ -599,8 +577,9 @@ def build_investor_summary(investor: Investor, as_of: date) -> dict:
     tax-ready vs total-holdings split, items needing attention, and the most
     recent successful import date.
     """
-    valuation, meta_by_security = _value_investors([investor], as_of)
-    extras = _holding_extras([investor], as_of)
+    ctx = PortfolioContext.load([investor], as_of)
+    valuation, meta_by_security = _value_investors([investor], as_of, ctx)
+    extras = _holding_extras([investor], as_of, ctx)
     rollup = _rollup(valuation, meta_by_security, extras)
 
     # Held mutual funds we *couldn't* price (no NAV) — the genuine, fixable gap that
@@ -661,7 +640,7 @@ def build_investor_summary(investor: Investor, as_of: date) -> dict:
             summary_as_of = last_known.date
             is_provisional = True
 
-    navs_as_of = _book_navs_as_of([investor], as_of)
+    navs_as_of = ctx.navs_as_of()
     return {
         "investor_id": investor.id,
         "as_of": summary_as_of,
@@ -678,8 +657,8 @@ def build_investor_summary(investor: Investor, as_of: date) -> dict:
         "unpriced_fund_count": unpriced_fund_count,
         "last_import_at": last_import_at,
         "day_change_inr": _day_change_total(extras),
-        "xirr": compute_portfolio_xirr([investor], as_of),
-        "period_returns": compute_portfolio_period_returns([investor], as_of),
+        "xirr": compute_portfolio_xirr([investor], as_of, ctx),
+        "period_returns": compute_portfolio_period_returns([investor], as_of, ctx),
         "asset_mix": rollup["asset_mix"],
         "amc_mix": rollup["amc_mix"],
         "category_mix": rollup["category_mix"],
@@ -704,8 +683,11 @@ def _folio_balances(investor: Investor, security, txns, price, as_of: date) -> l
             continue
         grouped.setdefault(t.folio_id, []).append(t)
         meta[t.folio_id] = t.folio
+    interned: SecurityMap = {}
     for fid, group in grouped.items():
-        units_by_folio[fid] = net_units_from_transactions([to_core_transaction(t) for t in group])
+        units_by_folio[fid] = net_units_from_transactions(
+            [to_ledger_row(t, interned) for t in group]
+        )
 
     # Snapshot-only folios (a holding row but no ledger here): take the units on
     # that folio's most recent snapshot as of the report date.
@@ -762,9 +744,7 @@ def _holdings_anchor(investor: Investor, security, as_of: date) -> Decimal | Non
     return sum((u for (_d, u) in latest.values()), _ZERO)
 
 
-def _scheme_ledger(
-    investor: Investor, security, as_of: date
-) -> tuple[list[dict], list, date | None]:
+def _scheme_ledger(investor: Investor, security, projected: list) -> tuple[list[dict], date | None]:
     """The as-traded ledger shown on the scheme page.
 
     Trades render with their **original tradebook units and prices** — so the figures
@@ -775,12 +755,10 @@ def _scheme_ledger(
     computed here and reaches the held quantity.
 
     Cost basis, gains and reconciliation stay on the corporate-action-adjusted projection
-    (returned as the second element for those consumers); this row view is presentation
-    only. Returns ``(rows, projected, partial_from)`` — ``projected`` the adjusted
-    cost-basis ledger, ``partial_from`` the earliest incomplete trade's date.
+    (``projected``, the security's :func:`compute_ledger`, which the merger receipts are
+    read from); this row view is presentation only. Returns ``(rows, partial_from)`` —
+    ``partial_from`` the earliest incomplete trade's date.
     """
-    projected = compute_ledger(investor, security, as_of=as_of)
-
     # Units converted *into* this security by each merger — the receipt amount. A
     # rebased lot keeps the pk of its pre-merger row (on the merged-away security), so a
     # row whose origin security isn't this one is a converted lot; net them per merger
@@ -906,7 +884,7 @@ def _scheme_ledger(
                 "balance": balance,
             }
         )
-    return rows, projected, partial_from
+    return rows, partial_from
 
 
 # Net-units sign rule, mirroring folioman_core.fifo.net_units_from_transactions.
@@ -962,18 +940,21 @@ def build_scheme_detail(investor: Investor, security, as_of: date) -> dict:
 
     Identity + current metrics (units / value / cost basis / per-fund XIRR /
     intraday change) computed from the same seams the dashboard uses, plus the
-    full NAV history and this security's transaction ledger and integrity rows.
-    """
-    txn_keys, hold_keys = _ledger_index([investor])
-    positions = _positions_asof(txn_keys, hold_keys, as_of)
-    extras = _holding_extras([investor], as_of)
+    NAV history (daily for the last year, weekly before) and this security's
+    transaction ledger and integrity rows.
 
-    pos = positions.get(security.id)
-    units = pos[1] if pos else _ZERO
-    ex = extras.get(security.id, {})
+    Only the security's merger-linked closure is projected, once, and feeds both the
+    metrics (through a :meth:`PortfolioContext.for_security`) and the ledger rows, so
+    the page costs the same however many other holdings the investor has.
+    """
+    projected = compute_ledger(investor, security, as_of=as_of)
+    ctx = PortfolioContext.for_security(investor, security, as_of, projected)
+    ex = _holding_extras([investor], as_of, ctx).get(security.id, {})
+    units = ex.get("units", _ZERO)
     invested = ex.get("invested_inr")
 
-    price = _latest_price(security.id, as_of)
+    nav_idx = ctx.nav_idx
+    price = nav_idx.price_at(security.id, as_of)
     if units <= _ZERO:
         value = _ZERO
     elif price is not None:
@@ -985,18 +966,13 @@ def build_scheme_detail(investor: Investor, security, as_of: date) -> dict:
     if value is not None and invested not in (None, _ZERO):
         return_pct = float((value - invested) / invested)
 
-    latest = (
-        NAVHistory.objects.filter(security=security, date__lte=as_of)
-        .order_by("-date")
-        .values_list("date", "nav")
-        .first()
-    )
-    latest_nav_date, latest_nav = latest if latest else (None, None)
+    nav_history = nav_idx.history(security.id, weekly_before=default_series_start(as_of))
+    latest_nav_date, latest_nav = nav_history[-1] if nav_history else (None, None)
 
     # The scheme page shows the corporate-action-adjusted ledger (merged lots, bonus /
     # split / merger marker rows), so the running balance reaches the held quantity and
     # the page explains how. Orphan partial-history rows are appended, badged.
-    txns, complete_core, partial_from = _scheme_ledger(investor, security, as_of)
+    txns, partial_from = _scheme_ledger(investor, security, projected)
     folios = _folio_balances(
         investor,
         security,
@@ -1010,7 +986,7 @@ def build_scheme_detail(investor: Investor, security, as_of: date) -> dict:
     # reconciles to its eCAS anchor, so it isn't partial even with orphan rows present.
     anchor = _holdings_anchor(investor, security, as_of)
     has_incomplete = partial_from is not None
-    complete_net = net_units_from_transactions(complete_core)
+    complete_net = net_units_from_transactions(projected)
     if anchor is not None:
         partial_history = has_incomplete and abs(complete_net - anchor) > TOLERANCE
     else:
@@ -1019,11 +995,11 @@ def build_scheme_detail(investor: Investor, security, as_of: date) -> dict:
     # Why the XIRR reads the way it does — so the UI can flag a provisional number
     # instead of presenting it as gospel.
     xirr = ex.get("xirr")
-    if not complete_core:
+    if not projected:
         xirr_status = "estimated"  # snapshot-only (or partial-history): value is observed
     elif xirr is None:
         xirr_status = "estimated"  # held but unpriced — can't value the terminal leg
-    elif (as_of - min(c.date for c in complete_core)).days < 365:
+    elif (as_of - min(c.date for c in projected)).days < 365:
         xirr_status = "less_than_1_year"  # annualized over a short period — indicative
     else:
         xirr_status = "valid"
@@ -1067,9 +1043,7 @@ def build_scheme_detail(investor: Investor, security, as_of: date) -> dict:
             )
         ),
         "folios": folios,
-        "nav_history": list(
-            NAVHistory.objects.filter(security=security, date__lte=as_of).order_by("date")
-        ),
+        "nav_history": [{"date": d, "nav": nav} for d, nav in nav_history],
         **dividend_detail,
         "corporate_actions": _corporate_action_rows(txns),
         "transactions": txns,
@@ -1093,14 +1067,22 @@ def _txn_cash(txn) -> Decimal:
     return txn.units * txn.nav_or_price
 
 
-def _ledger_index(investors: list[Investor]):
+def _ledger_index(investors: list[Investor], *, after: date | None = None):
     """Load every investor's ledger + snapshots once, grouped by (security, folio).
 
     Returns ``(txn_keys, hold_keys)``. Transactions are pre-converted to core
     value objects so the per-date netting below doesn't re-convert. This is the
     single load every series/XIRR path funnels through (the perf seam: swap for
-    DB-side aggregation if a long ledger makes it slow).
+    DB-side aggregation if a long ledger makes it slow). ``after`` keeps only the
+    rows dated after it — the tail a resumed FIFO checkpoint replays.
     """
+    return _merge_ledgers(list(_ledger_by_investor(investors, after=after).values()))
+
+
+def _ledger_by_investor(
+    investors: list[Investor], *, after: date | None = None
+) -> dict[int, tuple[dict, dict]]:
+    """:func:`_ledger_index` per investor: ``{investor_id: (txn_keys, hold_keys)}``."""
     # Ledger rows come from the corporate-action-adjusted projection (split-scaled,
     # merged, bonus). The bucket key stays (security_id, folio_id) — same contract every
     # downstream consumer relies on — by resolving the projected row's identity back to a
@@ -1119,23 +1101,65 @@ def _ledger_index(investors: list[Investor]):
     ):
         sec_by_key.setdefault(security_key(sec), sec)
 
-    txn_keys: dict[tuple[int, int | None], dict] = {}
+    ledgers: dict[int, tuple[dict, dict]] = {}
     for investor in investors:
+        txn_keys: dict[tuple[int, int | None], dict] = {}
         folio_by_num = {f.number: f.id for f in investor.folios.all()}
-        for core in projected_transactions(investor):
+        for core in projected_transactions(investor, after=after):
             security = sec_by_key.get(security_key(core.security))
             if security is None:
                 continue  # projected key with no Django security (defensive)
-            key = (security.id, folio_by_num.get(core.folio_number or ""))
-            rec = txn_keys.setdefault(key, {"security": security, "core": [], "cash": []})
-            rec["core"].append((core.date, core))
-            rec["cash"].append((core.date, core.type.value, _txn_cash(core)))
+            _add_core(txn_keys, security, folio_by_num.get(core.folio_number or ""), core)
+        hold_keys: dict[tuple[int, int | None], dict] = {}
+        for holding in investor.holdings.select_related("security", "security__amc", "folio"):
+            _add_holding(hold_keys, holding)
+        ledgers[investor.id] = (txn_keys, hold_keys)
+    return ledgers
+
+
+def _add_core(txn_keys: dict, security, folio_id: int | None, core) -> None:
+    """File a projected row under its (security, folio) bucket, with its cash flow."""
+    rec = txn_keys.setdefault(
+        (security.id, folio_id), {"security": security, "core": [], "cash": []}
+    )
+    rec["core"].append((core.date, core))
+    rec["cash"].append((core.date, core.type.value, _txn_cash(core)))
+
+
+def _add_holding(hold_keys: dict, holding) -> None:
+    key = (holding.security_id, holding.folio_id)
+    rec = hold_keys.setdefault(key, {"security": holding.security, "rows": []})
+    rec["rows"].append(holding)
+
+
+def _security_ledger(investor: Investor, security, projected: list) -> tuple[dict, dict]:
+    """:func:`_ledger_index` for one security, from its :func:`compute_ledger`
+    projection — the lots merged into it included, the rest of the book untouched."""
+    folio_by_num = {f.number: f.id for f in investor.folios.all()}
+    txn_keys: dict[tuple[int, int | None], dict] = {}
+    for core in projected:
+        _add_core(txn_keys, security, folio_by_num.get(core.folio_number or ""), core)
     hold_keys: dict[tuple[int, int | None], dict] = {}
-    for investor in investors:
-        for holding in investor.holdings.select_related("security", "folio"):
-            key = (holding.security_id, holding.folio_id)
-            rec = hold_keys.setdefault(key, {"security": holding.security, "rows": []})
-            rec["rows"].append(holding)
+    for holding in investor.holdings.filter(security=security).select_related("security", "folio"):
+        _add_holding(hold_keys, holding)
+    return txn_keys, hold_keys
+
+
+def _merge_ledgers(ledgers: list[tuple[dict, dict]]) -> tuple[dict, dict]:
+    """Fold per-investor ledger indexes into one, in investor order (a bucket shared
+    across investors — no folio — keeps the first investor's security)."""
+    if len(ledgers) == 1:
+        return ledgers[0]
+    txn_keys: dict[tuple[int, int | None], dict] = {}
+    hold_keys: dict[tuple[int, int | None], dict] = {}
+    for part_txns, part_holds in ledgers:
+        for key, rec in part_txns.items():
+            slot = txn_keys.setdefault(key, {"security": rec["security"], "core": [], "cash": []})
+            slot["core"].extend(rec["core"])
+            slot["cash"].extend(rec["cash"])
+        for key, rec in part_holds.items():
+            slot = hold_keys.setdefault(key, {"security": rec["security"], "rows": []})
+            slot["rows"].extend(rec["rows"])
     return txn_keys, hold_keys
 
 
@@ -1200,33 +1224,74 @@ def _positions_asof(
     return agg
 
 
-def _nav_index(security_ids, upto: date) -> dict[int, list]:
-    """Per-security ascending ``[(date, nav)]`` up to ``upto`` — one query, then
-    bisected per sample date so a multi-year series stays a single price load."""
-    idx: dict[int, list] = defaultdict(list)
-    rows = (
-        NAVHistory.objects.filter(security_id__in=list(security_ids), date__lte=upto)
-        .order_by("security_id", "date")
-        .values_list("security_id", "date", "nav")
-    )
-    for sec_id, nav_date, nav in rows:
-        idx[sec_id].append((nav_date, nav))
-    return idx
+def _nav_index(security_ids, upto: date) -> PriceIndex:
+    """Per-security NAV series up to ``upto`` — one query, then bisected per sample date
+    so a multi-year series stays a single price load. Callers that run several
+    valuation paths build it once and pass it down (see :class:`PortfolioContext`)."""
+    return PriceIndex.load(security_ids, upto)
 
 
-def _price_at(nav_idx: dict, sec_id: int, as_of: date) -> Decimal | None:
-    """Latest NAV on/before ``as_of`` for the security, or ``None``."""
-    seq = nav_idx.get(sec_id)
-    if not seq:
-        return None
-    lo, hi = 0, len(seq)
-    while lo < hi:
-        mid = (lo + hi) // 2
-        if seq[mid][0] <= as_of:
-            lo = mid + 1
-        else:
-            hi = mid
-    return seq[lo - 1][1] if lo > 0 else None
+@dataclass(slots=True)
+class PortfolioContext:
+    """One request's portfolio as of a date, loaded once for every valuation path.
+
+    ``/summary`` and the family aggregate value the holdings, derive per-fund extras,
+    the lifetime XIRR and the trailing returns — each used to project the ledger
+    (replaying corporate actions, converting rows to core models) on its own.
+    :meth:`load` does it once: the projected ledger and snapshots merged across the
+    investors (``txn_keys`` / ``hold_keys``), the demerger cost reductions, and one
+    :class:`PriceIndex` over every security those can price (current holdings come
+    from the materialized positions). Pass it to the functions taking ``ctx``.
+    """
+
+    investors: list[Investor]
+    as_of: date
+    txn_keys: dict
+    hold_keys: dict
+    reductions: dict[str, list]
+    book_security_ids: set[int]
+    nav_idx: PriceIndex
+
+    @classmethod
+    def load(cls, investors: list[Investor], as_of: date) -> PortfolioContext:
+        txn_keys, hold_keys = _ledger_index(investors)
+        # Every transacted security, not just the projected cost-basis ones (partial
+        # history, merged-away scrips): the book :func:`_book_navs_as_of` measures.
+        book = set(
+            Transaction.objects.filter(investor__in=investors).values_list("security_id", flat=True)
+        ) | {sec_id for sec_id, _folio_id in hold_keys}
+        return cls(
+            investors=investors,
+            as_of=as_of,
+            txn_keys=txn_keys,
+            hold_keys=hold_keys,
+            reductions=_merged_reductions(investors),
+            book_security_ids=book,
+            nav_idx=_nav_index(book | {sec_id for sec_id, _folio_id in txn_keys}, as_of),
+        )
+
+    @classmethod
+    def for_security(
+        cls, investor: Investor, security, as_of: date, projected: list
+    ) -> PortfolioContext:
+        """The context narrowed to one holding — the scheme page's, whose figures
+        depend on that security alone, so its cost doesn't grow with the rest of the
+        book. ``projected`` is the security's :func:`compute_ledger` as of ``as_of``."""
+        txn_keys, hold_keys = _security_ledger(investor, security, projected)
+        return cls(
+            investors=[investor],
+            as_of=as_of,
+            txn_keys=txn_keys,
+            hold_keys=hold_keys,
+            reductions=demerger_reductions(investor),
+            book_security_ids={security.id},
+            nav_idx=_nav_index([security.id], as_of),
+        )
+
+    def navs_as_of(self) -> date | None:
+        """:func:`_book_navs_as_of`, answered from the loaded index."""
+        days = (self.nav_idx.last_date(sec_id, self.as_of) for sec_id in self.book_security_ids)
+        return max((d for d in days if d is not None), default=None)
 
 
 def _add_months(start: date, months: int) -> date:
@@ -1261,15 +1326,131 @@ def _sample_dates(from_: date, to: date, granularity: str) -> list[date]:
     return out
 
 
-def _value_series(investors: list[Investor], from_: date, to: date, granularity: str) -> list[dict]:
-    txn_keys, _hold_keys = _ledger_index(investors)
-    sec_ids = {k[0] for k in txn_keys}
-    nav_idx = _nav_index(sec_ids, to)
+@dataclass(slots=True)
+class _LiveBucket:
+    """One (security, folio) bucket's FIFO state as the sweep moves forward in time.
+
+    ``events`` are ``(date, order, seq, payload)`` sorted ascending — order 0 is a
+    demerger reduction, 1 a ledger row. ``net`` tracks the signed unit total for the
+    over-sell fallback (see :func:`_sweep_positions`).
+    """
+
+    sec_id: int
+    folio_id: int | None
+    security: Security
+    events: list
+    fifo: FIFOUnits = field(default_factory=FIFOUnits)
+    cursor: int = 0
+    started: bool = False
+    broken: bool = False
+    net: Decimal = _ZERO
+
+    def advance(self, upto: date) -> None:
+        """Apply every event dated on/before ``upto`` not yet applied."""
+        events = self.events
+        while self.cursor < len(events) and events[self.cursor][0] <= upto:
+            _when, order, _seq, payload = events[self.cursor]
+            self.cursor += 1
+            if order == 0:
+                if not self.broken:
+                    self.fifo.reduce_lots(payload)
+                continue
+            self.started = True
+            if payload.type.value in _CA_INFLOW:
+                self.net += payload.units
+            elif payload.type.value in _CA_OUTFLOW:
+                self.net -= payload.units
+            if self.broken:
+                continue
+            try:
+                self.fifo.add_transaction(payload)
+            except InsufficientUnitsError:
+                # Over-sell (malformed manual entry): the replay path reports net units
+                # and zero cost for every later date; a half-consumed FIFO is unusable.
+                self.broken = True
+
+
+class _PositionSweep:
+    """Every (security, folio) bucket's live FIFO, advanced together through time.
+
+    Buckets are kept in ``txn_keys`` order — the order the per-date replay aggregates
+    in, so the Decimal sums match it exactly. ``seeded`` buckets (restored from a
+    persisted checkpoint, already in their saved order) go first: they started before
+    any bucket that only appears in the resumed tail, which is where a full replay
+    would have put them too.
+    """
+
+    def __init__(
+        self,
+        txn_keys: dict,
+        reductions: dict[str, list] | None = None,
+        seeded: list[_LiveBucket] | None = None,
+    ) -> None:
+        reductions = reductions or {}
+        self.buckets: list[_LiveBucket] = list(seeded or [])
+        by_key = {(b.sec_id, b.folio_id): b for b in self.buckets}
+        for (sec_id, folio_id), rec in txn_keys.items():
+            sec = rec["security"]
+            ident = sec.isin or sec.symbol or sec.name
+            events = [(ex, 0, seq, by) for seq, (ex, by) in enumerate(reductions.get(ident, []))]
+            events += [(txn_date, 1, seq, core) for seq, (txn_date, core) in enumerate(rec["core"])]
+            events.sort(key=lambda e: (e[0], e[1], e[2]))
+            bucket = by_key.get((sec_id, folio_id))
+            if bucket is None:
+                self.buckets.append(
+                    _LiveBucket(sec_id=sec_id, folio_id=folio_id, security=sec, events=events)
+                )
+            else:
+                bucket.events, bucket.cursor = events, 0
+
+    def advance(self, upto: date) -> None:
+        for bucket in self.buckets:
+            bucket.advance(upto)
+
+    def positions(self) -> dict[int, list]:
+        """``{security_id: [django_security, units, invested_inr]}`` at the current date."""
+        agg: dict[int, list] = {}
+        for bucket in self.buckets:
+            if not bucket.started:
+                continue  # ledger-managed folio, but nothing acquired yet as-of date
+            if bucket.broken:
+                units, invested = bucket.net, _ZERO
+            else:
+                units, invested = bucket.fifo.balance, bucket.fifo.invested
+            slot = agg.setdefault(bucket.sec_id, [bucket.security, _ZERO, _ZERO])
+            slot[1] += units
+            slot[2] += invested
+        return agg
+
+
+def _sweep_positions(
+    txn_keys: dict, samples: list[date], reductions: dict[str, list] | None = None
+):
+    """Yield ``(sample, agg)`` per ascending sample date, ``agg`` being exactly what
+    :func:`_positions_asof` returns for that date (ledger buckets only) — from one
+    ordered pass instead of a full FIFO replay per date.
+
+    Each (security, folio) bucket keeps one live ``FIFOUnits`` and is fed only the
+    rows (and demerger reductions) dated since the previous sample, so a daily series
+    costs O(transactions + samples x buckets), not O(samples x transactions). Rows
+    replay in the same order as ``apply_fifo`` (stable by date, a reduction ahead of
+    that day's rows), so units/invested are identical to the per-date replay. A bucket
+    that over-sells drops to net units with zero cost from that row on — the same
+    fallback ``_positions_asof`` takes for every date past the bad row.
+    """
+    sweep = _PositionSweep(txn_keys, reductions)
+    for sample in samples:
+        sweep.advance(sample)
+        yield sample, sweep.positions()
+
 
+def _price_points(positions, nav_idx: PriceIndex, samples: list[date]) -> list[dict]:
+    """Price each ``(sample, agg)`` of ledger positions (one per ``samples`` date, in
+    order) into a series point. A security's prices over the whole grid come from one
+    vectorised lookup the first time it's held, not a bisect per sample."""
     points: list[dict] = []
-    for sample in _sample_dates(from_, to, granularity):
-        # Ledger-only: snapshot holdings are today-only (headline), not historical trend.
-        agg = _positions_asof(txn_keys, {}, sample)
+    prices: dict[int, list] = {}
+    for i, (sample, agg) in enumerate(positions):
         value = _ZERO
         invested = _ZERO
         stale = False
@@ -1277,7 +1458,10 @@ def _value_series(investors: list[Investor], from_: date, to: date, granularity:
             if units <= _ZERO:
                 continue
             invested += inv_amt
-            price = _price_at(nav_idx, sec_id, sample)
+            grid = prices.get(sec_id)
+            if grid is None:
+                grid = prices[sec_id] = nav_idx.prices_at(sec_id, samples)
+            price = grid[i]
             if price is None:
                 stale = True  # held but unpriced — flag the point, don't drop it
                 continue
@@ -1288,6 +1472,19 @@ def _value_series(investors: list[Investor], from_: date, to: date, granularity:
     return points
 
 
+def _series_points(txn_keys: dict, nav_idx: PriceIndex, samples: list[date]) -> list[dict]:
+    """Price the swept ledger positions at each sample date (ledger-only: snapshot
+    holdings are today-only headline figures, not historical trend)."""
+    return _price_points(_sweep_positions(txn_keys, samples), nav_idx, samples)
+
+
+def _value_series(investors: list[Investor], from_: date, to: date, granularity: str) -> list[dict]:
+    txn_keys, _hold_keys = _ledger_index(investors)
+    sec_ids = {k[0] for k in txn_keys}
+    nav_idx = _nav_index(sec_ids, to)
+    return _series_points(txn_keys, nav_idx, _sample_dates(from_, to, granularity))
+
+
 def security_value_series(
     investor: Investor, security, *, to: date, granularity: str = "monthly"
 ) -> tuple[date, list[dict]]:
@@ -1297,30 +1494,12 @@ def security_value_series(
     first acquisition to ``to``. Computed live from the ledger (no per-security persisted
     series). Returns ``(start, points)``; ``points`` is ``[{date, value_inr, invested_inr,
     stale}]`` (``stale`` flags a sample held but unpriced)."""
-    txn_keys, _hold = _ledger_index([investor])
-    txn_keys = {k: v for k, v in txn_keys.items() if k[0] == security.id}
+    txn_keys, _hold = _security_ledger(investor, security, compute_ledger(investor, security))
     if not txn_keys:
         return to, []
     start = min(d for rec in txn_keys.values() for (d, _core) in rec["core"])
     nav_idx = _nav_index({security.id}, to)
-    points: list[dict] = []
-    for sample in _sample_dates(start, to, granularity):
-        agg = _positions_asof(txn_keys, {}, sample)
-        value = invested = _ZERO
-        stale = False
-        for sec_id, (_sec, units, inv_amt) in agg.items():
-            if units <= _ZERO:
-                continue
-            invested += inv_amt
-            price = _price_at(nav_idx, sec_id, sample)
-            if price is None:
-                stale = True
-                continue
-            value += units * price
-        points.append(
-            {"date": sample, "value_inr": value, "invested_inr": invested, "stale": stale}
-        )
-    return start, points
+    return start, _series_points(txn_keys, nav_idx, _sample_dates(start, to, granularity))
 
 
 def default_series_start(to: date) -> date:
@@ -1428,7 +1607,9 @@ def family_value_series(
     return _series_from_stored(member_ids, from_, to, granularity)
 
 
-def compute_portfolio_xirr(investors: list[Investor], as_of: date) -> float | None:
+def compute_portfolio_xirr(
+    investors: list[Investor], as_of: date, ctx: PortfolioContext | None = None
+) -> float | None:
     """Annualized XIRR over the whole ledger's cashflows + terminal ledger value.
 
     Cashflows are every ledger transaction (buys/transfers-in invest capital,
@@ -1440,25 +1621,17 @@ def compute_portfolio_xirr(investors: list[Investor], as_of: date) -> float | No
     Returns the rate as a fraction (``0.1849`` = 18.49%) or ``None`` when there's
     nothing to solve.
     """
-    txn_keys, _hold_keys = _ledger_index(investors)
-    flows: list[tuple[date, Decimal]] = []
-    for rec in txn_keys.values():
-        for txn_date, ttype, cash in rec["cash"]:
-            if ttype in _BUY_TYPES:
-                flows.append((txn_date, cash))  # capital invested (positive in)
-            elif ttype in _SELL_TYPES:
-                flows.append((txn_date, -cash))  # capital returned
-            elif ttype == TransactionType.DIVIDEND.value and cash:
-                flows.append((txn_date, -cash))  # cash dividend paid out
+    ctx = ctx or PortfolioContext.load(investors, as_of)
+    txn_keys = ctx.txn_keys
+    flows = _portfolio_cashflows(txn_keys)
     if not flows:
         return None
 
-    nav_idx = _nav_index({k[0] for k in txn_keys}, as_of)
     terminal = _ZERO
     for sec_id, (_sec, units, _inv) in _positions_asof(txn_keys, {}, as_of).items():
         if units <= _ZERO:
             continue
-        price = _price_at(nav_idx, sec_id, as_of)
+        price = ctx.nav_idx.price_at(sec_id, as_of)
         if price is not None:
             terminal += units * price
 
@@ -1479,44 +1652,59 @@ _RETURN_WINDOWS: tuple[tuple[str, int], ...] = (
 )
 
 
-def _value_at(txn_keys: dict, nav_idx: dict, when: date) -> Decimal:
-    """Priced value of the ledger-backed positions as-of ``when`` (snapshots excluded,
-    matching the lifetime XIRR terminal). Unpriced held units contribute nothing."""
-    total = _ZERO
-    for sec_id, (_sec, units, _inv) in _positions_asof(txn_keys, {}, when).items():
-        if units <= _ZERO:
-            continue
-        price = _price_at(nav_idx, sec_id, when)
-        if price is not None:
-            total += units * price
-    return total
-
-
-def _windowed_xirr(
-    txn_keys: dict, nav_idx: dict, start: date, as_of: date, terminal: Decimal
-) -> float | None:
-    """Money-weighted XIRR over ``(start, as_of]``: the portfolio value at ``start`` is
-    the opening capital, the window's cashflows follow, and ``terminal`` (value now)
-    is the closing inflow. Same-``start`` positions are folded into the opening value,
-    so a trade dated exactly ``start`` isn't double-counted."""
+def _portfolio_cashflows(txn_keys: dict) -> list[tuple[date, Decimal]]:
+    """Every ledger ``(date, invested_amount)`` row across the portfolio, in the sign
+    :func:`cashflows_from_transactions` takes (positive = capital invested)."""
     flows: list[tuple[date, Decimal]] = []
-    opening = _value_at(txn_keys, nav_idx, start)
-    if opening > _ZERO:
-        flows.append((start, opening))  # opening value = capital "invested" at window start
     for rec in txn_keys.values():
         for txn_date, ttype, cash in rec["cash"]:
-            if not (start < txn_date <= as_of):
-                continue
             if ttype in _BUY_TYPES:
                 flows.append((txn_date, cash))  # capital invested (positive in)
             elif ttype in _SELL_TYPES:
                 flows.append((txn_date, -cash))  # capital returned
             elif ttype == TransactionType.DIVIDEND.value and cash:
                 flows.append((txn_date, -cash))  # cash dividend paid out
-    if not flows:
-        return None
-    cashflows = cashflows_from_transactions(flows, present_date=as_of, present_value=terminal)
-    return compute_xirr(cashflows)
+    return flows
+
+
+def _windowed_xirrs(
+    txn_keys: dict, nav_idx: PriceIndex, starts: list[date], as_of: date
+) -> list[float | None]:
+    """Money-weighted XIRR over ``(start, as_of]`` for each of ``starts``, in order.
+
+    Per window the portfolio value at ``start`` is the opening capital, the window's
+    cashflows follow, and the value at ``as_of`` is the closing inflow; a trade dated
+    exactly ``start`` is folded into the opening value, not double-counted. ``None``
+    when a window holds nothing. Values are ledger-only (snapshots excluded, matching
+    the lifetime XIRR terminal); unpriced held units contribute nothing.
+
+    One shared state serves every window: the cashflows are netted per day and
+    sorted once (a window is a bisected slice of them), the positions at every window
+    start and ``as_of`` come from one FIFO sweep, and all windows solve in one batch.
+    Another window costs a slice and a solve, not a ledger rescan and FIFO replay.
+    """
+    flows = sorted(_portfolio_cashflows(txn_keys), key=lambda row: row[0])
+    daily = [
+        (when, sum((amount for _, amount in group), _ZERO))
+        for when, group in groupby(flows, key=lambda row: row[0])
+    ]
+    days = [when for when, _net in daily]
+
+    samples = sorted({*starts, as_of})
+    priced = _price_points(_sweep_positions(txn_keys, samples), nav_idx, samples)
+    value = {point["date"]: point["value_inr"] for point in priced}
+    terminal = value[as_of]
+    hi = bisect_right(days, as_of)
+
+    windows: list[list[CashFlow]] = []
+    for start in starts:
+        lo = bisect_right(days, start)
+        cashflows = [CashFlow(date=start, amount=-value[start])] if value[start] > _ZERO else []
+        cashflows += [CashFlow(date=when, amount=-net) for when, net in daily[lo:hi]]
+        if cashflows:
+            cashflows.append(CashFlow(date=as_of, amount=terminal))
+        windows.append(cashflows)
+    return compute_xirr_many(windows)
 
 
 def _period_return(label: str, start: date, as_of: date, rate: float) -> dict:
@@ -1529,30 +1717,34 @@ def _period_return(label: str, start: date, as_of: date, rate: float) -> dict:
     return {"period": label, "annualized": rate, "absolute": absolute, "days": days}
 
 
-def compute_portfolio_period_returns(investors: list[Investor], as_of: date) -> list[dict]:
+def compute_portfolio_period_returns(
+    investors: list[Investor], as_of: date, ctx: PortfolioContext | None = None
+) -> list[dict]:
     """Trailing money-weighted returns over the standard windows plus lifetime.
 
-    Each window is an independent windowed XIRR (see :func:`_windowed_xirr`). Windows
-    that predate the portfolio's first transaction are omitted; "All" always uses the
-    full ledger (its opening value is zero, so it equals the lifetime XIRR)."""
-    txn_keys, _hold_keys = _ledger_index(investors)
+    Each window is an independent windowed XIRR, all computed from one shared pass
+    (see :func:`_windowed_xirrs`). Windows that predate the portfolio's first
+    transaction are omitted; "All" always uses the full ledger (its opening value is
+    zero, so it equals the lifetime XIRR)."""
+    ctx = ctx or PortfolioContext.load(investors, as_of)
+    txn_keys = ctx.txn_keys
     if not txn_keys:
         return []
     inception = min(txn_date for rec in txn_keys.values() for (txn_date, _t, _c) in rec["cash"])
-    sec_ids = {k[0] for k in txn_keys}
-    nav_idx = _nav_index(sec_ids, as_of)
-    terminal = _value_at(txn_keys, nav_idx, as_of)
 
-    out: list[dict] = []
+    # (label, reported start, window start)
+    windows: list[tuple[str, date, date]] = []
     for label, months in _RETURN_WINDOWS:
         start = _add_months(as_of, -months)
         if start < inception:
             continue  # portfolio younger than the window — don't invent it
-        rate = _windowed_xirr(txn_keys, nav_idx, start, as_of, terminal)
-        if rate is not None:
-            out.append(_period_return(label, start, as_of, rate))
+        windows.append((label, start, start))
     # Lifetime: a day before inception so the first day's trades fall inside the window.
-    all_rate = _windowed_xirr(txn_keys, nav_idx, inception - timedelta(days=1), as_of, terminal)
-    if all_rate is not None:
-        out.append(_period_return("All", inception, as_of, all_rate))
-    return out
+    windows.append(("All", inception, inception - timedelta(days=1)))
+
+    rates = _windowed_xirrs(txn_keys, ctx.nav_idx, [w for _l, _s, w in windows], as_of)
+    return [
+        _period_return(label, start, as_of, rate)
+        for (label, start, _w), rate in zip(windows, rates, strict=True)
+        if rate is not None
+    ]
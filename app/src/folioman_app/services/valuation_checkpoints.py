@@ -0,0 +1,197 @@
+"""Persisted FIFO checkpoints: resume the day-wise recompute mid-history.
+
+The 6-hourly revalue pass re-queues every ready investor to recompute the last day or
+two, yet a cold recompute loads the whole projected ledger and replays FIFO from the
+first transaction. A :class:`FIFOCheckpoint` stores every (security, folio) bucket's
+open lots as of a date ``C``; the next recompute loads only the rows after ``C``,
+seeds the sweep with the stored lots and continues — O(holdings + new rows), not
+O(ledger).
+
+Resuming is exact, not approximate: the result is byte-identical to a full replay.
+That holds when
+
+* the ledger is the one the checkpoint was built from — ``ledger_fingerprint``
+  summarises the cost-basis rows, applied corporate actions and the securities/folios
+  they map to, and any import, apply or remap changes it (the mutating paths also
+  drop the checkpoint outright); and
+* every applied corporate action is on/before ``C``. Those only touch rows up to
+  their ex-date (or rebase rows one by one, for a merger), so projecting the tail
+  alone gives the tail of the full projection. A split/merger/bonus/rights/buyback
+  also re-sorts the projection; when only demergers/dividends are recorded, the full
+  projection may keep raw order where the tail alone would not, so no resume.
+
+Anything else falls back to the full replay, which then writes a fresh checkpoint.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db.models import Count, Max, Q, Sum
+from folioman_core.corporate_action_subject import CorpActionType
+from folioman_core.fifo import FIFOUnits
+
+from folioman_app.models import AppliedCorporateAction, FIFOCheckpoint, Investor, Security
+from folioman_app.services.valuation import (
+    _ledger_index,
+    _LiveBucket,
+    _nav_index,
+    _PositionSweep,
+    _price_points,
+    _sample_dates,
+)
+
+# Checkpoint this far behind the recompute end: late corporate actions and back-dated
+# trades cluster near today, and one landing after ``C`` would make it unusable.
+_CHECKPOINT_LAG = timedelta(days=7)
+
+# Kinds whose apply always re-sorts the projection (see the module docstring).
+_SORTING_KINDS = frozenset(
+    k.value
+    for k in (
+        CorpActionType.SPLIT,
+        CorpActionType.MERGER,
+        CorpActionType.BONUS,
+        CorpActionType.RIGHTS,
+        CorpActionType.BUYBACK,
+    )
+)
+
+
+def ledger_fingerprint(investor: Investor) -> str:
+    """A digest of everything the projected ledger is built from — changes whenever a
+    cost-basis row or applied corporate action is added, edited, removed or remapped."""
+    txns = investor.transactions.cost_basis().aggregate(
+        n=Count("id"),
+        last=Max("id"),
+        touched=Max("updated_at"),
+        secs=Sum("security_id"),
+        folios=Sum("folio_id"),
+    )
+    events = AppliedCorporateAction.objects.filter(investor=investor).aggregate(
+        n=Count("id"), last=Max("id"), touched=Max("updated_at")
+    )
+    acquirers = AppliedCorporateAction.objects.filter(investor=investor).values(
+        "counterparty_security_id"
+    )
+    identities = sorted(
+        Security.objects.filter(Q(transactions__investor=investor) | Q(pk__in=acquirers))
+        .values_list("id", "isin", "amfi_code", "symbol", "name")
+        .distinct()
+    )
+    folios = sorted(investor.folios.values_list("id", "number"))
+    parts = (sorted(txns.items()), sorted(events.items()), identities, folios)
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def invalidate_checkpoints(investor: Investor) -> None:
+    """Drop the investor's checkpoint — call from any path that rewrites the ledger."""
+    FIFOCheckpoint.objects.filter(investor=investor).delete()
+
+
+def _resumable_at(events: list[tuple[str, date]], as_of: date) -> bool:
+    if any(ex_date > as_of for _kind, ex_date in events):
+        return False
+    return not events or any(kind in _SORTING_KINDS for kind, _ex in events)
+
+
+def _encode(bucket: _LiveBucket) -> dict:
+    balance, invested, average, pnl, lots = bucket.fifo.lot_state()
+    return {
+        "security": bucket.sec_id,
+        "folio": bucket.folio_id,
+        "net": str(bucket.net),
+        "broken": bucket.broken,
+        "fifo": [
+            str(balance),
+            str(invested),
+            str(average),
+            str(pnl),
+            [[str(u), str(cost), acq.isoformat(), str(stamp)] for u, cost, acq, stamp in lots],
+        ],
+    }
+
+
+def _decode(rows: list[dict]) -> list[_LiveBucket] | None:
+    """The stored buckets as live sweep state, or ``None`` if a security is gone."""
+    securities = Security.objects.in_bulk({row["security"] for row in rows})
+    buckets: list[_LiveBucket] = []
+    for row in rows:
+        security = securities.get(row["security"])
+        if security is None:
+            return None
+        balance, invested, average, pnl, lots = row["fifo"]
+        fifo = FIFOUnits.from_lot_state(
+            (
+                Decimal(balance),
+                Decimal(invested),
+                Decimal(average),
+                Decimal(pnl),
+                [
+                    (Decimal(u), Decimal(cost), date.fromisoformat(acq), Decimal(stamp))
+                    for u, cost, acq, stamp in lots
+                ],
+            )
+        )
+        buckets.append(
+            _LiveBucket(
+                sec_id=row["security"],
+                folio_id=row["folio"],
+                security=security,
+                events=[],
+                fifo=fifo,
+                started=True,
+                broken=row["broken"],
+                net=Decimal(row["net"]),
+            )
+        )
+    return buckets
+
+
+def checkpointed_value_series(investor: Investor, from_: date, to: date) -> list[dict]:
+    """The investor's daily series over ``[from_, to]`` — exactly what
+    ``_value_series([investor], from_, to, "daily")`` returns — resumed from the stored
+    checkpoint when one is usable, and leaving a fresh checkpoint ``_CHECKPOINT_LAG``
+    behind ``to`` for the next run."""
+    from_ = min(from_, to)
+    fingerprint = ledger_fingerprint(investor)
+    events = list(
+        AppliedCorporateAction.objects.filter(investor=investor).values_list("kind", "ex_date")
+    )
+    checkpoint = FIFOCheckpoint.objects.filter(
+        investor=investor, ledger_fingerprint=fingerprint, as_of__lte=from_
+    ).first()
+    seeded = None
+    if checkpoint is not None and _resumable_at(events, checkpoint.as_of):
+        seeded = _decode(checkpoint.buckets)
+    resume_from = checkpoint.as_of if seeded is not None else None
+
+    txn_keys, _hold_keys = _ledger_index([investor], after=resume_from)
+    sweep = _PositionSweep(txn_keys, seeded=seeded)
+    nav_idx = _nav_index({b.sec_id for b in sweep.buckets}, to)
+
+    save_at: date | None = to - _CHECKPOINT_LAG
+    if (resume_from is not None and save_at <= resume_from) or not _resumable_at(events, save_at):
+        save_at = None
+    snapshot: list[dict] | None = None
+
+    samples = _sample_dates(from_, to, "daily")
+
+    def positions():
+        nonlocal snapshot
+        for sample in samples:
+            if save_at is not None and snapshot is None and save_at < sample:
+                sweep.advance(save_at)
+                snapshot = [_encode(b) for b in sweep.buckets if b.started]
+            sweep.advance(sample)
+            yield sample, sweep.positions()
+
+    points = _price_points(positions(), nav_idx, samples)
+    if snapshot is not None:
+        FIFOCheckpoint.objects.update_or_create(
+            investor=investor,
+            defaults={"as_of": save_at, "ledger_fingerprint": fingerprint, "buckets": snapshot},
+        )
+    return points
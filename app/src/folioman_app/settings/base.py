@@ -82,6 +82,43 @@ DEMO_MODE = env.bool("FOLIOMAN_DEMO", False)
 # Env override (FOLIOMAN_RUN_SCHEDULER=1) for a dev runserver that wants it inline.
 FOLIOMAN_RUN_SCHEDULER = env.bool("FOLIOMAN_RUN_SCHEDULER", False)
 
+# Valuation worker pool (tasks/valuation_jobs.py). 0 keeps the serial pending tick;
+# N > 0 on Postgres makes each tick claim due investors under a lease and recompute
+# them across N processes, so several `run_scheduler` / `valuation_tick_pending`
+# processes (on any number of hosts) share one work-list. A claim left by a crashed
+# worker lapses after FOLIOMAN_VALUATION_LEASE_SECONDS. SQLite always runs serial.
+FOLIOMAN_VALUATION_WORKERS = env.int("FOLIOMAN_VALUATION_WORKERS", 0)
+FOLIOMAN_VALUATION_LEASE_SECONDS = env.int("FOLIOMAN_VALUATION_LEASE_SECONDS", 900)
+
+# Background import threads per process (services/imports.py). 0 runs an upload's
+# persist + reconcile inline in the request (dev/tests); N > 0 queues it and the
+# upload returns the PENDING job for the client to poll. desktop.py / server.py
+# turn it on.
+FOLIOMAN_IMPORT_WORKERS = env.int("FOLIOMAN_IMPORT_WORKERS", 0)
+# A PENDING/RUNNING import not heard from for this long is failed as interrupted (its
+# process restarted or died) — at launch and when jobs are read. The owning process
+# heartbeats its live jobs every quarter of this window.
+FOLIOMAN_IMPORT_STALE_SECONDS = env.int("FOLIOMAN_IMPORT_STALE_SECONDS", 3600)
+
+# Processes in each web process's shared CAS parse pool (tasks/import_cas_batch.py),
+# which every batch upload parses its PDFs across; 0 = one per CPU. Parsing is
+# CPU-bound and per-file independent.
+FOLIOMAN_CAS_PARSE_WORKERS = env.int("FOLIOMAN_CAS_PARSE_WORKERS", 0)
+
+# Process-wide NAV-history cache (services/nav_cache.py): the LRU holds at most
+# FOLIOMAN_NAV_CACHE_SIZE securities' full series (~12 bytes a point, so 512 ten-year
+# daily funds ≈ 16 MB); 0 turns it off. Writers in this process invalidate it on
+# write; the TTL bounds how long a write from *another* process (a manage.py command,
+# the server's scheduler) can go unseen. FOLIOMAN_NAV_CACHE_ALIAS names a CACHES
+# alias to share one copy across processes instead (server.py wires one up).
+FOLIOMAN_NAV_CACHE_SIZE = env.int("FOLIOMAN_NAV_CACHE_SIZE", 512)
+FOLIOMAN_NAV_CACHE_TTL = env.int("FOLIOMAN_NAV_CACHE_TTL", 300)
+FOLIOMAN_NAV_CACHE_ALIAS = ""
+
+# Django's own default, spelled out so a mode can add aliases (server.py's "nav")
+# without replacing it.
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
 # Dev / test logging: console only, so a bare `manage.py runserver` (the dev
 # loop) actually shows scheduler + valuation job logs. desktop.py / server.py
 # override this with their rotating-file configs.
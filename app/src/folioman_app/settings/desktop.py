@@ -42,6 +42,10 @@ FOLIOMAN_API_AUTH = "local"
 # and the request thread share the DB.
 FOLIOMAN_RUN_SCHEDULER = True
 
+# One background import thread: an upload returns at once and the window stays
+# responsive, while SQLite's single writer still sees one import at a time.
+FOLIOMAN_IMPORT_WORKERS = env.int("FOLIOMAN_IMPORT_WORKERS", 1)
+
 # Inherit base's SQLite engine + WAL/busy-timeout OPTIONS (the shared _sqlite.py
 # config that lets the request thread and the in-process scheduler thread share the
 # file without "database is locked"); only the file location moves to the data dir.
@@ -43,6 +43,10 @@ DATABASES = {
 # explicitly tries to weaken it — server mode must never be "local".
 FOLIOMAN_API_AUTH = env.str("FOLIOMAN_API_AUTH", "jwt")
 
+# Imports run on background threads so a large CAS doesn't hold a gthread worker
+# for the whole persist + reconcile; the client polls the job.
+FOLIOMAN_IMPORT_WORKERS = env.int("FOLIOMAN_IMPORT_WORKERS", 2)
+
 # --- Fail-closed startup guards --------------------------------------------
 # These run at settings-import time, which gunicorn does on boot — so they are a
 # *guaranteed* hard failure, unlike a `manage.py check` that a deploy might skip.
@@ -86,6 +90,28 @@ FOLIOMAN_SETUP_TOKEN = env.str("FOLIOMAN_SETUP_TOKEN", "")
 _isin_db = env.str("FOLIOMAN_ISIN_DB", "")
 FOLIOMAN_ISIN_DB_PATH = Path(_isin_db) if _isin_db else None
 
+# Shared NAV-history cache. Each gunicorn worker (and the separate scheduler
+# process) otherwise keeps its own LRU, sees another process's NAV writes only after
+# FOLIOMAN_NAV_CACHE_TTL, and loads the same series once per worker. Point
+# FOLIOMAN_NAV_CACHE_LOCATION at a memcached (the default backend; its pymemcache
+# client ships with the server extra) or set FOLIOMAN_NAV_CACHE_BACKEND to e.g.
+# django.core.cache.backends.redis.RedisCache (install redis) to share one copy whose
+# invalidations every process sees. Only the "nav" alias is added; "default" stays.
+_nav_cache_location = env.str("FOLIOMAN_NAV_CACHE_LOCATION", "")
+if _nav_cache_location:
+    CACHES = {
+        **CACHES,
+        "nav": {
+            "BACKEND": env.str(
+                "FOLIOMAN_NAV_CACHE_BACKEND",
+                "django.core.cache.backends.memcached.PyMemcacheCache",
+            ),
+            "LOCATION": _nav_cache_location,
+            "TIMEOUT": FOLIOMAN_NAV_CACHE_TTL,
+        },
+    }
+    FOLIOMAN_NAV_CACHE_ALIAS = "nav"
+
 # Console always (so `docker logs` captures output); plus a rotating file when
 # FOLIOMAN_LOG_DIR is set (e.g. a mounted volume). No telemetry, ever.
 _log_dir = env.str("FOLIOMAN_LOG_DIR", "")
@@ -1,7 +1,8 @@
 """MF CAS (CAMS/KFin) import: PDF -> core parser -> ORM, then reconcile.
 
-Registered as the ``cas_pdf`` import processor (run synchronously by the import job).
-Persistence is atomic; reconcile runs per affected security after commit.
+Registered as the ``cas_pdf`` import processor (run by the import job, inline or on
+a background import thread). Persistence is atomic; reconcile runs per affected
+security after commit.
 
 Idempotent re-import: each transaction's ``dedup_key`` is a content hash
 (security identity + folio + date + type + units + nav + amount). Re-uploading
@@ -27,8 +28,9 @@ from folioman_core.parser import _HISTORY_TOLERANCE, scheme_history_gap
 
 from folioman_app.mappers import to_core_transaction
 from folioman_app.models import Folio, Holding, ImportJob, PartialBlock, Security, Transaction
-from folioman_app.models.jobs import ImportKind
-from folioman_app.services.imports import register_processor
+from folioman_app.models.jobs import ImportKind, ImportStage
+from folioman_app.services.imports import register_processor, report_stage
+from folioman_app.services.ledger_version import bump_ledger_version
 from folioman_app.tasks._upsert import upsert_folio, upsert_security
 from folioman_app.tasks.import_ecas import persist_ecas_statement
 from folioman_app.tasks.reconcile import reconcile_after_import
@@ -101,6 +103,7 @@ def _resolve_partial_block(investor, pb: PartialBlock) -> bool:
     ):
         return False
     flagged.update(cost_basis_complete=True)
+    bump_ledger_version(investor.id)
     # The block's closing snapshot is now redundant — the complete ledger supersedes
     # it. Dropping it makes B→A land in the same state as A→B (ledger-only, not a
     # ledger-plus-snapshot "reconciled"): a single converged full history.
@@ -354,6 +357,7 @@ def persist_mf_statement(investor, statement: MfCasStatement, *, source_ref: str
         summary["quarantined"] = quarantined
     # Reconcile per affected security after the import commits. A reconcile
     # failure does not lose the committed data — it is surfaced as a warning.
+    report_stage(ImportStage.RECONCILE)
     errors = reconcile_after_import(investor, securities_by_id.values())
     if errors:
         summary["reconcile_errors"] = errors
@@ -397,6 +401,7 @@ def process_cas(
     """
     if parsed is None:
         parsed = read_cas(io.BytesIO(content), password)
+        report_stage(ImportStage.PERSIST)
     if parsed.is_ecas:
         summary = persist_ecas_statement(
             job.investor, parsed.ecas, source_ref=job.source_ref, confirm=confirm
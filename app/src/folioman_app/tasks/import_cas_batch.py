@@ -0,0 +1,151 @@
+"""Batch CAS import: parse many statements across processes, persist per investor.
+
+Onboarding a family means a stack of CAS/eCAS PDFs. Parsing is the CPU-bound part
+and each file is independent, so ``import_cas_batch`` parses them across a process
+pool (``FOLIOMAN_CAS_PARSE_WORKERS``; 0 = one per CPU) — wall time approaches the
+slowest file rather than the sum. The children only run ``folioman_core``'s
+``read_cas``; nothing Django crosses the process boundary but the parsed statement.
+The pool is one per process, spawned on first use (see ``folioman_app._spawn``) and
+shared by every later batch, so concurrent uploads never run more parsers than it
+holds and no request pays a pool's start-up.
+
+Each parsed statement then resolves its investor by PAN (``resolve_or_create_investor``,
+race-free) and gets its own ``ImportJob``. Persistence is ordered per investor, oldest
+statement first — ``persist_mf_statement`` chains a statement onto the ledger as of
+its start date — and goes through ``submit_import_jobs``, so it runs inline or on the
+background import threads like a single upload. A file that won't parse (wrong
+password, not a CAS, no PAN) gets no job and is reported with its reason; the rest of
+the batch still imports.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import io
+import os
+import threading
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+from django.conf import settings
+from folioman_core.cas_reader import ParsedCas, read_cas
+from folioman_core.parser import CASParseError, CASPasswordError
+
+from folioman_app._spawn import spawn_pool
+from folioman_app.models import ImportJob
+from folioman_app.models.jobs import ImportKind, ImportStage
+from folioman_app.services.imports import submit_import_jobs
+
+_NO_PAN_MSG = "This statement has no PAN, so we can't tell whose it is."
+
+_pool: Executor | None = None
+_pool_lock = threading.Lock()
+
+
+@dataclass(slots=True)
+class BatchFile:
+    """One uploaded statement: its name, raw bytes and PDF password."""
+
+    name: str
+    content: bytes
+    password: str = ""
+
+
+def _parse_pool(workers: int) -> Executor:
+    """The process's parse pool, spawned with ``workers`` processes on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = spawn_pool(workers)
+        return _pool
+
+
+def _discard_parse_pool(pool: Executor) -> None:
+    """Drop a broken pool (a child died mid-parse) so the next batch spawns afresh."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def _parse_error(exc: Exception) -> str:
+    """The user-facing reason a file didn't parse (the parser's messages are PII-free)."""
+    if isinstance(exc, CASPasswordError):
+        return "Incorrect password for this statement."
+    if isinstance(exc, CASParseError):
+        return str(exc)
+    return "Could not read this statement."
+
+
+def parse_statements(files: list[BatchFile], *, workers: int = 0) -> list[ParsedCas | str]:
+    """Parse every file, in parallel when there's more than one; returns, per file,
+    the parsed statement or the reason it couldn't be read. ``workers`` sizes the
+    shared pool only when this call is the one that spawns it."""
+    workers = workers or settings.FOLIOMAN_CAS_PARSE_WORKERS or os.cpu_count() or 1
+    out: list[ParsedCas | str] = []
+    if min(workers, len(files)) <= 1:
+        for f in files:
+            try:
+                out.append(read_cas(io.BytesIO(f.content), f.password))
+            except Exception as exc:
+                out.append(_parse_error(exc))
+        return out
+    pool = _parse_pool(workers)
+    futures = [pool.submit(read_cas, io.BytesIO(f.content), f.password) for f in files]
+    for future in futures:
+        try:
+            out.append(future.result())
+        except BrokenProcessPool as exc:
+            _discard_parse_pool(pool)
+            out.append(_parse_error(exc))
+        except Exception as exc:
+            out.append(_parse_error(exc))
+    return out
+
+
+def _statement_date(parsed: ParsedCas) -> dt.date:
+    """Where a statement sits on its investor's timeline: an MF CAS by the period it
+    opens (what it must chain onto), an eCAS by its snapshot date."""
+    if parsed.is_ecas:
+        return parsed.ecas.statement_date
+    return parsed.mf.statement_from or parsed.mf.statement_to or dt.date.min
+
+
+def import_cas_batch(user, files: list[BatchFile], *, workers: int = 0) -> dict:
+    """Parse ``files`` in parallel, then import each under its PAN's investor.
+
+    Returns the aggregate report: one entry per file (in upload order) with its
+    investor, job and outcome, plus totals by job status. Jobs already finished
+    (inline imports) carry their final status; queued ones read ``pending``."""
+    from folioman_app.api.auth import resolve_or_create_investor
+
+    entries: list[dict] = []
+    by_investor: dict[int, list[tuple[dt.date, ImportJob, dict]]] = {}
+    for f, parsed in zip(files, parse_statements(files, workers=workers), strict=True):
+        entry = {"filename": f.name, "investor_id": None, "investor_name": "", "job_id": None}
+        entries.append(entry)
+        if isinstance(parsed, str) or not parsed.investor.pan:
+            reason = parsed if isinstance(parsed, str) else _NO_PAN_MSG
+            entry.update(status="failed", stage="parse", error=reason)
+            continue
+        investor, _created = resolve_or_create_investor(user, parsed.investor)
+        job = ImportJob.objects.create(
+            investor=investor, kind=ImportKind.CAS, filename=f.name, stage=ImportStage.PERSIST
+        )
+        entry.update(investor_id=investor.id, investor_name=investor.name, job_id=job.id)
+        run = {"content": f.content, "password": f.password, "parsed": parsed}
+        by_investor.setdefault(investor.id, []).append((_statement_date(parsed), job, run))
+
+    jobs: dict[int, ImportJob] = {}
+    for runs in by_investor.values():
+        runs.sort(key=lambda r: (r[0], r[1].id))
+        for job in submit_import_jobs([(job, run) for _date, job, run in runs]):
+            jobs[job.id] = job
+    totals: dict[str, int] = {}
+    for entry in entries:
+        if (job := jobs.get(entry["job_id"])) is not None:
+            entry.update(status=job.status, stage=job.stage, error=job.error)
+        totals[entry["status"]] = totals.get(entry["status"], 0) + 1
+    return {"files": entries, "investors": len(by_investor), "totals": totals}
@@ -51,9 +51,11 @@ from folioman_app.models import (
     Security,
     Transaction,
 )
-from folioman_app.models.jobs import ImportKind
+from folioman_app.models.jobs import ImportKind, ImportStage
 from folioman_app.services.equity_identity import resolve_equity_identity
-from folioman_app.services.imports import register_processor
+from folioman_app.services.imports import register_processor, report_stage
+from folioman_app.services.ledger_version import bump_ledger_version
+from folioman_app.services.positions import refresh_positions
 from folioman_app.tasks._upsert import upsert_folio, upsert_security
 from folioman_app.tasks.reconcile import reconcile_after_import, reconcile_security_folio
 
@@ -358,7 +360,8 @@ def _reconcile_cost_basis_completeness(investor, security: Security) -> list[dic
             pass
         else:
             # Solvent: ensure the bucket is complete and clear any stale partial block.
-            bucket.filter(cost_basis_complete=False).update(cost_basis_complete=True)
+            if bucket.filter(cost_basis_complete=False).update(cost_basis_complete=True):
+                bump_ledger_version(investor.id)
             PartialBlock.objects.filter(
                 investor=investor, security=security, folio_id=folio_id
             ).delete()
@@ -367,7 +370,8 @@ def _reconcile_cost_basis_completeness(investor, security: Security) -> list[dic
         # Underflow: the whole bucket's cost basis is unusable (the unseen earlier
         # buys would, by FIFO, be the first lots consumed). Flag every row and
         # record the overhang so a later earlier-period import can upgrade it.
-        bucket.filter(cost_basis_complete=True).update(cost_basis_complete=False)
+        if bucket.filter(cost_basis_complete=True).update(cost_basis_complete=False):
+            bump_ledger_version(investor.id)
         overhang, net = _fifo_overhang(cores)
         statement_from = bucket.order_by("date").values_list("date", flat=True).first()
         PartialBlock.objects.update_or_create(
@@ -402,6 +406,7 @@ def process_csv(
     if not reader.fieldnames:
         msg = "CSV has no header row"
         raise ValueError(msg)
+    report_stage(ImportStage.PERSIST)
 
     summary: dict = {"rows": 0, "created": 0, "skipped": 0, "errors": []}
     affected: dict[int, Security] = {}
@@ -480,6 +485,7 @@ def process_csv(
     if warnings:
         summary["post_import_warnings"] = warnings
 
+    report_stage(ImportStage.RECONCILE)
     errors = reconcile_after_import(job.investor, affected.values())
     if errors:
         summary["reconcile_errors"] = errors
@@ -521,8 +527,11 @@ def _manual_core_folio(data: dict) -> CoreFolio:
     )
 
 
+@db_transaction.atomic
 def create_manual_transaction(investor, data: dict) -> Transaction:
-    """Create a single hand-entered transaction (no dedup). Raises on bad input."""
+    """Create a single hand-entered transaction (no dedup). Raises on bad input.
+
+    One transaction with the reconcile and the investor's positions rebuild."""
     metadata = {k: data[k] for k in ("coin_id", "principal") if data.get(k)}
     security = upsert_security(
         _core_security(
@@ -553,6 +562,7 @@ def create_manual_transaction(investor, data: dict) -> Transaction:
         narration=data.get("narration") or "",
     )
     reconcile_security_folio(investor, security, folio)
+    refresh_positions(investor)
     return txn
 
 
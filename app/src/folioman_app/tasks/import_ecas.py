@@ -32,6 +32,9 @@ from folioman_app.models import (
     Security,
     SecurityIntegrityStatus,
 )
+from folioman_app.models.jobs import ImportStage
+from folioman_app.services.imports import report_stage
+from folioman_app.services.ledger_version import bump_ledger_version
 from folioman_app.tasks._upsert import upsert_folio, upsert_security
 from folioman_app.tasks.reconcile import reconcile_after_import
 
@@ -79,6 +82,7 @@ def _repoint_folio(investor, src: Folio, target: Folio) -> set[int]:
     sec_ids = set(investor.transactions.filter(folio=src).values_list("security_id", flat=True))
     investor.transactions.filter(folio=src).update(folio=target)
     investor.holdings.filter(folio=src).update(folio=target)
+    bump_ledger_version(investor.id)
     for pb in PartialBlock.objects.filter(investor=investor, folio=src):
         # (investor, security, folio) is unique; if the target already has a block
         # for this security the moved one is redundant — drop it.
@@ -294,6 +298,7 @@ def persist_ecas_statement(
     # a re-pointed ledger reconciles against its newly-matched eCAS holding.
     affected_ids = set(securities_by_id) | removed_security_ids | repointed_ids
     affected = list(Security.objects.filter(id__in=affected_ids))
+    report_stage(ImportStage.RECONCILE)
     errors = reconcile_after_import(investor, affected)
     if errors:
         summary["reconcile_errors"] = errors
@@ -0,0 +1,30 @@
+"""Scheduler-neutral entrypoint for recovering import jobs a restart stranded.
+
+Same contract as ``valuation_ticks``: a thin, exception-contained wrapper any
+trigger can call — the in-process APScheduler (desktop) or the ``run_scheduler``
+process (server), once on launch. No ``apscheduler`` import, so it stays usable
+from a bare ``manage.py`` process and the pure-Python desktop build.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+def run_stale_import_recovery_tick() -> int:
+    """Launch: fail the PENDING/RUNNING import jobs the last process left behind
+    (see ``services.imports.recover_stale_jobs``). Returns how many were failed."""
+    from folioman_app.services.imports import recover_stale_jobs
+
+    close_old_connections()
+    try:
+        return recover_stale_jobs()
+    except Exception:
+        logger.exception("stale import recovery failed")
+        return 0
+    finally:
+        close_old_connections()
@@ -7,14 +7,26 @@ consumes only its own folio's lots. Delegates the per-folio comparison to
 ``SecurityIntegrityStatus`` row per (investor, security, folio). A prior
 USER_ACKNOWLEDGED mismatch is preserved across re-reconciles. The integrity
 router builds list/acknowledge endpoints on top of this.
+
+Two entry shapes share the per-bucket logic (:func:`_reconciled_fields`): the
+targeted :func:`reconcile_security_folio` / :func:`reconcile_security`, which
+query their bucket's inputs, and :func:`recompute_investor`, which loads the whole
+investor's tables once, projects each folio in one corporate-action replay and
+bulk-upserts every status. :func:`reconcile_all_investors` runs that for every
+investor, optionally across a process pool with a resumable checkpoint.
 """
 
 from __future__ import annotations
 
 import logging
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import timedelta
 from decimal import Decimal
+from pathlib import Path
 
+from django.db import close_old_connections, connection
 from django.db.models import Q
 from django.utils import timezone
 from folioman_core.corporate_action_detect import (
@@ -34,22 +46,44 @@ from folioman_core.fifo import net_units_from_transactions
 from folioman_core.models import HoldingSource, SecurityType
 from folioman_core.reconciliation import TOLERANCE, IntegrityStatus, ReconciliationResult, reconcile
 
-from folioman_app.mappers import to_core_holding, to_core_security, to_core_transaction
+from folioman_app.mappers import (
+    SecurityMap,
+    to_core_holding,
+    to_core_security,
+    to_core_transaction,
+)
 from folioman_app.models import (
     AppliedCorporateAction,
     CorporateActionReference,
     Folio,
+    Holding,
     Investor,
     PartialBlock,
     Security,
     SecurityIntegrityStatus,
+    Transaction,
 )
 from folioman_app.services.dividends import attribute_dividends_for_security
-from folioman_app.services.projected_ledger import compute_ledger
+from folioman_app.services.projected_ledger import compute_ledger, project_by_security, security_key
 
 logger = logging.getLogger(__name__)
 
 _ZERO = Decimal("0")
+# Rows per INSERT … ON CONFLICT when the investor-wide pass writes its statuses.
+_UPSERT_BATCH = 500
+# The status columns a reconcile (re)writes; ``updated_at`` rides along on upsert.
+_STATUS_FIELDS = (
+    "status",
+    "tax_safe",
+    "units_from_transactions",
+    "units_from_holdings",
+    "issues",
+    "ledger_through",
+    "snapshot_as_of",
+    "last_reconciled_at",
+)
+# Investors handed to a ``reconcile_all --workers`` process per round trip.
+_POOL_CHUNK = 4
 
 
 def _incomplete_history_issue(partial: PartialBlock) -> dict:
@@ -77,6 +111,18 @@ def _annotate_incomplete_history(
     return result.model_copy(update={"tax_safe": False, "issues": issues})
 
 
+def _cached_action(row: CorporateActionReference) -> CachedCorporateAction:
+    return CachedCorporateAction(
+        ex_date=row.ex_date,
+        subject=row.subject,
+        parsed_type=row.parsed_type,
+        unit_multiplier=row.unit_multiplier,
+        needs_review=row.needs_review,
+        reference_id=row.id,
+        bonus_ratio=_parsed_ratio(row),
+    )
+
+
 def _cached_actions_for_security(security: Security) -> list[CachedCorporateAction]:
     """Load cached feed rows for ``security`` (ISIN-first, then symbol fallback)."""
     if security.security_type != SecurityType.EQUITY.value:
@@ -86,18 +132,37 @@ def _cached_actions_for_security(security: Security) -> list[CachedCorporateActi
         filt |= Q(isin=security.isin)
     rows: dict[int, CachedCorporateAction] = {}
     for row in CorporateActionReference.objects.filter(filt).distinct():
-        rows[row.id] = CachedCorporateAction(
-            ex_date=row.ex_date,
-            subject=row.subject,
-            parsed_type=row.parsed_type,
-            unit_multiplier=row.unit_multiplier,
-            needs_review=row.needs_review,
-            reference_id=row.id,
-            bonus_ratio=_parsed_ratio(row),
-        )
+        rows[row.id] = _cached_action(row)
     return list(rows.values())
 
 
+def _cached_actions_by_security(
+    securities: list[Security],
+) -> dict[int, list[CachedCorporateAction]]:
+    """:func:`_cached_actions_for_security` for many equities in one query."""
+    equities = [s for s in securities if s.security_type == SecurityType.EQUITY.value]
+    if not equities:
+        return {}
+    filt = Q(security__in=equities)
+    isins = {s.isin for s in equities if s.isin}
+    if isins:
+        filt |= Q(isin__in=isins)
+    by_security: dict[int, list[CorporateActionReference]] = defaultdict(list)
+    by_isin: dict[str, list[CorporateActionReference]] = defaultdict(list)
+    order: dict[int, int] = {}
+    for n, row in enumerate(CorporateActionReference.objects.filter(filt).distinct()):
+        order[row.id] = n
+        by_security[row.security_id].append(row)
+        by_isin[row.isin].append(row)
+    out: dict[int, list[CachedCorporateAction]] = {}
+    for security in equities:
+        rows = {row.id: row for row in by_security.get(security.id, ())}
+        if security.isin:
+            rows.update((row.id, row) for row in by_isin.get(security.isin, ()))
+        out[security.id] = [_cached_action(rows[i]) for i in sorted(rows, key=order.__getitem__)]
+    return out
+
+
 def _parsed_ratio(row: CorporateActionReference) -> tuple[int, int] | None:
     """The exact (a, b) bonus ratio the parser stored, if any."""
     raw = (row.parsed or {}).get("ratio")
@@ -187,6 +252,7 @@ def _annotate_corporate_actions(
     result: ReconciliationResult,
     *,
     security: Security,
+    cached_actions: list[CachedCorporateAction],
     incomplete_history: bool,
     txns: list,
     replay_source: list | None = None,
@@ -194,7 +260,6 @@ def _annotate_corporate_actions(
 ) -> ReconciliationResult:
     """Run the detection ruleset and merge issues into ``result``."""
     issues = strip_corporate_action_issues(result.issues)
-    cached_actions = _cached_actions_for_security(security)
     replay = None
     net = result.units_from_transactions
     holding = result.units_from_holdings
@@ -226,9 +291,8 @@ def _annotate_corporate_actions(
 def _annotate_opening_lot(
     result: ReconciliationResult,
     *,
-    investor: Investor,
     security: Security,
-    folio: Folio,
+    has_opening_lot: bool,
 ) -> ReconciliationResult:
     """Flag an eCAS-only equity that needs an opening lot, or mark that one is on file.
 
@@ -240,10 +304,6 @@ def _annotate_opening_lot(
     if security.security_type != SecurityType.EQUITY.value:
         return result
 
-    base_ref = f"opening-lot:{folio.id}:{security.id}"
-    has_opening_lot = investor.transactions.filter(
-        folio=folio, security=security, source_ref__startswith=base_ref
-    ).exists()
     if has_opening_lot:
         # An opening lot exists (any status) — surface it so it can be removed, and clear
         # any stale prompt. Dedup both opening-lot markers so a re-reconcile is idempotent.
@@ -280,38 +340,81 @@ def _annotate_opening_lot(
     return result.model_copy(update={"issues": issues})
 
 
-def reconcile_security_folio(
-    investor: Investor,
-    security: Security,
-    folio: Folio,
-    *,
-    acknowledge: bool = False,
-    clear_acknowledgement: bool = False,
-) -> SecurityIntegrityStatus | None:
-    """Reconcile one (investor, security, folio) and upsert its status.
+@dataclass(slots=True)
+class _Bucket:
+    """What reconciling one (investor, security, folio) reads. :func:`_load_bucket`
+    queries it; :func:`recompute_investor` slices it out of tables loaded once."""
 
-    ``acknowledge=True`` forces user-acknowledgement of a current mismatch (the
-    explicit "I accept this gap" action); a prior acknowledgement is preserved
-    on re-reconcile regardless. ``clear_acknowledgement=True`` undoes that — it
-    drops a prior acknowledgement so the row reverts to its real status (a
-    still-unresolved gap reappears as a mismatch). The two are mutually
-    exclusive; ``clear_acknowledgement`` wins if both are set.
-    """
-    # Cost-basis rows only: a partial-history folio has none here, so it reconciles
-    # as snapshot-only (its closing-balance holding vs an empty ledger) — never a
-    # spurious MISMATCH from partial units.
     # Cost-basis ledger with corporate actions applied in memory (split-scaled units,
     # merged lots, bonus shares) — read from the projection, never from rewritten rows.
-    txns = compute_ledger(investor, security, folio=folio)
-    holdings_qs = investor.holdings.filter(security=security, folio=folio)
+    txns: list
+    # Every stored row, partial history included (``security``/``folio`` selected):
+    # kept for display only — they date the ledger, never state a holding.
+    rows: list[Transaction]
+    holdings: list[Holding]
+    partial: PartialBlock | None
+    # Equity only: the corporate-action replay inputs.
+    applied_refs: set[str]
+    cached_actions: list[CachedCorporateAction]
+    # The projected whole-folio timeline (orphan rows kept); built only when needed.
+    replay_base: Callable[[], list]
+
+
+def _load_bucket(investor: Investor, security: Security, folio: Folio) -> _Bucket:
+    equity = security.security_type == SecurityType.EQUITY.value
+    applied_refs = (
+        set(
+            AppliedCorporateAction.objects.filter(investor=investor, security=security).values_list(
+                "source_ref", flat=True
+            )
+        )
+        if equity
+        else set()
+    )
+    return _Bucket(
+        # Cost-basis rows only: a partial-history folio has none here, so it
+        # reconciles as snapshot-only (its closing-balance holding vs an empty
+        # ledger) — never a spurious MISMATCH from partial units.
+        txns=compute_ledger(investor, security, folio=folio),
+        rows=list(
+            investor.transactions.filter(security=security, folio=folio).select_related(
+                "security", "folio"
+            )
+        ),
+        holdings=list(
+            investor.holdings.filter(security=security, folio=folio).select_related(
+                "security", "folio"
+            )
+        ),
+        partial=PartialBlock.objects.filter(
+            investor=investor, security=security, folio=folio
+        ).first(),
+        applied_refs=applied_refs,
+        cached_actions=_cached_actions_for_security(security),
+        replay_base=lambda: compute_ledger(
+            investor, security, folio=folio, include_incomplete=True
+        ),
+    )
+
+
+def _reconciled_fields(
+    security: Security,
+    folio: Folio,
+    bucket: _Bucket,
+    *,
+    user_acknowledged: bool,
+    interned: SecurityMap | None = None,
+) -> dict | None:
+    """Reconcile one bucket: its status row's field values, or ``None`` when the folio
+    has nothing to reconcile (any stale status should go)."""
+    txns = bucket.txns
     # A pure eCAS-only zero holding carries no position — e.g. a rights entitlement (a
     # transient line) that lapsed or was exercised, now reported as 0. Drop it so it
     # doesn't surface as a snapshot-only row begging a (0-unit) opening lot. A zero
     # holding alongside transactions is kept (a fully-exited ledger still reconciles
     # net 0 against it).
-    if not investor.transactions.filter(security=security, folio=folio).exists():
-        holdings_qs = holdings_qs.filter(units__gt=0)
-    holdings = [to_core_holding(h) for h in holdings_qs.select_related("security", "folio")]
+    stored = bucket.holdings if bucket.rows else [h for h in bucket.holdings if h.units > 0]
+    holdings = [to_core_holding(h, interned) for h in stored]
     # A cas-pdf snapshot is the closing balance of a CAS scheme. Relative to a
     # ledger it's either stale or a fresh check, decided by date:
     #  - a snapshot at/before the ledger's latest transaction is a superseded
@@ -328,24 +431,10 @@ def reconcile_security_folio(
             if not (h.source is HoldingSource.CAS_PDF and h.as_of_date <= latest_txn)
         ]
 
-    existing = SecurityIntegrityStatus.objects.filter(
-        investor=investor, security=security, folio=folio
-    ).first()
-    already_acknowledged = bool(
-        existing and existing.status == IntegrityStatus.USER_ACKNOWLEDGED.value
-    )
-    user_acknowledged = False if clear_acknowledgement else (already_acknowledged or acknowledge)
-
-    partial = PartialBlock.objects.filter(investor=investor, security=security, folio=folio).first()
-    # Rows kept for display only (a partial bucket has no cost-basis txns above);
-    # used to date the ledger, not to state a holding.
-    display_txns = [
-        to_core_transaction(t) for t in investor.transactions.filter(security=security, folio=folio)
-    ]
-
+    partial = bucket.partial
     result = reconcile(txns or None, holdings or None, user_acknowledged=user_acknowledged)
 
-    if partial is not None and not txns and display_txns:
+    if partial is not None and not txns and bucket.rows:
         if result is None:
             result = ReconciliationResult(
                 status=IntegrityStatus.SNAPSHOT_ONLY,
@@ -368,59 +457,100 @@ def reconcile_security_folio(
         # Replay over the projected whole-folio timeline (applied events incl. a merger
         # replayed in, orphan rows kept) and tell it which cached events are already
         # applied — so the suggestion reflects today's real holding, not the raw rows.
-        replay_base = (
-            compute_ledger(investor, security, folio=folio, include_incomplete=True) or display_txns
-        )
-        applied_refs = set(
-            AppliedCorporateAction.objects.filter(investor=investor, security=security).values_list(
-                "source_ref", flat=True
-            )
-        )
+        replay_base = bucket.replay_base() or [
+            to_core_transaction(t, interned) for t in bucket.rows
+        ]
         result = _annotate_corporate_actions(
             result,
             security=security,
+            cached_actions=bucket.cached_actions,
             incomplete_history=incomplete_history,
             txns=txns,
             replay_source=replay_base,
-            applied_refs=applied_refs,
+            applied_refs=bucket.applied_refs,
         )
+        base_ref = f"opening-lot:{folio.id}:{security.id}"
         result = _annotate_opening_lot(
             result,
-            investor=investor,
             security=security,
-            folio=folio,
+            has_opening_lot=any(t.source_ref.startswith(base_ref) for t in bucket.rows),
         )
 
     if result is None:
-        # Nothing to reconcile in this folio — drop any stale status.
-        if existing:
-            existing.delete()
         return None
 
     # Temporal context for the comparison: how far each side's evidence reaches.
     ledger_through = max((t.date for t in txns), default=None)
-    if ledger_through is None and display_txns:
-        ledger_through = max(t.date for t in display_txns)
-    snapshot_as_of = max((h.as_of_date for h in holdings), default=None)
+    if ledger_through is None and bucket.rows:
+        ledger_through = max(t.date for t in bucket.rows)
+    return {
+        "status": result.status.value,
+        "tax_safe": result.tax_safe,
+        "units_from_transactions": result.units_from_transactions,
+        "units_from_holdings": result.units_from_holdings,
+        "issues": result.issues,
+        "ledger_through": ledger_through,
+        "snapshot_as_of": max((h.as_of_date for h in holdings), default=None),
+        "last_reconciled_at": timezone.now(),
+    }
+
+
+def reconcile_security_folio(
+    investor: Investor,
+    security: Security,
+    folio: Folio,
+    *,
+    acknowledge: bool = False,
+    clear_acknowledgement: bool = False,
+) -> SecurityIntegrityStatus | None:
+    """Reconcile one (investor, security, folio) and upsert its status.
+
+    ``acknowledge=True`` forces user-acknowledgement of a current mismatch (the
+    explicit "I accept this gap" action); a prior acknowledgement is preserved
+    on re-reconcile regardless. ``clear_acknowledgement=True`` undoes that — it
+    drops a prior acknowledgement so the row reverts to its real status (a
+    still-unresolved gap reappears as a mismatch). The two are mutually
+    exclusive; ``clear_acknowledgement`` wins if both are set.
+    """
+    existing = SecurityIntegrityStatus.objects.filter(
+        investor=investor, security=security, folio=folio
+    ).first()
+    already_acknowledged = bool(
+        existing and existing.status == IntegrityStatus.USER_ACKNOWLEDGED.value
+    )
+    user_acknowledged = False if clear_acknowledgement else (already_acknowledged or acknowledge)
+
+    fields = _reconciled_fields(
+        security,
+        folio,
+        _load_bucket(investor, security, folio),
+        user_acknowledged=user_acknowledged,
+    )
+    if fields is None:
+        # Nothing to reconcile in this folio — drop any stale status.
+        if existing:
+            existing.delete()
+        return None
 
     status, _ = SecurityIntegrityStatus.objects.update_or_create(
-        investor=investor,
-        security=security,
-        folio=folio,
-        defaults={
-            "status": result.status.value,
-            "tax_safe": result.tax_safe,
-            "units_from_transactions": result.units_from_transactions,
-            "units_from_holdings": result.units_from_holdings,
-            "issues": result.issues,
-            "ledger_through": ledger_through,
-            "snapshot_as_of": snapshot_as_of,
-            "last_reconciled_at": timezone.now(),
-        },
+        investor=investor, security=security, folio=folio, defaults=fields
     )
     return status
 
 
+def _attribute_dividends(investor: Investor, security: Security) -> None:
+    if security.security_type != SecurityType.EQUITY.value:
+        return
+    try:
+        attribute_dividends_for_security(investor, security)
+    except Exception:
+        logger.exception(
+            "dividend attribution failed for security %s (investor %s)",
+            security.id,
+            investor.id,
+        )
+
+
 def reconcile_security(investor: Investor, security: Security) -> list[SecurityIntegrityStatus]:
     """Reconcile every folio that holds this security; prune stale folio statuses."""
     folio_ids = set(
@@ -435,15 +565,7 @@ def reconcile_security(investor: Investor, security: Security) -> list[SecurityI
         if status is not None:
             statuses.append(status)
 
-    if security.security_type == SecurityType.EQUITY.value:
-        try:
-            attribute_dividends_for_security(investor, security)
-        except Exception:
-            logger.exception(
-                "dividend attribution failed for security %s (investor %s)",
-                security.id,
-                investor.id,
-            )
+    _attribute_dividends(investor, security)
 
     # Drop statuses for (security, folio) pairs that no longer have data.
     SecurityIntegrityStatus.objects.filter(investor=investor, security=security).exclude(
@@ -475,20 +597,187 @@ def reconcile_after_import(investor: Investor, securities) -> list[dict]:
 
 
 def recompute_investor(investor: Investor) -> list[SecurityIntegrityStatus]:
-    """Re-reconcile every security the investor has transactions or holdings for."""
-    security_ids = set(investor.transactions.values_list("security_id", flat=True))
-    security_ids |= set(investor.holdings.values_list("security_id", flat=True))
-    statuses: list[SecurityIntegrityStatus] = []
-    for security in Security.objects.filter(id__in=security_ids):
-        statuses.extend(reconcile_security(investor, security))
+    """Re-reconcile every security the investor has transactions or holdings for.
+
+    The same per-bucket reconcile as :func:`reconcile_security`, without its queries
+    per (security, folio): the transactions, snapshots, applied corporate actions,
+    partial blocks, cached feed rows and current statuses are each loaded once, each
+    folio's ledger is projected in one replay, and the statuses are written in one
+    batched upsert. (Dividend attribution still runs per equity — it writes rows.)
+    """
+    rows: dict[tuple[int, int], list[Transaction]] = defaultdict(list)
+    for txn in investor.transactions.select_related("security", "folio"):
+        if txn.folio_id is not None:
+            rows[txn.security_id, txn.folio_id].append(txn)
+    snapshots: dict[tuple[int, int], list[Holding]] = defaultdict(list)
+    for holding in investor.holdings.select_related("security", "folio"):
+        if holding.folio_id is not None:
+            snapshots[holding.security_id, holding.folio_id].append(holding)
+    keys = sorted(rows.keys() | snapshots.keys())
+    securities: dict[int, Security] = {}
+    folios: dict[int, Folio] = {}
+    for key in keys:
+        first = (rows.get(key) or snapshots[key])[0]
+        securities[first.security_id] = first.security
+        folios[first.folio_id] = first.folio
+
+    applied = list(
+        AppliedCorporateAction.objects.filter(investor=investor).select_related(
+            "security", "counterparty_security"
+        )
+    )
+    applied_refs: dict[int, set[str]] = defaultdict(set)
+    for aca in applied:
+        applied_refs[aca.security_id].add(aca.source_ref)
+    partials: dict[tuple[int, int], PartialBlock] = {}
+    for partial in PartialBlock.objects.filter(investor=investor):
+        partials.setdefault((partial.security_id, partial.folio_id), partial)
+    existing = {(s.security_id, s.folio_id): s for s in investor.integrity_statuses.all()}
+    cached = _cached_actions_by_security(list(securities.values()))
+
+    interned: SecurityMap = {}
+    projections: dict[tuple[int, bool], dict[str, list]] = {}
+
+    def projected(folio_id: int, *, include_incomplete: bool) -> dict[str, list]:
+        """One replay per folio (and per row set), shared by its securities."""
+        cache_key = (folio_id, include_incomplete)
+        if cache_key not in projections:
+            folio_rows = [
+                t
+                for (_sec, f), bucket_rows in rows.items()
+                if f == folio_id
+                for t in bucket_rows
+                if include_incomplete or t.cost_basis_complete
+            ]
+            folio_rows.sort(key=lambda t: (t.date, t.id))  # the table's default order
+            projections[cache_key] = project_by_security(
+                folio_rows, [a for a in applied if a.folio_id == folio_id], interned
+            )
+        return projections[cache_key]
+
+    upserts: list[SecurityIntegrityStatus] = []
+    stale: list[int] = []
+    for sec_id, folio_id in keys:
+        security, folio = securities[sec_id], folios[folio_id]
+        ident = security_key(security)
+        prior = existing.get((sec_id, folio_id))
+        bucket = _Bucket(
+            txns=projected(folio_id, include_incomplete=False).get(ident, []),
+            rows=rows.get((sec_id, folio_id), []),
+            holdings=snapshots.get((sec_id, folio_id), []),
+            partial=partials.get((sec_id, folio_id)),
+            applied_refs=applied_refs[sec_id],
+            cached_actions=cached.get(sec_id, []),
+            replay_base=lambda f=folio_id, i=ident: projected(f, include_incomplete=True).get(
+                i, []
+            ),
+        )
+        fields = _reconciled_fields(
+            security,
+            folio,
+            bucket,
+            user_acknowledged=bool(
+                prior and prior.status == IntegrityStatus.USER_ACKNOWLEDGED.value
+            ),
+            interned=interned,
+        )
+        if fields is None:
+            if prior is not None:
+                stale.append(prior.pk)
+            continue
+        upserts.append(
+            SecurityIntegrityStatus(investor=investor, security=security, folio=folio, **fields)
+        )
+    # Statuses of a security that still has data, for folios that no longer do.
+    live = set(keys)
+    stale += [s.pk for key, s in existing.items() if key[0] in securities and key not in live]
+
+    SecurityIntegrityStatus.objects.filter(pk__in=stale).delete()
+    statuses = SecurityIntegrityStatus.objects.bulk_create(
+        upserts,
+        batch_size=_UPSERT_BATCH,
+        update_conflicts=True,
+        unique_fields=["investor", "security", "folio"],
+        update_fields=[*_STATUS_FIELDS, "updated_at"],
+    )
+    for security in securities.values():
+        _attribute_dividends(investor, security)
     return statuses
 
 
-def reconcile_all_investors() -> dict:
-    """Recompute integrity for every investor (e.g. after a reconcile-logic change)."""
-    investors = 0
+def _single_writer() -> bool:
+    """SQLite serialises writers: a pool there would only queue on the database lock."""
+    return connection.vendor == "sqlite"
+
+
+def _reconcile_investor_id(investor_id: int) -> int:
+    """Pool task: one investor's :func:`recompute_investor`; returns its status count."""
+    try:
+        return len(recompute_investor(Investor.objects.get(pk=investor_id)))
+    finally:
+        close_old_connections()
+
+
+def _read_checkpoint(path: Path | None) -> set[int]:
+    if path is None or not path.exists():
+        return set()
+    return {int(line) for line in path.read_text().split() if line.isdigit()}
+
+
+def reconcile_all_investors(
+    *,
+    workers: int = 1,
+    checkpoint: Path | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> dict:
+    """Recompute integrity for every investor (e.g. after a reconcile-logic change).
+
+    Investors are independent, so ``workers`` > 1 spreads them over a process pool,
+    each worker on its own DB connections (serial on SQLite, one writer at a time).
+    ``checkpoint`` is a file of finished investor ids, appended as each completes: an
+    interrupted run resumes past them, and a run that finishes deletes it.
+    ``progress(done, total)`` reports each finished investor.
+    """
+    finished = _read_checkpoint(checkpoint)
+    pending = [
+        iid
+        for iid in Investor.objects.order_by("id").values_list("id", flat=True)
+        if iid not in finished
+    ]
+    total, done = len(finished) + len(pending), len(finished)
+    statuses = 0
+    log = checkpoint.open("a") if checkpoint is not None else None
+    try:
+        if workers > 1 and len(pending) > 1 and not _single_writer():
+            from folioman_app.tasks.valuation_jobs import worker_pool
+
+            with worker_pool(workers) as pool:
+                counts = pool.map(_reconcile_investor_id, pending, chunksize=_POOL_CHUNK)
+                results = zip(pending, counts, strict=True)
+                statuses, done = _collect(results, log, progress, done, total)
+        else:
+            results = (
+                (investor.id, len(recompute_investor(investor)))
+                for investor in Investor.objects.filter(id__in=pending).order_by("id")
+            )
+            statuses, done = _collect(results, log, progress, done, total)
+    finally:
+        if log is not None:
+            log.close()
+    if checkpoint is not None:
+        checkpoint.unlink(missing_ok=True)
+    return {"investors": len(pending), "statuses": statuses, "resumed": len(finished)}
+
+
+def _collect(results, log, progress, done: int, total: int) -> tuple[int, int]:
+    """Tally ``(investor_id, status_count)`` results as they land, checkpointing each."""
     statuses = 0
-    for investor in Investor.objects.all():
-        investors += 1
-        statuses += len(recompute_investor(investor))
-    return {"investors": investors, "statuses": statuses}
+    for investor_id, count in results:
+        statuses += count
+        done += 1
+        if log is not None:
+            log.write(f"{investor_id}\n")
+            log.flush()
+        if progress is not None:
+            progress(done, total)
+    return statuses, done
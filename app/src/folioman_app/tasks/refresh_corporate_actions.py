@@ -1,8 +1,14 @@
 """Refresh cached NSE/BSE corporate actions for equity securities.
 
-Fetches date-ranged corporate-action history (back to 2016 by default) via the
-shared exchange client and upserts into :class:`CorporateActionReference`.
-Run on demand (`manage.py refresh_corporate_actions`) or from the scheduler.
+Fetches date-ranged corporate-action history via the shared exchange client and
+upserts into :class:`CorporateActionReference`. Run on demand (`manage.py
+refresh_corporate_actions`) or from the scheduler.
+
+Incremental: each (security, exchange) resumes from its
+:class:`CorporateActionSyncMark` less ``_RESUME_OVERLAP`` days (late corrections,
+back-dated announcements), so the daily tick fetches a few weeks per equity rather
+than its whole history back to 2016. A never-synced exchange starts from 2016; a
+full re-scan is on demand (``--full``).
 """
 
 from __future__ import annotations
@@ -11,7 +17,7 @@ import logging
 import random
 import time
 from collections.abc import Iterable
-from datetime import date
+from datetime import date, timedelta
 from typing import TYPE_CHECKING
 
 from django.utils import timezone
@@ -25,7 +31,8 @@ from folioman_core.price_feeds.corporate_actions_fetch import (
 )
 from folioman_core.price_feeds.nse_bse_client import ExchangeClient
 
-from folioman_app.models import CorporateActionReference, Security
+from folioman_app._env import env
+from folioman_app.models import CorporateActionReference, CorporateActionSyncMark, Security
 
 if TYPE_CHECKING:
     from folioman_core.models.corporate_action import CorporateActionEvent
@@ -38,6 +45,10 @@ _REQUEST_SPACING = 1.0
 _REQUEST_JITTER = 0.5
 _SLEEP = time.sleep
 
+# Each resumed fetch re-reads this many days before the exchange's mark, so a
+# corporate action filed or corrected after we last fetched its dates is picked up.
+_RESUME_OVERLAP = timedelta(days=env.int("FOLIOMAN_CA_SYNC_OVERLAP_DAYS", 30))
+
 
 def _pace_symbols() -> None:
     _SLEEP(_REQUEST_SPACING + random.uniform(0.0, _REQUEST_JITTER))
@@ -127,45 +138,90 @@ def _upsert_event(security: Security, event: CorporateActionEvent) -> None:
         )
 
 
+def _feeds_for(security: Security) -> tuple[str, ...]:
+    """The exchanges an equity's actions come from, primary first: its own listing,
+    or NSE with BSE filling in BSE-only rows when the exchange is unknown."""
+    ex = (security.exchange or "").strip().upper()
+    return (ex,) if ex in ("NSE", "BSE") else ("NSE", "BSE")
+
+
+def _resume_from(mark: date | None) -> date:
+    earliest = corporate_actions_fetch.DEFAULT_EARLIEST
+    return earliest if mark is None else max(earliest, mark - _RESUME_OVERLAP)
+
+
 def sync_corporate_actions_for_security(
     security: Security,
     *,
     since: date | None = None,
+    full: bool = False,
     clients: _FeedClients | None = None,
 ) -> int:
-    """Fetch and cache corporate actions for one equity. Returns event count."""
+    """Fetch and cache corporate actions for one equity. Returns event count.
+
+    Each exchange resumes from its own sync mark; ``full`` ignores the marks, ``since``
+    overrides the start outright. A mark only advances when the window reached back to
+    it, and only for a feed that answered. A throttle from either exchange propagates,
+    so the batch stops instead of pressing on into a longer block.
+    """
     if security.security_type != SecurityType.EQUITY.value or not security.symbol:
         return 0
-    since = since or corporate_actions_fetch.DEFAULT_EARLIEST
+    feeds = _feeds_for(security)
+    marks = (
+        {}
+        if full
+        else dict(
+            CorporateActionSyncMark.objects.filter(security=security).values_list(
+                "exchange", "fetched_through"
+            )
+        )
+    )
+    resume = {ex: _resume_from(marks.get(ex)) for ex in feeds}
+    start = {ex: since or resume[ex] for ex in feeds}
     end = timezone.localdate()
     owned = clients is None
     if owned:
         clients = _FeedClients()
     try:
-        try:
-            events = corporate_actions_fetch.fetch_corporate_actions(
-                security.symbol,
-                exchange=security.exchange,
-                isin=security.isin,
-                start=since,
-                end=end,
-                nse=clients.nse,
-                bse=clients.bse,
-            )
-        except CorporateActionThrottled:
-            # A rate-limit block must abort the whole refresh, not be swallowed as
-            # "no actions" — let it propagate to the batch loop.
-            raise
-        except CorporateActionFetchError as exc:
-            logger.warning(
-                "corporate-action fetch failed for security %s (%s): %s",
-                security.id,
-                security.name,
-                exc,
-            )
-            return 0
+        fetched: dict[str, list[CorporateActionEvent]] = {}
+        for ex in feeds:
+            try:
+                fetched[ex] = corporate_actions_fetch.fetch_corporate_actions(
+                    security.symbol,
+                    exchange=ex,
+                    isin=security.isin,
+                    start=start[ex],
+                    end=end,
+                    nse=clients.nse,
+                    bse=clients.bse,
+                )
+            except CorporateActionThrottled:
+                # A rate-limit block on either exchange must abort the whole refresh,
+                # not be swallowed as "no actions" — let it propagate to the batch loop.
+                raise
+            except CorporateActionFetchError as exc:
+                if ex != feeds[0]:
+                    # BSE only fills in BSE-only rows here: carry on with NSE's, and
+                    # leave BSE's mark where it was so the next pass re-covers it.
+                    logger.info("BSE corporate actions unavailable for %s: %s", security.id, exc)
+                    continue
+                logger.warning(
+                    "corporate-action fetch failed for security %s (%s): %s",
+                    security.id,
+                    security.name,
+                    exc,
+                )
+                return 0
+        events = corporate_actions_fetch.merge_exchange_events(
+            fetched.get("NSE", []), fetched.get("BSE", [])
+        )
         for event in events:
             _upsert_event(security, event)
+        for ex in fetched:
+            if start[ex] <= resume[ex]:
+                CorporateActionSyncMark.objects.update_or_create(
+                    security=security, exchange=ex, defaults={"fetched_through": end}
+                )
         # Stamp the fetch (even on zero events) so the UI knows this equity's
         # corporate actions have been checked, not merely never looked up.
         Security.objects.filter(pk=security.pk).update(corporate_actions_synced_at=timezone.now())
@@ -180,8 +236,12 @@ def refresh_corporate_actions(
     securities: Iterable[Security] | None = None,
     since: date | None = None,
     symbol: str | None = None,
+    full: bool = False,
 ) -> dict:
-    """Refresh cached corporate actions for equities. Returns a summary dict."""
+    """Refresh cached corporate actions for equities. Returns a summary dict.
+
+    Incremental by default (see :func:`sync_corporate_actions_for_security`);
+    ``full`` re-scans every equity's whole history."""
     if securities is not None:
         qs = securities
     elif symbol:
@@ -203,7 +263,9 @@ def refresh_corporate_actions(
                 _pace_symbols()
             fetched = True
             try:
-                count = sync_corporate_actions_for_security(security, since=since, clients=clients)
+                count = sync_corporate_actions_for_security(
+                    security, since=since, full=full, clients=clients
+                )
             except CorporateActionThrottled as exc:
                 # Blocked by the exchange — stop the run rather than hammer the rest
                 # into a longer block. The unsynced securities retry next pass.
@@ -15,10 +15,13 @@ from __future__ import annotations
 
 import functools
 import logging
+import threading
 import time
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import date as date_cls
 from datetime import timedelta
+from itertools import islice
 from math import ceil
 
 from django.db import IntegrityError, transaction
@@ -39,6 +42,7 @@ from folioman_core.price_feeds.yfinance_feed import PriceFetchError
 
 from folioman_app._env import env
 from folioman_app.models import Holding, NAVHistory, Security, Transaction
+from folioman_app.services import feed_limits, nav_cache
 from folioman_app.services.trading_calendar import (
     completed_trading_day,
     last_trading_day,
@@ -58,7 +62,11 @@ _QUOTE_TYPES = {
 # Politeness: a small gap between consecutive feed calls so a batch refresh /
 # backfill doesn't hammer a free public API. Indirected through ``_SLEEP`` so
 # tests stub it; ``_REQUEST_SPACING`` is module-level so a caller can tune it.
+# The live tails of ``refresh_navs`` / ``fill_gaps`` don't sleep: they fetch
+# ``_FETCH_WORKERS`` securities at a time and each request waits on its host's
+# token bucket instead (``services.feed_limits``).
 _REQUEST_SPACING = 0.15  # seconds between live fetches
+_FETCH_WORKERS = env.int("FOLIOMAN_FEED_WORKERS", 8)
 # The stored series counts as reaching the span start if its earliest date is within
 # this of the first transaction/holding — the first trade may fall on a holiday a few
 # days before the first available close, so an exact match isn't required.
@@ -69,6 +77,10 @@ _QUOTE_LOOKBACK_DAYS = 10
 # How many trading days back to look for the most recent published bhavcopy — today's
 # isn't out until after the close, and a holiday run can sit a few days behind.
 _BHAVCOPY_LOOKBACK = 5
+# Latest points gathered per upsert statement. Flushing in batches keeps what a long
+# live-fetch tail has already priced if the pass dies partway, and stays well inside
+# SQLite's bound-parameter limit.
+_UPSERT_BATCH = 500
 _SLEEP = time.sleep
 
 
@@ -79,50 +91,48 @@ class _FeedClients:
     security, and ONE NSE cookie warm-up per pass instead of one per equity
     (the warm-up is itself a request — per-security warming is what hammers
     NSE). Lazy, so an MF-only pass never touches NSE and a quote-only pass
-    never connects to mfapi. The owning batch closes via :meth:`close`.
+    never connects to mfapi. Shared by the concurrent fetch stage, so each is
+    created once under a lock and throttled to its host's token bucket. The
+    owning batch closes via :meth:`close`.
     """
 
     def __init__(self):
-        self._mfapi = None
-        self._captnemo = None
-        self._nse = None
-        self._yahoo = None
-        self._amfi = None
+        self._clients: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, factory: Callable[[], object]):
+        with self._lock:
+            if name not in self._clients:
+                self._clients[name] = feed_limits.throttled(factory())
+            return self._clients[name]
 
     @property
     def amfi(self):
-        if self._amfi is None:
-            self._amfi = amfi_bulk.shared_client()
-        return self._amfi
+        return self._get("amfi", amfi_bulk.shared_client)
 
     @property
     def mfapi(self):
-        if self._mfapi is None:
-            self._mfapi = mfapi.shared_client()
-        return self._mfapi
+        return self._get("mfapi", mfapi.shared_client)
 
     @property
     def captnemo(self):
-        if self._captnemo is None:
-            self._captnemo = captnemo.shared_client()
-        return self._captnemo
+        return self._get("captnemo", captnemo.shared_client)
 
     @property
     def nse(self):
-        if self._nse is None:
-            self._nse = nse_history.warmed_client()
-        return self._nse
+        return self._get("nse", nse_history.warmed_client)
 
     @property
     def yahoo(self):
-        if self._yahoo is None:
-            self._yahoo = yfinance_feed.shared_client()
-        return self._yahoo
+        return self._get("yahoo", yfinance_feed.shared_client)
+
+    @property
+    def coingecko(self):
+        return self._get("coingecko", coingecko.shared_client)
 
     def close(self) -> None:
-        for client in (self._mfapi, self._captnemo, self._nse, self._yahoo, self._amfi):
-            if client is not None:
-                client.close()
+        for client in self._clients.values():
+            client.close()
 
 
 def _fetch_mf_latest(security: Security, clients: _FeedClients):
@@ -182,16 +192,18 @@ def _fetch_point(security: Security, clients: _FeedClients):
     if stype == SecurityType.CRYPTO.value:
         coin_id = (security.metadata or {}).get("coin_id")
         if coin_id:
-            quote = coingecko.fetch_quote(coin_id)
+            quote = coingecko.fetch_quote(coin_id, client=clients.coingecko)
             return (quote.as_of, quote.price, quote.source) if quote else None
     return None
 
 
-def _prime_bulk(clients: _FeedClients) -> tuple[dict, dict]:
+def _prime_bulk(clients: _FeedClients, wanted: set[str] | None = None) -> tuple[dict, dict]:
     """Fetch the day's whole-market snapshots once: AMFI NAVAll + NSE bhavcopy.
 
     Returns ``(mf_map, eq_map)`` of ``{id: (date, nav, source)}`` — MF keyed by
-    AMFI code or ISIN, equity by NSE symbol. Either map is empty on a feed outage,
+    AMFI code or ISIN, equity by NSE symbol. ``wanted`` (the refreshed funds' codes
+    and ISINs) keeps only those schemes out of NAVAll as it streams; an empty set
+    skips the AMFI fetch altogether. Either map is empty on a feed outage,
     so :func:`refresh_navs` transparently falls back to a per-security fetch. This
     is the whole point: one request for the entire MF universe and one for the
     entire cash market, instead of one per security every day.
@@ -199,10 +211,9 @@ def _prime_bulk(clients: _FeedClients) -> tuple[dict, dict]:
     mf_map: dict[str, tuple] = {}
     eq_map: dict[str, tuple] = {}
     try:
-        mf_map = {
-            key: (p.date, p.nav, "amfi")
-            for key, p in amfi_bulk.fetch_all_latest(client=clients.amfi).items()
-        }
+        if wanted is None or wanted:
+            navall = amfi_bulk.fetch_all_latest(client=clients.amfi, wanted=wanted)
+            mf_map = {key: (p.date, p.nav, "amfi") for key, p in navall.items()}
     except NAVFetchError as exc:
         logger.warning("AMFI bulk NAV unavailable — falling back per-scheme: %s", exc)
     try:
@@ -226,6 +237,47 @@ def _prime_bulk(clients: _FeedClients) -> tuple[dict, dict]:
     return mf_map, eq_map
 
 
+def _guarded_fetch(fetch: Callable, item) -> tuple:
+    """``(item, fetch(item), None)``, or ``(item, None, error)`` on a feed error."""
+    try:
+        return item, fetch(item), None
+    except (NAVFetchError, PriceFetchError) as exc:
+        return item, None, exc
+
+
+def _fetch_concurrently(items: list, fetch: Callable) -> list[tuple]:
+    """``fetch(item)`` for every item across ``_FETCH_WORKERS`` threads, as
+    ``[(item, result, error)]`` in input order — a feed error is returned, not raised,
+    so one bad security never sinks the batch. Fetches only: the caller writes, on its
+    own thread and DB connection."""
+    if len(items) <= 1 or _FETCH_WORKERS <= 1:
+        return [_guarded_fetch(fetch, item) for item in items]
+    with ThreadPoolExecutor(max_workers=_FETCH_WORKERS, thread_name_prefix="feed") as pool:
+        return list(pool.map(functools.partial(_guarded_fetch, fetch), items))
+
+
+def _fetch_as_completed(items: list, fetch: Callable) -> Iterator[tuple]:
+    """:func:`_fetch_concurrently` for large results: yields each ``(item, result,
+    error)`` as its fetch completes, with at most ``_FETCH_WORKERS`` in flight, so the
+    caller writes one result while the next ones download and never holds the batch."""
+    if len(items) <= 1 or _FETCH_WORKERS <= 1:
+        for item in items:
+            yield _guarded_fetch(fetch, item)
+        return
+    queued = iter(items)
+    with ThreadPoolExecutor(max_workers=_FETCH_WORKERS, thread_name_prefix="feed") as pool:
+
+        def submit(count: int) -> set[Future]:
+            return {pool.submit(_guarded_fetch, fetch, item) for item in islice(queued, count)}
+
+        running = submit(_FETCH_WORKERS)
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            running |= submit(len(done))
+            for future in done:
+                yield future.result()
+
+
 def _bulk_point(security: Security, mf_map: dict, eq_map: dict):
     """Today's (date, nav, source) from the pre-fetched bulk maps, or None."""
     stype = security.security_type
@@ -243,32 +295,60 @@ def _bulk_point(security: Security, mf_map: dict, eq_map: dict):
     return None
 
 
+def _upsert_points(points: dict[tuple[int, date_cls], NAVHistory]) -> None:
+    """Insert-or-update the gathered latest points on (security, date) in one statement.
+
+    ``bulk_create`` sends no ``post_save``, so the NAV cache is written through here,
+    point by point, as the signal would have done."""
+    if not points:
+        return
+    NAVHistory.objects.bulk_create(
+        list(points.values()),
+        update_conflicts=True,
+        unique_fields=["security", "date"],
+        update_fields=["nav", "source", "updated_at"],
+    )
+    for row in points.values():
+        nav_cache.record_point(row.security_id, row.date, row.nav)
+    points.clear()
+
+
 def refresh_navs(*, securities: Iterable[Security] | None = None) -> dict:
-    qs = Security.objects.all() if securities is None else securities
+    qs = list(Security.objects.all() if securities is None else securities)
     summary = {"updated": 0, "skipped": 0, "errors": 0}
     clients = _FeedClients()
-    live_fetched = False
+    # Keyed on the conflict target: a security listed twice keeps its last point, as
+    # the per-row update_or_create did (one statement can't touch a row twice).
+    pending: dict[tuple[int, date_cls], NAVHistory] = {}
     try:
-        mf_map, eq_map = _prime_bulk(clients)
+        wanted = {
+            key
+            for security in qs
+            if security.security_type == SecurityType.MF.value
+            for key in (security.amfi_code, security.isin)
+            if key
+        }
+        mf_map, eq_map = _prime_bulk(clients, wanted)
+        hits, tail = [], []
         for security in qs:
             point = _bulk_point(security, mf_map, eq_map)
             if point is None:
-                # No bulk hit (foreign equity, crypto, a delisted symbol, or a bulk
-                # outage) → fetch this one live, spacing only the live calls.
-                if live_fetched:
-                    _SLEEP(_REQUEST_SPACING)
-                live_fetched = True
-                try:
-                    point = _fetch_point(security, clients)
-                except (NAVFetchError, PriceFetchError) as exc:
-                    logger.warning(
-                        "NAV refresh failed for security %s (%s): %s",
-                        security.id,
-                        security.name,
-                        exc,
-                    )
-                    summary["errors"] += 1
-                    continue
+                tail.append(security)
+            else:
+                hits.append((security, point, None))
+        # No bulk hit (foreign equity, crypto, a delisted symbol, or a bulk outage) →
+        # fetch these live, concurrently, each feed paced by its host's bucket.
+        fetched = _fetch_concurrently(tail, lambda security: _fetch_point(security, clients))
+        for security, point, error in hits + fetched:
+            if error is not None:
+                logger.warning(
+                    "NAV refresh failed for security %s (%s): %s",
+                    security.id,
+                    security.name,
+                    error,
+                )
+                summary["errors"] += 1
+                continue
             if point is None:
                 logger.debug(
                     "NAV refresh: no feed for security %s (%s)", security.id, security.name
@@ -276,10 +356,13 @@ def refresh_navs(*, securities: Iterable[Security] | None = None) -> dict:
                 summary["skipped"] += 1  # no feed for this type, or no data
                 continue
             on, nav, source = point
-            NAVHistory.objects.update_or_create(
-                security=security, date=on, defaults={"nav": nav, "source": source}
+            pending[(security.id, on)] = NAVHistory(
+                security=security, date=on, nav=nav, source=source
             )
             summary["updated"] += 1
+            if len(pending) >= _UPSERT_BATCH:
+                _upsert_points(pending)
+        _upsert_points(pending)
     finally:
         clients.close()
     return summary
@@ -304,8 +387,8 @@ def _fetch_mf_history(security, *, since, mfapi_client, captnemo_client):
     Backfill pulls the whole series in one call, so captnemo leads — it serves the
     full history always (no /latest), is edge-cached and fast, and is oldest-first
     already. mfapi backstops a captnemo outage and covers a fund we only know by
-    AMFI code. When mfapi backfills a fund whose ISIN we don't yet store, its meta
-    carries one — persist it so captnemo can lead next time.
+    AMFI code (its meta may carry the ISIN — see :func:`_adopt_isin`). Network only,
+    so the concurrent fetch stage can run it off the DB thread.
 
     Returns ``(history, source)`` or ``None`` when the fund has no usable id."""
     if security.isin:
@@ -323,26 +406,52 @@ def _fetch_mf_history(security, *, since, mfapi_client, captnemo_client):
             )
     if security.amfi_code:
         history = mfapi.fetch_nav_history(security.amfi_code, since=since, client=mfapi_client)
-        if history.isin and not security.isin:
-            security.isin = history.isin
-            try:
-                with transaction.atomic():
-                    security.save(update_fields=["isin", "updated_at"])
-            except IntegrityError:
-                # The ISIN is already claimed by another security row — leave this
-                # one AMFI-keyed rather than failing the backfill. Not fatal: mfapi
-                # still served the history we're about to write.
-                security.isin = ""
-                logger.warning(
-                    "security %s (%s): ISIN %s already in use; staying AMFI-keyed",
-                    security.id,
-                    security.name,
-                    history.isin,
-                )
         return history, "mfapi"
     return None
 
 
+def _adopt_isin(security: Security, history) -> None:
+    """When mfapi backfilled a fund whose ISIN we don't yet store, its meta carries
+    one — persist it so captnemo can lead next time."""
+    if not history.isin or security.isin:
+        return
+    security.isin = history.isin
+    try:
+        with transaction.atomic():
+            security.save(update_fields=["isin", "updated_at"])
+    except IntegrityError:
+        # The ISIN is already claimed by another security row — leave this one
+        # AMFI-keyed rather than failing the backfill. Not fatal: mfapi still served
+        # the history we're about to write.
+        security.isin = ""
+        logger.warning(
+            "security %s (%s): ISIN %s already in use; staying AMFI-keyed",
+            security.id,
+            security.name,
+            history.isin,
+        )
+
+
+def _store_history(security: Security, fetched) -> int:
+    """Insert a fetched ``(history, source)``'s points not already stored. Returns the
+    number written (0 for ``None``)."""
+    if fetched is None:
+        return 0
+    history, source = fetched
+    if source == "mfapi":
+        _adopt_isin(security, history)
+    existing = set(NAVHistory.objects.filter(security=security).values_list("date", flat=True))
+    to_create = [
+        NAVHistory(security=security, date=point.date, nav=point.nav, source=source)
+        for point in history.points
+        if point.date not in existing
+    ]
+    NAVHistory.objects.bulk_create(to_create)
+    if to_create:
+        nav_cache.invalidate([security.id])
+    return len(to_create)
+
+
 def backfill_nav_history(
     security: Security,
     *,
@@ -360,17 +469,7 @@ def backfill_nav_history(
     fetched = _fetch_mf_history(
         security, since=since, mfapi_client=mfapi_client, captnemo_client=captnemo_client
     )
-    if fetched is None:
-        return 0
-    history, source = fetched
-    existing = set(NAVHistory.objects.filter(security=security).values_list("date", flat=True))
-    to_create = [
-        NAVHistory(security=security, date=point.date, nav=point.nav, source=source)
-        for point in history.points
-        if point.date not in existing
-    ]
-    NAVHistory.objects.bulk_create(to_create)
-    return len(to_create)
+    return _store_history(security, fetched)
 
 
 def _fetch_equity_history(
@@ -411,27 +510,40 @@ def backfill_equity_history(
     MFs, so equity closes flow into valuation through the same path."""
     if security.security_type not in _QUOTE_TYPES or not security.symbol:
         return 0
-    history, source = _fetch_equity_history(
+    fetched = _fetch_equity_history(
         security, since=since, nse_client=nse_client, yahoo_client=yahoo_client
     )
-    existing = set(NAVHistory.objects.filter(security=security).values_list("date", flat=True))
-    to_create = [
-        NAVHistory(security=security, date=point.date, nav=point.nav, source=source)
-        for point in history.points
-        if point.date not in existing
-    ]
-    NAVHistory.objects.bulk_create(to_create)
-    return len(to_create)
+    return _store_history(security, fetched)
+
+
+def _fetch_history(security: Security, since: date_cls | None, clients: _FeedClients):
+    """``(history, source)`` from the security's history feed, or ``None`` when it has
+    none — the network half of :func:`backfill_nav_history` /
+    :func:`backfill_equity_history`."""
+    if security.security_type == SecurityType.MF.value:
+        return _fetch_mf_history(
+            security, since=since, mfapi_client=clients.mfapi, captnemo_client=clients.captnemo
+        )
+    if security.security_type in _QUOTE_TYPES and security.symbol:
+        return _fetch_equity_history(
+            security, since=since, nse_client=clients.nse, yahoo_client=clients.yahoo
+        )
+    return None
+
+
+def _store_prefetched(security: Security, *, since, fetched, error) -> int:
+    """A ``backfill_one`` for :func:`_run_backfill_one` over an already-fetched result."""
+    if error is not None:
+        raise error
+    return _store_history(security, fetched)
 
 
 # NSE security-wise history is fetched in ≤1-year chunks (see nse_history), so a
 # per-symbol backfill costs that many requests — the yardstick the bulk switch beats.
 _NSE_CHUNK_DAYS = 365
-# A fund that reaches back but is only this many trading days behind at the head is a
-# short catch-up: fill every such fund's gap with ONE AMFI range-report call instead
-# of a per-scheme call each. Beyond it (a longer absence / fresh import) per-scheme is
-# right — and the range file grows ~0.9 MB/day, so the window stays bounded.
-_MF_BULK_MAX_LAG = env.int("FOLIOMAN_MF_BULK_MAX_LAG", 14)
+# The AMFI range report serves every scheme's NAVs for at most ~90 days per request,
+# so a longer MF gap is tiled into windows of this many days.
+_AMFI_RANGE_DAYS = 90
 
 
 def _span_start(security: Security) -> date_cls | None:
@@ -580,6 +692,7 @@ def _bulk_backfill_equity(needing: list[tuple], cutoff: date_cls, summary: dict)
         client.close()
 
     NAVHistory.objects.bulk_create(to_create)
+    nav_cache.invalidate(written_ids)
     summary["securities"] += len(written_ids)
     summary["points"] += len(to_create)
     for sec_id in written_ids:  # data arrived → reopen a previously-dead code
@@ -590,56 +703,99 @@ def _bulk_backfill_equity(needing: list[tuple], cutoff: date_cls, summary: dict)
     return handled
 
 
+def _range_tiles(start: date_cls, end: date_cls) -> list[tuple[date_cls, date_cls]]:
+    """``[start, end]`` as consecutive windows of at most :data:`_AMFI_RANGE_DAYS`."""
+    tiles = []
+    while start <= end:
+        tile_end = min(start + timedelta(days=_AMFI_RANGE_DAYS - 1), end)
+        tiles.append((start, tile_end))
+        start = tile_end + timedelta(days=1)
+    return tiles
+
+
+def _plan_mf_ranges(windows: list[tuple], cutoff: date_cls) -> list[tuple]:
+    """The funds worth filling from ranged reports, out of ``[(security, start)]``.
+
+    Every window ends at ``cutoff``, so the union of any set of them is one span from
+    the earliest start, costing one request per tile against one per fund on the
+    per-scheme feeds. Funds are taken shallowest-first and the prefix that saves the
+    most requests wins — a family of recent funds tiles together, while one fund
+    reaching back a decade is left per-scheme rather than dragging every tile with it.
+    Empty when no prefix saves a request (a single fund is one call either way)."""
+    ordered = sorted(windows, key=lambda window: window[1], reverse=True)
+    best, saving = 0, 0
+    for taken, (_security, start) in enumerate(ordered, start=1):
+        tiles = ceil(((cutoff - start).days + 1) / _AMFI_RANGE_DAYS)
+        if taken - tiles > saving:
+            best, saving = taken, taken - tiles
+    return ordered[:best]
+
+
 def _bulk_backfill_mf(needing: list[tuple], cutoff: date_cls, summary: dict) -> set[int]:
-    """AMFI range-report bulk-backfill for MF funds that only lag at the head.
-
-    A fund that reaches back and is behind by ≤ :data:`_MF_BULK_MAX_LAG` trading days
-    is a short catch-up: one range-report call (all schemes over the union head span)
-    fills every such fund, instead of a per-scheme captnemo call each. Returns the ids
-    it covered (found in the report); ``set()`` when fewer than two funds qualify (a
-    single fund is one call either way) so they fall to per-scheme."""
-    eligible: list[tuple] = []
-    for security, _since, latest, reaches_back in needing:
-        if security.security_type != SecurityType.MF.value or latest is None or not reaches_back:
-            continue  # fresh / deep hole → per-scheme (one call serves its full history)
-        if 0 < trading_days_between(latest, cutoff) <= _MF_BULK_MAX_LAG:
-            eligible.append((security, latest))
-    if len(eligible) < 2:
+    """AMFI range-report bulk-backfill for MF funds missing NAVs up to ``cutoff``.
+
+    Plans which funds share ranged reports (:func:`_plan_mf_ranges` — first imports
+    included), tiles their union span into ≤90-day ``fetch_range`` calls oldest-first,
+    and after each tile bulk-inserts only the (security, date) rows not already stored.
+    Returns the ids the reports covered; a fund absent from every report, or every
+    planned fund when a tile fails, is left to the per-scheme feeds (which skip what
+    the earlier tiles wrote)."""
+    windows = [
+        (security, fetch_start)
+        for security, fetch_start, _latest, _rb in needing
+        if security.security_type == SecurityType.MF.value and (security.amfi_code or security.isin)
+    ]
+    planned = _plan_mf_ranges(windows, cutoff)
+    if not planned:
         return set()
 
-    start = min(latest for _, latest in eligible) + timedelta(days=1)
+    start = min(fetch_start for _, fetch_start in planned)
+    tiles = _range_tiles(start, cutoff)
     logger.info(
-        "MF backfill: %d funds lag ≤%d trading days → one AMFI range report "
-        "(cheaper than per-scheme)",
-        len(eligible),
-        _MF_BULK_MAX_LAG,
+        "MF backfill: %d funds from %s → %d AMFI range report(s) (cheaper than per-scheme)",
+        len(planned),
+        start,
+        len(tiles),
     )
-    try:
-        history = amfi_bulk.fetch_range(start, cutoff)
-    except NAVFetchError as exc:
-        logger.warning("AMFI range report unavailable — falling back per-scheme: %s", exc)
-        return set()
+    existing: dict[int, set[date_cls]] = {security.id: set() for security, _ in planned}
+    for sec_id, day in NAVHistory.objects.filter(
+        security_id__in=existing, date__gte=start
+    ).values_list("security_id", "date"):
+        existing[sec_id].add(day)
 
+    wanted = {key for security, _ in planned for key in (security.amfi_code, security.isin) if key}
     handled: set[int] = set()
     written_ids: set[int] = set()
-    to_create: list[NAVHistory] = []
-    for security, latest in eligible:
-        points = history.get(security.amfi_code) or history.get(security.isin)
-        if points is None:
-            continue  # not in the report → leave it for the per-scheme feed
-        handled.add(security.id)
-        existing = set(NAVHistory.objects.filter(security=security).values_list("date", flat=True))
-        for p in points:
-            if latest < p.date <= cutoff and p.date not in existing:
-                to_create.append(
-                    NAVHistory(security=security, date=p.date, nav=p.nav, source="amfi")
-                )
-                existing.add(p.date)
-                written_ids.add(security.id)
+    points_written = 0
+    for lo, hi in tiles:
+        try:
+            history = amfi_bulk.fetch_range(lo, hi, wanted=wanted)
+        except NAVFetchError as exc:
+            logger.warning("AMFI range report unavailable — falling back per-scheme: %s", exc)
+            summary["points"] += points_written
+            return set()
+        to_create: list[NAVHistory] = []
+        tile_ids: set[int] = set()
+        for security, fetch_start in planned:
+            points = history.get(security.amfi_code) or history.get(security.isin)
+            if points is None:
+                continue  # not in this report → maybe a later tile, else per-scheme
+            handled.add(security.id)
+            seen = existing[security.id]
+            for p in points:
+                if max(lo, fetch_start) <= p.date <= hi and p.date not in seen:
+                    to_create.append(
+                        NAVHistory(security=security, date=p.date, nav=p.nav, source="amfi")
+                    )
+                    seen.add(p.date)
+                    tile_ids.add(security.id)
+        NAVHistory.objects.bulk_create(to_create, batch_size=_UPSERT_BATCH)
+        nav_cache.invalidate(tile_ids)
+        written_ids |= tile_ids
+        points_written += len(to_create)
 
-    NAVHistory.objects.bulk_create(to_create)
     summary["securities"] += len(written_ids)
-    summary["points"] += len(to_create)
+    summary["points"] += points_written
     return handled
 
 
@@ -762,21 +918,23 @@ def fill_gaps(securities: Iterable[Security] | None = None, *, force: bool = Fal
     secs = _priceable(securities)
     cutoff = completed_trading_day(timezone.localdate())
     summary = _empty_summary()
-    fetched = False
+    holed: list[tuple] = []
     for security in secs:
         start = _span_start(security) if force else _earliest_gap(security, cutoff)
         if start is None:
             summary["skipped"] += 1
             continue
         latest = NAVHistory.objects.filter(security=security).aggregate(d=Max("date"))["d"]
-        # Each fetcher opens its own pooled client (gaps are rare, so no batch warm-up).
-        one = (
-            backfill_nav_history
-            if security.security_type == SecurityType.MF.value
-            else backfill_equity_history
-        )
-        if fetched:
-            _SLEEP(_REQUEST_SPACING)
-        fetched = True
-        _run_backfill_one(security, start, latest, one, summary)
+        holed.append((security, start, latest))
+
+    # Fetch the holed series concurrently (paced per feed host) and write each on this
+    # thread as it lands: a full-span history is large, so only those in flight are held.
+    clients = _FeedClients()
+    try:
+        fetched = _fetch_as_completed(holed, lambda item: _fetch_history(item[0], item[1], clients))
+        for (security, start, latest), history, error in fetched:
+            one = functools.partial(_store_prefetched, fetched=history, error=error)
+            _run_backfill_one(security, start, latest, one, summary)
+    finally:
+        clients.close()
     return summary
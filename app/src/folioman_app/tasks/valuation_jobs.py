@@ -12,51 +12,54 @@ Transient feed failures (mfapi 502/SSL timeouts) leave the investor ``error`` wi
 ``next_attempt_at`` set; the next tick retries with backoff, capped at
 ``_MAX_ATTEMPTS`` (terminal until the daily tick or a re-import re-queues it).
 
-Scaling to distributed workers (deferred — do not build until a Postgres hosted
-deployment actually needs concurrent recompute)
-------------------------------------------------------------------------------
-Swapping the *clock* (APScheduler -> Celery Beat / OS cron / k8s CronJob) is cheap
-and already supported: external schedulers call the one-shot management commands
-(``valuation_tick_pending`` / ``valuation_tick_daily_extend``), which run the same
-ticks. **That alone does NOT make recompute safe to parallelise.** ``process_pending
-_valuations`` selects due investors with an unguarded ``SELECT`` then loops, so two
-workers would claim and recompute the same investor. Today a single in-thread tick
-(APScheduler ``max_instances=1`` + ``coalesce``) hides this; cron/k8s triggers do
-not bound overlap on their own. The real work to go distributed, in order:
-
-1. **Atomic claim.** Replace the unguarded select with a row-claim: Postgres
-   ``select_for_update(skip_locked=True)`` (or ``UPDATE ... RETURNING``) and lease
-   columns (e.g. ``valuation_claimed_by`` / ``valuation_claimed_until``) so each
-   due investor is owned by exactly one worker and abandoned leases expire.
-2. **Disambiguate status.** ``COMPUTING`` currently means both "queued" (set by
-   ``queue_recompute`` at import) and "running" (set at the top of
-   ``recompute_investor_valuation``). Split into queued vs running before fan-out.
-3. **Then fan out.** A tick claims N due investors; each worker runs
-   ``recompute_investor_valuation(investor_id, from_date)`` (already idempotent via
-   delete->=from_date + bulk_create). No ``Dispatcher``/broker abstraction is needed
-   until a concrete worker runtime exists.
-4. **SQLite/desktop stays serial** — ``skip_locked``/lease claiming is Postgres-only;
-   the desktop single-worker path is unchanged.
-
-Gotchas to carry into that work: cron/k8s lack ``max_instances`` (until the claim
-lands, add an advisory lock / ``flock``), and the daily tick's timezone moves
-outside Django config when scheduled by the OS rather than APScheduler.
+Worker pool (Postgres)
+----------------------
+``queue_recompute`` / ``enqueue_daily_extend`` leave an investor ``pending`` (queued);
+``computing`` means a worker holds it. With ``FOLIOMAN_VALUATION_WORKERS`` = N > 0 on
+a database with ``SKIP LOCKED`` (Postgres), a pending tick claims due investors in
+batches — ``select_for_update(skip_locked=True)`` plus a lease
+(``valuation_claimed_by`` / ``valuation_claimed_until``) — primes their NAVs once per
+batch and recomputes them across N processes. Any number of ticking processes, on any
+number of hosts (``run_scheduler`` or cron-driven ``valuation_tick_pending``), share
+the work-list without claiming the same investor twice; a lease left by a crashed
+worker expires after ``FOLIOMAN_VALUATION_LEASE_SECONDS`` and the investor is claimed
+again. ``recompute_investor_valuation`` is idempotent (compute, then upsert), so a
+recompute that outlives its lease and overlaps a reclaim only repeats work. Its final
+status write only lands while the row is still ``computing`` under its claim: an
+investor re-queued mid-run stays ``pending`` (with the earlier of the two start dates)
+for the next tick instead of being marked ready over the newer ledger. The
+processes are spawned, not forked (see ``folioman_app._spawn``).
+
+SQLite/desktop keeps the serial path: one in-thread tick (APScheduler
+``max_instances=1`` + ``coalesce``) recomputes the due investors one by one.
 """
 
 from __future__ import annotations
 
 import datetime as dt
 import logging
+import os
+import socket
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta
 from decimal import Decimal
+from functools import partial
 
+from django.conf import settings
+from django.db import close_old_connections, connection
 from django.db import transaction as db_transaction
-from django.db.models import F, Min, Q
+from django.db.models import DateField, F, Min, Q, Value
+from django.db.models.functions import Coalesce, Least
 from django.utils import timezone
 from folioman_core.models import SecurityType
 
+from folioman_app._spawn import spawn_pool
 from folioman_app.models import Investor, InvestorValue, NAVHistory, Security, ValuationStatus
-from folioman_app.services.valuation import _value_series
+from folioman_app.services.positions import refresh_positions
+from folioman_app.services.valuation_checkpoints import (
+    checkpointed_value_series,
+    invalidate_checkpoints,
+)
 from folioman_app.tasks.refresh_navs import (
     _QUOTE_TYPES,
     extend_tails,
@@ -66,6 +69,9 @@ from folioman_app.tasks.refresh_navs import (
 logger = logging.getLogger(__name__)
 
 _MAX_ATTEMPTS = 8
+# Investors a worker-pool tick claims per worker process at a time: enough to keep
+# every process busy through a batch, small enough that a lease rarely outlives one.
+_CLAIM_PER_WORKER = 4
 
 # The persisted ``InvestorValue`` series is always **daily** — one point per calendar
 # day from the start date to today. The upsert in ``_upsert_series`` relies on this:
@@ -77,6 +83,7 @@ _MAX_ATTEMPTS = 8
 _SERIES_GRANULARITY = "daily"
 
 
+@db_transaction.atomic
 def queue_recompute(
     investor: Investor,
     recompute_from: dt.date,
@@ -86,16 +93,20 @@ def queue_recompute(
     as_of: dt.date | None = None,
 ) -> None:
     """Mark an investor for day-wise recompute from ``recompute_from`` (extended
-    back to cover any pending earlier date), set status ``computing``, and — when a
+    back to cover any pending earlier date), queue it (``pending``), and — when a
     statement value is supplied — seed one **provisional** ``InvestorValue`` at
     ``as_of`` so the headline/chart show a real number immediately, until the worker
-    computes the precise live-NAV series and supersedes it. Call from the import.
+    computes the precise live-NAV series and supersedes it. Call from the import —
+    the ledger just changed, so the investor's FIFO checkpoint is dropped and its
+    materialized positions rebuilt too, in one transaction with the queueing.
     """
+    invalidate_checkpoints(investor)
+    refresh_positions(investor)
     existing = investor.valuation_recompute_from
     investor.valuation_recompute_from = (
         min(existing, recompute_from) if existing else recompute_from
     )
-    investor.valuation_status = ValuationStatus.COMPUTING
+    investor.valuation_status = ValuationStatus.PENDING
     investor.save(update_fields=["valuation_recompute_from", "valuation_status", "updated_at"])
     if as_of is not None and provisional_value is not None and provisional_value > 0:
         InvestorValue.objects.update_or_create(
@@ -144,49 +155,81 @@ def _backoff(attempts: int) -> timedelta:
     return timedelta(minutes=min(2**attempts, 60))  # 1,2,4,…,60 min, capped
 
 
-def _mark_ready(inv: Investor, through: dt.date) -> None:
-    inv.valuation_status = ValuationStatus.READY
-    inv.valuation_computed_through = through
-    inv.valuation_recompute_from = None
-    inv.valuation_next_attempt_at = None
-    inv.valuation_attempts = 0
-    inv.valuation_error = ""
-    inv.save(
-        update_fields=[
-            "valuation_status",
-            "valuation_computed_through",
-            "valuation_recompute_from",
-            "valuation_next_attempt_at",
-            "valuation_attempts",
-            "valuation_error",
-            "updated_at",
-        ]
+def _worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _claim_unclaimed(inv: Investor) -> str:
+    """Take an investor the caller didn't claim (the serial tick, a direct call): mark
+    it ``computing`` under this process, with no lease — a run that dies leaves it due
+    for the next tick, as before. Returns the claim the final write checks."""
+    worker = _worker_id()
+    Investor.objects.filter(pk=inv.pk).update(
+        valuation_status=ValuationStatus.COMPUTING,
+        valuation_claimed_by=worker,
+        valuation_claimed_until=None,
+        updated_at=timezone.now(),
     )
+    return worker
 
 
-def _mark_error(inv: Investor, message: str) -> None:
-    inv.valuation_attempts = (inv.valuation_attempts or 0) + 1
-    inv.valuation_status = ValuationStatus.ERROR
-    inv.valuation_error = message[:500]
-    logger.warning(
-        "investor %s valuation error (attempt %s): %s", inv.id, inv.valuation_attempts, message
+def _finish(inv: Investor, worker: str, start: dt.date | None, **fields) -> bool:
+    """Write a run's final status — only while the row is still ``computing`` under
+    ``worker``'s claim. A ``queue_recompute`` during the run set it back to ``pending``
+    with the ledger's new start; then only the claim is released, and the queued start
+    is lowered to this run's, so the next tick recomputes everything this one covered
+    against the newer ledger. Returns whether the status landed."""
+    now = timezone.now()
+    landed = Investor.objects.filter(
+        pk=inv.pk, valuation_claimed_by=worker, valuation_status=ValuationStatus.COMPUTING
+    ).update(valuation_claimed_by="", valuation_claimed_until=None, updated_at=now, **fields)
+    if landed:
+        return True
+    release: dict = {"valuation_claimed_by": "", "valuation_claimed_until": None}
+    if start is not None:
+        run_start = Value(start, output_field=DateField())
+        release["valuation_recompute_from"] = Least(
+            Coalesce(F("valuation_recompute_from"), run_start), run_start
+        )
+    Investor.objects.filter(pk=inv.pk, valuation_claimed_by=worker).update(
+        updated_at=now, **release
+    )
+    logger.info("investor %s: re-queued during the recompute, left pending", inv.id)
+    return False
+
+
+def _mark_ready(inv: Investor, through: dt.date, worker: str, start: dt.date | None) -> str:
+    landed = _finish(
+        inv,
+        worker,
+        start,
+        valuation_status=ValuationStatus.READY,
+        valuation_computed_through=through,
+        valuation_recompute_from=None,
+        valuation_next_attempt_at=None,
+        valuation_attempts=0,
+        valuation_error="",
     )
+    return ValuationStatus.READY if landed else ValuationStatus.PENDING
+
+
+def _mark_error(inv: Investor, message: str, worker: str, start: dt.date | None) -> str:
+    attempts = (inv.valuation_attempts or 0) + 1
+    logger.warning("investor %s valuation error (attempt %s): %s", inv.id, attempts, message)
     # Below the cap, schedule a retry; at/above it, stop auto-retrying (the daily
     # tick re-queues errored investors so a recovered feed still gets picked up).
-    inv.valuation_next_attempt_at = (
-        timezone.now() + _backoff(inv.valuation_attempts)
-        if inv.valuation_attempts < _MAX_ATTEMPTS
-        else None
-    )
-    inv.save(
-        update_fields=[
-            "valuation_status",
-            "valuation_attempts",
-            "valuation_error",
-            "valuation_next_attempt_at",
-            "updated_at",
-        ]
+    landed = _finish(
+        inv,
+        worker,
+        start,
+        valuation_status=ValuationStatus.ERROR,
+        valuation_attempts=attempts,
+        valuation_error=message[:500],
+        valuation_next_attempt_at=(
+            timezone.now() + _backoff(attempts) if attempts < _MAX_ATTEMPTS else None
+        ),
     )
+    return ValuationStatus.ERROR if landed else ValuationStatus.PENDING
 
 
 def _upsert_series(inv: Investor, points: list[dict]) -> None:
@@ -226,7 +269,11 @@ def _upsert_series(inv: Investor, points: list[dict]) -> None:
 
 
 def recompute_investor_valuation(
-    investor_id: int, from_date: dt.date | None = None, *, prime_navs: bool = True
+    investor_id: int,
+    from_date: dt.date | None = None,
+    *,
+    prime_navs: bool = True,
+    worker: str = "",
 ) -> str:
     """Recompute the daily ``InvestorValue`` series for one investor from
     ``from_date`` (or its pending/last-computed/earliest date) to today. Returns the
@@ -236,10 +283,17 @@ def recompute_investor_valuation(
     this investor's holdings before valuing. Batch callers that already primed the
     NAV cache once for *all* due investors (see ``process_pending_valuations``) pass
     ``False`` so shared schemes aren't re-fetched per investor — the cause of
-    feed rate-limiting at scale."""
+    feed rate-limiting at scale.
+
+    ``worker`` is the claim a worker-pool tick took (:func:`claim_due_investors`);
+    without one the run claims the investor itself. The final status is written only
+    while that claim still holds the row ``computing`` (see :func:`_finish`); a run the
+    investor was re-queued under returns ``pending``."""
     inv = Investor.objects.filter(id=investor_id).first()
     if inv is None:
         return "missing"
+    if not worker:
+        worker = _claim_unclaimed(inv)
     today = timezone.localdate()
     start = (
         from_date
@@ -248,12 +302,9 @@ def recompute_investor_valuation(
         or _earliest_activity(inv)
     )
     if start is None:  # no holdings/transactions yet → nothing to value
-        _mark_ready(inv, today)
-        return ValuationStatus.READY
+        return _mark_ready(inv, today, worker, start)
 
     logger.info("investor %s: recomputing from %s to %s", investor_id, start, today)
-    inv.valuation_status = ValuationStatus.COMPUTING
-    inv.save(update_fields=["valuation_status", "updated_at"])
     try:
         sec_ids = _held_security_ids(inv)
         securities = Security.objects.filter(id__in=sec_ids)
@@ -296,41 +347,41 @@ def recompute_investor_valuation(
             )
             pending = unpriced - degraded
             if pending and inv.valuation_attempts < _MAX_ATTEMPTS:
-                _mark_error(inv, f"{len(pending)} securities awaiting price (feed pending)")
-                return ValuationStatus.ERROR
+                return _mark_error(
+                    inv, f"{len(pending)} securities awaiting price (feed pending)", worker, start
+                )
             # else: only unmapped/closed left (or retries exhausted) — degrade.
 
         # Compute the full new series first, then upsert it — a failure in either step
-        # leaves the prior/provisional series intact (see _upsert_series).
-        points = _value_series([inv], start, today, _SERIES_GRANULARITY)
+        # leaves the prior/provisional series intact (see _upsert_series). Always
+        # ``_SERIES_GRANULARITY`` (daily); resumes from the persisted FIFO checkpoint when
+        # the ledger hasn't changed since it was taken, so a routine revalue replays only
+        # the last few days rather than the whole history.
+        points = checkpointed_value_series(inv, start, today)
         logger.info("investor %s: computed %s value points", investor_id, len(points))
         _upsert_series(inv, points)
-        _mark_ready(inv, today)
-        logger.info("investor %s: valuation ready through %s", investor_id, today)
-        return ValuationStatus.READY
+        status = _mark_ready(inv, today, worker, start)
+        logger.info("investor %s: valuation %s through %s", investor_id, status, today)
+        return status
     except Exception as exc:
         logger.exception("investor %s: unexpected error during recompute", investor_id)
-        _mark_error(inv, f"{type(exc).__name__}: {exc}")
-        return ValuationStatus.ERROR
+        return _mark_error(inv, f"{type(exc).__name__}: {exc}", worker, start)
 
 
-def process_pending_valuations() -> int:
-    """Interval tick: recompute every investor that's pending/computing, or an error
-    whose backoff has elapsed. Returns how many were processed."""
-    now = timezone.now()
-    due = list(
-        Investor.objects.filter(
-            Q(valuation_status__in=[ValuationStatus.PENDING, ValuationStatus.COMPUTING])
-            | Q(valuation_status=ValuationStatus.ERROR, valuation_next_attempt_at__lte=now)
-        ).values_list("id", "valuation_recompute_from")
+def _due(now: dt.datetime) -> Q:
+    """Investors a pending tick should recompute: queued, a due-for-retry error, or
+    ``computing`` with no live claim (a lapsed lease, or a serial run that died)."""
+    return (
+        Q(valuation_status=ValuationStatus.PENDING)
+        | Q(valuation_status=ValuationStatus.ERROR, valuation_next_attempt_at__lte=now)
+        | Q(valuation_status=ValuationStatus.COMPUTING, valuation_claimed_until__isnull=True)
+        | Q(valuation_status=ValuationStatus.COMPUTING, valuation_claimed_until__lt=now)
     )
-    if not due:
-        return 0
-    logger.info("pending valuation pass: %s investor(s) due", len(due))
-    # Prime the NAV cache ONCE for the union of all due investors' holdings, then
-    # value each off the cache (prime_navs=False). Without this, investors sharing
-    # popular schemes each re-fetch them — the burst that rate-limits the feed.
-    investor_ids = [iid for iid, _ in due]
+
+
+def _prime_navs(investor_ids: list[int]) -> None:
+    """Refresh NAVs once for the union of the investors' holdings, so investors sharing
+    popular schemes don't each re-fetch them (the burst that rate-limits the feed)."""
     sec_ids: set[int] = set()
     for inv in Investor.objects.filter(id__in=investor_ids):
         sec_ids.update(_held_security_ids(inv))
@@ -341,6 +392,78 @@ def process_pending_valuations() -> int:
         logger.info("batch tail extend: %s", tail_summary)
         nav_summary = refresh_navs(securities=securities)
         logger.info("batch NAV refresh: %s", nav_summary)
+
+
+def claim_due_investors(worker: str, limit: int) -> list[tuple[int, dt.date | None]]:
+    """Claim up to ``limit`` due investors for ``worker`` under a lease: mark them
+    ``computing`` and return ``[(investor_id, recompute_from)]``. Rows another worker
+    is claiming right now are skipped (``SKIP LOCKED``), never waited on or shared."""
+    now = timezone.now()
+    with db_transaction.atomic():
+        claimed = list(
+            Investor.objects.filter(_due(now))
+            .order_by("valuation_next_attempt_at", "id")
+            .select_for_update(skip_locked=True)
+            .values_list("id", "valuation_recompute_from")[:limit]
+        )
+        Investor.objects.filter(id__in=[iid for iid, _ in claimed]).update(
+            valuation_status=ValuationStatus.COMPUTING,
+            valuation_claimed_by=worker,
+            valuation_claimed_until=now
+            + timedelta(seconds=settings.FOLIOMAN_VALUATION_LEASE_SECONDS),
+        )
+    return claimed
+
+
+def worker_pool(workers: int) -> ProcessPoolExecutor:
+    """The process pool a worker-mode tick (and ``reconcile_all --workers``) fans out
+    to — spawned, so no child inherits this thread's siblings' locks or DB sockets."""
+    return spawn_pool(workers)
+
+
+def _recompute_claimed(worker: str, claim: tuple[int, dt.date | None]) -> str:
+    investor_id, recompute_from = claim
+    try:
+        return recompute_investor_valuation(
+            investor_id, recompute_from, prime_navs=False, worker=worker
+        )
+    finally:
+        close_old_connections()
+
+
+def _process_claimed(workers: int) -> int:
+    """Worker-pool tick: claim batches of due investors and recompute each batch across
+    ``workers`` processes until nothing is due. Returns how many were processed."""
+    worker = _worker_id()
+    processed = 0
+    with worker_pool(workers) as pool:
+        while claimed := claim_due_investors(worker, workers * _CLAIM_PER_WORKER):
+            logger.info("worker %s claimed %s investor(s)", worker, len(claimed))
+            _prime_navs([iid for iid, _ in claimed])
+            processed += len(list(pool.map(partial(_recompute_claimed, worker), claimed)))
+    return processed
+
+
+def process_pending_valuations(workers: int | None = None) -> int:
+    """Interval tick: recompute every investor that's pending, an error whose backoff
+    has elapsed, or computing without a live claim. Returns how many were processed.
+
+    ``workers`` (default ``FOLIOMAN_VALUATION_WORKERS``) > 0 runs the lease-claimed
+    worker pool where the database supports ``SKIP LOCKED``; otherwise serially."""
+    if workers is None:
+        workers = settings.FOLIOMAN_VALUATION_WORKERS
+    if workers > 0 and connection.features.has_select_for_update_skip_locked:
+        return _process_claimed(workers)
+
+    due = list(
+        Investor.objects.filter(_due(timezone.now())).values_list("id", "valuation_recompute_from")
+    )
+    if not due:
+        return 0
+    logger.info("pending valuation pass: %s investor(s) due", len(due))
+    # Prime the NAV cache ONCE for the union of all due investors' holdings, then
+    # value each off the cache (prime_navs=False).
+    _prime_navs([iid for iid, _ in due])
     processed = 0
     for investor_id, recompute_from in due:
         recompute_investor_valuation(investor_id, recompute_from, prime_navs=False)
@@ -45,12 +45,15 @@ def _run(fn: Callable[[], int]) -> int:
         close_old_connections()
 
 
-def run_pending_valuations_tick() -> int:
-    """Process every investor whose valuation is pending/computing or a
-    due-for-retry error. Returns how many were processed."""
+def run_pending_valuations_tick(workers: int | None = None) -> int:
+    """Process every investor whose valuation is pending, unclaimed computing or a
+    due-for-retry error — across ``workers`` processes when given (default
+    ``FOLIOMAN_VALUATION_WORKERS``). Returns how many were processed."""
     from folioman_app.tasks.valuation_jobs import process_pending_valuations
 
-    return _run(process_pending_valuations)
+    if workers is None:
+        return _run(process_pending_valuations)
+    return _run(lambda: process_pending_valuations(workers))
 
 
 def run_daily_extend_tick() -> int:
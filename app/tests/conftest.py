@@ -21,6 +21,7 @@ from folioman_app.models import (
     Security,
     Transaction,
 )
+from folioman_app.services.positions import refresh_positions
 from folioman_core.models import (
     FolioType,
     HoldingSource,
@@ -72,6 +73,18 @@ def _no_isin_resolution(monkeypatch):
     monkeypatch.setattr(import_csv, "resolve_equity_identity", lambda securities: [])
 
 
+@pytest.fixture(autouse=True)
+def _fresh_nav_cache():
+    """Start every test with an empty process-wide NAV cache: rolled-back test
+    transactions reuse security ids, so a series cached by an earlier test must not
+    answer for this one."""
+    from folioman_app.services import nav_cache
+
+    nav_cache.clear()
+    yield
+    nav_cache.clear()
+
+
 @pytest.fixture
 def user(db):
     """The single local advisor user — the one local-mode API auth resolves, so
@@ -147,12 +160,14 @@ def make_transaction(make_investor, make_security, make_folio) -> Callable[...,
         kw.setdefault("units", Decimal("100"))
         kw.setdefault("nav_or_price", Decimal("10"))
         kw.setdefault("source", TransactionSource.CAS_PDF.value)
-        return Transaction.objects.create(
+        txn = Transaction.objects.create(
             investor=inv,
             security=security or make_security(),
             folio=folio,
             **kw,
         )
+        refresh_positions(inv)  # as every ledger writer leaves them
+        return txn
 
     return _make
 
@@ -163,11 +178,13 @@ def make_holding(make_investor, make_security) -> Callable[..., Holding]:
         kw.setdefault("as_of_date", dt.date(2025, 6, 1))
         kw.setdefault("units", Decimal("100"))
         kw.setdefault("source", HoldingSource.MANUAL.value)
-        return Holding.objects.create(
+        holding = Holding.objects.create(
             investor=investor or make_investor(),
             security=security or make_security(),
             **kw,
         )
+        refresh_positions(holding.investor)  # as every ledger writer leaves them
+        return holding
 
     return _make
 
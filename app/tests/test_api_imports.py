@@ -235,3 +235,182 @@ def test_upload_without_content_length_is_capped(settings):
     with pytest.raises(HttpError) as exc:
         _read_upload(upload)
     assert exc.value.status_code == 413
+
+
+class _HeldPool:
+    """Stands in for the background import threads: holds submissions until run."""
+
+    def __init__(self):
+        self.queued = []
+
+    def submit(self, fn, *args):
+        self.queued.append((fn, args))
+
+    def drain(self):
+        while self.queued:
+            fn, args = self.queued.pop(0)
+            fn(*args)
+
+
+def test_upload_returns_pending_job_when_workers_are_on(
+    client, patch_cas, make_parsed_cas, settings, monkeypatch, django_capture_on_commit_callbacks
+):
+    from folioman_app.services import imports as imports_svc
+
+    settings.FOLIOMAN_IMPORT_WORKERS = 2
+    pool = _HeldPool()
+    monkeypatch.setattr(imports_svc, "_import_pool", lambda _workers: pool)
+    patch_cas(_empty_cas(make_parsed_cas))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        upload = SimpleUploadedFile("cams.pdf", b"%PDF fake")
+        body = client.post("/api/imports/cas", {"file": upload, "password": "s"}).json()
+
+    # Parsed in the request (the PAN picked the investor); persist is still queued.
+    assert (body["status"], body["stage"]) == ("pending", "persist")
+    assert body["started_at"] is None
+    poll_url = f"/api/investors/{body['investor_id']}/imports/{body['id']}"
+
+    pool.drain()
+
+    done = client.get(poll_url).json()
+    assert (done["status"], done["stage"]) == ("success", "done")
+    assert len(done["source_ref"]) == 64
+
+
+def test_runner_records_each_stage(make_investor, monkeypatch):
+    """The job row shows the stage a processor reached while it runs, and where a
+    failed one stopped."""
+    from folioman_app.models import ImportJob
+    from folioman_app.models.jobs import ImportStage
+    from folioman_app.services import imports as imports_svc
+
+    seen = []
+
+    def _processor(job, content, password, *, confirm, parsed):
+        seen.append(ImportJob.objects.get(id=job.id).stage)
+        imports_svc.report_stage(ImportStage.RECONCILE)
+        seen.append(ImportJob.objects.get(id=job.id).stage)
+        if content == b"boom":
+            raise RuntimeError("reconcile exploded")
+        return {}
+
+    monkeypatch.setitem(imports_svc._PROCESSORS, "staged", _processor)
+    inv = make_investor()
+
+    ok = imports_svc.run_import_job(
+        ImportJob.objects.create(investor=inv, kind="staged"), content=b"x"
+    )
+    assert seen == ["parse", "reconcile"]
+    assert (ok.status, ok.stage) == ("success", "done")
+
+    bad = imports_svc.run_import_job(
+        ImportJob.objects.create(investor=inv, kind="staged"), content=b"boom", parsed=object()
+    )
+    assert seen[2:] == ["persist", "reconcile"]  # handed a parse, so it starts at persist
+    bad.refresh_from_db()
+    assert (bad.status, bad.stage, bad.error) == ("failed", "reconcile", "reconcile exploded")
+    imports_svc.report_stage(ImportStage.DONE)  # outside a job: a no-op
+
+
+def test_a_job_stranded_by_a_restart_reads_failed(client, make_investor, settings):
+    """A PENDING/RUNNING job not heard from past the staleness window (its process
+    died) is failed when read — on launch too — so the client stops polling it."""
+    import datetime as dt
+
+    from django.utils import timezone
+    from folioman_app.models import ImportJob
+    from folioman_app.tasks.import_ticks import run_stale_import_recovery_tick
+
+    settings.FOLIOMAN_IMPORT_STALE_SECONDS = 600
+    inv = make_investor()
+    stranded = ImportJob.objects.create(investor=inv, kind="cas")
+    running = ImportJob.objects.create(investor=inv, kind="cas", status="running")
+    elsewhere = ImportJob.objects.create(investor=make_investor(), kind="csv", status="running")
+    an_hour_ago = timezone.now() - dt.timedelta(hours=1)
+    ImportJob.objects.filter(id__in=[stranded.id, elsewhere.id]).update(updated_at=an_hour_ago)
+
+    body = client.get(f"/api/investors/{inv.id}/imports/{stranded.id}").json()
+    assert body["status"] == "failed"
+    assert "restarted" in body["error"]
+    assert body["finished_at"] is not None
+    # Still inside the window: left to the worker running it.
+    assert client.get(f"/api/investors/{inv.id}/imports/{running.id}").json()["status"] == "running"
+
+    assert run_stale_import_recovery_tick() == 1  # the launch sweep covers every investor
+    elsewhere.refresh_from_db()
+    assert elsewhere.status == "failed"
+
+
+def test_recovery_spares_own_jobs_and_a_late_finish_keeps_failed(
+    make_investor, settings, monkeypatch
+):
+    """A job this process owns is heartbeated and never failed by its own recovery; one
+    that another process failed mid-run keeps FAILED when the run finishes."""
+    import datetime as dt
+
+    from django.utils import timezone
+    from folioman_app.models import ImportJob
+    from folioman_app.services import imports
+
+    settings.FOLIOMAN_IMPORT_STALE_SECONDS = 600
+    inv = make_investor()
+    an_hour_ago = timezone.now() - dt.timedelta(hours=1)
+    own = ImportJob.objects.create(investor=inv, kind="cas", runner=imports._BOOT_ID)
+    ImportJob.objects.filter(id=own.id).update(updated_at=an_hour_ago)
+    assert imports.recover_stale_jobs() == 0
+    assert imports.touch_own_jobs() == 1
+    own.refresh_from_db()
+    assert own.status == "pending" and own.updated_at > an_hour_ago
+
+    def failed_elsewhere(job, content, password, *, confirm, parsed):
+        # Another process's recovery fails the job while this run is still persisting.
+        ImportJob.objects.filter(id=job.id).update(status="failed", error="interrupted")
+        return {"transactions_created": 3}
+
+    monkeypatch.setitem(imports._PROCESSORS, "test-late", failed_elsewhere)
+    late = ImportJob.objects.create(investor=inv, kind="test-late")
+    imports.run_import_job(late, content=b"x")
+    late.refresh_from_db()
+    assert (late.status, late.error, late.result) == ("failed", "interrupted", {})
+
+
+def test_queued_run_skips_a_job_no_longer_pending(make_investor, monkeypatch):
+    from folioman_app.models import ImportJob
+    from folioman_app.services import imports
+
+    calls = []
+    monkeypatch.setitem(
+        imports._PROCESSORS, "test-skip", lambda job, *a, **kw: calls.append(job.id) or {}
+    )
+    inv = make_investor()
+    failed = ImportJob.objects.create(investor=inv, kind="test-skip", status="failed")
+    pending = ImportJob.objects.create(investor=inv, kind="test-skip")
+
+    imports._run_queued([(failed.id, {"content": b"a"}), (pending.id, {"content": b"b"})])
+    assert calls == [pending.id]
+    failed.refresh_from_db()
+    assert failed.status == "failed" and failed.started_at is None
+
+
+def test_concurrent_first_import_for_a_pan_lands_one_investor(user, make_investor, monkeypatch):
+    """Two uploads for a new PAN can both miss the lookup; the unique (owner, PAN)
+    constraint lets one insert win and the other attaches to it."""
+    from django.db.models import QuerySet
+    from folioman_app.api.auth import resolve_or_create_investor
+    from folioman_app.models import Investor
+    from folioman_core.models.cas import CasInvestorIdentity
+
+    winner = make_investor(name="Asha Rao", owned_by=user)
+    winner.set_pan("ABCDE1234F")
+    winner.save()
+    real_first = QuerySet.first
+    misses = [None]  # the loser's lookup ran before the winner committed
+    monkeypatch.setattr(QuerySet, "first", lambda qs: misses.pop() if misses else real_first(qs))
+
+    investor, created = resolve_or_create_investor(
+        user, CasInvestorIdentity(name="Asha Rao", email="", pan="ABCDE1234F")
+    )
+
+    assert (investor.id, created) == (winner.id, False)
+    assert Investor.objects.filter(owned_by=user).count() == 1
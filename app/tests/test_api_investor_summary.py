@@ -311,3 +311,63 @@ def test_roster_aggregate_sums_value_and_returns_rows(
     # when there are holdings; here there are none).
     assert Decimal(str(rows[other.id]["total_inr"])) == Decimal("0")
     assert rows[other.id]["holdings_count"] == 0
+
+
+def _ledger_portfolio(
+    funds, make_investor, make_security, make_folio, make_transaction, make_holding
+):
+    """``funds`` MFs bought monthly for a year with weekly NAVs, plus an eCAS snapshot."""
+    inv = make_investor()
+    folio = make_folio(investor=inv)
+    for _ in range(funds):
+        mf = make_security(security_type=SecurityType.MF.value)
+        for month in range(1, 13):
+            make_transaction(
+                investor=inv,
+                security=mf,
+                folio=folio,
+                date=dt.date(2024, month, 5),
+                units=Decimal("10"),
+                nav_or_price=Decimal("10"),
+            )
+        weekly = (dt.date(2024, 1, 1) + dt.timedelta(days=d) for d in range(0, 520, 7))
+        NAVHistory.objects.bulk_create(
+            NAVHistory(security=mf, date=day, nav=Decimal("11")) for day in weekly
+        )
+    eq = make_security(security_type=SecurityType.EQUITY.value, isin=f"INE{funds:03d}A01011")
+    make_holding(investor=inv, security=eq, units=Decimal("5"), as_of_date=dt.date(2025, 1, 1))
+    return inv
+
+
+def test_summary_loads_the_ledger_once_in_constant_queries(
+    client, monkeypatch, make_investor, make_security, make_folio, make_transaction, make_holding
+):
+    """Regression guard: the request-scoped portfolio context projects the ledger once
+    (not once per valuation path) and the query count does not grow with the book.
+    Its wall time is tracked by ``benchmarks/test_bench_engines.py``."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from folioman_app.services import nav_cache, valuation
+
+    projections: list[int] = []
+    real = valuation.projected_transactions
+
+    def _counting(investor, **kwargs):
+        projections.append(investor.id)
+        return real(investor, **kwargs)
+
+    monkeypatch.setattr(valuation, "projected_transactions", _counting)
+    factories = (make_investor, make_security, make_folio, make_transaction, make_holding)
+    counts = []
+    for funds in (2, 20):
+        inv = _ledger_portfolio(funds, *factories)
+        nav_cache.clear()  # price the book from the DB, not a warm cache
+        projections.clear()
+        with CaptureQueriesContext(connection) as queries:
+            resp = client.get(f"/api/investors/{inv.id}/summary", {"as_of": "2025-06-01"})
+        assert resp.status_code == 200
+        assert Decimal(str(resp.json()["total_inr"])) == funds * 120 * 11
+        assert projections == [inv.id]
+        counts.append(len(queries))
+
+    assert counts[0] == counts[1] <= 14  # incl. the materialized positions read
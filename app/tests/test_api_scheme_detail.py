@@ -7,7 +7,10 @@ import datetime as dt
 from decimal import Decimal
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from folioman_app.models import AppliedCorporateAction, NAVHistory
+from folioman_app.services import valuation
 from folioman_core.models import SecurityType
 
 pytestmark = pytest.mark.django_db
@@ -260,3 +263,29 @@ def test_scheme_detail_unheld_security_404s(client, make_investor, make_security
 def test_scheme_detail_unknown_investor_404s(client, make_security):
     mf = make_security()
     assert client.get(f"/api/investors/999999/holdings/{mf.id}").status_code == 404
+
+
+def test_scheme_detail_cost_is_independent_of_the_rest_of_the_book(
+    monkeypatch, make_investor, make_security, make_transaction
+):
+    def _whole_book(*_a, **_kw):
+        raise AssertionError("scheme detail must not project the whole ledger")
+
+    inv = make_investor()
+    mf = make_security(security_type=SecurityType.MF.value)
+    make_transaction(investor=inv, security=mf, date=dt.date(2024, 6, 1))
+    NAVHistory.objects.create(security=mf, date=dt.date(2025, 6, 1), nav=Decimal("20"))
+
+    def _queries() -> int:
+        # Only the read is guarded: the writers rebuild the book's positions.
+        with monkeypatch.context() as patched, CaptureQueriesContext(connection) as captured:
+            patched.setattr(valuation, "projected_transactions", _whole_book)
+            detail = valuation.build_scheme_detail(inv, mf, dt.date(2025, 6, 1))
+        assert detail["value_inr"] == Decimal("2000")
+        return len(captured)
+
+    _queries()  # warm the process-wide NAV cache
+    alone = _queries()
+    for _ in range(5):
+        make_transaction(investor=inv, security=make_security(), date=dt.date(2024, 6, 1))
+    assert _queries() == alone
@@ -211,6 +211,45 @@ def test_extend_tails_mf_short_lag_uses_one_amfi_range_report(monkeypatch, make_
         assert row.source == "amfi"
 
 
+def test_extend_tails_first_import_tiles_amfi_ranges(monkeypatch, make_investor):
+    """A fresh family import fills from ≤90-day range reports tiled over the union span
+    — a handful of requests for many funds — while one fund reaching back years is
+    left per-scheme instead of stretching every tile."""
+    from folioman_core.price_feeds import amfi_bulk
+
+    end = completed_trading_day(dt.date.today())
+    recent = end - dt.timedelta(days=200)
+    old = end - dt.timedelta(days=3000)
+    codes = [f"1100{n:02d}" for n in range(8)]
+    ranges = []
+
+    def _range(frmdt, todt, **_):
+        ranges.append((frmdt, todt))
+        return {code: [NAVPoint(date=frmdt, nav=Decimal("10"))] for code in codes}
+
+    per_scheme = []
+    monkeypatch.setattr(amfi_bulk, "fetch_range", _range)
+    monkeypatch.setattr(
+        mfapi,
+        "fetch_nav_history",
+        lambda code, **_: per_scheme.append(code) or _history((str(old), "5")),
+    )
+    for code in codes:
+        _mf_with_txn(code, on=recent, make_investor=make_investor)
+    _mf_with_txn("119999", on=old, make_investor=make_investor)
+    stored = Security.objects.get(amfi_code=codes[0])
+    NAVHistory.objects.create(security=stored, date=recent, nav=Decimal("9"))  # kept as is
+
+    summary = extend_tails()
+
+    assert len(ranges) == 3 and ranges[0][0] == recent and ranges[-1][1] == end
+    assert all((todt - frmdt).days < 90 for frmdt, todt in ranges)
+    assert per_scheme == ["119999"]
+    assert summary["securities"] == 9
+    assert NAVHistory.objects.get(security=stored, date=recent).nav == Decimal("9")
+    assert NAVHistory.objects.filter(security=stored, source="amfi").count() == 2
+
+
 def test_extend_tails_single_fund_stays_per_scheme(monkeypatch, make_investor):
     """One lagging fund isn't worth a range report (one call either way) → per-scheme."""
     from folioman_core.price_feeds import amfi_bulk
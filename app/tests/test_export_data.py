@@ -8,8 +8,9 @@ import io
 from decimal import Decimal
 
 import pytest
-from folioman_app.models import NAVHistory, Security, Transaction
+from folioman_app.models import NAVHistory, Security, SecurityIntegrityStatus, Transaction
 from folioman_app.models.jobs import ImportJob, ImportKind
+from folioman_app.services.exports import iter_holdings_csv
 from folioman_app.tasks.import_csv import create_manual_transaction, process_csv
 from folioman_app.tasks.import_ecas import persist_ecas_statement
 from folioman_core.models import SecurityType
@@ -27,10 +28,15 @@ pytestmark = pytest.mark.django_db
 _ISIN = "INE002A01018"
 
 
+def _body(response) -> str:
+    assert response.streaming  # streamed line by line, never built whole
+    return b"".join(response.streaming_content).decode()
+
+
 def _parse_csv(response):
     assert response["Content-Type"] == "text/csv"
     assert "attachment" in response["Content-Disposition"]
-    return list(csv.DictReader(io.StringIO(response.content.decode())))
+    return list(csv.DictReader(io.StringIO(_body(response))))
 
 
 def _equity_txn(inv, *, txn_type, units, price, on):
@@ -94,6 +100,32 @@ def test_holdings_csv_includes_ecas_snapshot_without_price(client, make_investor
     assert rows[0]["value_inr"] == ""  # no NAVHistory price
 
 
+def test_holdings_csv_prices_every_security_in_one_query(
+    make_investor, make_security, make_folio, django_assert_num_queries
+):
+    inv = make_investor()
+    folio = make_folio(investor=inv)
+    for n in range(3):
+        sec = make_security(name=f"Fund {n}")
+        SecurityIntegrityStatus.objects.create(
+            investor=inv,
+            security=sec,
+            folio=folio,
+            status="full_history",
+            units_from_transactions=Decimal("10"),
+        )
+        NAVHistory.objects.create(security=sec, date=dt.date(2025, 1, 1), nav=Decimal("10"))
+        NAVHistory.objects.create(security=sec, date=dt.date(2025, 2, 1), nav=Decimal(11 + n))
+        NAVHistory.objects.create(security=sec, date=dt.date(2025, 3, 1), nav=Decimal("99"))
+
+    with django_assert_num_queries(1):
+        text = "".join(iter_holdings_csv(inv, as_of=dt.date(2025, 2, 15)))
+
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert [Decimal(r["price_inr"]) for r in rows] == [Decimal(11), Decimal(12), Decimal(13)]
+    assert [Decimal(r["value_inr"]) for r in rows] == [Decimal(110), Decimal(120), Decimal(130)]
+
+
 def test_fully_sold_security_omitted(client, make_investor):
     inv = make_investor()
     _equity_txn(inv, txn_type="buy", units="10", price="100", on=dt.date(2024, 1, 1))
@@ -107,7 +139,7 @@ def test_transactions_csv_round_trips_into_another_investor(client, make_investo
     _equity_txn(src, txn_type="buy", units="10", price="100", on=dt.date(2024, 1, 1))
     _equity_txn(src, txn_type="sell", units="4", price="150", on=dt.date(2024, 6, 1))
 
-    csv_text = client.get(f"/api/investors/{src.id}/exports/transactions").content.decode()
+    csv_text = _body(client.get(f"/api/investors/{src.id}/exports/transactions"))
 
     # Re-import the exported CSV into a fresh investor. CSV import is disabled at
     # the runner/endpoint (multi-asset release), so round-trip via the preserved
@@ -0,0 +1,153 @@
+"""Per-host token buckets, the concurrent live-fetch tail of ``refresh_navs`` and the
+streaming fetch stage of ``fill_gaps``.
+
+The end-to-end tests point mfapi at a local stub HTTP server (stdlib, loopback only),
+so the fetch stage's threads, the shared pooled client and the request hook that
+takes a token all run for real."""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import threading
+import time
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+
+import httpx
+import pytest
+from folioman_app.models import NAVHistory, Security
+from folioman_app.services import feed_limits
+from folioman_app.tasks import refresh_navs as refresh_navs_mod
+from folioman_app.tasks.refresh_navs import fill_gaps, refresh_navs
+from folioman_core.models import SecurityType
+from folioman_core.price_feeds import mfapi
+
+pytestmark = pytest.mark.django_db
+
+_FUNDS = 12
+_LATENCY = 0.05  # seconds the stub holds each response
+
+
+def test_bucket_spends_its_burst_then_paces(monkeypatch):
+    now = [100.0]
+    waits = []
+    monkeypatch.setattr(feed_limits, "_CLOCK", lambda: now[0])
+    monkeypatch.setattr(feed_limits, "_SLEEP", waits.append)
+    bucket = feed_limits.TokenBucket(rate=4.0, burst=2)
+
+    assert [bucket.acquire() for _ in range(4)] == [0.0, 0.0, 0.25, 0.5]
+    now[0] += 2.0  # idle long enough to refill, but never past the burst
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.25]
+    assert waits == [0.25, 0.5, 0.25]
+
+
+class _StubFeed(BaseHTTPRequestHandler):
+    """``GET /mf/<code>[/latest]`` in mfapi's shape (one point, 2025-06-02), recording
+    peak concurrency."""
+
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+    served: ClassVar[list[float]] = []
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+            cls.served.append(time.monotonic())
+        time.sleep(_LATENCY)
+        code = self.path.split("/")[2]
+        body = json.dumps(
+            {"status": "SUCCESS", "data": [{"date": "02-06-2025", "nav": f"{code[-2:]}.5"}]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with cls.lock:
+            cls.in_flight -= 1
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def stub_mfapi(monkeypatch):
+    _StubFeed.in_flight = _StubFeed.peak = 0
+    _StubFeed.served = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubFeed)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(mfapi, "BASE_URL", url)
+    monkeypatch.setattr(mfapi, "shared_client", lambda: httpx.Client(base_url=url, timeout=5))
+    # No whole-market snapshot, so every fund takes the live path.
+    monkeypatch.setattr(refresh_navs_mod.amfi_bulk, "fetch_all_latest", lambda **_: {})
+    monkeypatch.setattr(refresh_navs_mod.nse_bhavcopy, "fetch_close_by_symbol", lambda *a, **k: {})
+    feed_limits.reset()
+    yield _StubFeed
+    feed_limits.reset()
+    server.shutdown()
+    server.server_close()
+
+
+def _funds() -> list[Security]:
+    return [
+        Security.objects.create(
+            security_type=SecurityType.MF.value, name=f"Fund {n}", amfi_code=f"1200{n:02d}"
+        )
+        for n in range(_FUNDS)
+    ]
+
+
+def test_live_tail_fetches_concurrently(monkeypatch, stub_mfapi):
+    monkeypatch.setitem(feed_limits.FEED_RATES, "127.0.0.1", (1000.0, _FUNDS))
+    funds = _funds()
+
+    summary = refresh_navs(securities=funds)
+
+    assert summary == {"updated": _FUNDS, "skipped": 0, "errors": 0}
+    assert stub_mfapi.peak > 1  # overlapping requests, not one at a time
+    nav = NAVHistory.objects.get(security=funds[3], date=dt.date(2025, 6, 2)).nav
+    assert nav == Decimal("3.5")
+
+
+def test_live_tail_respects_the_host_budget(monkeypatch, stub_mfapi):
+    rate = 40.0
+    monkeypatch.setitem(feed_limits.FEED_RATES, "127.0.0.1", (rate, 1))
+
+    assert refresh_navs(securities=_funds())["updated"] == _FUNDS
+
+    served = sorted(stub_mfapi.served)
+    # One token banked, then one every 1/rate s: the 12 requests span >= 11/rate.
+    assert served[-1] - served[0] >= (_FUNDS - 1) / rate * 0.9
+
+
+def test_fill_gaps_writes_each_history_as_it_lands(
+    monkeypatch, stub_mfapi, make_investor, make_transaction
+):
+    monkeypatch.setitem(feed_limits.FEED_RATES, "127.0.0.1", (1000.0, _FUNDS))
+    monkeypatch.setattr(refresh_navs_mod, "_FETCH_WORKERS", 2)
+    inv, funds = make_investor(), _funds()
+    for fund in funds:
+        make_transaction(investor=inv, security=fund, date=dt.date(2025, 6, 2))
+    served_at_write = []
+    store = refresh_navs_mod._store_history
+
+    def _recording_store(security, fetched):
+        served_at_write.append(len(stub_mfapi.served))
+        return store(security, fetched)
+
+    monkeypatch.setattr(refresh_navs_mod, "_store_history", _recording_store)
+
+    summary = fill_gaps(securities=funds)
+
+    assert summary["securities"] == _FUNDS
+    assert NAVHistory.objects.filter(security__in=funds, date=dt.date(2025, 6, 2)).count() == _FUNDS
+    assert stub_mfapi.peak == 2  # concurrent, but bounded to the workers
+    # The first history is written long before the last one is even requested.
+    assert served_at_write[0] < _FUNDS
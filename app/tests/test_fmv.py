@@ -12,7 +12,7 @@ from decimal import Decimal
 
 import pytest
 from folioman_app.models import NAVHistory
-from folioman_app.services.fmv import fmv_lookup
+from folioman_app.services.fmv import FmvTable, fmv_lookup
 from folioman_core.price_feeds.casparser_fmv import fmv_lookup as _mf_fmv
 
 pytestmark = pytest.mark.django_db
@@ -49,3 +49,32 @@ def test_equity_without_priced_history_returns_none(make_security):
 
 def test_blank_isin_returns_none():
     assert fmv_lookup("", _GF) is None
+
+
+def test_fmv_table_preloads_in_one_query_and_agrees_with_the_lookup(
+    make_security, django_assert_num_queries
+):
+    sec = make_security(security_type="equity", name="R", isin="INE002A01018", symbol="R")
+    NAVHistory.objects.create(security=sec, date=_GF, nav=Decimal("920.50"))
+    make_security(security_type="equity", name="Y", isin="INE222A01012", symbol="Y")
+    isins = ["INF179K01BE2", "INE002A01018", "INE222A01012", ""]
+
+    with django_assert_num_queries(1):  # one NAVHistory query for every equity
+        table = FmvTable.preload(isins)
+    with django_assert_num_queries(0):  # every lot after that is a dict hit
+        got = [table(isin, _GF) for isin in isins * 3]
+
+    assert got == [fmv_lookup(isin, _GF) for isin in isins] * 3
+    assert got[:3] == [_mf_fmv("INF179K01BE2", _GF), Decimal("920.50"), None]
+
+
+def test_fmv_table_falls_back_once_for_an_isin_it_was_not_given(
+    make_security, django_assert_num_queries
+):
+    sec = make_security(security_type="equity", name="X", isin="INE111A01011", symbol="X")
+    NAVHistory.objects.create(security=sec, date=_GF, nav=Decimal("100"))
+    table = FmvTable.preload([])
+
+    assert table("INE111A01011", _GF) == Decimal("100")
+    with django_assert_num_queries(0):
+        assert table("INE111A01011", _GF) == Decimal("100")
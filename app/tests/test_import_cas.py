@@ -837,7 +837,7 @@ def test_import_seeds_provisional_value_and_queues_recompute(make_investor):
     persist_mf_statement(inv, stmt, source_ref="prov")
 
     inv.refresh_from_db()
-    assert inv.valuation_status == "computing"
+    assert inv.valuation_status == "pending"
     assert inv.valuation_recompute_from == dt.date(2024, 4, 1)
     prov = InvestorValue.objects.get(investor=inv, date=dt.date(2025, 3, 31))
     assert prov.is_provisional
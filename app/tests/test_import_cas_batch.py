@@ -0,0 +1,171 @@
+"""Batch CAS import: parallel parse, per-investor date-ordered persist, one report."""
+
+from __future__ import annotations
+
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from folioman_app.models import ImportJob, Investor, Transaction
+from folioman_app.tasks import import_cas_batch as batch_mod
+from folioman_app.tasks.import_cas_batch import BatchFile, import_cas_batch
+from folioman_core.models import SecurityType, TransactionType
+from folioman_core.models.cas import MfCasLineItem, MfCasSchemeBlock, MfCasStatement
+from folioman_core.models.investor import Folio as CoreFolio
+from folioman_core.models.security import Security as CoreSecurity
+from folioman_core.parser import CASPasswordError
+
+pytestmark = pytest.mark.django_db
+
+_FUND = CoreSecurity(
+    type=SecurityType.MF, name="Parag Parikh Flexi Cap", amfi_code="122639", isin="INF879O01027"
+)
+
+
+def _year(year: int, opening: str, bought: str) -> MfCasStatement:
+    """One calendar year of a single folio: ``opening`` carried in, ``bought`` added."""
+    closing = str(int(opening) + int(bought))
+    block = MfCasSchemeBlock(
+        folio=CoreFolio(folio_type="mf", number="12345/67", amc_code="PPFAS"),
+        security=_FUND,
+        opening_units=opening,
+        closing_units=closing,
+        transactions=[
+            MfCasLineItem(
+                date=dt.date(year, 3, 1),
+                transaction_type=TransactionType.BUY,
+                units=bought,
+                nav="50",
+                amount=str(int(bought) * 50),
+            )
+        ],
+    )
+    return MfCasStatement(
+        statement_from=dt.date(year, 1, 1), statement_to=dt.date(year, 12, 31), schemes=[block]
+    )
+
+
+@pytest.fixture
+def family(monkeypatch, settings, make_parsed_cas):
+    """Four uploads: Asha's 2025 statement before her 2024 one (newest first, as a
+    download folder lists them), Ravi's, and a file with the wrong password. Parsing
+    defaults to serial so the stubbed reader never has to cross a process boundary."""
+    settings.FOLIOMAN_CAS_PARSE_WORKERS = 1
+    parsed = {
+        b"asha-2025": make_parsed_cas(mf=_year(2025, "100", "50"), name="Asha", pan="AAAAA1111A"),
+        b"ravi-2024": make_parsed_cas(mf=_year(2024, "0", "30"), name="Ravi", pan="BBBBB2222B"),
+        b"asha-2024": make_parsed_cas(mf=_year(2024, "0", "100"), name="Asha", pan="AAAAA1111A"),
+    }
+
+    def _read(stream, password):
+        key = stream.read()
+        if key not in parsed:
+            raise CASPasswordError("bad password")
+        return parsed[key]
+
+    monkeypatch.setattr(batch_mod, "read_cas", _read)
+    return [
+        BatchFile(name.decode() + ".pdf", name, "pw")
+        for name in (b"asha-2025", b"ravi-2024", b"asha-2024", b"locked")
+    ]
+
+
+def _by_file(report) -> dict[str, dict]:
+    return {entry["filename"]: entry for entry in report["files"]}
+
+
+def test_batch_persists_each_investor_oldest_first(user, family):
+    report = import_cas_batch(user, family, workers=1)
+
+    files = _by_file(report)
+    assert list(files) == ["asha-2025.pdf", "ravi-2024.pdf", "asha-2024.pdf", "locked.pdf"]
+    assert report["investors"] == 2
+    assert report["totals"] == {"success": 3, "failed": 1}
+    # 2024 ran first, so 2025 chained onto it: both full history, no partial warning.
+    asha = Investor.objects.get(name="Asha")
+    assert files["asha-2025.pdf"]["investor_id"] == files["asha-2024.pdf"]["investor_id"] == asha.id
+    first, second = ImportJob.objects.filter(investor=asha).order_by("started_at")
+    assert (first.filename, second.filename) == ("asha-2024.pdf", "asha-2025.pdf")
+    assert Transaction.objects.cost_basis().filter(investor=asha).count() == 2
+    # The unreadable file is reported with its reason and never got a job.
+    assert files["locked.pdf"] == {
+        "filename": "locked.pdf",
+        "investor_id": None,
+        "investor_name": "",
+        "job_id": None,
+        "status": "failed",
+        "stage": "parse",
+        "error": "Incorrect password for this statement.",
+    }
+    assert ImportJob.objects.count() == 3
+
+
+def test_batch_parses_across_the_pool(monkeypatch, user, family):
+    sizes = []
+    pool = ThreadPoolExecutor(max_workers=4)  # in-process stand-in
+
+    def _pool(workers):
+        sizes.append(workers)
+        return pool
+
+    monkeypatch.setattr(batch_mod, "_parse_pool", _pool)
+    report = import_cas_batch(user, family, workers=8)
+    pool.shutdown()
+
+    assert sizes == [8]
+    assert report["totals"] == {"success": 3, "failed": 1}
+
+
+def test_parse_pool_is_spawned_once_and_shared(monkeypatch):
+    """Real processes: each child spawns, sets Django up and runs the core reader."""
+    monkeypatch.setattr(batch_mod, "_pool", None)
+    junk = [BatchFile("a.pdf", b"not a pdf"), BatchFile("b.pdf", b"nor is this")]
+
+    first = batch_mod.parse_statements(junk, workers=2)
+    pool = batch_mod._pool
+    try:
+        second = batch_mod.parse_statements(junk, workers=2)
+        assert batch_mod._pool is pool  # reused, not re-spawned per batch
+        assert pool._mp_context.get_start_method() == "spawn"
+    finally:
+        pool.shutdown()
+
+    assert first == second
+    assert all(reason.startswith("Unhandled error while opening PDF") for reason in first)
+
+
+def test_batch_endpoint_reports_every_file(client, family):
+    uploads = [SimpleUploadedFile(f.name, f.content) for f in family]
+    resp = client.post("/api/imports/cas/batch", {"files": uploads, "passwords": ["pw"]})
+
+    assert resp.status_code == 201
+    body = resp.json()
+    assert [f["status"] for f in body["files"]] == ["success", "success", "success", "failed"]
+    assert body["investors"] == 2
+
+
+def test_batch_endpoint_rejects_mismatched_passwords(client, family):
+    uploads = [SimpleUploadedFile(f.name, f.content) for f in family]
+    resp = client.post("/api/imports/cas/batch", {"files": uploads, "passwords": ["a", "b"]})
+
+    assert resp.status_code == 422
+    assert ImportJob.objects.count() == 0
+
+
+def test_batch_command(tmp_path, family):
+    paths = []
+    for f in family:
+        path = tmp_path / f.name
+        path.write_bytes(f.content)
+        paths.append(str(path))
+    out = StringIO()
+
+    call_command("import_cas_batch", *paths, "--password", "pw", "--workers", "1", stdout=out)
+
+    lines = out.getvalue().splitlines()
+    assert "  asha-2024.pdf -> Asha  [success]" in lines
+    assert "  locked.pdf  [failed: Incorrect password for this statement.]" in lines
+    assert lines[-1] == "Imported 4 statements for 2 investors (1 failed, 3 success)"
@@ -0,0 +1,72 @@
+"""The ledger version: single-row writes bump it, an import bumps it once for all its
+rows, and a nested batch defers to the outer one."""
+
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from folioman_app.models import LedgerVersion
+from folioman_app.models.jobs import ImportJob, ImportJobStatus, ImportKind
+from folioman_app.services.imports import run_import_job
+from folioman_app.services.ledger_version import deferred_ledger_bumps
+
+pytestmark = pytest.mark.django_db
+
+_CSV = (
+    "security_type,name,symbol,isin,date,transaction_type,units,price,folio_number,broker\n"
+    + "".join(
+        f"equity,Reliance Industries,RELIANCE,INE002A01018,2024-01-0{day},buy,10,2000,"
+        "1208160000000001,Zerodha\n"
+        for day in range(1, 6)
+    )
+)
+
+
+def _version(investor) -> int:
+    return LedgerVersion.objects.get(investor=investor).version
+
+
+def _version_updates(queries) -> list[str]:
+    table = LedgerVersion._meta.db_table
+    return [q["sql"] for q in queries if q["sql"].startswith(f'UPDATE "{table}"')]
+
+
+def test_single_row_write_bumps(make_investor, make_security, make_transaction):
+    inv = make_investor()
+    LedgerVersion.objects.create(investor=inv)
+
+    txn = make_transaction(investor=inv, security=make_security(), date=dt.date(2024, 1, 1))
+    assert _version(inv) == 1
+    txn.delete()
+    assert _version(inv) == 2
+
+
+def test_import_bumps_once_for_all_its_rows(make_investor):
+    inv = make_investor()
+    LedgerVersion.objects.create(investor=inv)
+    job = ImportJob.objects.create(investor=inv, kind=ImportKind.CSV)
+
+    with CaptureQueriesContext(connection) as queries:
+        run_import_job(job, content=_CSV.encode())
+
+    assert job.status == ImportJobStatus.SUCCESS
+    assert inv.transactions.count() == 5
+    assert len(_version_updates(queries)) == 1
+    assert _version(inv) == 1
+
+
+def test_nested_batch_defers_to_the_outer_one(make_investor, make_security, make_transaction):
+    inv = make_investor()
+    LedgerVersion.objects.create(investor=inv)
+    sec = make_security()
+
+    with deferred_ledger_bumps():
+        with deferred_ledger_bumps():
+            make_transaction(investor=inv, security=sec, date=dt.date(2024, 1, 1))
+        make_transaction(investor=inv, security=sec, date=dt.date(2024, 1, 2))
+        assert _version(inv) == 0
+
+    assert _version(inv) == 1
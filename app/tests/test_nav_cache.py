@@ -0,0 +1,179 @@
+"""The process-wide NAV cache serves repeat loads without a query, answers exactly what
+a fresh query would, and is kept current by every ``NAVHistory`` writer — single-row
+saves, deletes and the bulk backfills — locally or through a shared Django cache."""
+
+from __future__ import annotations
+
+import datetime as dt
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from django.core.cache import caches
+from folioman_app.models import NAVHistory
+from folioman_app.services import nav_cache
+from folioman_app.services.price_index import PriceIndex
+from folioman_app.tasks import refresh_navs as refresh_navs_mod
+from folioman_app.tasks.refresh_navs import backfill_nav_history
+from folioman_core.models import NAVPoint, SecurityType
+
+pytestmark = pytest.mark.django_db
+
+_END = dt.date(2025, 12, 31)
+
+
+def _uncached(sec_ids, upto):
+    return PriceIndex.from_rows(
+        NAVHistory.objects.filter(security_id__in=sec_ids, date__lte=upto)
+        .order_by("security_id", "date")
+        .values_list("security_id", "date", "nav")
+    )
+
+
+@pytest.fixture
+def funds(make_security):
+    a, b = make_security(), make_security()
+    for day, nav in ((2, "10.5"), (3, "10.75"), (6, "11.000125")):
+        NAVHistory.objects.create(security=a, date=dt.date(2025, 1, day), nav=Decimal(nav))
+    NAVHistory.objects.create(security=b, date=dt.date(2025, 1, 3), nav=Decimal("99"))
+    return a, b
+
+
+def test_repeat_load_is_served_from_cache(funds, django_assert_num_queries):
+    a, b = funds
+    ids = [a.id, b.id]
+    with django_assert_num_queries(1):
+        PriceIndex.load(ids, _END)
+    dates = (_END, dt.date(2025, 1, 4), dt.date(2025, 1, 1))
+    with django_assert_num_queries(0):
+        cached = [PriceIndex.load(ids, upto) for upto in dates]
+
+    for upto, idx in zip(dates, cached, strict=True):
+        fresh = _uncached(ids, upto)
+        assert len(idx) == len(fresh)
+        assert [idx.history(i) for i in ids] == [fresh.history(i) for i in ids]
+
+    s = nav_cache.stats()
+    assert (s["hits"], s["misses"], s["entries"]) == (6, 2, 2)
+    assert repr(PriceIndex.load(ids, _END).tail(a.id, _END)) == repr(
+        [Decimal("10.750000"), Decimal("11.000125")]
+    )
+
+
+def test_single_row_writes_go_through(funds, django_assert_num_queries):
+    a, _b = funds
+    PriceIndex.load([a.id], _END)
+
+    # A newer point appends and a head correction replaces — no reload needed.
+    NAVHistory.objects.create(security=a, date=dt.date(2025, 1, 7), nav=Decimal("12"))
+    head = NAVHistory.objects.get(security=a, date=dt.date(2025, 1, 7))
+    head.nav = Decimal("12.5")
+    head.save()
+    with django_assert_num_queries(0):
+        assert PriceIndex.load([a.id], _END).price_at(a.id, _END) == Decimal("12.5")
+    assert nav_cache.stats()["appends"] == 2
+
+    # A back-dated correction and a delete drop the entry; the reload sees both.
+    older = NAVHistory.objects.get(security=a, date=dt.date(2025, 1, 3))
+    older.nav = Decimal("10.8")
+    older.save()
+    assert PriceIndex.load([a.id], _END).price_at(a.id, dt.date(2025, 1, 4)) == Decimal("10.8")
+    head.delete()
+    assert PriceIndex.load([a.id], _END).history(a.id) == _uncached([a.id], _END).history(a.id)
+
+
+def test_backfill_invalidates(monkeypatch, make_security):
+    mf = make_security(security_type=SecurityType.MF.value, amfi_code="120001")
+    NAVHistory.objects.create(security=mf, date=dt.date(2025, 1, 10), nav=Decimal("10"))
+    assert PriceIndex.load([mf.id], _END).price_at(mf.id, dt.date(2025, 1, 5)) is None
+
+    points = [NAVPoint(date=dt.date(2025, 1, d), nav=Decimal("9")) for d in (2, 3, 10)]
+    monkeypatch.setattr(
+        refresh_navs_mod,
+        "_fetch_mf_history",
+        lambda *_a, **_k: (SimpleNamespace(points=points, isin=""), "mfapi"),
+    )
+    assert backfill_nav_history(mf) == 2  # bulk_create: no signals, explicit invalidate
+
+    assert PriceIndex.load([mf.id], _END).price_at(mf.id, dt.date(2025, 1, 5)) == Decimal("9")
+    assert nav_cache.stats()["invalidations"] == 1
+
+
+def test_lru_evicts_least_recently_used(settings, funds, make_security):
+    settings.FOLIOMAN_NAV_CACHE_SIZE = 2
+    a, b = funds
+    c = make_security()
+    NAVHistory.objects.create(security=c, date=dt.date(2025, 1, 2), nav=Decimal("1"))
+
+    PriceIndex.load([a.id, b.id], _END)
+    PriceIndex.load([a.id], _END)  # b is now the least recently used
+    PriceIndex.load([c.id], _END)
+
+    assert nav_cache.lookup([a.id, b.id, c.id])[0].keys() == {a.id, c.id}
+    assert nav_cache.stats()["evictions"] == 1
+
+
+def test_write_during_fill_is_not_cached(funds):
+    a, _b = funds
+    _found, epoch = nav_cache.lookup([a.id])
+    stale = PriceIndex.from_rows(
+        NAVHistory.objects.filter(security=a).values_list("security_id", "date", "nav")
+    )
+    NAVHistory.objects.create(security=a, date=dt.date(2025, 1, 8), nav=Decimal("13"))
+
+    nav_cache.store({a.id: (stale._days[a.id], stale._navs[a.id])}, epoch)
+
+    assert nav_cache.lookup([a.id])[0] == {}
+    assert PriceIndex.load([a.id], _END).price_at(a.id, _END) == Decimal("13")
+
+
+def test_disabled_cache_queries_every_time(settings, funds, django_assert_num_queries):
+    settings.FOLIOMAN_NAV_CACHE_SIZE = 0
+    a, _b = funds
+    for _ in range(2):
+        with django_assert_num_queries(1):
+            assert PriceIndex.load([a.id], _END).price_at(a.id, _END) == Decimal("11.000125")
+    assert nav_cache.stats()["entries"] == 0
+
+
+@pytest.fixture
+def shared_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "nav": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "test-nav-cache",
+        },
+    }
+    settings.FOLIOMAN_NAV_CACHE_ALIAS = "nav"
+    yield caches["nav"]
+    caches["nav"].clear()
+
+
+def test_shared_backend(shared_cache, funds, django_assert_num_queries):
+    a, b = funds
+    PriceIndex.load([a.id, b.id], _END)
+    nav_cache.clear()  # another worker: nothing local, the shared copy serves it
+
+    with django_assert_num_queries(0):
+        idx = PriceIndex.load([a.id, b.id], _END)
+    assert repr(idx.history(a.id)) == repr(_uncached([a.id], _END).history(a.id))
+    assert nav_cache.stats()["backend"] == "shared"
+
+    # A shared write retires the generation rather than patching the stored series.
+    NAVHistory.objects.create(security=a, date=dt.date(2025, 1, 9), nav=Decimal("14"))
+    nav_cache.invalidate([b.id])
+    assert nav_cache.lookup([a.id, b.id])[0] == {}
+    assert PriceIndex.load([a.id], _END).price_at(a.id, _END) == Decimal("14")
+
+
+def test_shared_fill_racing_another_process_write_is_not_served(shared_cache, funds):
+    a, _b = funds
+    _found, token = nav_cache.lookup([a.id])
+    stale = _uncached([a.id], _END)
+    # Another process writes: its bump lands in the backend, not in this process.
+    shared_cache.incr(nav_cache._GEN_KEY.format(a.id))
+
+    nav_cache.store({a.id: (stale._days[a.id], stale._navs[a.id])}, token)
+
+    assert nav_cache.lookup([a.id])[0] == {}
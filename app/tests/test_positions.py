@@ -0,0 +1,113 @@
+"""Materialized current positions: writers leave them current inside their own
+transaction, reads never rebuild them, and the checker finds (and the command
+repairs) a table that drifted from the ledger."""
+
+from __future__ import annotations
+
+import datetime as dt
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from folioman_app.models import CurrentPosition, Transaction
+from folioman_app.services.positions import (
+    build_positions,
+    check_positions,
+    load_positions,
+    refresh_positions,
+)
+from folioman_app.tasks.import_csv import create_manual_transaction
+from folioman_core.models import HoldingSource, SecurityType
+
+pytestmark = pytest.mark.django_db
+
+
+def _manual(investor, kind: str, units: str) -> None:
+    create_manual_transaction(
+        investor,
+        {
+            "security_type": "equity",
+            "name": "Reliance Industries",
+            "isin": "INE002A01018",
+            "folio_number": "1208160007654321",
+            "broker": "ZERODHA",
+            "date": dt.date(2024, 1, 1),
+            "transaction_type": kind,
+            "units": Decimal(units),
+            "price": Decimal("2000"),
+        },
+    )
+
+
+def test_manual_entry_leaves_positions_current(make_investor):
+    inv = make_investor()
+    _manual(inv, "buy", "60")
+    _manual(inv, "sell", "15")
+
+    (position,) = CurrentPosition.objects.filter(investor=inv)
+    assert (position.units, position.invested_inr) == (Decimal("45"), Decimal("90000.00"))
+    assert position.source == HoldingSource.LEDGER.value
+    assert check_positions(inv) == []
+
+
+def test_manual_entry_rolls_back_with_its_positions(make_investor, monkeypatch):
+    from folioman_app.tasks import import_csv
+
+    inv = make_investor()
+    _manual(inv, "buy", "60")
+
+    def boom(investor):
+        raise RuntimeError("rebuild failed")
+
+    monkeypatch.setattr(import_csv, "refresh_positions", boom)
+    with pytest.raises(RuntimeError):
+        _manual(inv, "buy", "5")
+
+    assert inv.transactions.count() == 1
+    assert [p.units for p in CurrentPosition.objects.filter(investor=inv)] == [Decimal("60")]
+
+
+def test_read_is_one_query_and_never_rebuilds(
+    make_investor, make_security, make_holding, django_assert_num_queries
+):
+    inv = make_investor()
+    eq = make_security(security_type=SecurityType.EQUITY.value)
+    make_holding(investor=inv, security=eq, units=Decimal("5"), avg_cost_observed=Decimal("3"))
+
+    # A write that bypasses every writer: the read reports the stored rows as they are.
+    Transaction.objects.create(
+        investor=inv,
+        security=make_security(),
+        date=dt.date(2025, 2, 1),
+        transaction_type="buy",
+        units=Decimal("4"),
+        nav_or_price=Decimal("10"),
+        source="manual",
+    )
+    with django_assert_num_queries(1):
+        (position,) = load_positions([inv])[inv.id]
+    assert (position.security_id, position.units, position.invested_inr) == (
+        eq.id,
+        Decimal("5"),
+        Decimal("15.00"),
+    )
+
+
+def test_checker_reports_and_command_repairs_drift(make_investor, make_security, make_transaction):
+    inv = make_investor()
+    mf = make_security()
+    make_transaction(investor=inv, security=mf, units=Decimal("10"))
+
+    # A signal-less rewrite outside the writers: only the checker sees it.
+    Transaction.objects.filter(investor=inv).update(units=Decimal("12"))
+    (drift,) = check_positions(inv)
+    assert drift["security_id"] == mf.id
+    assert drift["stored"][0] == Decimal("10") and drift["expected"][0] == Decimal("12")
+
+    out = StringIO()
+    call_command("check_positions", "--repair", stdout=out)
+    assert "1 repaired" in out.getvalue()
+    assert check_positions(inv) == []
+    assert [p.units for p in build_positions(inv)] == [Decimal("12")]
+    assert refresh_positions(inv) == 1
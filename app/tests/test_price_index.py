@@ -0,0 +1,100 @@
+"""The array-backed NAV index answers exactly what the per-date ``NAVHistory`` lookup
+did, and one summary builds it once for every valuation path."""
+
+from __future__ import annotations
+
+import datetime as dt
+from decimal import Decimal
+
+import pytest
+from folioman_app.models import NAVHistory
+from folioman_app.services import price_index, valuation
+from folioman_app.services.price_index import PriceIndex
+from folioman_core.models import SecurityType
+
+pytestmark = pytest.mark.django_db
+
+
+def _latest(sec_id: int, as_of: dt.date):
+    return (
+        NAVHistory.objects.filter(security_id=sec_id, date__lte=as_of)
+        .order_by("-date")
+        .values_list("nav", flat=True)
+        .first()
+    )
+
+
+@pytest.fixture
+def priced(make_security):
+    a, b = make_security(), make_security()
+    for day, nav in ((3, "10.5"), (4, "10.123456"), (9, "0.000001"), (20, "123456789.5")):
+        NAVHistory.objects.create(security=a, date=dt.date(2025, 1, day), nav=Decimal(nav))
+    NAVHistory.objects.create(security=b, date=dt.date(2025, 1, 10), nav=Decimal("0"))
+    return a, b
+
+
+def test_lookups_match_navhistory_query(priced):
+    a, b = priced
+    idx = PriceIndex.load([a.id, b.id], dt.date(2025, 12, 31))
+    days = [dt.date(2025, 1, d) for d in range(1, 31)]
+
+    for sec in (a, b):
+        expected = [_latest(sec.id, d) for d in days]
+        # repr: the decoded Decimal is the row's own value, exponent included.
+        assert repr(idx.prices_at(sec.id, days)) == repr(expected)
+        assert repr([idx.price_at(sec.id, d) for d in days]) == repr(expected)
+        shuffled = days[::-1]
+        assert idx.prices_at(sec.id, shuffled) == [_latest(sec.id, d) for d in shuffled]
+
+
+def test_unknown_security_and_tail(priced):
+    a, _b = priced
+    idx = PriceIndex.load([a.id], dt.date(2025, 1, 9))
+
+    assert idx.price_at(999_999, dt.date(2025, 1, 9)) is None
+    assert idx.prices_at(999_999, [dt.date(2025, 1, 9)]) == [None]
+    assert idx.tail(a.id, dt.date(2025, 1, 9)) == [Decimal("10.123456"), Decimal("0.000001")]
+    assert idx.tail(a.id, dt.date(2025, 1, 3)) == [Decimal("10.5")]
+    assert idx.tail(a.id, dt.date(2025, 1, 2)) == []
+    assert a.id in idx and len(idx) == 1
+    assert idx.nbytes == 3 * (4 + 8)  # only the points up to ``upto``
+
+
+def test_history_thins_older_points_to_weekly(make_security):
+    sec = make_security()
+    start = dt.date(2024, 12, 30)  # a Monday
+    for n in range(28):  # four full weeks, daily
+        day = start + dt.timedelta(days=n)
+        NAVHistory.objects.create(security=sec, date=day, nav=Decimal(n))
+    idx = PriceIndex.load([sec.id], dt.date(2025, 12, 31))
+
+    thinned = idx.history(sec.id, weekly_before=dt.date(2025, 1, 20))
+
+    # Sundays of the first three weeks, then the fourth week day by day.
+    sundays = [dt.date(2025, 1, 5), dt.date(2025, 1, 12), dt.date(2025, 1, 19)]
+    assert [d for d, _nav in thinned[:3]] == sundays
+    assert [nav for _d, nav in thinned[3:]] == [Decimal(n) for n in range(21, 28)]
+    assert idx.history(sec.id, weekly_before=dt.date(2020, 1, 1)) == idx.history(sec.id)
+    assert idx.history(sec.id, weekly_before=dt.date(2030, 1, 1))[-1] == thinned[-1]
+
+
+def test_summary_loads_one_price_index(monkeypatch, make_investor, make_security, make_transaction):
+    inv = make_investor()
+    mf = make_security(security_type=SecurityType.MF.value)
+    make_transaction(investor=inv, security=mf, date=dt.date(2025, 1, 1))
+    NAVHistory.objects.create(security=mf, date=dt.date(2025, 1, 1), nav=Decimal("10"))
+    NAVHistory.objects.create(security=mf, date=dt.date(2025, 2, 1), nav=Decimal("12"))
+    loads: list = []
+    real = price_index.PriceIndex.load.__func__
+
+    def _counting(cls, security_ids, upto):
+        loads.append(upto)
+        return real(cls, security_ids, upto)
+
+    monkeypatch.setattr(PriceIndex, "load", classmethod(_counting))
+
+    summary = valuation.build_investor_summary(inv, dt.date(2025, 3, 1))
+
+    assert loads == [dt.date(2025, 3, 1)]
+    assert summary["total_inr"] == Decimal("1200")
+    assert summary["day_change_inr"] == Decimal("200")
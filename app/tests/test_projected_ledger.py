@@ -7,10 +7,11 @@ import datetime as dt
 from decimal import Decimal
 
 import pytest
+from folioman_app.mappers import to_core_transaction
 from folioman_app.models import AppliedCorporateAction
 from folioman_app.services.projected_ledger import compute_ledger, projected_transactions
 from folioman_core.fifo import apply_fifo, net_units_from_transactions
-from folioman_core.models import SecurityType, TransactionType
+from folioman_core.models import LedgerRow, SecurityType, TransactionType
 
 pytestmark = pytest.mark.django_db
 
@@ -123,6 +124,40 @@ def test_merger_rebases_old_lots_onto_the_acquirer_projection(
     assert raw.security_id == old.id
 
 
+def test_chained_mergers_carry_the_first_lots_through(
+    make_investor, make_security, make_transaction
+):
+    inv = make_investor()
+    first = _equity(make_security, "INE040A01042", "FIRSTCO")
+    middle = _equity(make_security, "INE040A01059", "MIDCO")
+    last = _equity(make_security, "INE040A01067", "LASTCO")
+    unrelated = _equity(make_security, "INE040A01075", "OTHERCO")
+    for sec in (first, unrelated):
+        make_transaction(
+            investor=inv,
+            security=sec,
+            date=dt.date(2019, 1, 1),
+            units=Decimal("10"),
+            nav_or_price=Decimal("100"),
+        )
+    for old, new, ex in ((first, middle, dt.date(2021, 1, 1)), (middle, last, dt.date(2023, 1, 1))):
+        AppliedCorporateAction.objects.create(
+            investor=inv,
+            security=old,
+            counterparty_security=new,
+            kind="merger",
+            ex_date=ex,
+            merger_ratio=Decimal("2"),
+            source_ref=f"merger-{old.symbol}",
+        )
+
+    # A -> B -> C: C's projection reaches A's lots through B, and nothing else.
+    rows = compute_ledger(inv, last)
+    assert net_units_from_transactions(rows) == Decimal("40")  # 10 * 2 * 2
+    assert apply_fifo(rows).invested == Decimal("1000")
+    assert {r.security.symbol for r in rows} == {"LASTCO"}
+
+
 def test_as_of_excludes_later_corporate_actions(make_investor, make_security, make_transaction):
     inv = make_investor()
     sec = _equity(make_security, "INE003A01024", "ASOF")
@@ -218,3 +253,48 @@ def test_projected_transactions_spans_the_whole_investor(
     b_units = net_units_from_transactions([r for r in rows if r.security.isin == "INE006A01012"])
     assert a_units == Decimal("30")  # AAA split 1->3
     assert b_units == Decimal("5")  # BBB untouched
+
+
+def test_raw_rows_replay_as_slotted_rows_sharing_one_security(
+    make_investor, make_security, make_transaction
+):
+    inv = make_investor()
+    sec = _equity(make_security, "INE009A01021", "SLOTS")
+    for day in (1, 2, 3):
+        make_transaction(investor=inv, security=sec, date=dt.date(2024, 1, day), source_ref=" r ")
+
+    rows = projected_transactions(inv)
+
+    assert all(type(r) is LedgerRow for r in rows)
+    assert len({id(r.security) for r in rows}) == 1
+    # Same values the validated mapping gives (whitespace stripped, currency normalised).
+    raw = inv.transactions.select_related("security", "folio").order_by("date")
+    assert [r.to_transaction() for r in rows] == [to_core_transaction(t) for t in raw]
+
+
+def test_events_share_the_ledgers_interned_securities(
+    make_investor, make_security, make_transaction, django_assert_num_queries
+):
+    inv = make_investor()
+    old = _equity(make_security, "INE010A01011", "OLDCO")
+    new = _equity(make_security, "INE011A01019", "NEWCO")
+    for day in (1, 2):
+        make_transaction(investor=inv, security=old, date=dt.date(2022, 1, day))
+    make_transaction(investor=inv, security=new, date=dt.date(2022, 1, 3))
+    AppliedCorporateAction.objects.create(
+        investor=inv,
+        security=old,
+        counterparty_security=new,
+        kind="merger",
+        ex_date=dt.date(2023, 1, 1),
+        merger_ratio=Decimal("2"),
+        source_ref="merger-interned",
+    )
+
+    with django_assert_num_queries(2):  # the ledger and the event log, relations joined
+        rows = projected_transactions(inv)
+
+    # One ``Security`` object per security: the rebased lots, the acquirer's own buy
+    # and the merger marker all carry the very same instance.
+    assert {r.type for r in rows} == {TransactionType.BUY, TransactionType.MERGER}
+    assert len({id(r.security) for r in rows}) == 1
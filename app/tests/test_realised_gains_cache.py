@@ -0,0 +1,219 @@
+"""Cached realised gains: served while current, rebuilt on a ledger, gating,
+classification or FMV change."""
+
+from __future__ import annotations
+
+import datetime as dt
+from decimal import Decimal
+
+import pytest
+from folioman_app.models import (
+    Folio,
+    LedgerVersion,
+    NAVHistory,
+    RealisedGain,
+    RealisedGainSet,
+    Security,
+    SecurityIntegrityStatus,
+)
+from folioman_app.models.jobs import ImportJob, ImportKind
+from folioman_app.services import tax_export
+from folioman_app.services.identity_remap import apply_identity_remap
+from folioman_app.services.tax_export import build_capital_gains, build_capital_gains_by_fy
+from folioman_app.tasks._upsert import upsert_security
+from folioman_app.tasks.import_csv import create_manual_transaction, process_csv
+from folioman_core.models import SecurityType
+from folioman_core.models.security import Security as CoreSecurity
+from folioman_core.reconciliation import IntegrityStatus
+
+pytestmark = pytest.mark.django_db
+
+_ISIN = "INE002A01018"
+_NEW_ISIN = "INE002A01026"
+_HEADER = "security_type,name,symbol,isin,date,transaction_type,units,price,folio_number,broker\n"
+
+
+def _trades(investor, *rows) -> None:
+    body = "".join(
+        f"equity,Reliance Industries,RELIANCE,{_ISIN},{on},{ttype},{units},{price},"
+        "1208160000000001,Zerodha\n"
+        for on, ttype, units, price in rows
+    )
+    job = ImportJob.objects.create(investor=investor, kind=ImportKind.CSV)
+    process_csv(job, (_HEADER + body).encode(), "")
+
+
+@pytest.fixture
+def computes(monkeypatch):
+    """Counts real gain computations (cache misses)."""
+    calls = []
+    real = tax_export._compute_gain_lines
+
+    def counting(*args):
+        calls.append(args[0])
+        return real(*args)
+
+    monkeypatch.setattr(tax_export, "_compute_gain_lines", counting)
+    return calls
+
+
+def test_second_read_is_served_from_cache(make_investor, computes):
+    inv = make_investor()
+    _trades(inv, ("2020-01-01", "buy", 10, 1000), ("2024-08-01", "sell", 4, 2000))
+
+    first = build_capital_gains(inv, "2024-25")
+    second = build_capital_gains(inv, "2024-25")
+
+    assert len(computes) == 1
+    assert second == first and second["ltcg_total"] == Decimal("4000.00")
+    gain_set = RealisedGainSet.objects.get(investor=inv, include_unreconciled=False)
+    assert list(gain_set.lines.values_list("fy", flat=True)) == ["2024-25"]
+
+
+def test_fy_read_comes_from_the_same_set(make_investor, computes):
+    inv = make_investor()
+    _trades(
+        inv,
+        ("2020-01-01", "buy", 10, 1000),
+        ("2022-08-01", "sell", 2, 1500),
+        ("2024-08-01", "sell", 4, 2000),
+    )
+
+    by_fy = build_capital_gains_by_fy(inv)
+    assert [r["fy"] for r in by_fy] == ["2022-23", "2024-25"]
+    older = build_capital_gains(inv, "2022-23")
+
+    assert len(computes) == 1
+    assert [r["sale_value"] for r in older["rows"]] == [Decimal("3000.00")]
+    assert RealisedGain.objects.filter(gain_set__investor=inv).count() == 2
+
+
+def test_ledger_write_invalidates(make_investor, computes):
+    inv = make_investor()
+    _trades(inv, ("2020-01-01", "buy", 10, 1000), ("2024-08-01", "sell", 4, 2000))
+    build_capital_gains(inv, "2024-25")
+
+    _trades(inv, ("2024-09-01", "sell", 6, 2500))
+    cg = build_capital_gains(inv, "2024-25")
+
+    assert len(computes) == 2
+    assert cg["ltcg_total"] == Decimal("13000.00")
+    assert RealisedGain.objects.filter(gain_set__investor=inv).count() == 2
+
+
+def test_identity_remap_invalidates(make_investor, computes):
+    inv = make_investor()
+    _trades(inv, ("2020-01-01", "buy", 10, 1000), ("2024-08-01", "sell", 4, 2000))
+    assert [r["isin"] for r in build_capital_gains(inv, "2024-25")["rows"]] == [_ISIN]
+    version = LedgerVersion.objects.get(investor=inv).version
+
+    # Moves the rows with QuerySet.update, which fires no signal.
+    apply_identity_remap(
+        inv, Folio.objects.get(investor=inv), Security.objects.get(isin=_ISIN), to_isin=_NEW_ISIN
+    )
+
+    assert LedgerVersion.objects.get(investor=inv).version == version + 1
+    assert [r["isin"] for r in build_capital_gains(inv, "2024-25")["rows"]] == [_NEW_ISIN]
+    assert len(computes) == 2
+
+
+def test_integrity_change_invalidates_without_a_ledger_write(make_investor, computes):
+    inv = make_investor()
+    _trades(inv, ("2020-01-01", "buy", 10, 1000), ("2024-08-01", "sell", 4, 2000))
+    assert build_capital_gains(inv, "2024-25")["rows"]
+
+    # A queryset update fires no signal and leaves the ledger version alone.
+    SecurityIntegrityStatus.objects.filter(investor=inv).update(
+        status=IntegrityStatus.USER_ACKNOWLEDGED
+    )
+
+    assert build_capital_gains(inv, "2024-25")["rows"] == []
+    assert len(computes) == 2
+
+
+def test_backfilled_fmv_invalidates_ungrandfathered_lines(make_investor, computes):
+    inv = make_investor()
+    _trades(inv, ("2017-01-01", "buy", 10, 100), ("2024-08-01", "sell", 10, 300))
+    assert build_capital_gains(inv, "2024-25")["rows"][0]["grandfathering_unavailable"]
+    build_capital_gains(inv, "2024-25")
+    assert len(computes) == 1
+
+    sec = Security.objects.get(isin=_ISIN)
+    NAVHistory.objects.create(security=sec, date=dt.date(2018, 1, 31), nav=Decimal("150"))
+    row = build_capital_gains(inv, "2024-25")["rows"][0]
+
+    assert len(computes) == 2
+    assert row["grandfathering_unavailable"] is False
+    assert row["gain"] == Decimal("1500.00")
+
+
+def test_corrected_fmv_invalidates_grandfathered_lines(make_investor, computes):
+    inv = make_investor()
+    _trades(inv, ("2017-01-01", "buy", 10, 100), ("2024-08-01", "sell", 10, 300))
+    sec = Security.objects.get(isin=_ISIN)
+    close = NAVHistory.objects.create(security=sec, date=dt.date(2018, 1, 31), nav=Decimal("150"))
+    assert build_capital_gains(inv, "2024-25")["rows"][0]["gain"] == Decimal("1500.00")
+
+    close.nav = Decimal("200")  # a corrected close for an ISIN that already had one
+    close.save()
+    row = build_capital_gains(inv, "2024-25")["rows"][0]
+
+    assert len(computes) == 2
+    assert row["gain"] == Decimal("1000.00")
+
+
+def test_cache_hit_checks_fmvs_without_resolving_them(make_investor, computes, monkeypatch):
+    inv = make_investor()
+    _trades(inv, ("2017-01-01", "buy", 10, 100), ("2024-08-01", "sell", 10, 300))
+    build_capital_gains(inv, "2024-25")
+
+    def no_preload(isins):
+        raise AssertionError("a cache hit resolved the FMVs")
+
+    monkeypatch.setattr(tax_export.FmvTable, "preload", no_preload)
+    assert build_capital_gains(inv, "2024-25")["rows"][0]["grandfathering_unavailable"]
+    assert len(computes) == 1
+
+
+def test_shared_fund_reclassified_by_another_import_invalidates(make_investor, computes):
+    fund = {"security_type": "mf", "name": "Flexi Cap Fund", "isin": "INF879O01027"}
+    inv = make_investor()
+    for on, ttype in ((dt.date(2022, 1, 3), "buy"), (dt.date(2024, 8, 1), "sell")):
+        create_manual_transaction(
+            inv,
+            {
+                **fund,
+                "folio_number": "12345/67",
+                "date": on,
+                "transaction_type": ttype,
+                "units": Decimal("10"),
+                "price": Decimal("100") if ttype == "buy" else Decimal("150"),
+            },
+        )
+    # Not flagged equity-oriented: outside 112A, so classified short-term.
+    assert build_capital_gains(inv, "2024-25")["rows"][0]["term"] == "short"
+
+    # Another investor's statement flags the shared fund — no write to this ledger.
+    upsert_security(
+        CoreSecurity(
+            type=SecurityType.MF,
+            name=fund["name"],
+            isin=fund["isin"],
+            metadata={"equity_oriented": True},
+        )
+    )
+    row = build_capital_gains(inv, "2024-25")["rows"][0]
+
+    assert len(computes) == 2
+    assert row["term"] == "long"
+
+
+def test_injected_fmv_lookup_bypasses_cache(make_investor, computes):
+    inv = make_investor()
+    _trades(inv, ("2020-01-01", "buy", 10, 1000), ("2024-08-01", "sell", 4, 2000))
+
+    build_capital_gains(inv, "2024-25", fmv_lookup=lambda *_: None)
+    build_capital_gains(inv, "2024-25", fmv_lookup=lambda *_: None)
+
+    assert len(computes) == 2
+    assert not RealisedGainSet.objects.filter(investor=inv).exists()
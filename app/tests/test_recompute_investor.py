@@ -0,0 +1,283 @@
+"""The investor-wide reconcile pass: same statuses as reconciling each (security, folio)
+on its own, from a fixed number of queries however large the book."""
+
+from __future__ import annotations
+
+import datetime as dt
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from folioman_app.models import (
+    AppliedCorporateAction,
+    CorporateActionReference,
+    PartialBlock,
+    Security,
+    SecurityIntegrityStatus,
+)
+from folioman_app.tasks import reconcile, valuation_jobs
+from folioman_app.tasks.reconcile import recompute_investor, reconcile_security
+from folioman_core.corporate_action_subject import CorpActionType
+from folioman_core.models import HoldingSource, SecurityType, TransactionType
+from folioman_core.reconciliation import IntegrityStatus
+
+pytestmark = pytest.mark.django_db
+
+_AS_OF = dt.date(2025, 6, 1)
+
+
+@pytest.fixture
+def book(make_investor, make_security, make_folio, make_transaction, make_holding):
+    """One of each kind of bucket: matching, acknowledged-mismatch and snapshot-only
+    funds, a zero eCAS line, a partial-history folio, an equity with an applied split
+    and a cached bonus, and a stale status for a folio that no longer has data."""
+    inv = make_investor()
+    mf_folio, other_folio, gone = (make_folio(investor=inv) for _ in range(3))
+    demat = make_folio(investor=inv, folio_type="demat", number="1208160000000001")
+    ok, gap, lone, zero, partial = (make_security() for _ in range(5))
+    for sec, folio, units in ((ok, mf_folio, "100"), (gap, mf_folio, "100")):
+        make_transaction(investor=inv, security=sec, folio=folio, units=Decimal(units))
+        make_transaction(
+            investor=inv,
+            security=sec,
+            folio=folio,
+            date=dt.date(2025, 3, 1),
+            transaction_type=TransactionType.SELL.value,
+            units=Decimal("40"),
+        )
+    make_holding(investor=inv, security=ok, folio=mf_folio, units=Decimal("60"))
+    make_holding(investor=inv, security=gap, folio=mf_folio, units=Decimal("75"))
+    make_holding(investor=inv, security=lone, folio=other_folio, units=Decimal("12.5"))
+    make_holding(
+        investor=inv,
+        security=zero,
+        folio=other_folio,
+        units=Decimal("0"),
+        source=HoldingSource.ECAS.value,
+    )
+    make_transaction(
+        investor=inv,
+        security=partial,
+        folio=other_folio,
+        transaction_type=TransactionType.SELL.value,
+        units=Decimal("5"),
+        cost_basis_complete=False,
+    )
+    PartialBlock.objects.create(
+        investor=inv, security=partial, folio=other_folio, opening_units=Decimal("20")
+    )
+
+    eq = make_security(security_type=SecurityType.EQUITY.value, isin="INE418H01026", symbol="AC")
+    make_transaction(investor=inv, security=eq, folio=demat, units=Decimal("60"))
+    AppliedCorporateAction.objects.create(
+        investor=inv,
+        folio=demat,
+        security=eq,
+        kind=CorpActionType.SPLIT.value,
+        ex_date=dt.date(2025, 2, 1),
+        unit_multiplier=Decimal("2"),
+        source_ref="split-test",
+    )
+    CorporateActionReference.objects.create(
+        security=eq,
+        isin=eq.isin,
+        symbol="AC",
+        exchange="NSE",
+        ex_date=dt.date(2025, 4, 1),
+        subject="Bonus 3:1",
+        parsed_type=CorpActionType.BONUS.value,
+        unit_multiplier=Decimal("4"),
+        source="nse",
+    )
+    make_holding(
+        investor=inv,
+        security=eq,
+        folio=demat,
+        units=Decimal("480"),
+        source=HoldingSource.ECAS.value,
+    )
+
+    def reset():
+        SecurityIntegrityStatus.objects.filter(investor=inv).delete()
+        for sec, folio, status in (
+            (gap, mf_folio, IntegrityStatus.USER_ACKNOWLEDGED),
+            (ok, gone, IntegrityStatus.RECONCILED),
+        ):
+            SecurityIntegrityStatus.objects.create(
+                investor=inv, security=sec, folio=folio, status=status.value
+            )
+
+    reset()
+    return inv, reset
+
+
+def _statuses(inv) -> list[tuple]:
+    return sorted(
+        SecurityIntegrityStatus.objects.filter(investor=inv).values_list(
+            "security_id",
+            "folio_id",
+            "status",
+            "tax_safe",
+            "units_from_transactions",
+            "units_from_holdings",
+            "issues",
+            "ledger_through",
+            "snapshot_as_of",
+        )
+    )
+
+
+def test_matches_reconciling_each_security(book):
+    inv, reset = book
+    securities = Security.objects.filter(
+        Q(id__in=inv.transactions.values("security_id"))
+        | Q(id__in=inv.holdings.values("security_id"))
+    )
+    per_bucket = [s for sec in securities for s in reconcile_security(inv, sec)]
+    expected = _statuses(inv)
+    reset()
+
+    batched = recompute_investor(inv)
+
+    assert _statuses(inv) == expected
+    assert len(batched) == len(per_bucket) == 5  # the zero line and the stale folio drop out
+    by_status = {s[2] for s in expected}
+    assert IntegrityStatus.USER_ACKNOWLEDGED.value in by_status  # preserved, not overwritten
+    equity = next(s for s in expected if s[0] == inv.transactions.get(units=60).security_id)
+    assert equity[4] == Decimal("120")  # the applied split, projected in
+    assert [i["type"] for i in equity[6]] == ["unit_mismatch", "corporate_action_suggestion"]
+
+
+def _mf_book(inv, make_security, make_folio, make_transaction, make_holding, funds: int):
+    for _ in range(funds):
+        folio = make_folio(investor=inv)
+        sec = make_security()
+        make_transaction(investor=inv, security=sec, folio=folio)
+        make_holding(investor=inv, security=sec, folio=folio, as_of_date=_AS_OF)
+
+
+def _queries(inv) -> int:
+    with CaptureQueriesContext(connection) as ctx:
+        recompute_investor(inv)
+    return len(ctx)
+
+
+def test_query_count_does_not_grow_with_the_book(
+    make_investor, make_security, make_folio, make_transaction, make_holding
+):
+    small, large = make_investor(), make_investor()
+    _mf_book(small, make_security, make_folio, make_transaction, make_holding, funds=3)
+    _mf_book(large, make_security, make_folio, make_transaction, make_holding, funds=30)
+
+    assert _queries(small) == _queries(large) <= 8
+    assert SecurityIntegrityStatus.objects.filter(investor=large).count() == 30
+    # A re-run updates the rows in place rather than adding more.
+    assert _queries(large) <= 8
+    assert SecurityIntegrityStatus.objects.filter(investor=large).count() == 30
+
+
+def _investors(make_investor, make_security, make_folio, make_transaction, make_holding, n=3):
+    out = []
+    for _ in range(n):
+        inv = make_investor()
+        _mf_book(inv, make_security, make_folio, make_transaction, make_holding, funds=2)
+        out.append(inv)
+    return out
+
+
+def test_reconcile_all_resumes_from_its_checkpoint(
+    tmp_path, make_investor, make_security, make_folio, make_transaction, make_holding
+):
+    first, *_rest = _investors(
+        make_investor, make_security, make_folio, make_transaction, make_holding
+    )
+    checkpoint = tmp_path / "reconcile.ckpt"
+    checkpoint.write_text(f"{first.id}\n")
+    seen = []
+
+    summary = reconcile.reconcile_all_investors(
+        checkpoint=checkpoint, progress=lambda done, total: seen.append((done, total))
+    )
+
+    assert summary == {"investors": 2, "statuses": 4, "resumed": 1}
+    assert seen == [(2, 3), (3, 3)]
+    assert not SecurityIntegrityStatus.objects.filter(investor=first).exists()
+    assert not checkpoint.exists()  # a finished run starts the next one afresh
+
+
+def test_reconcile_all_checkpoints_each_investor_before_a_failure(
+    monkeypatch, tmp_path, make_investor, make_security, make_folio, make_transaction, make_holding
+):
+    invs = _investors(make_investor, make_security, make_folio, make_transaction, make_holding)
+    real = reconcile.recompute_investor
+
+    def flaky(investor):
+        if investor.id == invs[2].id:
+            raise RuntimeError("boom")
+        return real(investor)
+
+    monkeypatch.setattr(reconcile, "recompute_investor", flaky)
+    checkpoint = tmp_path / "reconcile.ckpt"
+    with pytest.raises(RuntimeError):
+        reconcile.reconcile_all_investors(checkpoint=checkpoint)
+    assert checkpoint.read_text().split() == [str(invs[0].id), str(invs[1].id)]
+
+
+def test_reconcile_all_fans_out_over_the_pool(
+    monkeypatch, make_investor, make_security, make_folio, make_transaction, make_holding
+):
+    """With workers on a multi-writer database, investors go through the pool (an
+    inline stand-in here); SQLite stays serial."""
+    invs = _investors(make_investor, make_security, make_folio, make_transaction, make_holding)
+    mapped = []
+
+    class _InlinePool:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def map(self, fn, ids, chunksize=1):
+            mapped.extend(ids)
+            return [fn(iid) for iid in ids]
+
+    monkeypatch.setattr(valuation_jobs, "worker_pool", lambda workers: _InlinePool())
+    assert reconcile.reconcile_all_investors(workers=4)["statuses"] == 6
+    assert mapped == []  # SQLite: one writer, no pool
+
+    monkeypatch.setattr(reconcile, "_single_writer", lambda: False)
+    assert reconcile.reconcile_all_investors(workers=4) == {
+        "investors": 3,
+        "statuses": 6,
+        "resumed": 0,
+    }
+    assert mapped == [inv.id for inv in invs]
+
+
+def test_reconcile_all_command_reports_progress(monkeypatch, tmp_path):
+    from folioman_app.management.commands import reconcile_all as cmd
+
+    captured = {}
+
+    def _fake(*, workers, checkpoint, progress):
+        captured.update(workers=workers, checkpoint=checkpoint)
+        for done in range(1, 4):
+            progress(done, 40)
+        progress(40, 40)
+        return {"investors": 30, "statuses": 90, "resumed": 10}
+
+    monkeypatch.setattr(cmd, "reconcile_all_investors", _fake)
+    out = StringIO()
+    call_command("reconcile_all", "--workers", "4", "--checkpoint", str(tmp_path / "c"), stdout=out)
+
+    assert captured == {"workers": 4, "checkpoint": tmp_path / "c"}
+    assert out.getvalue().splitlines() == [
+        "  2/40 investors",
+        "  40/40 investors",
+        "Reconciled 90 statuses across 30 investors (resumed past 10)",
+    ]
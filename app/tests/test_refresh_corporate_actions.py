@@ -1,6 +1,6 @@
 """Corporate-action cache refresh into CorporateActionReference."""
 
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 
 import httpx
@@ -203,9 +203,10 @@ def test_command_passes_options_and_reports_summary(monkeypatch):
 
     captured = {}
 
-    def _fake(*, symbol=None, since=None):
+    def _fake(*, symbol=None, since=None, full=False):
         captured["symbol"] = symbol
         captured["since"] = since
+        captured["full"] = full
         return {"securities": 3, "events": 5, "skipped": 1, "errors": 0}
 
     monkeypatch.setattr(cmd, "refresh_corporate_actions", _fake)
@@ -216,10 +217,118 @@ def test_command_passes_options_and_reports_summary(monkeypatch):
 
     assert captured["symbol"] == "HDFCBANK"
     assert captured["since"] == date(2020, 1, 1)
+    assert captured["full"] is False
     assert "3 securities" in out.getvalue()
     assert "5 events" in out.getvalue()
 
 
+def _recording_fetch(calls, *, failing=()):
+    from folioman_core.price_feeds.corporate_actions_fetch import CorporateActionFetchError
+
+    def _fetch(symbol, *, exchange, start, **_kw):
+        calls.append((exchange, start))
+        if exchange in failing:
+            raise CorporateActionFetchError(f"{exchange} down")
+        return []
+
+    return _fetch
+
+
+class _NoClients:
+    nse = bse = None
+
+    def close(self):
+        pass
+
+
+@pytest.mark.django_db
+def test_sync_resumes_from_the_mark_with_overlap(monkeypatch, hdfc_security):
+    from django.utils import timezone
+    from folioman_app.models import CorporateActionSyncMark
+    from folioman_app.tasks import refresh_corporate_actions as task
+    from folioman_core.price_feeds import corporate_actions_fetch
+
+    calls = []
+    monkeypatch.setattr(corporate_actions_fetch, "fetch_corporate_actions", _recording_fetch(calls))
+    today = timezone.localdate()
+
+    sync_corporate_actions_for_security(hdfc_security, clients=_NoClients())
+    mark = CorporateActionSyncMark.objects.get(security=hdfc_security)
+    assert (mark.exchange, mark.fetched_through) == ("NSE", today)
+
+    sync_corporate_actions_for_security(hdfc_security, clients=_NoClients())
+    sync_corporate_actions_for_security(hdfc_security, full=True, clients=_NoClients())
+    earliest = corporate_actions_fetch.DEFAULT_EARLIEST
+    assert calls == [
+        ("NSE", earliest),  # never synced: the whole history
+        ("NSE", today - task._RESUME_OVERLAP),  # then only the recent tail
+        ("NSE", earliest),  # --full ignores the mark
+    ]
+
+
+@pytest.mark.django_db
+def test_sync_keeps_a_failed_exchanges_mark(monkeypatch, hdfc_security):
+    """With no listed exchange, NSE and BSE are fetched separately and a BSE outage
+    only holds back BSE's mark — the next pass re-covers it from there."""
+    from django.utils import timezone
+    from folioman_app.models import CorporateActionSyncMark
+    from folioman_app.tasks import refresh_corporate_actions as task
+    from folioman_core.price_feeds import corporate_actions_fetch
+
+    hdfc_security.exchange = ""
+    hdfc_security.save()
+    today = timezone.localdate()
+    CorporateActionSyncMark.objects.create(
+        security=hdfc_security, exchange="NSE", fetched_through=today - timedelta(days=1)
+    )
+    CorporateActionSyncMark.objects.create(
+        security=hdfc_security, exchange="BSE", fetched_through=today - timedelta(days=100)
+    )
+    calls = []
+    monkeypatch.setattr(
+        corporate_actions_fetch,
+        "fetch_corporate_actions",
+        _recording_fetch(calls, failing={"BSE"}),
+    )
+
+    assert sync_corporate_actions_for_security(hdfc_security, clients=_NoClients()) == 0
+
+    # Each exchange resumes from its own mark; BSE lagging doesn't widen NSE's window.
+    assert calls == [
+        ("NSE", today - timedelta(days=1) - task._RESUME_OVERLAP),
+        ("BSE", today - timedelta(days=100) - task._RESUME_OVERLAP),
+    ]
+    marks = dict(
+        CorporateActionSyncMark.objects.filter(security=hdfc_security).values_list(
+            "exchange", "fetched_through"
+        )
+    )
+    assert marks == {"NSE": today, "BSE": today - timedelta(days=100)}
+    hdfc_security.refresh_from_db()
+    assert hdfc_security.corporate_actions_synced_at is not None
+
+
+@pytest.mark.django_db
+def test_sync_propagates_a_bse_throttle(monkeypatch, hdfc_security):
+    """A BSE block aborts the batch like an NSE one, and moves no mark."""
+    from folioman_app.models import CorporateActionSyncMark
+    from folioman_core.price_feeds import corporate_actions_fetch
+    from folioman_core.price_feeds.corporate_actions_fetch import CorporateActionThrottled
+
+    hdfc_security.exchange = ""
+    hdfc_security.save()
+
+    def _fetch(symbol, *, exchange, **_kw):
+        if exchange == "BSE":
+            raise CorporateActionThrottled("blocked")
+        return []
+
+    monkeypatch.setattr(corporate_actions_fetch, "fetch_corporate_actions", _fetch)
+    with pytest.raises(CorporateActionThrottled):
+        sync_corporate_actions_for_security(hdfc_security, clients=_NoClients())
+    assert not CorporateActionSyncMark.objects.filter(security=hdfc_security).exists()
+
+
 def test_command_rejects_a_malformed_since_date(monkeypatch):
     from django.core.management import call_command
     from django.core.management.base import CommandError
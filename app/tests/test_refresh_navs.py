@@ -236,6 +236,39 @@ def test_refresh_is_idempotent_on_same_day(mocked_feeds):
     assert NAVHistory.objects.filter(date=_TODAY).count() == 1
 
 
+def test_refresh_upserts_points_in_batches(monkeypatch, django_assert_num_queries):
+    """Points are written with one bulk upsert per batch, not a SELECT + write per
+    security; a second pass updates the day's rows in place and keeps the NAV cache
+    current (bulk writes send no post_save)."""
+    monkeypatch.setattr(refresh_navs_mod, "_UPSERT_BATCH", 2)
+    funds = [
+        Security.objects.create(
+            security_type=SecurityType.MF.value, name=f"Fund {n}", amfi_code=f"12263{n}"
+        )
+        for n in range(5)
+    ]
+    recorded = []
+    monkeypatch.setattr(
+        refresh_navs_mod.nav_cache, "record_point", lambda *point: recorded.append(point)
+    )
+
+    for nav in ("75.5", "76.25"):
+        monkeypatch.setattr(
+            refresh_navs_mod.amfi_bulk,
+            "fetch_all_latest",
+            lambda nav=nav, **_: {
+                f.amfi_code: NAVPoint(date=_TODAY, nav=Decimal(nav)) for f in funds
+            },
+        )
+        with django_assert_num_queries(3):  # ceil(5 / 2) upserts
+            summary = refresh_navs(securities=funds)
+        assert summary == {"updated": 5, "skipped": 0, "errors": 0}
+
+    assert NAVHistory.objects.filter(date=_TODAY).count() == 5
+    assert set(NAVHistory.objects.values_list("nav", flat=True)) == {Decimal("76.25")}
+    assert recorded[-1] == (funds[-1].id, _TODAY, Decimal("76.25"))
+
+
 def test_refresh_records_feed_errors(monkeypatch):
     def _boom(code, **_):
         raise mfapi.NAVFetchError("mfapi down")
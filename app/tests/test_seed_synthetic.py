@@ -0,0 +1,104 @@
+"""The offline synthetic book: deterministic, corporate actions replayed, reconciled."""
+
+from __future__ import annotations
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from folioman_app.management.commands.seed_synthetic import (
+    SyntheticSpec,
+    build_synthetic_book,
+    synthetic_mf_statement,
+)
+from folioman_app.models import (
+    AppliedCorporateAction,
+    Investor,
+    NAVHistory,
+    SecurityIntegrityStatus,
+    Transaction,
+)
+from folioman_app.services import nav_cache
+from folioman_app.services.projected_ledger import compute_ledger
+from folioman_app.services.valuation import build_investor_summary
+from folioman_app.tasks.import_cas import persist_mf_statement
+from folioman_core.fifo import net_units_from_transactions
+
+pytestmark = pytest.mark.django_db
+
+_SPEC = SyntheticSpec(investors=2, funds=2, equities=4, years=2, sip_days=30, redeem_every=6)
+
+
+def _ledger(book) -> list[tuple]:
+    return list(
+        Transaction.objects.filter(investor__in=book.investors)
+        .order_by("investor__name", "security__name", "date")
+        .values_list("investor__name", "security__name", "date", "transaction_type", "units")
+    )
+
+
+def test_same_spec_same_book(user):
+    first = build_synthetic_book(_SPEC, user=user)
+    rows = _ledger(first)
+    navs = sorted(NAVHistory.objects.values_list("security__name", "date", "nav"))
+    first.delete()
+    assert not Investor.objects.exists() and not NAVHistory.objects.exists()
+
+    second = build_synthetic_book(_SPEC, user=user)
+
+    assert _ledger(second) == rows
+    assert sorted(NAVHistory.objects.values_list("security__name", "date", "nav")) == navs
+    assert {r[3] for r in rows} == {"buy", "sell"}  # SIPs and redemptions
+    assert NAVHistory.objects.count() == 6 * 730  # a daily series per security
+
+
+def test_book_drops_its_price_series_from_the_nav_cache(user, monkeypatch):
+    dropped = []
+    monkeypatch.setattr(nav_cache, "invalidate", dropped.extend)
+
+    book = build_synthetic_book(_SPEC, user=user)
+
+    assert sorted(dropped) == sorted(s.id for s in book.securities)
+
+
+def test_book_replays_corporate_actions_and_is_reconciled(user):
+    book = build_synthetic_book(_SPEC, user=user)
+    inv = book.investors[0]
+    _split, _bonus, merged, acquirer = book.equities
+
+    kinds = AppliedCorporateAction.objects.filter(investor=inv).values_list("kind", flat=True)
+    assert sorted(kinds) == ["bonus", "merger", "split"]
+    # Nobody holds the merged-away stock after the merger; its units moved across.
+    assert net_units_from_transactions(compute_ledger(inv, merged)) == 0
+    raw = sum(t.units for t in Transaction.objects.filter(investor=inv, security=acquirer))
+    assert net_units_from_transactions(compute_ledger(inv, acquirer)) > raw
+    # Every bucket has a full ledger, and the book values.
+    statuses = SecurityIntegrityStatus.objects.filter(investor=inv)
+    assert set(statuses.values_list("status", flat=True)) == {"full_history"}
+    summary = build_investor_summary(inv, _SPEC.end)
+    assert summary["holdings_count"] == 2 + 3  # both funds and the three stocks still listed
+
+
+def test_synthetic_statement_persists_as_a_full_ledger(user, make_investor):
+    book = build_synthetic_book(_SPEC, user=user)
+    holder = make_investor()
+
+    summary = persist_mf_statement(holder, synthetic_mf_statement(_SPEC, book))
+
+    assert summary["incomplete_history"] == []
+    per_fund = Transaction.objects.filter(investor=book.investors[0], security=book.funds[0])
+    assert Transaction.objects.filter(investor=holder).count() == 2 * per_fund.count()
+
+
+def test_command_seeds_once_unless_reset():
+    out = StringIO()
+    args = ["--investors", "1", "--funds", "1", "--equities", "1", "--years", "1"]
+    call_command("seed_synthetic", *args, stdout=out)
+    call_command("seed_synthetic", *args, stdout=out)
+    call_command("seed_synthetic", *args, "--reset", stdout=out)
+
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith("Seeded 1 investors, 2 securities, ")
+    assert lines[1] == "Synthetic book already present (pass --reset to rebuild)."
+    assert lines[2] == lines[0]
+    assert Investor.objects.count() == 1
@@ -0,0 +1,153 @@
+"""Persisted FIFO checkpoints: a resumed recompute is byte-identical to a full replay,
+is actually taken on an unchanged ledger, and is dropped/ignored once the ledger
+changes or a corporate action would make the tail projection differ."""
+
+from __future__ import annotations
+
+import datetime as dt
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from folioman_app.models import AppliedCorporateAction, FIFOCheckpoint, NAVHistory
+from folioman_app.services import valuation_checkpoints
+from folioman_app.services.valuation import _value_series
+from folioman_app.services.valuation_checkpoints import (
+    checkpointed_value_series,
+    ledger_fingerprint,
+)
+from folioman_app.tasks import valuation_jobs
+from folioman_core.models import SecurityType, TransactionType
+
+pytestmark = pytest.mark.django_db
+
+_TO = dt.date(2025, 6, 30)
+_START = dt.date(2025, 1, 1)
+
+
+@pytest.fixture(autouse=True)
+def _stub_feeds(monkeypatch):
+    monkeypatch.setattr(valuation_jobs, "refresh_navs", lambda **kw: {"updated": 0})
+    monkeypatch.setattr(valuation_jobs, "extend_tails", lambda **kw: {"securities": 0})
+
+
+@pytest.fixture
+def spy_after(monkeypatch):
+    """Record the ``after=`` each ledger load was asked for."""
+    seen: list = []
+    real = valuation_checkpoints._ledger_index
+
+    def _spy(investors, *, after=None):
+        seen.append(after)
+        return real(investors, after=after)
+
+    monkeypatch.setattr(valuation_checkpoints, "_ledger_index", _spy)
+    return seen
+
+
+@pytest.fixture
+def ledger(make_investor, make_security, make_folio, make_transaction):
+    """Two folios, an MF with a redemption, a split equity, and a fund first bought
+    inside the checkpoint lag (a bucket that only exists in the resumed tail)."""
+    inv = make_investor()
+    mf = make_security(security_type=SecurityType.MF.value)
+    late = make_security(security_type=SecurityType.MF.value)
+    eq = make_security(security_type=SecurityType.EQUITY.value, isin="INE111A01011", symbol="ACME")
+    f1, f2 = make_folio(investor=inv), make_folio(investor=inv)
+    rows = [
+        (mf, f1, dt.date(2025, 1, 3), TransactionType.BUY, "100.125", "10.1234"),
+        (mf, f2, dt.date(2025, 2, 1), TransactionType.BUY, "40", "11"),
+        (eq, f1, dt.date(2025, 2, 14), TransactionType.BUY, "10", "1500.55"),
+        (mf, f1, dt.date(2025, 3, 3), TransactionType.SELL, "33.3", "12.5"),
+        (mf, f1, dt.date(2025, 6, 26), TransactionType.SELL, "10", "13"),
+        (late, f2, dt.date(2025, 6, 27), TransactionType.BUY, "7.777", "21.5"),
+    ]
+    for sec, folio, when, ttype, units, price in rows:
+        make_transaction(
+            investor=inv,
+            security=sec,
+            folio=folio,
+            date=when,
+            transaction_type=ttype.value,
+            units=Decimal(units),
+            nav_or_price=Decimal(price),
+        )
+    AppliedCorporateAction.objects.create(
+        investor=inv,
+        folio=f1,
+        security=eq,
+        kind="split",
+        ex_date=dt.date(2025, 4, 1),
+        unit_multiplier=Decimal("2"),
+        source_ref="split-test",
+    )
+    for sec, nav in ((mf, "10.5"), (late, "21.75"), (eq, "760.1")):
+        NAVHistory.objects.create(security=sec, date=_START, nav=Decimal(nav))
+    return inv
+
+
+def test_resumed_series_matches_full_replay(ledger, spy_after):
+    first = checkpointed_value_series(ledger, _START, _TO)
+    assert repr(first) == repr(_value_series([ledger], _START, _TO, "daily"))
+    checkpoint = FIFOCheckpoint.objects.get(investor=ledger)
+    assert checkpoint.as_of == _TO - valuation_checkpoints._CHECKPOINT_LAG
+
+    resumed = checkpointed_value_series(ledger, dt.date(2025, 6, 28), _TO)
+
+    assert spy_after == [None, checkpoint.as_of]
+    # Decimal == ignores exponent; repr pins byte-identical points.
+    expected = _value_series([ledger], dt.date(2025, 6, 28), _TO, "daily")
+    assert repr(resumed) == repr(expected)
+
+
+def test_changed_ledger_falls_back_to_full_replay(ledger, spy_after, make_transaction):
+    checkpointed_value_series(ledger, _START, _TO)
+    before = ledger_fingerprint(ledger)
+    sec = ledger.transactions.first().security
+    make_transaction(investor=ledger, security=sec, date=dt.date(2025, 2, 2))
+    assert ledger_fingerprint(ledger) != before
+
+    points = checkpointed_value_series(ledger, dt.date(2025, 6, 28), _TO)
+
+    assert spy_after == [None, None]
+    assert repr(points) == repr(_value_series([ledger], dt.date(2025, 6, 28), _TO, "daily"))
+
+
+def test_late_corporate_action_blocks_resume(ledger, spy_after):
+    checkpointed_value_series(ledger, _START, _TO)
+    cp = FIFOCheckpoint.objects.get(investor=ledger)
+    # Fingerprint unchanged on purpose: the ex-date check alone must refuse the resume.
+    AppliedCorporateAction.objects.filter(investor=ledger).update(ex_date=dt.date(2025, 6, 29))
+    FIFOCheckpoint.objects.filter(pk=cp.pk).update(ledger_fingerprint=ledger_fingerprint(ledger))
+
+    points = checkpointed_value_series(ledger, dt.date(2025, 6, 28), _TO)
+
+    assert spy_after == [None, None]
+    assert repr(points) == repr(_value_series([ledger], dt.date(2025, 6, 28), _TO, "daily"))
+
+
+def test_dividend_only_ledger_takes_no_checkpoint(ledger):
+    AppliedCorporateAction.objects.filter(investor=ledger).update(
+        kind="dividend", unit_multiplier=None, dividend_per_share=Decimal("2")
+    )
+    checkpointed_value_series(ledger, _START, _TO)
+    assert not FIFOCheckpoint.objects.filter(investor=ledger).exists()
+
+
+def test_queue_recompute_drops_checkpoint(ledger):
+    checkpointed_value_series(ledger, _START, _TO)
+    valuation_jobs.queue_recompute(ledger, dt.date(2025, 6, 1))
+    assert not FIFOCheckpoint.objects.filter(investor=ledger).exists()
+
+
+def test_daily_recompute_resumes_from_checkpoint(ledger, spy_after):
+    """The scheduler path: a cold recompute leaves a checkpoint, the next revalue from
+    the computed-through date resumes from it and writes the same series."""
+    today = timezone.localdate()
+    assert valuation_jobs.recompute_investor_valuation(ledger.id, _START) == "ready"
+    cold = {v.date: v.value_inr for v in ledger.daily_values.all()}
+
+    assert valuation_jobs.recompute_investor_valuation(ledger.id, today) == "ready"
+
+    assert spy_after == [None, today - valuation_checkpoints._CHECKPOINT_LAG]
+    assert {v.date: v.value_inr for v in ledger.daily_values.all()} == cold
@@ -5,18 +5,22 @@ HTTP) — NAVHistory is created directly, as in test_refresh_navs."""
 from __future__ import annotations
 
 import datetime as dt
+import os
 from decimal import Decimal
 
 import pytest
 from django.utils import timezone
-from folioman_app.models import InvestorValue, NAVHistory, ValuationStatus
+from folioman_app.models import Investor, InvestorValue, NAVHistory, ValuationStatus
+from folioman_app.services import valuation
 from folioman_app.services.valuation import (
+    _value_series,
     build_investor_summary,
     compute_portfolio_period_returns,
 )
 from folioman_app.tasks import valuation_jobs
 from folioman_core.models import SecurityType, TransactionType
 from folioman_core.models.investor import FolioType
+from folioman_core.xirr import cashflows_from_transactions, compute_xirr
 
 pytestmark = pytest.mark.django_db
 
@@ -348,6 +352,141 @@ def test_process_pending_primes_navs_once_globally(
     assert calls["backfill"] == 1
 
 
+def _queued(make_investor, n: int) -> list[int]:
+    ids = []
+    for _ in range(n):
+        inv = make_investor()
+        inv.valuation_status = ValuationStatus.PENDING
+        inv.save()
+        ids.append(inv.id)
+    return ids
+
+
+def test_claims_are_disjoint_and_expired_leases_are_reclaimed(make_investor):
+    ids = _queued(make_investor, 5)
+
+    first = valuation_jobs.claim_due_investors("host-a:1", 3)
+    second = valuation_jobs.claim_due_investors("host-b:2", 3)
+    assert len(first) == 3 and len(second) == 2
+    assert {iid for iid, _ in first} | {iid for iid, _ in second} == set(ids)
+    assert valuation_jobs.claim_due_investors("host-c:3", 3) == []  # all leased
+
+    claimed = Investor.objects.get(pk=first[0][0])
+    assert claimed.valuation_status == ValuationStatus.COMPUTING
+    assert claimed.valuation_claimed_by == "host-a:1"
+    # host-a died mid-batch: once its lease lapses, the investor is due again.
+    Investor.objects.filter(pk=claimed.pk).update(
+        valuation_claimed_until=timezone.now() - dt.timedelta(seconds=1)
+    )
+    assert valuation_jobs.claim_due_investors("host-c:3", 3) == [(claimed.pk, None)]
+
+
+def test_finishing_a_recompute_releases_the_lease(make_investor):
+    (iid,) = _queued(make_investor, 1)
+    valuation_jobs.claim_due_investors("host-a:1", 1)
+
+    assert (
+        valuation_jobs.recompute_investor_valuation(iid, worker="host-a:1") == ValuationStatus.READY
+    )
+    inv = Investor.objects.get(pk=iid)
+    assert (inv.valuation_claimed_by, inv.valuation_claimed_until) == ("", None)
+
+
+def test_requeue_during_a_claimed_run_stays_pending(
+    monkeypatch, make_investor, make_security, make_transaction
+):
+    """An import that queues a recompute while a worker holds the investor must not
+    be marked ready over: the row stays pending, from the earlier start, unleased."""
+    inv = make_investor()
+    mf = make_security(security_type=SecurityType.MF.value)
+    make_transaction(investor=inv, security=mf, date=dt.date(2025, 1, 1))
+    NAVHistory.objects.create(security=mf, date=dt.date(2025, 1, 1), nav=Decimal("10"))
+    valuation_jobs.queue_recompute(inv, dt.date(2025, 1, 1))
+    [(iid, start)] = valuation_jobs.claim_due_investors("host-a:1", 1)
+
+    real = valuation_jobs.checkpointed_value_series
+
+    def series_then_import(investor, *args):
+        points = real(investor, *args)
+        valuation_jobs.queue_recompute(Investor.objects.get(pk=iid), dt.date(2025, 3, 1))
+        return points
+
+    monkeypatch.setattr(valuation_jobs, "checkpointed_value_series", series_then_import)
+    status = valuation_jobs.recompute_investor_valuation(iid, start, worker="host-a:1")
+
+    assert status == ValuationStatus.PENDING
+    inv.refresh_from_db()
+    assert inv.valuation_status == ValuationStatus.PENDING
+    assert inv.valuation_recompute_from == dt.date(2025, 1, 1)
+    assert (inv.valuation_claimed_by, inv.valuation_claimed_until) == ("", None)
+    # The next tick picks it up and finishes it.
+    assert valuation_jobs.claim_due_investors("host-b:2", 1) == [(iid, dt.date(2025, 1, 1))]
+
+
+def test_error_during_a_requeued_run_keeps_the_earlier_start(monkeypatch, make_investor):
+    (iid,) = _queued(make_investor, 1)
+    Investor.objects.filter(pk=iid).update(valuation_recompute_from=dt.date(2025, 5, 1))
+    valuation_jobs.claim_due_investors("host-a:1", 1)
+
+    def requeue_then_fail(investor):
+        valuation_jobs.queue_recompute(Investor.objects.get(pk=iid), dt.date(2025, 6, 1))
+        raise RuntimeError("feed down")
+
+    monkeypatch.setattr(valuation_jobs, "_held_security_ids", requeue_then_fail)
+    status = valuation_jobs.recompute_investor_valuation(
+        iid, dt.date(2025, 2, 1), worker="host-a:1"
+    )
+
+    assert status == ValuationStatus.PENDING
+    inv = Investor.objects.get(pk=iid)
+    assert (inv.valuation_status, inv.valuation_attempts) == (ValuationStatus.PENDING, 0)
+    assert inv.valuation_recompute_from == dt.date(2025, 2, 1)
+
+
+def test_worker_pool_spawns_its_processes():
+    """Spawned, not forked from the scheduler thread: each child sets Django up afresh."""
+    with valuation_jobs.worker_pool(1) as pool:
+        assert pool._mp_context.get_start_method() == "spawn"
+        assert pool.submit(os.getpid).result() != os.getpid()
+
+
+def test_worker_pool_tick_claims_batches_and_fans_out(monkeypatch, make_investor):
+    """With workers on a SKIP LOCKED database, the tick claims batches and maps them
+    over the pool (an inline stand-in here) until nothing is due."""
+    ids = _queued(make_investor, 10)
+    batches = []
+
+    class _InlinePool:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def map(self, fn, claims):
+            batches.append([iid for iid, _ in claims])
+            return [fn(claim) for claim in claims]
+
+    monkeypatch.setattr(valuation_jobs, "worker_pool", lambda workers: _InlinePool())
+    monkeypatch.setattr(
+        valuation_jobs.connection.features, "has_select_for_update_skip_locked", True
+    )
+
+    assert valuation_jobs.process_pending_valuations(workers=2) == 10
+    assert [len(b) for b in batches] == [8, 2]  # workers x _CLAIM_PER_WORKER per claim
+    assert sorted(iid for b in batches for iid in b) == sorted(ids)
+    assert set(Investor.objects.filter(pk__in=ids).values_list("valuation_status", flat=True)) == {
+        ValuationStatus.READY
+    }
+
+
+def test_serial_tick_ignores_live_claims(make_investor):
+    """The serial path still skips an investor another worker holds a live lease on."""
+    _queued(make_investor, 2)
+    valuation_jobs.claim_due_investors("host-a:1", 1)
+    assert valuation_jobs.process_pending_valuations(workers=0) == 1
+
+
 def test_empty_investor_is_ready_with_no_rows(make_investor):
     inv = make_investor()
     status = valuation_jobs.recompute_investor_valuation(inv.id)
@@ -424,7 +563,7 @@ def test_catch_up_fires_when_navs_stale_even_if_valuation_current(
     assert inv.valuation_status == ValuationStatus.PENDING
 
 
-def test_queue_recompute_seeds_provisional_and_marks_computing(make_investor):
+def test_queue_recompute_seeds_provisional_and_queues(make_investor):
     inv = make_investor()
     valuation_jobs.queue_recompute(
         inv,
@@ -434,7 +573,7 @@ def test_queue_recompute_seeds_provisional_and_marks_computing(make_investor):
         as_of=dt.date(2025, 3, 31),
     )
     inv.refresh_from_db()
-    assert inv.valuation_status == ValuationStatus.COMPUTING
+    assert inv.valuation_status == ValuationStatus.PENDING  # queued; computing = claimed
     assert inv.valuation_recompute_from == dt.date(2024, 4, 1)
     prov = InvestorValue.objects.get(investor=inv, date=dt.date(2025, 3, 31))
     assert prov.is_provisional and prov.value_inr == Decimal("50000")
@@ -592,6 +731,77 @@ def test_period_returns_windowed_xirr(make_investor, make_security, make_folio,
     assert six_month["absolute"] == pytest.approx(0.3333, abs=0.01)  # 1500 → 2000
 
 
+def test_period_returns_share_one_sweep(
+    monkeypatch, make_investor, make_security, make_folio, make_transaction
+):
+    """Every window comes from one cashflow pass and one FIFO sweep, and matches a
+    per-window rebuild: the window's flows, its opening value and the terminal."""
+    inv = make_investor()
+    folio = make_folio(investor=inv)
+    funds = [make_security(security_type=SecurityType.MF.value) for _ in range(3)]
+    for n, mf in enumerate(funds):
+        for month in range(1, 13, 2):
+            make_transaction(
+                investor=inv,
+                security=mf,
+                folio=folio,
+                date=dt.date(2023 + n % 2, month, 10),
+                units=Decimal("50"),
+                nav_or_price=Decimal(10 + month),
+            )
+        make_transaction(
+            investor=inv,
+            security=mf,
+            folio=folio,
+            date=dt.date(2024, 12, 2),
+            transaction_type=TransactionType.SELL.value,
+            units=Decimal("40"),
+            nav_or_price=Decimal("30"),
+        )
+        for month in range(1, 13):
+            for year in (2023, 2024):
+                NAVHistory.objects.create(
+                    security=mf, date=dt.date(year, month, 1), nav=Decimal(8 + month + n)
+                )
+    as_of = dt.date(2025, 1, 20)
+    ctx = valuation.PortfolioContext.load([inv], as_of)
+
+    def per_window(start):
+        def value(when):
+            agg = valuation._positions_asof(ctx.txn_keys, {}, when)
+            prices = {sec_id: ctx.nav_idx.price_at(sec_id, when) for sec_id in agg}
+            return sum(
+                (u * prices[s] for s, (_x, u, _i) in agg.items() if u > 0 and prices[s]),
+                Decimal("0"),
+            )
+
+        flows = [f for f in valuation._portfolio_cashflows(ctx.txn_keys) if start < f[0]]
+        opening = value(start)
+        flows += [(start, opening)] if opening > 0 else []
+        return compute_xirr(
+            cashflows_from_transactions(flows, present_date=as_of, present_value=value(as_of))
+        )
+
+    expected = {}
+    for label, months in valuation._RETURN_WINDOWS:
+        start = valuation._add_months(as_of, -months)
+        expected[label] = per_window(start) if start >= dt.date(2023, 1, 10) else None
+    expected["All"] = per_window(dt.date(2023, 1, 9))
+
+    sweeps = []
+    real_sweep = valuation._sweep_positions
+    monkeypatch.setattr(
+        valuation, "_sweep_positions", lambda *a, **k: sweeps.append(a[1]) or real_sweep(*a, **k)
+    )
+    monkeypatch.setattr(valuation, "_positions_asof", None)  # no per-window replay
+    returns = compute_portfolio_period_returns([inv], as_of, ctx)
+    got = {r["period"]: r["annualized"] for r in returns}
+
+    assert len(sweeps) == 1
+    assert got == {label: rate for label, rate in expected.items() if rate is not None}
+    assert {"1M", "1Y", "All"} <= got.keys() and "3Y" not in got
+
+
 def test_partial_equity_excluded_from_series_but_snapshot_counts_headline(
     make_investor, make_security, make_folio, make_transaction, make_holding
 ):
@@ -697,3 +907,98 @@ def test_symbolless_equity_degrades_not_blocks(
     status = valuation_jobs.recompute_investor_valuation(inv.id, dt.date(2025, 1, 1))
     assert status == ValuationStatus.READY  # degraded, not errored
     assert _values(inv)[dt.date(2025, 1, 1)] == Decimal("1000")  # only the priced MF
+
+
+def _replay_positions(txn_keys, samples, reductions=None):
+    """Reference: the per-date full FIFO replay the sweep replaced."""
+    from folioman_app.services.valuation import _positions_asof
+
+    out = []
+    for sample in samples:
+        agg = _positions_asof(txn_keys, {}, sample, reductions)
+        out.append((sample, {k: (v[1], v[2]) for k, v in agg.items()}))
+    return out
+
+
+def test_sweep_matches_per_date_replay(make_investor, make_security, make_folio, make_transaction):
+    """The single-pass engine yields the exact units/invested the per-date replay did —
+    across folios, partial sells, a same-day buy+sell, a bonus, and an over-sold bucket
+    (net units, zero cost from the bad row on)."""
+    from folioman_app.services.valuation import (
+        _ledger_index,
+        _sample_dates,
+        _sweep_positions,
+    )
+
+    inv = make_investor()
+    mf = make_security(security_type=SecurityType.MF.value)
+    other = make_security(security_type=SecurityType.MF.value)
+    f1, f2 = make_folio(investor=inv), make_folio(investor=inv)
+    rows = [
+        (mf, f1, dt.date(2024, 1, 5), TransactionType.BUY, "100", "10"),
+        (mf, f2, dt.date(2024, 1, 20), TransactionType.BUY, "50.125", "11"),
+        (mf, f1, dt.date(2024, 2, 10), TransactionType.SELL, "30.5", "12"),
+        (mf, f1, dt.date(2024, 2, 10), TransactionType.BUY, "7", "12"),
+        (mf, f2, dt.date(2024, 3, 1), TransactionType.BONUS, "5", "0"),
+        (other, f1, dt.date(2024, 1, 15), TransactionType.BUY, "10", "100"),
+        (other, f1, dt.date(2024, 2, 20), TransactionType.SELL, "25", "110"),  # over-sell
+        (other, f1, dt.date(2024, 3, 10), TransactionType.BUY, "3", "90"),
+    ]
+    for sec, folio, when, ttype, units, price in rows:
+        make_transaction(
+            investor=inv,
+            security=sec,
+            folio=folio,
+            date=when,
+            transaction_type=ttype.value,
+            units=Decimal(units),
+            nav_or_price=Decimal(price),
+        )
+    txn_keys, _ = _ledger_index([inv])
+    samples = _sample_dates(dt.date(2024, 1, 1), dt.date(2024, 4, 1), "daily")
+    ident = mf.isin or mf.symbol or mf.name
+    reductions = {ident: [(dt.date(2024, 2, 10), {dt.date(2024, 1, 5): Decimal("40")})]}
+
+    for reds in (None, reductions):
+        swept = [
+            (sample, {k: (v[1], v[2]) for k, v in agg.items()})
+            for sample, agg in _sweep_positions(txn_keys, samples, reds)
+        ]
+        expected = _replay_positions(txn_keys, samples, reds)
+        # Decimal == ignores exponent; repr pins the byte-identical rows.
+        assert repr(swept) == repr(expected)
+
+
+def test_value_series_daily_matches_replay_pricing(
+    make_investor, make_security, make_folio, make_transaction
+):
+    """End to end: the persisted daily points are what the replay would have priced."""
+    inv = make_investor()
+    mf = make_security(security_type=SecurityType.MF.value)
+    folio = make_folio(investor=inv)
+    for when, ttype, units in (
+        (dt.date(2025, 1, 1), TransactionType.BUY, "100"),
+        (dt.date(2025, 1, 10), TransactionType.SELL, "40"),
+        (dt.date(2025, 1, 20), TransactionType.BUY, "15.5"),
+    ):
+        make_transaction(
+            investor=inv,
+            security=mf,
+            folio=folio,
+            date=when,
+            transaction_type=ttype.value,
+            units=Decimal(units),
+            nav_or_price=Decimal("10"),
+        )
+    NAVHistory.objects.create(security=mf, date=dt.date(2025, 1, 1), nav=Decimal("10"))
+    NAVHistory.objects.create(security=mf, date=dt.date(2025, 1, 15), nav=Decimal("12.5"))
+
+    points = _value_series([inv], dt.date(2024, 12, 30), dt.date(2025, 1, 31), "daily")
+
+    by_date = {p["date"]: p for p in points}
+    assert by_date[dt.date(2024, 12, 31)]["value_inr"] == Decimal("0")
+    assert by_date[dt.date(2025, 1, 9)]["value_inr"] == Decimal("1000")
+    assert by_date[dt.date(2025, 1, 14)]["value_inr"] == Decimal("600")
+    assert by_date[dt.date(2025, 1, 15)]["value_inr"] == Decimal("750.0")
+    assert by_date[dt.date(2025, 1, 31)]["value_inr"] == Decimal("943.75")
+    assert by_date[dt.date(2025, 1, 31)]["invested_inr"] == Decimal("755.0")
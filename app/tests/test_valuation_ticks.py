@@ -15,7 +15,7 @@ from pathlib import Path
 import pytest
 from django.core.management import call_command
 from folioman_app import scheduler
-from folioman_app.tasks import valuation_jobs, valuation_ticks
+from folioman_app.tasks import import_ticks, valuation_jobs, valuation_ticks
 
 pytestmark = pytest.mark.django_db
 
@@ -40,10 +40,11 @@ def test_tick_contains_job_exception(monkeypatch):
 
 
 def test_pending_command_drives_tick(monkeypatch):
-    called = {"n": 0}
+    called = {"n": 0, "workers": []}
 
-    def fake_tick() -> int:
+    def fake_tick(workers=None) -> int:
         called["n"] += 1
+        called["workers"].append(workers)
         return 5
 
     monkeypatch.setattr(
@@ -54,6 +55,8 @@ def test_pending_command_drives_tick(monkeypatch):
     call_command("valuation_tick_pending", stdout=out)
     assert called["n"] == 1
     assert "5 processed" in out.getvalue()
+    call_command("valuation_tick_pending", "--workers", "4", stdout=StringIO())
+    assert called["workers"] == [None, 4]
 
 
 def test_daily_extend_command_drives_tick(monkeypatch):
@@ -129,13 +132,14 @@ def test_background_start_schedules_catch_up_off_the_init_thread(monkeypatch):
     catch_up = [(f, jid) for f, jid in added if jid == "catch_up_on_launch"]
     assert len(catch_up) == 1  # scheduled once as a one-shot job
     assert catch_up[0][0] is scheduler.run_catch_up_tick
+    assert (scheduler.run_stale_import_recovery_tick, "recover_stale_imports_on_launch") in added
     assert invoked["n"] == 0  # not called inline on the init thread
 
 
 def test_no_scheduler_import_leaks_into_neutral_modules():
     # The job + tick modules must stay broker/clock-free so they run from a bare
     # manage.py process and inside the pure-Python desktop build.
-    for module in (valuation_jobs, valuation_ticks):
+    for module in (import_ticks, valuation_jobs, valuation_ticks):
         src = Path(module.__file__).read_text()
         assert "import apscheduler" not in src
         assert "from apscheduler" not in src
@@ -9,6 +9,7 @@ from decimal import ROUND_FLOOR, Decimal
 
 from folioman_core.corporate_action_subject import CorpActionType
 from folioman_core.fifo import net_units_from_transactions
+from folioman_core.models.ledger_row import copy_row
 from folioman_core.models.security import Security, SecurityType
 from folioman_core.models.transaction import Transaction, TransactionSource, TransactionType
 
@@ -109,6 +110,8 @@ def _event_sort_key(event: CorporateActionApplyEvent) -> tuple:
 
 def _same_security(left: Security, right: Security) -> bool:
     """Identity match for apply passes — ISIN when both sides have one."""
+    if left is right:  # interned: every row of a security shares one object
+        return True
     if left.isin and right.isin:
         return left.isin == right.isin
     return left == right
@@ -162,10 +165,10 @@ def _stable_source_ref(core: Transaction) -> str:
 
 
 def _copy(txn: Transaction, **updates) -> Transaction:
-    """``model_copy`` that keeps ``ledger_id`` unless explicitly overridden."""
+    """:func:`copy_row` that keeps ``ledger_id`` unless explicitly overridden."""
     if "ledger_id" not in updates and txn.ledger_id is not None:
         updates = {**updates, "ledger_id": txn.ledger_id}
-    return txn.model_copy(update=updates)
+    return copy_row(txn, **updates)
 
 
 def cost_basis_complete_for_acquisition(acquired_on: date) -> bool:
@@ -383,7 +386,7 @@ def apply_bonus(
         folio_number=folio_number,
     )
     if not bonus.source_ref:
-        bonus = bonus.model_copy(update={"source_ref": _stable_source_ref(bonus)})
+        bonus = copy_row(bonus, source_ref=_stable_source_ref(bonus))
     return _sort_transactions([*transactions, bonus])
 
 
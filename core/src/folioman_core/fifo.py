@@ -13,6 +13,7 @@ from dataclasses import dataclass
 from datetime import date
 from decimal import ROUND_HALF_EVEN, Decimal
 
+from folioman_core.models.ledger_row import copy_row
 from folioman_core.models.security import Security
 from folioman_core.models.transaction import Transaction, TransactionSource, TransactionType
 
@@ -106,6 +107,25 @@ class FIFOUnits:
             f"average={self.average}, pnl={self.pnl}, lots={len(self._lots)})"
         )
 
+    def lot_state(self) -> tuple:
+        """The open lots and running totals — everything later rows depend on.
+
+        ``(balance, invested, average, pnl, lots)`` with ``lots`` as
+        ``(units, cost_total_remaining, acquired_on, stamp_duty_remaining)`` tuples.
+        Recorded disposals are not part of it: a restored tracker carries forward
+        cost basis and units, not the sell history already emitted.
+        """
+        return (self.balance, self.invested, self.average, self.pnl, tuple(self._lots))
+
+    @classmethod
+    def from_lot_state(cls, state: Sequence) -> FIFOUnits:
+        """Rebuild a tracker from :meth:`lot_state` so replay can resume mid-ledger."""
+        balance, invested, average, pnl, lots = state
+        fifo = cls(balance=balance, invested=invested, average=average)
+        fifo.pnl = pnl
+        fifo._lots.extend(tuple(lot) for lot in lots)
+        return fifo
+
     def add_transaction(self, txn: Transaction) -> None:
         """Apply one ledger row. Expects ``txn`` in chronological order."""
         if txn.type in (TransactionType.BUY, TransactionType.TRANSFER_IN):
@@ -375,7 +395,7 @@ def _scaled_to_units(txn: Transaction, units: Decimal) -> Transaction:
         updates["amount"] = txn.amount * ratio
     if txn.cost_total is not None:
         updates["cost_total"] = txn.cost_total * ratio
-    return txn.model_copy(update=updates)
+    return copy_row(txn, **updates)
 
 
 def net_intraday_offsets(transactions: Sequence[Transaction]) -> list[Transaction]:
@@ -439,6 +459,8 @@ def net_units_from_transactions(transactions: Iterable[Transaction]) -> Decimal:
 
 def _same_security(left: Security, right: Security) -> bool:
     """Identity match — ISIN when both sides have one."""
+    if left is right:  # interned: every row of a security shares one object
+        return True
     if left.isin and right.isin:
         return left.isin == right.isin
     return left == right
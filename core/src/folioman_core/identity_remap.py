@@ -4,11 +4,14 @@ from __future__ import annotations
 
 from collections.abc import Sequence
 
+from folioman_core.models.ledger_row import copy_row
 from folioman_core.models.security import Security
 from folioman_core.models.transaction import Transaction
 
 
 def _same_security(left: Security, right: Security) -> bool:
+    if left is right:
+        return True
     if left.isin and right.isin:
         return left.isin == right.isin
     return left == right
@@ -26,7 +29,7 @@ def remap_transaction_identities(
     out: list[Transaction] = []
     for txn in transactions:
         if _same_security(txn.security, from_security):
-            out.append(txn.model_copy(update={"security": to_security}))
+            out.append(copy_row(txn, security=to_security))
         else:
             out.append(txn)
     return out
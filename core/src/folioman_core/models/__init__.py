@@ -11,6 +11,7 @@ from folioman_core.models.cas import (
 )
 from folioman_core.models.holding import Holding, HoldingSource
 from folioman_core.models.investor import Folio, FolioType, Investor
+from folioman_core.models.ledger_row import LedgerRow, copy_row
 from folioman_core.models.nav import NAVHistory, NAVPoint
 from folioman_core.models.quote import Quote
 from folioman_core.models.security import Security, SecurityType
@@ -26,6 +27,7 @@ __all__ = [
     "Holding",
     "HoldingSource",
     "Investor",
+    "LedgerRow",
     "MfCasLineItem",
     "MfCasSchemeBlock",
     "MfCasStatement",
@@ -37,4 +39,5 @@ __all__ = [
     "Transaction",
     "TransactionSource",
     "TransactionType",
+    "copy_row",
 ]
@@ -0,0 +1,65 @@
+"""Slotted ledger rows for the FIFO / valuation hot path.
+
+A :class:`Transaction` validates every field on construction and carries pydantic's
+per-instance state — right at the import and API boundaries, where input is untrusted,
+but pure overhead when replaying tens of thousands of rows already stored (and
+validated) in the ledger. :class:`LedgerRow` has the same fields and defaults as a
+frozen, ``__slots__`` dataclass with no validation, so FIFO, the corporate-action
+engine and :func:`~folioman_core.fifo.net_intraday_offsets` read either one unchanged.
+
+Rows the corporate-action engine synthesises (bonus, split/merger markers, rights) are
+still validated ``Transaction`` objects — one per event — so a projected ledger may mix
+the two. Consumers read attributes only; copy a row with :func:`copy_row`, never
+``model_copy``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields, replace
+from datetime import date
+from decimal import Decimal
+
+from folioman_core.models.security import Security
+from folioman_core.models.transaction import Transaction, TransactionSource, TransactionType
+
+_ONE = Decimal("1")
+_ZERO = Decimal("0")
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class LedgerRow:
+    """A stored ledger event, unvalidated — see :class:`Transaction` for the field
+    semantics and sign convention. Build from trusted rows only."""
+
+    security: Security
+    date: date
+    type: TransactionType
+    units: Decimal
+    nav_or_price: Decimal
+    amount: Decimal | None = None
+    currency: str = "INR"
+    fx_rate_to_inr: Decimal = _ONE
+    fees: Decimal = _ZERO
+    stamp_duty: Decimal = _ZERO
+    brokerage: Decimal = _ZERO
+    cost_total: Decimal | None = None
+    source: TransactionSource
+    source_ref: str = ""
+    folio_number: str = ""
+    broker: str = ""
+    ledger_id: int | None = None
+
+    @classmethod
+    def from_transaction(cls, txn: Transaction) -> LedgerRow:
+        return cls(**{f.name: getattr(txn, f.name) for f in fields(cls)})
+
+    def to_transaction(self) -> Transaction:
+        """The validated pydantic row, for an API or export boundary."""
+        return Transaction(**{f.name: getattr(self, f.name) for f in fields(self)})
+
+
+def copy_row[Row: (Transaction, LedgerRow)](row: Row, **updates) -> Row:
+    """A copy of ``row`` with ``updates`` applied, of the same kind as ``row``."""
+    if isinstance(row, LedgerRow):
+        return replace(row, **updates)
+    return row.model_copy(update=updates)
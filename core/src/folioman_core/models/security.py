@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Mapping
 from enum import StrEnum
+from functools import cached_property
 from typing import Any, Self
 
 from pydantic import ConfigDict, Field, field_validator, model_validator
@@ -109,17 +111,44 @@ class Security(DomainModel):
             raise ValueError(msg)
         return self
 
-    def _identity(self) -> tuple:
+    # The identity tuple, its hash and the grouping key are computed once per object:
+    # a ledger's rows share one interned ``Security`` (see the app's mappers), so FIFO
+    # bucketing and intraday netting hash the same object thousands of times.
+    @cached_property
+    def _identity_cached(self) -> tuple:
         return (self.type, self.isin, self.symbol, self.exchange, self.amfi_code, self.currency)
 
+    @cached_property
+    def _hash_cached(self) -> int:
+        return hash(self._identity_cached)
+
+    @cached_property
+    def identity_key(self) -> str:
+        """Grouping key across the core/Django boundary: ISIN, else AMFI code, else
+        symbol, else name."""
+        return self.isin or self.amfi_code or self.symbol or self.name
+
+    def _identity(self) -> tuple:
+        return self._identity_cached
+
+    def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> Self:
+        # ``model_copy`` copies ``__dict__``, cached identity included — drop it so a
+        # copy with an updated ISIN/symbol hashes on its own fields.
+        copied = super().model_copy(update=update, deep=deep)
+        for name in ("_identity_cached", "_hash_cached", "identity_key"):
+            copied.__dict__.pop(name, None)
+        return copied
+
     def __hash__(self) -> int:
-        return hash(self._identity())
+        return self._hash_cached
 
     def __eq__(self, other: object) -> bool:
         # Identity-only equality (matches __hash__). Returning NotImplemented
         # for non-Security ``other`` lets Python try the reflected op / fall
         # back to ``is`` so ``Security == "string"`` behaves like any other
         # cross-type comparison instead of raising.
+        if other is self:
+            return True
         if not isinstance(other, Security):
             return NotImplemented
         return self._identity() == other._identity()
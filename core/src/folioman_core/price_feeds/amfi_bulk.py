@@ -12,12 +12,19 @@ blocks, then data rows)::
 
 Non-data lines (the header, blanks, bare section names) have fewer than five
 ``;`` and are skipped. A row whose NAV is non-numeric ("N.A.") is skipped.
+
+Both files are parsed as they stream in, line by line, never held whole — a 90-day
+history report runs to ~80 MB. Callers pass the codes/ISINs they hold as ``wanted``:
+other schemes' rows are dropped on their identifiers alone, before any NAV, date or
+point is built, so memory stays bounded by what is wanted, not by the window.
 """
 
 from __future__ import annotations
 
+import functools
 import time
 from collections import defaultdict
+from collections.abc import Collection, Iterable, Iterator
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
 
@@ -64,48 +71,60 @@ def _is_transient(exc: Exception) -> bool:
     return False
 
 
-def fetch_all_latest(*, client: httpx.Client | None = None) -> dict[str, NAVPoint]:
-    """Latest NAV for every scheme, keyed by AMFI code **and** each ISIN.
+def fetch_all_latest(
+    *, client: httpx.Client | None = None, wanted: Collection[str] | None = None
+) -> dict[str, NAVPoint]:
+    """Latest NAV for every scheme (or just the ``wanted`` codes/ISINs), keyed by AMFI
+    code **and** each ISIN.
 
     A scheme's numeric AMFI code and its payout/growth/reinvest ISINs all map to
     the same point, so a caller looks it up by whichever identifier it stores.
     """
-    return parse_navall(_fetch_text(_NAVALL_PATH, client=client))
+    return parse_navall(_stream_lines(_NAVALL_PATH, client=client), wanted=wanted)
 
 
-def parse_navall(text: str) -> dict[str, NAVPoint]:
-    """Parse NAVAll.txt into ``{amfi_code | isin: NAVPoint}``."""
+def parse_navall(
+    text: str | Iterable[str], *, wanted: Collection[str] | None = None
+) -> dict[str, NAVPoint]:
+    """Parse NAVAll.txt (the text, or its lines) into ``{amfi_code | isin: NAVPoint}``."""
     out: dict[str, NAVPoint] = {}
-    for line in text.splitlines():
+    for line in _lines(text):
         if line.count(";") < 5:  # header, blank, or a bare AMC/scheme-type name
             continue
         code, isin_a, isin_b, _name, raw_nav, raw_date = line.split(";")[:6]
+        keys = _keys(wanted, code, isin_a, isin_b)
+        if not keys:
+            continue
         try:
-            nav = Decimal(raw_nav.strip())
-            when = datetime.strptime(raw_date.strip(), "%d-%b-%Y").date()
+            point = NAVPoint(date=_day(raw_date.strip()), nav=Decimal(raw_nav.strip()))
         except (ValueError, InvalidOperation):
             continue
-        point = NAVPoint(date=when, nav=nav)
-        for key in (code.strip(), isin_a.strip(), isin_b.strip()):
-            if key and key != "-":
-                out.setdefault(key, point)
+        for key in keys:
+            out.setdefault(key, point)
     return out
 
 
 def fetch_range(
-    frmdt: date, todt: date, *, client: httpx.Client | None = None
+    frmdt: date,
+    todt: date,
+    *,
+    client: httpx.Client | None = None,
+    wanted: Collection[str] | None = None,
 ) -> dict[str, list[NAVPoint]]:
-    """Every scheme's NAVs across ``[frmdt, todt]``, keyed by AMFI code and each ISIN.
+    """Every scheme's (or just the ``wanted`` codes/ISINs') NAVs across ``[frmdt, todt]``,
+    keyed by AMFI code and each ISIN.
 
     One request backfills a whole date-range gap for the entire MF universe, instead
-    of a per-scheme call each. The report caps at ~90 days per request; callers keep
-    the window small (a fortnight-ish catch-up) since the file grows ~0.9 MB/day.
+    of a per-scheme call each. The report caps at ~90 days per request and grows
+    ~0.9 MB/day; it is parsed as it streams, so only the wanted rows are kept.
     """
     path = f"{_HISTORY_PATH}?frmdt={frmdt:%d-%b-%Y}&todt={todt:%d-%b-%Y}"
-    return parse_nav_history(_fetch_text(path, client=client))
+    return parse_nav_history(_stream_lines(path, client=client), wanted=wanted)
 
 
-def parse_nav_history(text: str) -> dict[str, list[NAVPoint]]:
+def parse_nav_history(
+    text: str | Iterable[str], *, wanted: Collection[str] | None = None
+) -> dict[str, list[NAVPoint]]:
     """Parse the NAV history report into ``{amfi_code | isin: [NAVPoint, ...]}``.
 
     Columns differ from NAVAll.txt (name comes second, ISINs third/fourth):
@@ -113,49 +132,75 @@ def parse_nav_history(text: str) -> dict[str, list[NAVPoint]]:
     Repurchase;Sale;Date``. Points accumulate per key across the requested dates.
     """
     out: dict[str, list[NAVPoint]] = defaultdict(list)
-    for line in text.splitlines():
+    for line in _lines(text):
         if line.count(";") < 7:  # header, blank, or a bare AMC/scheme-type name
             continue
         parts = line.split(";")
         code, _name, isin_a, isin_b, raw_nav, _repurchase, _sale, raw_date = parts[:8]
+        keys = _keys(wanted, code, isin_a, isin_b)
+        if not keys:
+            continue
         try:
-            nav = Decimal(raw_nav.strip())
-            when = datetime.strptime(raw_date.strip(), "%d-%b-%Y").date()
+            point = NAVPoint(date=_day(raw_date.strip()), nav=Decimal(raw_nav.strip()))
         except (ValueError, InvalidOperation):
             continue
-        point = NAVPoint(date=when, nav=nav)
-        for key in (code.strip(), isin_a.strip(), isin_b.strip()):
-            if key and key != "-":
-                out[key].append(point)
+        for key in keys:
+            out[key].append(point)
     return dict(out)
 
 
-def _fetch_text(
+def _lines(text: str | Iterable[str]) -> Iterable[str]:
+    return text.splitlines() if isinstance(text, str) else text
+
+
+def _keys(wanted: Collection[str] | None, *raw: str) -> list[str]:
+    """A row's identifiers (dash/blank ISINs dropped), restricted to ``wanted``."""
+    keys = []
+    for key in raw:
+        key = key.strip()
+        if key and key != "-" and (wanted is None or key in wanted):
+            keys.append(key)
+    return keys
+
+
+@functools.lru_cache(maxsize=4096)
+def _day(raw: str) -> date:
+    """``01-Jul-2026`` → date. Cached: a report repeats a handful of dates on every row."""
+    return datetime.strptime(raw, "%d-%b-%Y").date()
+
+
+def _stream_lines(
     path: str,
     *,
     client: httpx.Client | None,
     retries: int = _MAX_RETRIES,
     backoff: float = _BACKOFF_BASE,
-) -> str:
-    """GET ``path`` as text; wrap any failure as ``NAVFetchError`` (transient retried)."""
+) -> Iterator[str]:
+    """GET ``path`` and yield its lines as the body streams in; wrap any failure as
+    ``NAVFetchError``. A transient failure before the first line is retried; one
+    mid-body can't be resumed, so it raises and the caller's partial parse is dropped."""
     owned = client is None
     if owned:
         client = shared_client()
     try:
         for attempt in range(retries + 1):
+            started = False
             try:
-                response = client.get(path)
-                response.raise_for_status()
+                with client.stream("GET", path) as response:
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        started = started or ";" in line
+                        yield line
             except httpx.HTTPError as exc:
-                if attempt < retries and _is_transient(exc):
+                if not started and attempt < retries and _is_transient(exc):
                     _SLEEP(backoff * (2**attempt))
                     continue
                 msg = f"amfi GET {path} failed: {exc}"
                 raise NAVFetchError(msg) from exc
-            if not response.text or ";" not in response.text:
+            if not started:
                 msg = f"amfi GET {path}: unexpected body"
                 raise NAVFetchError(msg)
-            return response.text
+            return
         msg = f"amfi GET {path}: exhausted retries"  # unreachable
         raise NAVFetchError(msg)
     finally:
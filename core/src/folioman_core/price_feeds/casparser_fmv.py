@@ -9,10 +9,13 @@ casparser — our gains can only match casparser if we look up the same numbers.
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from datetime import date
 from decimal import Decimal
 
 from casparser.analysis.utils import nav_search
+from casparser_isin import MFISINDb
+from casparser_isin.utils import get_isin_db_path
 
 # Section 55(2)(ac) is fixed to the close of 31-Jan-2018 regardless of `on`,
 # but we accept the parameter so this matches the ``FmvLookup`` protocol.
@@ -31,4 +34,26 @@ def fmv_lookup(isin: str, on: date) -> Decimal | None:
     return nav_search(isin)
 
 
-__all__ = ["fmv_lookup"]
+def fmv_table(isins: Iterable[str]) -> dict[str, Decimal | None]:
+    """``fmv_lookup`` for many ISINs over one dataset connection.
+
+    ``nav_search`` opens the bundled SQLite file per call; a capital-gains run asks
+    for the same few funds once per grandfathered lot, so callers batch here.
+    Blank ISINs are dropped; an ISIN the dataset doesn't carry maps to ``None``.
+    """
+    wanted = sorted({isin for isin in isins if isin})
+    if not wanted:
+        return {}
+    with MFISINDb() as db:
+        return {isin: db.nav_lookup(isin) for isin in wanted}
+
+
+def dataset_stamp() -> str:
+    """Identifies the dataset file in use (path, size, mtime) without opening it, so a
+    cache of looked-up FMVs can tell when ``casparser-isin --update`` replaced it."""
+    path = get_isin_db_path()
+    stat = path.stat()
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+__all__ = ["dataset_stamp", "fmv_lookup", "fmv_table"]
@@ -27,6 +27,12 @@ BASE_URL = "https://api.coingecko.com"
 DEFAULT_TIMEOUT = 15.0
 
 
+def shared_client() -> httpx.Client:
+    """A client for a batch of calls — one pooled connection across coins. Caller
+    closes."""
+    return httpx.Client(base_url=BASE_URL, timeout=DEFAULT_TIMEOUT)
+
+
 def fetch_quote(
     coin_id: str,
     *,
@@ -452,8 +452,16 @@ def fetch_corporate_actions(
         )
     except CorporateActionFetchError:
         bse_events = []
-    seen = {_cross_feed_key(e) for e in events}
-    merged = list(events)
+    return merge_exchange_events(events, bse_events)
+
+
+def merge_exchange_events(
+    nse_events: list[CorporateActionEvent], bse_events: list[CorporateActionEvent]
+) -> list[CorporateActionEvent]:
+    """NSE rows plus the BSE-only ones, oldest-first, deduped on
+    (isin|symbol, ex_date, subject) regardless of which feed supplied them."""
+    seen = {_cross_feed_key(e) for e in nse_events}
+    merged = list(nse_events)
     for event in bse_events:
         key = _cross_feed_key(event)
         if key not in seen:
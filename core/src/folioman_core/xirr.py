@@ -7,6 +7,8 @@ is solved in ``float`` space (standard for root-finding); money never uses
 
 from __future__ import annotations
 
+import math
+import sys
 from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import date
@@ -14,6 +16,7 @@ from decimal import Decimal
 from itertools import groupby
 
 _ZERO = Decimal("0")
+_EPSILON = sys.float_info.epsilon
 
 
 @dataclass(frozen=True, slots=True)
@@ -32,33 +35,84 @@ def _npv(rate: float, flows: Sequence[tuple[float, float]]) -> float:
     return sum(amount / (1.0 + rate) ** year for year, amount in flows)
 
 
-def _npv_derivative(rate: float, flows: Sequence[tuple[float, float]]) -> float:
-    return sum(-year * amount / (1.0 + rate) ** (year + 1.0) for year, amount in flows)
+def _npv_and_derivative(rate: float, flows: Sequence[tuple[float, float]]) -> tuple[float, float]:
+    """NPV and its derivative in one pass: each flow's discount factor is computed
+    once and shared by both sums (the derivative term is ``-year * term / (1 + r)``)."""
+    base = 1.0 + rate
+    npv = slope = 0.0
+    for year, amount in flows:
+        term = amount / base**year
+        npv += term
+        slope -= year * term
+    return npv, slope / base
 
 
-def _bisect_xirr(
+def _brent_xirr(
     flows: Sequence[tuple[float, float]],
     *,
     tolerance: float,
     low: float = -0.999999,
     high: float = 100.0,
-    max_iterations: int = 200,
+    max_iterations: int = 100,
 ) -> float | None:
-    """Bracketed fallback for when Newton-Raphson fails to converge."""
-    f_low = _npv(low, flows)
-    f_high = _npv(high, flows)
-    if (f_low > 0.0) == (f_high > 0.0):
+    """Bracketed fallback for when Newton-Raphson fails to converge.
+
+    Brent's method: inverse-quadratic / secant steps, safeguarded by bisection so
+    the bracket always shrinks — superlinear near the root where plain bisection
+    needed ~30 halvings of ``[low, high]`` to reach ``tolerance``.
+    """
+    a, b = low, high
+    fa, fb = _npv(a, flows), _npv(b, flows)
+    if (fa > 0.0) == (fb > 0.0):
         return None  # no sign change in the bracket → no locatable root here
+    c, fc = b, fb
+    d = e = b - a
     for _ in range(max_iterations):
-        mid = (low + high) / 2.0
-        f_mid = _npv(mid, flows)
-        if abs(f_mid) < tolerance or (high - low) / 2.0 < tolerance:
-            return mid
-        if (f_mid > 0.0) == (f_low > 0.0):
-            low, f_low = mid, f_mid
+        if (fb > 0.0) == (fc > 0.0):
+            c, fc = a, fa  # keep the root bracketed between b and c
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2.0 * _EPSILON * abs(b) + 0.5 * tolerance
+        half = 0.5 * (c - b)
+        if abs(half) <= tol or abs(fb) < tolerance:
+            return b
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:  # secant
+                p, q = 2.0 * half * s, 1.0 - s
+            else:  # inverse quadratic interpolation
+                q, r = fa / fc, fb / fc
+                p = s * (2.0 * half * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0.0:
+                q = -q
+            p = abs(p)
+            if 2.0 * p < min(3.0 * half * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:  # interpolation would leave the bracket or converge too slowly
+                d = e = half
         else:
-            high = mid
-    return (low + high) / 2.0
+            d = e = half
+        a, fa = b, fb
+        b += d if abs(d) > tol else math.copysign(tol, half)
+        fb = _npv(b, flows)
+    return b
+
+
+def _float_flows(cashflows: Sequence[CashFlow]) -> list[tuple[float, float]] | None:
+    """``(year fraction, amount)`` pairs, oldest first — or ``None`` when there is no
+    rate to solve for (fewer than two flows, or not mixed-sign)."""
+    if len(cashflows) < 2:
+        return None
+    dated = sorted(cashflows, key=lambda row: row.date)
+    has_inflow = any(flow.amount > _ZERO for flow in dated)
+    has_outflow = any(flow.amount < _ZERO for flow in dated)
+    if not (has_inflow and has_outflow):
+        return None
+    start = dated[0].date
+    return [(_year_fraction(start, flow.date), float(flow.amount)) for flow in dated]
 
 
 def compute_xirr(
@@ -72,38 +126,56 @@ def compute_xirr(
 
     Returns ``None`` when there are fewer than two flows, when the flows are not
     mixed-sign (a root needs at least one inflow and one outflow), or when
-    neither Newton-Raphson nor the bisection fallback can locate a rate.
+    neither Newton-Raphson nor the Brent fallback can locate a rate.
     """
-    if len(cashflows) < 2:
-        return None
+    return compute_xirr_many(
+        [cashflows], guess=guess, max_iterations=max_iterations, tolerance=tolerance
+    )[0]
 
-    dated = sorted(cashflows, key=lambda row: row.date)
-    has_inflow = any(flow.amount > _ZERO for flow in dated)
-    has_outflow = any(flow.amount < _ZERO for flow in dated)
-    if not (has_inflow and has_outflow):
-        return None
 
-    start = dated[0].date
-    float_flows: list[tuple[float, float]] = [
-        (_year_fraction(start, flow.date), float(flow.amount)) for flow in dated
-    ]
+def compute_xirr_many(
+    cashflow_sets: Sequence[Sequence[CashFlow]],
+    *,
+    guess: float = 0.1,
+    max_iterations: int = 100,
+    tolerance: float = 1e-7,
+) -> list[float | None]:
+    """:func:`compute_xirr` for many independent flow sets (e.g. one per fund), in order.
 
-    rate = guess
+    The Newton iterations share one loop: each round steps every unsolved set once
+    and retires those that converged, so a portfolio's funds are solved together
+    rather than one after another; sets Newton can't finish go to the Brent fallback.
+    Each result is exactly what :func:`compute_xirr` returns for that set alone.
+    """
+    results: list[float | None] = [None] * len(cashflow_sets)
+    problems = {i: flows for i, cfs in enumerate(cashflow_sets) if (flows := _float_flows(cfs))}
+    rates = dict.fromkeys(problems, guess)
+    pending = list(problems)
+    fallback: list[int] = []
     for _ in range(max_iterations):
-        npv = _npv(rate, float_flows)
-        if abs(npv) < tolerance:
-            return rate
-        derivative = _npv_derivative(rate, float_flows)
-        if abs(derivative) < tolerance:
+        if not pending:
             break
-        next_rate = rate - npv / derivative
-        if next_rate <= -0.999999:
-            next_rate = -0.999999
-        if abs(next_rate - rate) < tolerance:
-            return next_rate
-        rate = next_rate
-
-    return _bisect_xirr(float_flows, tolerance=tolerance)
+        unsolved = []
+        for i in pending:
+            rate = rates[i]
+            npv, derivative = _npv_and_derivative(rate, problems[i])
+            if abs(npv) < tolerance:
+                results[i] = rate
+                continue
+            if abs(derivative) < tolerance:
+                fallback.append(i)  # flat: Newton can't make progress from here
+                continue
+            next_rate = max(rate - npv / derivative, -0.999999)
+            if abs(next_rate - rate) < tolerance:
+                results[i] = next_rate
+                continue
+            rates[i] = next_rate
+            unsolved.append(i)
+        pending = unsolved
+
+    for i in sorted([*fallback, *pending]):
+        results[i] = _brent_xirr(problems[i], tolerance=tolerance)
+    return results
 
 
 def cashflows_from_transactions(
@@ -3,7 +3,16 @@
 from datetime import date
 from decimal import Decimal
 
-from folioman_core.price_feeds.amfi_bulk import parse_nav_history, parse_navall
+import httpx
+import pytest
+from folioman_core.price_feeds import amfi_bulk
+from folioman_core.price_feeds.amfi_bulk import (
+    NAVFetchError,
+    fetch_all_latest,
+    fetch_range,
+    parse_nav_history,
+    parse_navall,
+)
 
 # Header, a blank line, a bare AMC section name, then data rows: one full row, one
 # with a dash reinvest ISIN, one code-only, and one with a non-numeric NAV.
@@ -87,3 +96,55 @@ def test_history_dash_isin_and_non_numeric_nav_handled():
     assert m["119551"][0].nav == Decimal("45.1200")
     assert "100000" not in m  # N.A. NAV row skipped
     assert "Scheme Code" not in m  # header skipped
+
+
+def _chunked(body: str, size: int = 7):
+    """Serve ``body`` in small byte chunks, so lines (and a UTF-8 char) split across reads."""
+    raw = body.encode()
+    return [raw[i : i + size] for i in range(0, len(raw), size)]
+
+
+def _client(body: str, seen: list | None = None) -> httpx.Client:
+    def handler(request):
+        if seen is not None:
+            seen.append(request.url)
+        return httpx.Response(200, content=iter(_chunked(body)))
+
+    return httpx.Client(base_url="https://amfi.test", transport=httpx.MockTransport(handler))
+
+
+def test_wanted_keeps_only_those_schemes():
+    m = parse_navall(SAMPLE, wanted={"INF209KA12Z1", "100999"})
+    assert m.keys() == {"INF209KA12Z1", "100999"}  # not the row's other code
+    h = parse_nav_history(_HISTORY.splitlines(), wanted={"120503"})
+    assert h.keys() == {"120503"}  # the row's ISINs aren't wanted, so not keyed
+    assert len(h["120503"]) == 2
+
+
+def test_fetch_range_parses_the_streamed_report():
+    seen = []
+    body = _HISTORY.replace("Some Fund", "Fönd")
+    with _client(body, seen) as client:
+        m = fetch_range(date(2026, 7, 1), date(2026, 7, 2), client=client, wanted={"120503"})
+    assert str(seen[0]).endswith("?frmdt=01-Jul-2026&todt=02-Jul-2026")
+    assert m == parse_nav_history(_HISTORY, wanted={"120503"})
+
+
+def test_fetch_all_latest_streams_navall():
+    with _client(SAMPLE) as client:
+        m = fetch_all_latest(client=client)
+    assert m.keys() == parse_navall(SAMPLE).keys()
+    assert m["INF209K01165"] is m["120503"]
+
+
+def test_body_without_rows_raises():
+    with _client("<html>maintenance</html>") as client, pytest.raises(NAVFetchError):
+        fetch_all_latest(client=client)
+
+
+def test_report_dates_parse_once():
+    amfi_bulk._day.cache_clear()
+    parse_nav_history(_HISTORY)
+    info = amfi_bulk._day.cache_info()
+    # Two distinct dates (plus the header's "Date", which never parses) over four rows.
+    assert (info.misses, info.hits) == (3, 2)
@@ -536,3 +536,24 @@ def test_demerger_reduction_apportions_across_same_date_lots():
     )
     # 200*103 - 1566 = 19034.
     assert fifo.invested == Decimal("19034")
+
+
+def test_lot_state_round_trip_resumes_identically():
+    """A tracker rebuilt from ``lot_state`` mid-ledger ends exactly where a full replay
+    does — the persisted-checkpoint resume path."""
+    from folioman_core.fifo import FIFOUnits
+
+    head = [
+        _buy("100", "10.0000", "1000.00", on=date(2024, 1, 1)),
+        _buy("33.333", "12.1234", "404.11", on=date(2024, 2, 1)),
+        _sell("55.5", "13.0000", on=date(2024, 3, 1)),
+    ]
+    tail = [_sell("20", "14.0000", on=date(2024, 6, 1))]
+    full = apply_fifo([*head, *tail])
+
+    resumed = FIFOUnits.from_lot_state(apply_fifo(head).lot_state())
+    for txn in tail:
+        resumed.add_transaction(txn)
+
+    assert resumed.lot_state() == full.lot_state()
+    assert repr(resumed.lot_state()) == repr(full.lot_state())
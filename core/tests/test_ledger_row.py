@@ -0,0 +1,94 @@
+"""Slotted ledger rows replay exactly like validated ``Transaction``s."""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime as dt
+from decimal import Decimal
+
+import pytest
+from folioman_core.corporate_action_subject import CorpActionType
+from folioman_core.corporate_actions import CorporateActionApplyEvent, apply_corporate_action_events
+from folioman_core.fifo import build_sell_disposals, net_intraday_offsets
+from folioman_core.models import LedgerRow, SecurityType, TransactionSource, TransactionType
+from folioman_core.models.security import Security
+from folioman_core.models.transaction import Transaction
+
+OLD = Security(type=SecurityType.EQUITY, name="Old", isin="INE111A01011", symbol="OLD")
+NEW = Security(type=SecurityType.EQUITY, name="New", isin="INE222B01022", symbol="NEW")
+
+
+def _ledger() -> list[Transaction]:
+    def row(day, kind, units, price, sec=OLD, ledger_id=None):
+        return Transaction(
+            security=sec,
+            date=dt.date(2024, 1, day),
+            type=kind,
+            units=Decimal(units),
+            nav_or_price=Decimal(price),
+            brokerage=Decimal("1.5"),
+            source=TransactionSource.CSV_IMPORT,
+            folio_number="1201",
+            ledger_id=ledger_id,
+        )
+
+    return [
+        row(2, TransactionType.BUY, "10", "100", ledger_id=1),
+        row(3, TransactionType.BUY, "5", "101", ledger_id=2),
+        row(3, TransactionType.SELL, "2", "102", ledger_id=3),  # intraday: nets to 3 bought
+        row(8, TransactionType.BUY, "3", "50", sec=NEW, ledger_id=4),
+        row(20, TransactionType.SELL, "7", "40", sec=NEW, ledger_id=5),
+    ]
+
+
+_EVENTS = [
+    CorporateActionApplyEvent(
+        kind=CorpActionType.SPLIT,
+        ex_date=dt.date(2024, 1, 5),
+        security=OLD,
+        unit_multiplier=Decimal("3"),
+        source_ref="split-1",
+    ),
+    CorporateActionApplyEvent(
+        kind=CorpActionType.MERGER,
+        ex_date=dt.date(2024, 1, 10),
+        security=NEW,
+        merger_old_security=OLD,
+        merger_new_security=NEW,
+        merger_ratio=Decimal("0.3"),
+        source_ref="merger-1",
+    ),
+    CorporateActionApplyEvent(
+        kind=CorpActionType.BONUS,
+        ex_date=dt.date(2024, 1, 15),
+        security=NEW,
+        unit_multiplier=Decimal("2"),
+        bonus_ratio=(1, 1),
+        source_ref="bonus-1",
+    ),
+]
+
+
+def _replay(rows):
+    return apply_corporate_action_events(net_intraday_offsets(rows), _EVENTS)
+
+
+def test_replay_matches_validated_transactions():
+    validated = _ledger()
+    slotted = [LedgerRow.from_transaction(t) for t in validated]
+
+    via_model, via_rows = _replay(validated), _replay(slotted)
+
+    assert [r.ledger_id for r in via_rows if isinstance(r, LedgerRow)] == [1, 2, 4, 5]
+    assert [r.to_transaction() if isinstance(r, LedgerRow) else r for r in via_rows] == via_model
+    assert build_sell_disposals(via_rows) == build_sell_disposals(via_model)
+
+
+def test_row_is_frozen_and_round_trips():
+    txn = _ledger()[0]
+    row = LedgerRow.from_transaction(txn)
+
+    assert not hasattr(row, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        row.units = Decimal("1")  # type: ignore[misc]
+    assert row.to_transaction() == txn
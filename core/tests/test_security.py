@@ -220,3 +220,18 @@ def test_security_equality_returns_notimplemented_for_other_types():
     assert (sec == "INF174V01317") is False
     assert (sec == None) is False  # noqa: E711 — testing operator, not bool
     assert (sec == 42) is False
+
+
+def test_security_cached_identity_follows_a_copy():
+    sec = Security(type=SecurityType.EQUITY, name="Infosys", isin="INE009A01021", symbol="INFY")
+    assert sec.identity_key == "INE009A01021"
+    hash(sec)  # fills the cache
+
+    moved = sec.model_copy(update={"isin": "INE467B01029"})
+    assert moved.identity_key == "INE467B01029"
+    same = Security(type=SecurityType.EQUITY, name="TCS", isin="INE467B01029", symbol="INFY")
+    assert hash(moved) == hash(same)
+    assert moved != sec
+    assert "identity_key" not in sec.model_dump()
+    mf = Security(type=SecurityType.MF, name="Fund", amfi_code="122639")
+    assert mf.identity_key == "122639"
@@ -6,9 +6,10 @@ from decimal import Decimal
 import pytest
 from folioman_core.xirr import (
     CashFlow,
-    _bisect_xirr,
+    _brent_xirr,
     cashflows_from_transactions,
     compute_xirr,
+    compute_xirr_many,
 )
 
 
@@ -48,14 +49,14 @@ def test_xirr_returns_none_for_all_zero_flows():
     assert compute_xirr(flows) is None
 
 
-def test_bisect_xirr_finds_root():
+def test_brent_xirr_finds_root():
     # -1000 now, +1100 in a year → 10%
-    rate = _bisect_xirr([(0.0, -1000.0), (1.0, 1100.0)], tolerance=1e-7)
+    rate = _brent_xirr([(0.0, -1000.0), (1.0, 1100.0)], tolerance=1e-7)
     assert rate == pytest.approx(0.1, rel=1e-4)
 
 
-def test_bisect_xirr_returns_none_without_sign_change():
-    assert _bisect_xirr([(0.0, 1000.0), (1.0, 1100.0)], tolerance=1e-7) is None
+def test_brent_xirr_returns_none_without_sign_change():
+    assert _brent_xirr([(0.0, 1000.0), (1.0, 1100.0)], tolerance=1e-7) is None
 
 
 def test_xirr_returns_none_without_sign_change():
@@ -80,3 +81,28 @@ def test_cashflows_from_transactions_groups_by_date():
     assert flows[0].amount == Decimal("-1500")
     assert flows[1].amount == Decimal("200")
     assert flows[-1].amount == Decimal("2000")
+
+
+_SIP = [
+    CashFlow(date=date(2021, 1, 5), amount=Decimal("-5000")),
+    CashFlow(date=date(2021, 7, 5), amount=Decimal("-5000")),
+    CashFlow(date=date(2022, 1, 5), amount=Decimal("-5000")),
+    CashFlow(date=date(2022, 3, 9), amount=Decimal("2500")),
+    CashFlow(date=date(2024, 1, 5), amount=Decimal("16900")),
+]
+
+
+def test_brent_fallback_agrees_with_newton():
+    # One Newton step can't converge, so the bracketed fallback finishes the solve.
+    assert compute_xirr(_SIP, max_iterations=1) == pytest.approx(compute_xirr(_SIP), abs=1e-7)
+
+
+def test_compute_xirr_many_matches_one_at_a_time():
+    sets = [
+        _SIP,
+        [CashFlow(date=date(2024, 1, 1), amount=Decimal("-1000"))],  # unsolvable
+        [*_SIP[:2], CashFlow(date=date(2022, 1, 5), amount=Decimal("9000"))],
+        [],
+    ]
+    assert compute_xirr_many(sets) == [compute_xirr(flows) for flows in sets]
+    assert compute_xirr_many(sets)[1] is None
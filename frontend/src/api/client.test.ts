@@ -2,12 +2,12 @@ import { describe, it, expect, vi, beforeEach } from 'vitest'
 
 // Stub openapi-fetch so the real `importCas`/`previewCas`/`unwrap` run against a
 // spy client. `vi.hoisted` defines the spy in the same hoisted scope as `vi.mock`.
-const { post } = vi.hoisted(() => ({ post: vi.fn() }))
+const { post, get } = vi.hoisted(() => ({ post: vi.fn(), get: vi.fn() }))
 // `use` is stubbed to complete the openapi-fetch shape; the auth interceptor now
 // lives in api/authInterceptor.ts (registered from main.ts), not imported here.
-vi.mock('openapi-fetch', () => ({ default: () => ({ POST: post, GET: vi.fn(), use: vi.fn() }) }))
+vi.mock('openapi-fetch', () => ({ default: () => ({ POST: post, GET: get, use: vi.fn() }) }))
 
-import { importCas, previewCas } from '@/api/client'
+import { importCas, previewCas, waitForImport, type ImportJobOut } from '@/api/client'
 
 function serialize(call: unknown[]): FormData {
   const init = call[1] as { body: unknown; bodySerializer: (b: unknown) => FormData }
@@ -55,6 +55,45 @@ describe('importCas', () => {
   })
 })
 
+describe('waitForImport', () => {
+  beforeEach(() => get.mockReset())
+
+  it('returns a settled job without polling', async () => {
+    const job = { id: 7, investor_id: 42, status: 'success' } as ImportJobOut
+
+    expect(await waitForImport(job)).toBe(job)
+    expect(get).not.toHaveBeenCalled()
+  })
+
+  it('polls a queued job until it settles, reporting each stage', async () => {
+    get
+      .mockResolvedValueOnce({
+        data: { id: 7, investor_id: 42, status: 'running', stage: 'reconcile' },
+      })
+      .mockResolvedValueOnce({ data: { id: 7, investor_id: 42, status: 'success', stage: 'done' } })
+    const stages: string[] = []
+    const queued = { id: 7, investor_id: 42, status: 'pending', stage: 'persist' } as ImportJobOut
+
+    const job = await waitForImport(queued, (j) => stages.push(j.stage), 0)
+
+    expect(job.status).toBe('success')
+    expect(stages).toEqual(['persist', 'reconcile'])
+    const [path, init] = get.mock.calls[0] as [string, { params: { path: object } }]
+    expect(path).toBe('/api/investors/{investor_id}/imports/{job_id}')
+    expect(init.params.path).toEqual({ investor_id: 42, job_id: 7 })
+  })
+
+  it('rejects a job that never settles after the poll cap', async () => {
+    get.mockResolvedValue({ data: { id: 7, investor_id: 42, status: 'running', stage: 'persist' } })
+    const queued = { id: 7, investor_id: 42, status: 'pending', stage: 'persist' } as ImportJobOut
+
+    await expect(waitForImport(queued, undefined, 0, 3)).rejects.toThrow(
+      'Import 7 is still running after 3 status checks',
+    )
+    expect(get).toHaveBeenCalledTimes(3)
+  })
+})
+
 describe('previewCas', () => {
   beforeEach(() => post.mockReset())
 
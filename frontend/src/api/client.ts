@@ -78,24 +78,65 @@ export async function previewCas(file: File, password = ''): Promise<CasPreviewO
 
 /**
  * Import a CAS PDF (CAMS/KFin MF CAS or NSDL/CDSL eCAS — the server auto-detects
- * and resolves/creates the investor by PAN). Returns the job at HTTP 201; inspect
- * `status`/`result` for the outcome (`success`, `completed_with_warnings`,
- * `needs_confirmation`, or `failed`). Pass `confirm` to apply a destructive eCAS
- * that removes holdings.
+ * and resolves/creates the investor by PAN). Resolves with the settled job (see
+ * `waitForImport`); inspect `status`/`result` for the outcome (`success`,
+ * `completed_with_warnings`, `needs_confirmation`, or `failed`). Pass `confirm` to
+ * apply a destructive eCAS that removes holdings; `onProgress` follows a queued job.
  */
-export async function importCas(file: File, password = '', confirm = false): Promise<ImportJobOut> {
+export async function importCas(
+  file: File,
+  password = '',
+  confirm = false,
+  onProgress?: (job: ImportJobOut) => void,
+): Promise<ImportJobOut> {
   const res = await api.POST('/api/imports/cas', {
     body: { file: file as unknown as string, password, confirm },
     bodySerializer: casFormData(true),
   })
-  return unwrap(res, 'Import failed')
+  return waitForImport(unwrap(res, 'Import failed'), onProgress)
+}
+
+const IMPORT_POLL_MS = 1000
+// Give up polling after this many polls (~30 min at the default interval). A job the
+// server lost to a restart reads `failed` once it goes stale, so this only ends a
+// wait on a server that stopped answering with a settled status.
+const IMPORT_MAX_POLLS = 1800
+
+/**
+ * Poll an import job until it settles. A server with background import workers
+ * answers an upload with the job still `pending`; one that imports in-request
+ * returns it finished, and this hands it straight back. `onProgress` sees each
+ * unsettled poll — its `stage` moves parse → persist → reconcile → done. Rejects
+ * when the job is still unsettled after `maxPolls` polls.
+ */
+export async function waitForImport(
+  job: ImportJobOut,
+  onProgress?: (job: ImportJobOut) => void,
+  intervalMs = IMPORT_POLL_MS,
+  maxPolls = IMPORT_MAX_POLLS,
+): Promise<ImportJobOut> {
+  for (let polls = 0; job.status === 'pending' || job.status === 'running'; polls++) {
+    if (polls >= maxPolls) {
+      throw new Error(
+        `Import ${job.id} is still ${job.status} after ${polls} status checks — ` +
+          'check Settings → Jobs before uploading it again',
+      )
+    }
+    onProgress?.(job)
+    await new Promise((resolve) => setTimeout(resolve, intervalMs))
+    const res = await api.GET('/api/investors/{investor_id}/imports/{job_id}', {
+      params: { path: { investor_id: job.investor_id, job_id: job.id } },
+    })
+    job = unwrap(res, 'Import failed')
+  }
+  return job
 }
 
 /**
  * Import a canonical-CSV transaction file (e.g. a mapped broker tradebook) for a
  * specific investor. The wizard derives the canonical CSV client-side; we upload
  * those bytes as a file so they ride the same content-hashed, idempotent import
- * path as every other import. Returns the job at HTTP 201 — inspect
+ * path as every other import. Resolves with the settled job — inspect
  * `status`/`result` for created/skipped counts, incomplete-history flags, etc.
  */
 export async function importTransactionsCsv(
@@ -113,5 +154,5 @@ export async function importTransactionsCsv(
       return fd
     },
   })
-  return unwrap(res, 'Import failed')
+  return waitForImport(unwrap(res, 'Import failed'))
 }
@@ -174,7 +174,9 @@ export interface paths {
          *     Auto-detects MF CAS vs NSDL/CDSL eCAS. An eCAS that would *remove* securities
          *     returns the job at status ``needs_confirmation`` with ``result.removals`` and
          *     persists nothing — resubmit with ``confirm=true`` to apply. A PAN-less
-         *     statement is rejected (422); nothing is created.
+         *     statement is rejected (422); nothing is created. Parsing stays in the request —
+         *     the PAN picks the investor the job belongs to, and a bad password or unreadable
+         *     file should fail the upload itself — persist + reconcile may run in the background.
          */
         post: operations["folioman_app_api_imports_import_cas"];
         delete?: never;
@@ -183,6 +185,32 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/api/imports/cas/batch": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Import Cas Batch Files
+         * @description Import several CAS/eCAS files at once, each under the investor its PAN names.
+         *
+         *     The files are parsed in parallel (``FOLIOMAN_CAS_PARSE_WORKERS`` processes) and
+         *     each investor's statements persist oldest first. ``passwords`` is one password
+         *     for every file or one per file, in order. A file that can't be read is reported
+         *     in the result, not raised — the rest still import. No ``confirm``: an eCAS that
+         *     would remove holdings lands at ``needs_confirmation``; re-upload it on its own.
+         */
+        post: operations["folioman_app_api_imports_import_cas_batch_files"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/imports/cas/preview": {
         parameters: {
             query?: never;
@@ -1144,6 +1172,38 @@ export interface components {
             /** Stcg Total */
             stcg_total: string;
         };
+        /**
+         * CasBatchFileOut
+         * @description One file of a batch CAS upload: the investor and job it landed in, or — for a
+         *     file that couldn't be parsed — no job and the reason.
+         */
+        CasBatchFileOut: {
+            /** Error */
+            error: string;
+            /** Filename */
+            filename: string;
+            /** Investor Id */
+            investor_id: number | null;
+            /** Investor Name */
+            investor_name: string;
+            /** Job Id */
+            job_id: number | null;
+            /** Stage */
+            stage: string;
+            /** Status */
+            status: string;
+        };
+        /** CasBatchOut */
+        CasBatchOut: {
+            /** Files */
+            files: components["schemas"]["CasBatchFileOut"][];
+            /** Investors */
+            investors: number;
+            /** Totals */
+            totals: {
+                [key: string]: number;
+            };
+        };
         /**
          * CasPreviewOut
          * @description Owner identity parsed from an uploaded CAS, before anything is persisted.
@@ -1477,6 +1537,8 @@ export interface components {
             };
             /** Source Ref */
             source_ref: string;
+            /** Stage */
+            stage: string;
             /** Started At */
             started_at: string | null;
             /** Status */
@@ -2810,6 +2872,38 @@ export interface operations {
             };
         };
     };
+    folioman_app_api_imports_import_cas_batch_files: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "multipart/form-data": {
+                    /** Files */
+                    files: string[];
+                    /**
+                     * Passwords
+                     * @default []
+                     */
+                    passwords?: string[];
+                };
+            };
+        };
+        responses: {
+            /** @description Created */
+            201: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["CasBatchOut"];
+                };
+            };
+        };
+    };
     folioman_app_api_imports_preview_cas: {
         parameters: {
             query?: never;